@@ -0,0 +1,93 @@
+-- 178: core.table_watermark + timestamp indexes for the constant-time freshness check
+--
+-- WHY: the 05:30 log review (src/agents/log_review_agent.py DatabaseChecker)
+-- ran `SELECT COUNT(*), MAX(ts_col)` plus an information_schema probe for each
+-- of 13 monitored tables, serially. None of the monitored timestamp columns is
+-- indexed, so every check was a full sequential scan of bronze.census_trade,
+-- bronze.weather_raw, etc. -- the health check got slower as the data grew.
+--
+-- NEW SHAPE:
+--   * Row counts come from catalog statistics (pg_stat_user_tables.n_live_tup,
+--     falling back to pg_class.reltuples) -- estimates, never a scan.
+--   * Latest-record time comes from core.table_watermark when CollectorRunner
+--     maintains it (collector_name set: advanced on every successful run that
+--     brought new data), otherwise from MAX(ts_col) over the btree index
+--     created below (an index-only descent, O(log n)).
+--   * All existence / stats / watermark / index lookups are ONE catalog query.
+--
+-- The seed below records which registry collector writes each monitored table.
+-- Tables written outside the dispatcher (the weather agents, backfill scripts)
+-- have collector_name NULL and rely on the index. last_write_at is
+-- initialised from the current MAX() -- a one-time scan at migration time.
+--
+-- Index builds take a SHARE lock (blocks writes) for the duration of the
+-- build. If that matters for census_trade / weather_raw, create those two
+-- indexes by hand first with CREATE INDEX CONCURRENTLY; the IF NOT EXISTS
+-- below then skips them.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS core.table_watermark (
+    schema_name     VARCHAR(63) NOT NULL,
+    table_name      VARCHAR(63) NOT NULL,
+    ts_column       VARCHAR(63) NOT NULL,
+    collector_name  VARCHAR(100),            -- registry key that writes the table; NULL = not runner-maintained
+    last_write_at   TIMESTAMPTZ,             -- latest successful write (runner) or seeded MAX(ts_column)
+    last_rows       INTEGER,                 -- rows_collected reported by that run
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (schema_name, table_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_table_watermark_collector
+    ON core.table_watermark (collector_name) WHERE collector_name IS NOT NULL;
+
+COMMENT ON TABLE core.table_watermark IS
+    'Latest-write watermark per monitored table. Advanced by CollectorRunner on successful runs; read by the log review freshness check instead of MAX() scans.';
+
+INSERT INTO core.table_watermark (schema_name, table_name, ts_column, collector_name) VALUES
+    ('bronze', 'weather_raw',              'collected_at', NULL),
+    ('bronze', 'weather_email_extract',    'collected_at', NULL),
+    ('bronze', 'weather_alerts_raw',       'collected_at', NULL),
+    ('silver', 'weather_observation',      'updated_at',   NULL),
+    ('bronze', 'nass_crop_progress',       'collected_at', 'usda_nass_crop_progress'),
+    ('bronze', 'nass_crop_condition',      'collected_at', 'usda_nass_crop_progress'),
+    ('bronze', 'nass_production',          'collected_at', 'usda_nass_production'),
+    ('bronze', 'census_trade',             'collected_at', 'census_trade'),
+    ('bronze', 'cftc_cot',                 'collected_at', 'cftc_cot'),
+    ('bronze', 'eia_raw_ingestion',        'ingestion_ts', NULL),
+    ('silver', 'eia_petroleum_weekly',     'updated_ts',   NULL),
+    ('bronze', 'futures_daily_settlement', 'collected_at', 'yfinance_futures'),
+    ('bronze', 'conab_production',         'created_at',   NULL)
+ON CONFLICT (schema_name, table_name) DO UPDATE SET
+    ts_column = EXCLUDED.ts_column,
+    collector_name = EXCLUDED.collector_name;
+
+-- Index each monitored timestamp column and seed the watermark from it.
+-- Tables/columns missing in this environment are skipped.
+DO $$
+DECLARE
+    w RECORD;
+    v_max TIMESTAMPTZ;
+BEGIN
+    FOR w IN SELECT schema_name, table_name, ts_column FROM core.table_watermark LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = w.schema_name AND table_name = w.table_name
+              AND column_name = w.ts_column
+        ) THEN
+            EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I.%I (%I)',
+                           'idx_' || w.table_name || '_' || w.ts_column,
+                           w.schema_name, w.table_name, w.ts_column);
+            EXECUTE format('SELECT MAX(%I)::timestamptz FROM %I.%I',
+                           w.ts_column, w.schema_name, w.table_name) INTO v_max;
+            UPDATE core.table_watermark
+            SET last_write_at = GREATEST(last_write_at, v_max), updated_at = NOW()
+            WHERE schema_name = w.schema_name AND table_name = w.table_name;
+        ELSE
+            RAISE NOTICE 'table_watermark: %.%.% not found, skipped',
+                w.schema_name, w.table_name, w.ts_column;
+        END IF;
+    END LOOP;
+END $$;
+
+COMMIT;
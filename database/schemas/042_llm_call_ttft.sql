@@ -0,0 +1,13 @@
+-- ============================================================================
+-- Migration 042: Time-to-first-token on the LLM call log
+-- ============================================================================
+-- Streamed LLM calls (llm_client.stream_llm / call_llm(on_token=...)) record
+-- the milliseconds until the first token arrived. NULL for non-streamed calls.
+-- Cache hits are flagged in details ('cache_hit') and logged with zero cost.
+-- ============================================================================
+
+ALTER TABLE core.llm_call_log
+    ADD COLUMN IF NOT EXISTS ttft_ms INTEGER;     -- Time to first token (streamed calls)
+
+COMMENT ON COLUMN core.llm_call_log.ttft_ms IS
+    'Milliseconds from request to first streamed token; NULL when the call was not streamed.';
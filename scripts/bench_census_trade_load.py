@@ -0,0 +1,167 @@
+"""Benchmark the Census trade PostgreSQL load: row-by-row upserts vs COPY + merge.
+
+Generates a synthetic backfill (every HS code, both flows, N months x M
+countries) and writes it twice, each into its own scratch schema so the real
+census_trade_* tables are never touched: once with the row-wise path
+(per-row INSERT ... ON CONFLICT plus Python summary loops) and once with the
+bulk path (COPY into staging, one merge, set-based summaries). Reports
+records/second and checks both schemas end up with the same tables.
+
+Needs a reachable PostgreSQL database (DATABASE_URL or RLC_PG_* / DB_*).
+
+Usage:
+    python scripts/bench_census_trade_load.py                          # 60 months x 120 countries
+    python scripts/bench_census_trade_load.py --months 120 --countries 200 --commodity SOYBEAN_MEAL
+"""
+import argparse
+import logging
+import math
+import random
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import psycopg2
+
+import pull_census_trade as pct
+
+TABLES = {
+    'census_trade_records': (
+        "SELECT trade_date, commodity, flow, country_name, hs_code, destination_region, "
+        "value_usd, quantity, marketing_year FROM census_trade_records ORDER BY 1, 2, 3, 4"),
+    'census_trade_monthly_summary': (
+        "SELECT trade_date, commodity, flow, country_name, destination_region, total_value_usd, "
+        "total_quantity, marketing_year, record_count FROM census_trade_monthly_summary "
+        "ORDER BY 1, 2, 3, 4"),
+    'census_trade_yearly_summary': (
+        "SELECT marketing_year, commodity, flow, country_name, destination_region, total_value_usd, "
+        "total_quantity, record_count FROM census_trade_yearly_summary ORDER BY 1, 2, 3, 4"),
+}
+
+
+def synthetic_records(commodity: str, months: int, countries: int, seed: int = 3):
+    """A backfill starting at a marketing-year boundary, so every year is complete."""
+    rng = random.Random(seed)
+    names = sorted(set(pct.CENSUS_COUNTRY_CODES.values()))[:countries]
+    codes = {name: code for code, name in pct.CENSUS_COUNTRY_CODES.items()}
+    year, month = 2015, pct.MARKETING_YEAR_START.get(commodity, 9)
+    records = []
+    for _ in range(months):
+        trade_date = date(year, month, 1)
+        for flow in ('exports', 'imports'):
+            for hs_code in pct.HS_CODES[commodity]:
+                for name in names:
+                    if rng.random() < 0.3:
+                        continue
+                    records.append({
+                        'year': year, 'month': month, 'date': trade_date,
+                        'flow': flow, 'hs_code': hs_code,
+                        'country_code': codes[name], 'country_name': name,
+                        'value_usd': round(rng.uniform(1e3, 5e7), 2),
+                        'quantity': round(rng.uniform(1e3, 1e8), 1) if rng.random() > 0.05 else None,
+                        'unit': 'KG',
+                        'commodity': commodity,
+                        'marketing_year': pct.get_marketing_year(commodity, trade_date),
+                    })
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return records
+
+
+def connect():
+    parsed = urlparse(pct.get_database_url())
+    if parsed.scheme != 'postgresql':
+        sys.exit("PostgreSQL connection not configured (DATABASE_URL or RLC_PG_*)")
+    return psycopg2.connect(host=parsed.hostname, port=parsed.port or 5432,
+                            database=parsed.path[1:], user=parsed.username,
+                            password=parsed.password)
+
+
+def load(records, bulk: bool, schema: str, keep: bool):
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        cursor.execute(f"SET search_path TO {schema}")
+        conn.commit()
+
+        t0 = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            pct._write_postgresql(conn, records, bulk=bulk)
+        elapsed = time.perf_counter() - t0
+
+        cursor = conn.cursor()
+        snapshot = {}
+        for table, sql in TABLES.items():
+            cursor.execute(sql)
+            snapshot[table] = cursor.fetchall()
+        if not keep:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+            conn.commit()
+        return elapsed, snapshot
+    finally:
+        conn.close()
+
+
+def same_rows(a, b, abs_tol: float) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        for u, v in zip(x, y):
+            if isinstance(u, (int, float)) or hasattr(u, 'as_tuple'):
+                if not math.isclose(float(u), float(v), rel_tol=1e-12, abs_tol=abs_tol):
+                    return False
+            elif u != v:
+                return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--commodity", default="SOYBEANS", choices=sorted(pct.HS_CODES))
+    ap.add_argument("--months", type=int, default=60)
+    ap.add_argument("--countries", type=int, default=120)
+    ap.add_argument("--rounds", type=int, default=1)
+    ap.add_argument("--keep", action="store_true", help="Keep the scratch schemas for inspection")
+    args = ap.parse_args()
+    logging.disable(logging.INFO)
+
+    records = synthetic_records(args.commodity, args.months, args.countries)
+    print(f"{args.commodity}: {len(records):,} records ({args.months} months x "
+          f"{args.countries} countries x {len(pct.HS_CODES[args.commodity])} HS codes x 2 flows), "
+          f"rounds={args.rounds}\n")
+
+    timings, snapshots = {}, {}
+    for label, bulk in (("row-wise", False), ("bulk", True)):
+        schema = f"bench_census_{'bulk' if bulk else 'rowwise'}"
+        runs = [load(records, bulk, schema, args.keep and r == args.rounds - 1)
+                for r in range(args.rounds)]
+        timings[label] = [t for t, _ in runs]
+        snapshots[label] = runs[-1][1]
+        med = statistics.median(timings[label])
+        print(f"  {label:<9} median {med:8.2f}s  min {min(timings[label]):8.2f}s  "
+              f"{len(records) / med:>12,.0f} records/s")
+
+    print(f"\n  speedup  {statistics.median(timings['row-wise']) / statistics.median(timings['bulk']):.1f}x")
+
+    # Yearly totals are sums of cent-rounded monthly totals on the bulk path
+    same = all(
+        same_rows(snapshots['row-wise'][table], snapshots['bulk'][table],
+                  abs_tol=0.0 if table == 'census_trade_records' else 0.01 * args.months)
+        for table in TABLES
+    )
+    for table in TABLES:
+        print(f"  {table:<30} {len(snapshots['bulk'][table]):>9,} rows")
+    print(f"  identical output: {'YES' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Benchmark CurveEngine: per-row path vs batched (set-based) path.
+
+Runs build_all() in both modes over the same trailing window and checks that
+they leave identical gold.curve_term / headline rows behind. Both modes are
+idempotent rewrites of the engine's own rows (DELETE + INSERT per
+(curve, obs_date), tie-out validated at COMMIT), so this is safe to run
+against production -- it writes exactly what the nightly curve_builder writes.
+
+Usage:
+    python scripts/bench_curve_engine.py                 # 10 trailing dates, 3 rounds
+    python scripts/bench_curve_engine.py --window 60 --rounds 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dotenv import load_dotenv; load_dotenv()
+
+from src.curves.engine import CurveEngine, ENGINE_SOURCE
+from src.services.database.db_config import get_connection
+
+
+def snapshot(specs, window):
+    """Engine-written rows for the window, as sorted tuples (for equality)."""
+    keys = [s.curve_key for s in specs]
+    with get_connection(dict_rows=False) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """SELECT curve_key, obs_date, tenor, term_name, term_value, term_source,
+                      quality_rank
+               FROM gold.curve_term
+               WHERE curve_key = ANY(%s)
+               ORDER BY 1, 2, 3, 4""", (keys,))
+        terms = cur.fetchall()
+        cur.execute(
+            """SELECT series_key, obs_date, tenor, value
+               FROM silver.price_mark
+               WHERE series_key = ANY(%s) AND source = %s
+               ORDER BY 1, 2, 3""", (keys, ENGINE_SOURCE))
+        headlines = cur.fetchall()
+    return terms, headlines
+
+
+def time_mode(batched, window, rounds):
+    engine = CurveEngine(window_dates=window, batched=batched)
+    timings, results = [], []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        results = engine.build_all()
+        timings.append(time.perf_counter() - t0)
+    return timings, results, snapshot(engine.specs, window)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--window", type=int, default=10, help="trailing obs_dates per spec")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"window={args.window} obs_dates, rounds={args.rounds}\n")
+    row_t, row_res, row_snap = time_mode(False, args.window, args.rounds)
+    bulk_t, bulk_res, bulk_snap = time_mode(True, args.window, args.rounds)
+
+    terms = sum(r["term_rows"] for r in bulk_res)
+    for label, t in (("per-row", row_t), ("batched", bulk_t)):
+        med = statistics.median(t)
+        print(f"  {label:<8} median {med:8.3f}s  min {min(t):8.3f}s  "
+              f"({len(bulk_res)} builds, {terms} term rows, {terms / med:,.0f} rows/s)")
+    print(f"\n  speedup  {statistics.median(row_t) / statistics.median(bulk_t):.1f}x")
+
+    same = row_snap == bulk_snap and len(row_res) == len(bulk_res)
+    print(f"  identical output: {'YES' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
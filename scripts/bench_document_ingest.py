@@ -0,0 +1,81 @@
+"""Benchmark Document RAG ingestion against the stub embedding server.
+
+Generates a synthetic markdown corpus in a temp directory and indexes it
+twice: once with the old one-at-a-time shape (1 parser, 1 text per request,
+1 request in flight) and once with the pipeline defaults. Nothing touches
+the real data/document_index.
+
+Usage:
+    python scripts/bench_document_ingest.py                       # 200 docs
+    python scripts/bench_document_ingest.py --docs 500 --request-ms 40 --text-ms 3
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.document.document_rag import (
+    DocumentRAG, EMBED_BATCH_SIZE, EMBED_IN_FLIGHT, PARSE_WORKERS,
+)
+from src.services.document.stub_embedding_server import StubEmbeddingServer
+
+
+def make_corpus(root: Path, docs: int):
+    docs_dir = root / "docs"
+    docs_dir.mkdir(parents=True)
+    for i in range(docs):
+        body = " ".join(f"Document {i} paragraph {j} on crush margins and basis." for j in range(150))
+        (docs_dir / f"doc_{i:04d}.md").write_text(f"# Doc {i}\n\n{body}\n")
+
+
+def run(root: Path, url: str, workers: int, batch: int, in_flight: int) -> float:
+    rag = DocumentRAG(root, url, parse_workers=workers, batch_size=batch, max_in_flight=in_flight)
+    rag.index_dirs = [root / "docs"]
+
+    async def go():
+        try:
+            await rag.build_index(force_rebuild=True)
+        finally:
+            await rag.close()
+
+    t0 = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        asyncio.run(go())
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--request-ms", type=float, default=20.0)
+    ap.add_argument("--text-ms", type=float, default=2.0)
+    args = ap.parse_args()
+
+    server = StubEmbeddingServer(request_ms=args.request_ms, text_ms=args.text_ms).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            make_corpus(root, args.docs)
+            print(f"{args.docs} docs, stub latency {args.request_ms}ms/request "
+                  f"+ {args.text_ms}ms/text\n")
+            for label, cfg in (("serial", (1, 1, 1)),
+                               ("pipeline", (PARSE_WORKERS, EMBED_BATCH_SIZE, EMBED_IN_FLIGHT))):
+                requests, texts = server.requests, server.texts
+                elapsed = run(root, server.url, *cfg)
+                n = server.texts - texts
+                print(f"  {label:<9} workers={cfg[0]} batch={cfg[1]:<3} in_flight={cfg[2]}  "
+                      f"{elapsed:7.2f}s  {n / elapsed:8.1f} chunks/s  "
+                      f"({server.requests - requests} requests)")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
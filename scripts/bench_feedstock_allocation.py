@@ -0,0 +1,155 @@
+"""Benchmark FeedstockAllocator: per-pair allocation core vs indexed core.
+
+Builds a synthetic facility universe (500 plants by default, every fuel type,
+technology and PADD), allocates the same month with each core from identical
+inputs and checks the allocations match. No database access.
+
+margin_model is not present in every checkout; without it the benchmark runs
+against the test stand-in (tests/margin_model_stub.py), so timings then
+measure the allocation cores around a cheap calculate().
+
+Usage:
+    python scripts/bench_feedstock_allocation.py                  # 500 facilities, 5 rounds
+    python scripts/bench_feedstock_allocation.py --facilities 2000 --rounds 3
+"""
+import argparse
+import copy
+import logging
+import math
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from dotenv import load_dotenv; load_dotenv()
+
+try:
+    import src.engines.feedstock_allocation.margin_model  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(ROOT / 'tests'))
+    import margin_model_stub
+    sys.modules['src.engines.feedstock_allocation.margin_model'] = margin_model_stub
+    print("margin_model not found: using tests/margin_model_stub.py\n")
+
+from src.engines.feedstock_allocation.allocator import (
+    CONVERSION_RATES, Facility, FeedstockAllocator, MonthInputs, RegionalSupply,
+)
+
+PERIOD = date(2025, 1, 1)
+FEEDSTOCKS = ['SBO', 'CO', 'DCO', 'EBFT', 'IBFT', 'CWG', 'PF', 'YG', 'UCO']
+BASE_PRICES = {'SBO': 0.45, 'CO': 0.52, 'DCO': 0.38, 'EBFT': 0.44, 'IBFT': 0.38,
+               'CWG': 0.35, 'PF': 0.38, 'YG': 0.32, 'UCO': 0.40}
+PADD_STATES = {
+    'PADD1': ['PA', 'NY', 'NC', 'GA'],
+    'PADD2': ['IA', 'IL', 'MN', 'NE', 'IN', 'MO'],
+    'PADD3': ['TX', 'LA', 'MS', 'AR'],
+    'PADD4': ['WY', 'MT', 'CO'],
+    'PADD5': ['CA', 'WA', 'OR', ''],
+}
+FUEL_TECH = [('biodiesel', 'transesterification'), ('renewable_diesel', 'hefa'),
+             ('saf', 'hefa'), ('coprocessing', 'coprocessing')]
+
+
+def synthetic_inputs(n_facilities: int = 500, seed: int = 7) -> MonthInputs:
+    """A deterministic month: n facilities and a PADD x feedstock supply grid that binds."""
+    rng = random.Random(seed)
+    facilities = []
+    for fid in range(1, n_facilities + 1):
+        fuel_type, technology = rng.choice(FUEL_TECH)
+        padd = rng.choice(list(PADD_STATES))
+        codes = [c for c in FEEDSTOCKS if c in CONVERSION_RATES.get(technology, {})] or FEEDSTOCKS
+        eligible = [] if rng.random() < 0.15 else rng.sample(codes, rng.randint(1, len(codes)))
+        facilities.append(Facility(
+            facility_id=fid,
+            company=f'Company {fid % 40}',
+            facility_name=f'Plant {fid}',
+            state=rng.choice(PADD_STATES[padd]),
+            padd=padd,
+            fuel_type=fuel_type,
+            technology=technology,
+            nameplate_mmgy=round(rng.uniform(5, 400), 1),
+            status='operating',
+            year_online=rng.randint(2005, 2025),
+            eligible_feedstocks=eligible,
+        ))
+
+    # Regional supply around 60% of total need, so supply constraints bind
+    total_need = sum(f.nameplate_mmgy for f in facilities) * 0.85 / 12 * 7.8
+    supply = {}
+    for code in FEEDSTOCKS:
+        for padd in PADD_STATES:
+            supply[(code, padd)] = RegionalSupply(
+                feedstock_code=code,
+                region=padd,
+                available_mil_lbs=total_need * 0.6 / 45 * rng.uniform(0.2, 1.8),
+                price_per_lb=round(BASE_PRICES[code] * rng.uniform(0.9, 1.1), 4),
+            )
+
+    prices = {'rin_d4_cents': 105.0, 'lcfs_per_gal': 0.62, 'ulsd': 2.45, 'b100': 4.35}
+    return MonthInputs(period=PERIOD, facilities=facilities, supply=supply, prices=prices)
+
+
+def time_core(indexed: bool, inputs: MonthInputs, rounds: int):
+    allocator = FeedstockAllocator(indexed=indexed)
+    calls = {'calculate': 0, 'build_credit_stack': 0}
+    for obj, name in ((allocator.margin_calc, 'calculate'),
+                      (allocator.credit_resolver, 'build_credit_stack')):
+        def counted(*a, _f=getattr(obj, name), _n=name, **kw):
+            calls[_n] += 1
+            return _f(*a, **kw)
+        setattr(obj, name, counted)
+
+    timings, results = [], []
+    for _ in range(rounds):
+        month = copy.deepcopy(inputs)
+        t0 = time.perf_counter()
+        results = allocator.allocate_inputs(month)
+        timings.append(time.perf_counter() - t0)
+    return timings, results, {k: v // rounds for k, v in calls.items()}
+
+
+def same_allocation(a, b) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if (x.facility_id, x.feedstock_code, x.constraint_binding, x.margin_rank) != \
+                (y.facility_id, y.feedstock_code, y.constraint_binding, y.margin_rank):
+            return False
+        for attr in ('allocated_mil_lbs', 'allocated_mil_gal', 'pct_of_facility',
+                     'feedstock_cost_lb', 'margin_per_gal'):
+            if not math.isclose(getattr(x, attr), getattr(y, attr), rel_tol=1e-9, abs_tol=1e-12):
+                return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--facilities", type=int, default=500)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    logging.disable(logging.INFO)
+
+    inputs = synthetic_inputs(args.facilities, args.seed)
+    print(f"facilities={args.facilities}, supply cells={len(inputs.supply)}, rounds={args.rounds}\n")
+    pair_t, pair_res, pair_calls = time_core(False, inputs, args.rounds)
+    idx_t, idx_res, idx_calls = time_core(True, inputs, args.rounds)
+
+    for label, t, calls in (("per-pair", pair_t, pair_calls), ("indexed", idx_t, idx_calls)):
+        med = statistics.median(t)
+        print(f"  {label:<8} median {med * 1000:8.1f}ms  min {min(t) * 1000:8.1f}ms  "
+              f"calculate x{calls['calculate']:,}  credit stacks x{calls['build_credit_stack']:,}")
+    print(f"\n  speedup  {statistics.median(pair_t) / statistics.median(idx_t):.1f}x "
+          f"({len(idx_res)} allocation rows)")
+
+    same = same_allocation(pair_res, idx_res)
+    print(f"  identical output: {'YES' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
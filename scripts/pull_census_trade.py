@@ -15,16 +15,24 @@ Usage:
     python scripts/pull_census_trade.py --commodity soybeans --years 5
     python scripts/pull_census_trade.py --commodity all --save-to-db --update-excel
 
+    # Backfill with more concurrent requests; cached responses are reused on rerun
+    python scripts/pull_census_trade.py --commodity ALL --years 10 --workers 10 --save-to-db
+
     # Test with Models folder outside Dropbox (on Desktop):
     python scripts/pull_census_trade.py --commodity SOYBEANS --years 1 --update-excel --models-path "C:\\Users\\torem\\OneDrive\\Desktop\\Models\\Oilseeds"
 """
 
 import argparse
 import csv
+import hashlib
+import io
+import json
 import logging
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -48,6 +56,8 @@ except ImportError:
     print("ERROR: requests not installed. Run: pip install requests")
     sys.exit(1)
 
+from src.utils.rate_limit import install_shared_limiter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -62,6 +72,15 @@ logger = logging.getLogger(__name__)
 # Census API base URL
 CENSUS_API_BASE = "https://api.census.gov/data/timeseries/intltrade"
 
+# Fetch planner: concurrent requests under one shared rate limit, with raw
+# responses cached on disk so reruns only fetch what is missing
+CENSUS_FETCH_WORKERS = int(os.getenv('RLC_CENSUS_WORKERS', 6))
+CENSUS_RATE_PER_MIN = float(os.getenv('RLC_CENSUS_RATE_PER_MIN', 120))
+CENSUS_RATE_BURST = 5.0
+CENSUS_CACHE_DIR = PROJECT_ROOT / 'data' / 'cache' / 'census_trade'
+CENSUS_CACHE_RECENT_MONTHS = 3   # months that may still be released or revised
+CENSUS_CACHE_TTL_HOURS = 24      # expiry for cached recent months
+
 # HS Codes for commodities (6-digit codes from RLC HS codes reference)
 # Multiple codes per commodity - will fetch and aggregate data from all codes
 # Source: Models/HS codes reference sheet
@@ -887,54 +906,37 @@ def test_census_api(api_key: str = None) -> bool:
         return False
 
 
-def fetch_trade_data(
+def _flow_fields(flow: str) -> Tuple[str, str, List[str]]:
+    """Commodity field, value field and quantity fields for a trade flow"""
+    # Field names differ between imports and exports
+    # See: https://api.census.gov/data/timeseries/intltrade/exports/hs/variables.html
+    # See: https://api.census.gov/data/timeseries/intltrade/imports/hs/variables.html
+    if flow == 'imports':
+        return 'I_COMMODITY', 'GEN_VAL_MO', ['GEN_QY1_MO', 'CON_QY1_MO']
+    return 'E_COMMODITY', 'ALL_VAL_MO', ['QTY_1_MO', 'QTY_2_MO']
+
+
+def build_trade_request(
     flow: str,
     hs_code: str,
     year: int,
     month: int,
-    api_key: str = None,
-    max_retries: int = 3
-) -> List[Dict]:
+    api_key: str = None
+) -> Tuple[str, Dict]:
     """
-    Fetch trade data from Census API for a specific month
-
-    Args:
-        flow: 'exports' or 'imports'
-        hs_code: HS code (e.g., '1201' for soybeans)
-        year: Year
-        month: Month (1-12)
-        api_key: Census API key (optional but recommended)
-        max_retries: Maximum number of retry attempts
+    Build the Census API URL and query parameters for one month of one HS code
 
     Returns:
-        List of trade records
+        (url, params)
     """
-    import time as time_module
-    import json
-
     # Build URL
     url = f"{CENSUS_API_BASE}/{flow}/hs"
 
-    # Field names differ between imports and exports
-    # See: https://api.census.gov/data/timeseries/intltrade/exports/hs/variables.html
-    # See: https://api.census.gov/data/timeseries/intltrade/imports/hs/variables.html
     # IMPORTANT: Census API returns 0 for BOTH true zeros AND missing values!
     # We must request the FLAG fields to distinguish between them.
     # Flag values: blank = real data, 'A' = suppressed, 'N' = not available
-    if flow == 'imports':
-        commodity_field = 'I_COMMODITY'
-        value_field = 'GEN_VAL_MO'
-        # Quantity fields and their corresponding flag fields for imports
-        qty_fields = ['GEN_QY1_MO', 'CON_QY1_MO']
-        qty_flag_fields = ['GEN_QY1_MO_FLAG', 'CON_QY1_MO_FLAG']
-        unit_field = 'UNIT_QY1'
-    else:
-        commodity_field = 'E_COMMODITY'
-        value_field = 'ALL_VAL_MO'
-        # Quantity fields and their corresponding flag fields for exports
-        qty_fields = ['QTY_1_MO', 'QTY_2_MO']
-        qty_flag_fields = ['QTY_1_MO_FLAG', 'QTY_2_MO_FLAG']
-        unit_field = 'UNIT_QY1'
+    commodity_field, value_field, qty_fields = _flow_fields(flow)
+    unit_field = 'UNIT_QY1'
 
     # Build params - request quantity fields (WITHOUT flag fields - they cause API errors)
     # Also request shipping weight fields as alternative data sources
@@ -971,13 +973,45 @@ def fetch_trade_data(
     if api_key:
         params['key'] = api_key
 
+    return url, params
+
+
+def request_trade_data(
+    flow: str,
+    hs_code: str,
+    year: int,
+    month: int,
+    api_key: str = None,
+    max_retries: int = 3,
+    session=None,
+    limiter=None
+) -> Optional[List[List]]:
+    """
+    Request one month of one HS code from the Census API, with retry/backoff
+
+    Args:
+        session: requests.Session to reuse connections (module-level requests if None)
+        limiter: TokenBucket acquired before every attempt, shared across threads
+
+    Returns:
+        Raw JSON rows (header row first), [] when Census has no data for the
+        request, or None when the request failed after all retries
+    """
+    import time as time_module
+    import json
+
+    url, params = build_trade_request(flow, hs_code, year, month, api_key)
+    time_str = f"{year}-{month:02d}"
+
     for attempt in range(max_retries):
         try:
             # Debug: show URL on first attempt
             if attempt == 0:
                 print(f"  Fetching {flow}/{hs_code} for {time_str}...")
 
-            response = requests.get(url, params=params, timeout=30)
+            if limiter:
+                limiter.acquire()
+            response = (session or requests).get(url, params=params, timeout=30)
 
             if response.status_code == 200:
                 # Check if response is empty or not JSON
@@ -1000,126 +1034,10 @@ def fetch_trade_data(
                         logger.info(f"Retrying in {wait_time}s...")
                         time_module.sleep(wait_time)
                         continue
-                    return []
+                    return None
 
                 if data and len(data) > 1:
-                    headers = data[0]
-                    records = []
-
-                    # DEBUG: Print summary and determine volume source
-                    if len(data) > 1:
-                        first_row = dict(zip(headers, data[1]))
-                        unit_val = first_row.get('UNIT_QY1', '-')
-                        val_usd = first_row.get(value_field, 'N/A')
-
-                        # Determine which volume source is available
-                        if flow == 'exports':
-                            ves_wgt = parse_number(first_row.get('VES_WGT_MO'))
-                            air_wgt = parse_number(first_row.get('AIR_WGT_MO'))
-                            total_wgt = (ves_wgt or 0) + (air_wgt or 0)
-                            if total_wgt > 0:
-                                volume_source = f"WEIGHT (VES+AIR={total_wgt:,.0f} KG)"
-                            elif unit_val and unit_val != '-':
-                                qty_val = parse_number(first_row.get('QTY_1_MO'))
-                                volume_source = f"QTY_1 ({qty_val} {unit_val})"
-                            else:
-                                volume_source = "NONE (will estimate from USD)"
-                        else:
-                            qty_val = parse_number(first_row.get('GEN_QY1_MO') or first_row.get('QTY_1_MO'))
-                            if unit_val and unit_val != '-' and qty_val:
-                                volume_source = f"QTY ({qty_val} {unit_val})"
-                            else:
-                                volume_source = "NONE (will estimate from USD)"
-
-                        print(f"  Got {len(data)-1} records. Volume source: {volume_source}")
-
-                    for row in data[1:]:
-                        record = dict(zip(headers, row))
-
-                        # Parse values
-                        value_usd = parse_number(record.get(value_field))
-
-                        # Volume extraction strategy:
-                        # 1. Check if QTY fields are actually populated (UNIT_QY1 != '-')
-                        # 2. If QTY not reported, use shipping weight as volume (VES_WGT + AIR_WGT)
-                        # 3. For imports (no weight fields), fall back to QTY fields
-
-                        quantity = None
-                        unit = None
-                        unit_qy1 = record.get('UNIT_QY1', '-')
-
-                        # For EXPORTS: Use shipping weight as PRIMARY volume measure
-                        # (QTY fields are often not populated for commodity exports)
-                        if flow == 'exports':
-                            # Check if weight data is available
-                            ves_wgt = parse_number(record.get('VES_WGT_MO'))
-                            air_wgt = parse_number(record.get('AIR_WGT_MO'))
-
-                            # Total weight = Vessel + Air (not additive with CNT_WGT)
-                            total_weight = (ves_wgt or 0) + (air_wgt or 0)
-
-                            if total_weight > 0:
-                                quantity = total_weight
-                                unit = 'KG'  # Shipping weight is always in KG
-                            elif unit_qy1 and unit_qy1 != '-':
-                                # QTY fields are populated, use them
-                                for i, qty_field in enumerate(qty_fields):
-                                    q = parse_number(record.get(qty_field))
-                                    if q is not None and q > 0:
-                                        quantity = q
-                                        if 'QY1' in qty_field or i == 0:
-                                            unit = unit_qy1
-                                        else:
-                                            unit = record.get('UNIT_QY2', unit_qy1)
-                                        break
-                        else:
-                            # For IMPORTS: Use QTY fields (weight not available)
-                            if unit_qy1 and unit_qy1 != '-':
-                                for i, qty_field in enumerate(qty_fields):
-                                    q = parse_number(record.get(qty_field))
-                                    if q is not None and q > 0:
-                                        quantity = q
-                                        if 'QY1' in qty_field or i == 0:
-                                            unit = unit_qy1
-                                        else:
-                                            unit = record.get('UNIT_QY2', unit_qy1)
-                                        break
-
-                        # NORMALIZE QUANTITY TO KG
-                        # Census reports different units for different HS codes:
-                        # - 150710 (crude SBO): MT (metric tons)
-                        # - 150790 (refined SBO): KG (kilograms)
-                        # Normalize everything to KG for consistent downstream processing
-                        if quantity is not None and unit:
-                            unit_upper = unit.upper().strip()
-                            if unit_upper in ('MT', 'T', 'METRIC TON', 'METRIC TONS'):
-                                # Convert MT to KG (multiply by 1000)
-                                quantity = quantity * 1000
-                                logger.debug(f"Converted {quantity/1000} MT to {quantity} KG for HS {hs_code}")
-                            elif unit_upper in ('LB', 'LBS', 'POUND', 'POUNDS'):
-                                # Convert LBS to KG (divide by 2.20462)
-                                quantity = quantity / 2.20462
-                            # KG stays as-is
-
-                        # If no quantity found but we have value, skip this record's quantity
-                        # (we'll still save it to DB with quantity=None)
-                        if value_usd is None and quantity is None:
-                            continue
-
-                        records.append({
-                            'year': year,
-                            'month': month,
-                            'date': date(year, month, 1),
-                            'flow': flow,
-                            'hs_code': hs_code,
-                            'country_code': record.get('CTY_CODE', ''),
-                            'country_name': clean_country_name(record.get('CTY_NAME', '')),
-                            'value_usd': value_usd,
-                            'quantity': quantity,
-                            'unit': unit or '',
-                        })
-
-                    return records
+                    return data
                 else:
                     # Valid JSON but no data
                     return []
@@ -1144,10 +1062,10 @@ def fetch_trade_data(
                     continue
                 else:
                     logger.error(f"API returned {response.status_code} for {flow}/{hs_code} {time_str} after {max_retries} attempts")
-                    return []
+                    return None
             else:
                 logger.warning(f"API returned {response.status_code} for {flow}/{hs_code} {time_str}")
-                return []
+                return None
 
         except requests.exceptions.ConnectionError as e:
             # Connection reset, timeout, etc - retry
@@ -1158,13 +1076,415 @@ def fetch_trade_data(
                 continue
             else:
                 logger.error(f"Connection error for {flow}/{hs_code} {time_str} after {max_retries} attempts: {e}")
-                return []
+                return None
 
         except requests.RequestException as e:
             logger.error(f"Request failed for {flow}/{hs_code} {time_str}: {e}")
-            return []
+            return None
+
+    return None
+
+
+def parse_trade_response(
+    data: Optional[List[List]],
+    flow: str,
+    hs_code: str,
+    year: int,
+    month: int
+) -> List[Dict]:
+    """
+    Convert raw Census API rows into trade records
+
+    Args:
+        data: JSON rows from request_trade_data (header row first)
+        flow, hs_code, year, month: The request the rows answer
+
+    Returns:
+        List of trade records
+    """
+    if not data or len(data) < 2:
+        return []
+
+    _, value_field, qty_fields = _flow_fields(flow)
+    headers = data[0]
+    records = []
+
+    # DEBUG: Print summary and determine volume source
+    if len(data) > 1:
+        first_row = dict(zip(headers, data[1]))
+        unit_val = first_row.get('UNIT_QY1', '-')
+        val_usd = first_row.get(value_field, 'N/A')
+
+        # Determine which volume source is available
+        if flow == 'exports':
+            ves_wgt = parse_number(first_row.get('VES_WGT_MO'))
+            air_wgt = parse_number(first_row.get('AIR_WGT_MO'))
+            total_wgt = (ves_wgt or 0) + (air_wgt or 0)
+            if total_wgt > 0:
+                volume_source = f"WEIGHT (VES+AIR={total_wgt:,.0f} KG)"
+            elif unit_val and unit_val != '-':
+                qty_val = parse_number(first_row.get('QTY_1_MO'))
+                volume_source = f"QTY_1 ({qty_val} {unit_val})"
+            else:
+                volume_source = "NONE (will estimate from USD)"
+        else:
+            qty_val = parse_number(first_row.get('GEN_QY1_MO') or first_row.get('QTY_1_MO'))
+            if unit_val and unit_val != '-' and qty_val:
+                volume_source = f"QTY ({qty_val} {unit_val})"
+            else:
+                volume_source = "NONE (will estimate from USD)"
+
+        print(f"  Got {len(data)-1} records. Volume source: {volume_source}")
+
+    for row in data[1:]:
+        record = dict(zip(headers, row))
+
+        # Parse values
+        value_usd = parse_number(record.get(value_field))
+
+        # Volume extraction strategy:
+        # 1. Check if QTY fields are actually populated (UNIT_QY1 != '-')
+        # 2. If QTY not reported, use shipping weight as volume (VES_WGT + AIR_WGT)
+        # 3. For imports (no weight fields), fall back to QTY fields
+
+        quantity = None
+        unit = None
+        unit_qy1 = record.get('UNIT_QY1', '-')
+
+        # For EXPORTS: Use shipping weight as PRIMARY volume measure
+        # (QTY fields are often not populated for commodity exports)
+        if flow == 'exports':
+            # Check if weight data is available
+            ves_wgt = parse_number(record.get('VES_WGT_MO'))
+            air_wgt = parse_number(record.get('AIR_WGT_MO'))
+
+            # Total weight = Vessel + Air (not additive with CNT_WGT)
+            total_weight = (ves_wgt or 0) + (air_wgt or 0)
+
+            if total_weight > 0:
+                quantity = total_weight
+                unit = 'KG'  # Shipping weight is always in KG
+            elif unit_qy1 and unit_qy1 != '-':
+                # QTY fields are populated, use them
+                for i, qty_field in enumerate(qty_fields):
+                    q = parse_number(record.get(qty_field))
+                    if q is not None and q > 0:
+                        quantity = q
+                        if 'QY1' in qty_field or i == 0:
+                            unit = unit_qy1
+                        else:
+                            unit = record.get('UNIT_QY2', unit_qy1)
+                        break
+        else:
+            # For IMPORTS: Use QTY fields (weight not available)
+            if unit_qy1 and unit_qy1 != '-':
+                for i, qty_field in enumerate(qty_fields):
+                    q = parse_number(record.get(qty_field))
+                    if q is not None and q > 0:
+                        quantity = q
+                        if 'QY1' in qty_field or i == 0:
+                            unit = unit_qy1
+                        else:
+                            unit = record.get('UNIT_QY2', unit_qy1)
+                        break
+
+        # NORMALIZE QUANTITY TO KG
+        # Census reports different units for different HS codes:
+        # - 150710 (crude SBO): MT (metric tons)
+        # - 150790 (refined SBO): KG (kilograms)
+        # Normalize everything to KG for consistent downstream processing
+        if quantity is not None and unit:
+            unit_upper = unit.upper().strip()
+            if unit_upper in ('MT', 'T', 'METRIC TON', 'METRIC TONS'):
+                # Convert MT to KG (multiply by 1000)
+                quantity = quantity * 1000
+                logger.debug(f"Converted {quantity/1000} MT to {quantity} KG for HS {hs_code}")
+            elif unit_upper in ('LB', 'LBS', 'POUND', 'POUNDS'):
+                # Convert LBS to KG (divide by 2.20462)
+                quantity = quantity / 2.20462
+            # KG stays as-is
+
+        # If no quantity found but we have value, skip this record's quantity
+        # (we'll still save it to DB with quantity=None)
+        if value_usd is None and quantity is None:
+            continue
 
-    return []
+        records.append({
+            'year': year,
+            'month': month,
+            'date': date(year, month, 1),
+            'flow': flow,
+            'hs_code': hs_code,
+            'country_code': record.get('CTY_CODE', ''),
+            'country_name': clean_country_name(record.get('CTY_NAME', '')),
+            'value_usd': value_usd,
+            'quantity': quantity,
+            'unit': unit or '',
+        })
+
+    return records
+
+
+def fetch_trade_data(
+    flow: str,
+    hs_code: str,
+    year: int,
+    month: int,
+    api_key: str = None,
+    max_retries: int = 3
+) -> List[Dict]:
+    """
+    Fetch trade data from Census API for a specific month
+
+    Args:
+        flow: 'exports' or 'imports'
+        hs_code: HS code (e.g., '1201' for soybeans)
+        year: Year
+        month: Month (1-12)
+        api_key: Census API key (optional but recommended)
+        max_retries: Maximum number of retry attempts
+
+    Returns:
+        List of trade records
+    """
+    data = request_trade_data(flow, hs_code, year, month, api_key, max_retries)
+    return parse_trade_response(data, flow, hs_code, year, month)
+
+
+# =============================================================================
+# FETCH PLANNER
+# =============================================================================
+
+@dataclass(frozen=True)
+class TradeRequest:
+    """One Census API request: a month of one HS code for one flow"""
+    flow: str
+    hs_code: str
+    year: int
+    month: int
+
+
+class CensusResponseCache:
+    """
+    On-disk cache of raw Census API responses, one JSON file per request.
+
+    Entries are keyed by URL and parameters (API key excluded). Months older
+    than CENSUS_CACHE_RECENT_MONTHS are settled and never expire; recent months
+    expire after CENSUS_CACHE_TTL_HOURS so new releases are picked up.
+    Failed requests are never written, so a rerun refetches exactly those.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = CENSUS_CACHE_DIR,
+        ttl_hours: float = CENSUS_CACHE_TTL_HOURS,
+        recent_months: int = CENSUS_CACHE_RECENT_MONTHS,
+        today: date = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_hours = ttl_hours
+        today = today or date.today()
+        cutoff = today.year * 12 + today.month - 1 - recent_months
+        self.settled_before = date(cutoff // 12, cutoff % 12 + 1, 1)
+
+    def _path(self, url: str, params: Dict) -> Path:
+        key_params = {k: v for k, v in params.items() if k != 'key'}
+        key_string = f"{url}|{json.dumps(key_params, sort_keys=True)}"
+        return self.cache_dir / f"{hashlib.md5(key_string.encode()).hexdigest()}.json"
+
+    def get(self, url: str, params: Dict, period: date) -> Optional[List[List]]:
+        """Cached rows for a request, or None on a miss"""
+        path = self._path(url, params)
+        if not path.exists():
+            return None
+        if period >= self.settled_before:
+            age_hours = (datetime.now().timestamp() - path.stat().st_mtime) / 3600
+            if age_hours >= self.ttl_hours:
+                return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)['data']
+        except Exception as e:
+            logger.warning(f"Error reading Census cache {path.name}: {e}")
+            return None
+
+    def put(self, url: str, params: Dict, data: List[List]):
+        """Store rows for a request (written atomically; safe across threads)"""
+        path = self._path(url, params)
+        tmp = path.with_suffix(f'.{os.getpid()}.{id(data)}.tmp')
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({'url': url, 'params': {k: v for k, v in params.items() if k != 'key'},
+                           'data': data}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Error writing Census cache {path.name}: {e}")
+
+
+class CensusFetchPlanner:
+    """
+    Expands a commodity pull into its (month, flow, hs_code) request grid and
+    runs it concurrently.
+
+    Working HS codes are probed once per flow, the same way the serial loop
+    did: the 6-digit codes at the first month, falling back to the 4-digit
+    codes, moving to the next month until some code returns data. The rest of
+    the grid then runs on a thread pool. Every attempt draws from the shared
+    'Census API' token bucket, and raw responses go through CensusResponseCache.
+    Records come back in the serial loop's order (month, flow, code).
+
+    Args:
+        commodity: Commodity name (SOYBEANS, SOYBEAN_MEAL, ...)
+        start_date, end_date: Months to fetch (inclusive)
+        flow: 'exports', 'imports', or 'both'
+        api_key: Census API key
+        workers: Concurrent requests (default RLC_CENSUS_WORKERS)
+        cache: Response cache; None disables caching
+        refresh: Ignore cached responses (fresh ones are still written)
+    """
+
+    def __init__(
+        self,
+        commodity: str,
+        start_date: date,
+        end_date: date,
+        flow: str = 'both',
+        api_key: str = None,
+        workers: int = None,
+        cache: Optional[CensusResponseCache] = None,
+        refresh: bool = False
+    ):
+        self.commodity = commodity.upper()
+        self.start_date = start_date
+        self.end_date = end_date
+        self.flows = ['exports', 'imports'] if flow == 'both' else [flow]
+        self.api_key = api_key
+        self.workers = max(1, workers or CENSUS_FETCH_WORKERS)
+        self.cache = cache
+        self.refresh = refresh
+        self.hs_codes_6 = HS_CODES.get(self.commodity, [])
+        self.hs_codes_4 = HS_CODES_4DIGIT.get(self.commodity, [])
+
+        self.limiter = install_shared_limiter('Census API', CENSUS_RATE_PER_MIN, CENSUS_RATE_BURST)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, self.workers))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.working_codes: Dict[str, List[str]] = {}
+        self.stats = {'cached': 0, 'fetched': 0, 'failed': 0}
+        self.failed: List[TradeRequest] = []
+
+    def months(self) -> List[Tuple[int, int]]:
+        """(year, month) for every month in the range"""
+        months = []
+        year, month = self.start_date.year, self.start_date.month
+        while date(year, month, 1) <= self.end_date:
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    def _execute(self, req: TradeRequest) -> Tuple[Optional[List[List]], str]:
+        """Raw rows for one request, from the cache or the API"""
+        url, params = build_trade_request(req.flow, req.hs_code, req.year, req.month, self.api_key)
+        period = date(req.year, req.month, 1)
+
+        if self.cache and not self.refresh:
+            data = self.cache.get(url, params, period)
+            if data is not None:
+                return data, 'cached'
+
+        data = request_trade_data(
+            req.flow, req.hs_code, req.year, req.month, self.api_key,
+            session=self.session, limiter=self.limiter
+        )
+        if data is None:
+            return None, 'failed'
+        if self.cache:
+            self.cache.put(url, params, data)
+        return data, 'fetched'
+
+    def _run(self, batch: List[TradeRequest]) -> Dict[TradeRequest, List[Dict]]:
+        """Run a batch of requests and parse the responses"""
+        if self.workers <= 1 or len(batch) <= 1:
+            outcomes = [self._execute(req) for req in batch]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batch))) as pool:
+                outcomes = list(pool.map(self._execute, batch))
+
+        results = {}
+        for req, (data, outcome) in zip(batch, outcomes):
+            self.stats[outcome] += 1
+            if outcome == 'failed':
+                self.failed.append(req)
+            results[req] = parse_trade_response(data, req.flow, req.hs_code, req.year, req.month)
+        return results
+
+    def probe(self, months: List[Tuple[int, int]], results: Dict) -> Dict[str, int]:
+        """
+        Find the working HS codes for each flow.
+
+        Returns:
+            {flow: index of the month the codes were found in}
+        """
+        found_at = {}
+        pending = list(self.flows)
+        for i, (year, month) in enumerate(months):
+            if not pending:
+                break
+
+            results.update(self._run([TradeRequest(f, code, year, month)
+                                      for f in pending for code in self.hs_codes_6]))
+            fallback = [f for f in pending
+                        if not any(results[TradeRequest(f, code, year, month)] for code in self.hs_codes_6)]
+            if fallback and self.hs_codes_4:
+                results.update(self._run([TradeRequest(f, code, year, month)
+                                          for f in fallback for code in self.hs_codes_4]))
+
+            for f in pending:
+                codes = [code for code in self.hs_codes_6 + self.hs_codes_4
+                         if results.get(TradeRequest(f, code, year, month))]
+                if codes:
+                    self.working_codes[f] = codes
+                    found_at[f] = i
+                    logger.info(f"Using HS codes {', '.join(codes)} for {self.commodity} {f}")
+            pending = [f for f in pending if f not in self.working_codes]
+
+        return found_at
+
+    def run(self) -> List[Dict]:
+        """Fetch every month, flow and working code; returns trade records"""
+        months = self.months()
+        results: Dict[TradeRequest, List[Dict]] = {}
+        found_at = self.probe(months, results)
+
+        grid = [TradeRequest(f, code, year, month)
+                for f, codes in self.working_codes.items()
+                for year, month in months[found_at[f] + 1:]
+                for code in codes]
+        results.update(self._run(grid))
+
+        all_records = []
+        for i, (year, month) in enumerate(months):
+            for f in self.flows:
+                if f in found_at and i > found_at[f]:
+                    codes = self.working_codes[f]
+                else:
+                    codes = self.hs_codes_6 + self.hs_codes_4
+                for code in codes:
+                    for r in results.get(TradeRequest(f, code, year, month), []):
+                        r['commodity'] = self.commodity
+                        r['marketing_year'] = get_marketing_year(self.commodity, r['date'])
+                        all_records.append(r)
+
+        logger.info(
+            f"{self.commodity}: {sum(self.stats.values())} Census requests over {len(months)} months "
+            f"({self.stats['cached']} cached, {self.stats['fetched']} fetched, {self.stats['failed']} failed)"
+        )
+        if self.failed:
+            logger.warning(f"{len(self.failed)} Census requests failed; rerun to fetch only those")
+        return all_records
 
 
 def fetch_commodity_data(
@@ -1172,7 +1492,10 @@ def fetch_commodity_data(
     start_date: date,
     end_date: date,
     flow: str = 'both',
-    api_key: str = None
+    api_key: str = None,
+    workers: int = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False
 ) -> List[Dict]:
     """
     Fetch all trade data for a commodity over a date range
@@ -1183,101 +1506,22 @@ def fetch_commodity_data(
         end_date: End date
         flow: 'exports', 'imports', or 'both'
         api_key: Census API key
+        workers: Concurrent requests (default RLC_CENSUS_WORKERS)
+        use_cache: Read and write the on-disk response cache
+        refresh_cache: Refetch everything, overwriting cached responses
 
     Returns:
         List of all trade records
     """
-    # Get HS codes (now lists to support multiple codes per commodity)
-    hs_codes_6 = HS_CODES.get(commodity.upper(), [])
-    hs_codes_4 = HS_CODES_4DIGIT.get(commodity.upper(), [])
-
-    if not hs_codes_6 and not hs_codes_4:
+    if not HS_CODES.get(commodity.upper()) and not HS_CODES_4DIGIT.get(commodity.upper()):
         logger.error(f"Unknown commodity: {commodity}")
         return []
 
-    flows = ['exports', 'imports'] if flow == 'both' else [flow]
-    all_records = []
-
-    # Track which HS codes work for each flow
-    working_codes = {}
-
-    # Iterate through months
-    current = date(start_date.year, start_date.month, 1)
-    total_months = ((end_date.year - start_date.year) * 12 +
-                    end_date.month - start_date.month + 1)
-    months_processed = 0
-
-    while current <= end_date:
-        months_processed += 1
-
-        for trade_flow in flows:
-            flow_records = []
-
-            # Use working codes if we've already found them
-            if trade_flow in working_codes:
-                for hs_code in working_codes[trade_flow]:
-                    records = fetch_trade_data(
-                        flow=trade_flow,
-                        hs_code=hs_code,
-                        year=current.year,
-                        month=current.month,
-                        api_key=api_key
-                    )
-                    flow_records.extend(records)
-            else:
-                # Try 6-digit codes first
-                codes_that_work = []
-                for hs_code in hs_codes_6:
-                    records = fetch_trade_data(
-                        flow=trade_flow,
-                        hs_code=hs_code,
-                        year=current.year,
-                        month=current.month,
-                        api_key=api_key
-                    )
-                    if records:
-                        codes_that_work.append(hs_code)
-                        flow_records.extend(records)
-                        logger.info(f"Using 6-digit code {hs_code} for {trade_flow}")
-
-                # If no 6-digit codes worked, try 4-digit
-                if not flow_records and hs_codes_4:
-                    for hs_code in hs_codes_4:
-                        records = fetch_trade_data(
-                            flow=trade_flow,
-                            hs_code=hs_code,
-                            year=current.year,
-                            month=current.month,
-                            api_key=api_key
-                        )
-                        if records:
-                            codes_that_work.append(hs_code)
-                            flow_records.extend(records)
-                            logger.info(f"Using 4-digit code {hs_code} for {trade_flow}")
-
-                if codes_that_work:
-                    working_codes[trade_flow] = codes_that_work
-
-            records = flow_records
-
-            # Add commodity info to records
-            for r in records:
-                r['commodity'] = commodity.upper()
-                r['marketing_year'] = get_marketing_year(commodity, r['date'])
-
-            all_records.extend(records)
-
-        # Progress update every 12 months
-        if months_processed % 12 == 0:
-            logger.info(f"  Processed {months_processed}/{total_months} months...")
-
-        # Move to next month
-        if current.month == 12:
-            current = date(current.year + 1, 1, 1)
-        else:
-            current = date(current.year, current.month + 1, 1)
-
-    return all_records
+    planner = CensusFetchPlanner(
+        commodity, start_date, end_date, flow=flow, api_key=api_key, workers=workers,
+        cache=CensusResponseCache() if use_cache else None, refresh=refresh_cache
+    )
+    return planner.run()
 
 
 # =============================================================================
@@ -1634,9 +1878,49 @@ def _save_to_postgresql(records: List[Dict], connection_string: str) -> int:
             print(f"\nERROR connecting to PostgreSQL: {e}")
         return 0
 
+    try:
+        inserted = _write_postgresql(conn, records)
+    finally:
+        conn.close()
+
+    print(f"SUCCESS: Saved {inserted} records to PostgreSQL with aggregation tables updated")
+    return inserted
+
+
+def _write_postgresql(conn, records: List[Dict], bulk: bool = True) -> int:
+    """
+    Upsert records and refresh the summary tables on an open connection.
+
+    Args:
+        conn: psycopg2 connection (closed by the caller)
+        records: Trade records from fetch_commodity_data
+        bulk: COPY + set-based merge (default); False uses the row-by-row
+              path, kept for scripts/bench_census_trade_load.py
+
+    Returns:
+        Number of records written
+    """
     cursor = conn.cursor()
+    _create_postgresql_tables(cursor)
+    conn.commit()
 
-    # Create tables
+    if bulk:
+        inserted = _bulk_upsert_records(cursor, records)
+        print(f"Inserted/updated {inserted} raw records in PostgreSQL")
+        _refresh_postgresql_summaries(cursor)
+    else:
+        inserted = _upsert_records_rowwise(cursor, records)
+        conn.commit()
+        print(f"Inserted/updated {inserted} raw records in PostgreSQL")
+        _update_postgresql_aggregations(cursor, records)
+    conn.commit()
+
+    cursor.close()
+    return inserted
+
+
+def _create_postgresql_tables(cursor):
+    """Create the records and summary tables if needed"""
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS census_trade_records (
             id BIGSERIAL PRIMARY KEY,
@@ -1700,9 +1984,146 @@ def _save_to_postgresql(records: List[Dict], connection_string: str) -> int:
         )
     """)
 
-    conn.commit()
 
-    # Insert records
+# Staging columns, in COPY order; seq keeps input order so the merge can apply
+# "last record wins" for keys repeated across HS codes, as the row-wise path does
+STAGE_COLUMNS = [
+    'seq', 'trade_date', 'year', 'month', 'commodity', 'hs_code', 'flow',
+    'country_code', 'country_name', 'destination_region',
+    'value_usd', 'quantity', 'unit', 'marketing_year',
+]
+COPY_NULL = '\\N'
+
+
+def _stage_records(cursor, records: List[Dict]) -> int:
+    """COPY records into a temp staging table (dropped at commit)"""
+    cursor.execute("""
+        CREATE TEMP TABLE census_trade_stage (
+            seq INTEGER,
+            trade_date DATE,
+            year INTEGER,
+            month INTEGER,
+            commodity VARCHAR(50),
+            hs_code VARCHAR(10),
+            flow VARCHAR(10),
+            country_code VARCHAR(10),
+            country_name VARCHAR(100),
+            destination_region VARCHAR(50),
+            value_usd DOUBLE PRECISION,
+            quantity DOUBLE PRECISION,
+            unit VARCHAR(20),
+            marketing_year VARCHAR(10)
+        ) ON COMMIT DROP
+    """)
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    regions = {}
+    for seq, r in enumerate(records):
+        country = r['country_name']
+        if country not in regions:
+            regions[country] = get_destination_region(country)
+        row = (
+            seq, r['date'], r['year'], r['month'], r['commodity'], r['hs_code'],
+            r['flow'], r.get('country_code'), country, regions[country],
+            r.get('value_usd'), r.get('quantity'), r.get('unit'),
+            r.get('marketing_year')
+        )
+        writer.writerow([COPY_NULL if v is None else v for v in row])
+    buf.seek(0)
+
+    cursor.copy_expert(
+        f"COPY census_trade_stage ({', '.join(STAGE_COLUMNS)}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+        buf
+    )
+    return len(records)
+
+
+def _bulk_upsert_records(cursor, records: List[Dict]) -> int:
+    """Stage records with COPY, then merge them in one INSERT ... ON CONFLICT"""
+    staged = _stage_records(cursor, records)
+    cursor.execute("""
+        INSERT INTO census_trade_records
+        (trade_date, year, month, commodity, hs_code, flow,
+         country_code, country_name, destination_region,
+         value_usd, quantity, unit, marketing_year)
+        SELECT DISTINCT ON (trade_date, commodity, flow, country_name)
+            trade_date, year, month, commodity, hs_code, flow,
+            country_code, country_name, destination_region,
+            value_usd, quantity, unit, marketing_year
+        FROM census_trade_stage
+        ORDER BY trade_date, commodity, flow, country_name, seq DESC
+        ON CONFLICT (trade_date, commodity, flow, country_name)
+        DO UPDATE SET
+            value_usd = EXCLUDED.value_usd,
+            quantity = EXCLUDED.quantity,
+            updated_at = CURRENT_TIMESTAMP
+    """)
+    logger.info(f"Merged {cursor.rowcount} census_trade_records rows from {staged} staged records")
+    return staged
+
+
+def _refresh_postgresql_summaries(cursor):
+    """
+    Refresh the summary tables for the staged batch with set-based SQL.
+
+    Monthly rows are summed over every staged record (all HS codes) per
+    (month, commodity, flow, country). Marketing-year rows are rebuilt from
+    the monthly summary for each (commodity, flow, marketing year) the batch
+    touched, so a partial-year pull no longer overwrites a full-year total.
+    """
+    cursor.execute("""
+        INSERT INTO census_trade_monthly_summary
+        (trade_date, commodity, flow, country_name, destination_region,
+         total_value_usd, total_quantity, marketing_year, record_count, calculated_at)
+        SELECT
+            make_date(year, month, 1), commodity, flow, country_name,
+            MAX(destination_region),
+            SUM(COALESCE(value_usd, 0)), SUM(COALESCE(quantity, 0)),
+            MAX(marketing_year), COUNT(*), CURRENT_TIMESTAMP
+        FROM census_trade_stage
+        WHERE flow IN ('exports', 'imports')
+        GROUP BY year, month, commodity, flow, country_name
+        ON CONFLICT (trade_date, commodity, flow, country_name)
+        DO UPDATE SET
+            total_value_usd = EXCLUDED.total_value_usd,
+            total_quantity = EXCLUDED.total_quantity,
+            record_count = EXCLUDED.record_count,
+            calculated_at = CURRENT_TIMESTAMP
+    """)
+    monthly = cursor.rowcount
+
+    cursor.execute("""
+        INSERT INTO census_trade_yearly_summary
+        (marketing_year, commodity, flow, country_name, destination_region,
+         total_value_usd, total_quantity, record_count, calculated_at)
+        SELECT
+            m.marketing_year, m.commodity, m.flow, m.country_name,
+            MAX(m.destination_region),
+            SUM(m.total_value_usd), SUM(m.total_quantity), SUM(m.record_count),
+            CURRENT_TIMESTAMP
+        FROM census_trade_monthly_summary m
+        JOIN (
+            SELECT DISTINCT commodity, flow, marketing_year
+            FROM census_trade_stage
+            WHERE flow IN ('exports', 'imports') AND marketing_year <> ''
+        ) touched USING (commodity, flow, marketing_year)
+        GROUP BY m.marketing_year, m.commodity, m.flow, m.country_name
+        ON CONFLICT (marketing_year, commodity, flow, country_name)
+        DO UPDATE SET
+            total_value_usd = EXCLUDED.total_value_usd,
+            total_quantity = EXCLUDED.total_quantity,
+            record_count = EXCLUDED.record_count,
+            calculated_at = CURRENT_TIMESTAMP
+    """)
+    logger.info(f"Refreshed {monthly} monthly and {cursor.rowcount} marketing-year summary rows")
+
+
+def _upsert_records_rowwise(cursor, records: List[Dict]) -> int:
+    """Upsert records one statement at a time"""
+    import psycopg2
+
     inserted = 0
     for r in records:
         try:
@@ -1728,22 +2149,11 @@ def _save_to_postgresql(records: List[Dict], connection_string: str) -> int:
         except psycopg2.Error as e:
             logger.warning(f"Failed to insert record: {e}")
 
-    conn.commit()
-    print(f"Inserted/updated {inserted} raw records in PostgreSQL")
-
-    # Update aggregation tables
-    _update_postgresql_aggregations(cursor, records)
-    conn.commit()
-
-    cursor.close()
-    conn.close()
-
-    print(f"SUCCESS: Saved {inserted} records to PostgreSQL with aggregation tables updated")
     return inserted
 
 
 def _update_postgresql_aggregations(cursor, records: List[Dict]):
-    """Update PostgreSQL aggregation tables"""
+    """Update PostgreSQL aggregation tables row by row (pre-bulk path)"""
 
     # Group by flow for aggregation
     for flow in ['exports', 'imports']:
@@ -2554,7 +2964,10 @@ def run_census_update(
     flow: str = 'both',
     save_to_db: bool = False,
     update_excel: bool = False,
-    models_path: str = None
+    models_path: str = None,
+    workers: int = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False
 ) -> Dict:
     """
     Run the Census trade data update workflow
@@ -2566,6 +2979,9 @@ def run_census_update(
         save_to_db: Save to database
         update_excel: Update Excel files
         models_path: Custom path to Models folder (to test outside Dropbox/OneDrive)
+        workers: Concurrent Census API requests (default RLC_CENSUS_WORKERS)
+        use_cache: Use the on-disk Census response cache
+        refresh_cache: Refetch everything, overwriting cached responses
 
     Returns:
         Results summary
@@ -2607,7 +3023,10 @@ def run_census_update(
             start_date=start_date,
             end_date=end_date,
             flow=flow,
-            api_key=api_key
+            api_key=api_key,
+            workers=workers,
+            use_cache=use_cache,
+            refresh_cache=refresh_cache
         )
 
         if records:
@@ -2763,6 +3182,25 @@ def main():
         help='Custom path to Models folder (e.g., C:\\Users\\torem\\Desktop\\Models). Use this to test outside Dropbox.'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help=f'Concurrent Census API requests (default: {CENSUS_FETCH_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the Census response cache (data/cache/census_trade)'
+    )
+
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Refetch every request, overwriting cached responses'
+    )
+
     args = parser.parse_args()
 
     print("\n" + "=" * 60)
@@ -2788,7 +3226,10 @@ def main():
         flow=args.flow,
         save_to_db=args.save_to_db,
         update_excel=args.update_excel,
-        models_path=args.models_path
+        models_path=args.models_path,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh_cache
     )
 
     print("\n" + "=" * 60)
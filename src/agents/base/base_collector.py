@@ -192,8 +192,16 @@ class BaseCollector(ABC):
         return session
 
     def _respect_rate_limit(self):
-        """Enforce rate limiting between requests"""
-        if self.last_request_time and self.config.rate_limit_per_minute:
+        """Enforce rate limiting between requests.
+
+        If a shared limiter is installed for this source (e.g. by a parallel
+        backfill), it governs the aggregate rate across all instances.
+        """
+        from src.utils.rate_limit import get_shared_limiter
+        shared = get_shared_limiter(self.config.source_name)
+        if shared is not None:
+            shared.acquire()
+        elif self.last_request_time and self.config.rate_limit_per_minute:
             min_interval = 60.0 / self.config.rate_limit_per_minute
             elapsed = time.time() - self.last_request_time
             if elapsed < min_interval:
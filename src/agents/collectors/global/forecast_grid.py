@@ -0,0 +1,358 @@
+"""
+Gridded Forecast Decoding and Crop-Region Aggregation
+
+Shared array engine for the GFS and GEFS collectors:
+- Decode GRIB2 (cfgrib) or NetCDF forecast files once each
+- Fold forecast steps into daily tmax/tmin/precip on the full grid
+- Reduce grids to area-weighted crop region means, all members x days at once
+- Ensemble percentile and exceedance-probability tables
+
+Arrays follow one layout throughout: (members, days, ...) with the grid as
+the trailing (lat, lon) axes before region reduction and a trailing
+region axis after it. Missing data is NaN.
+
+Dependencies (decoding only):
+    pip install xarray cfgrib eccodes    # GRIB2
+    pip install xarray netCDF4           # NetCDF (scipy also reads NetCDF3)
+"""
+
+import logging
+import warnings
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('ForecastGrid')
+
+# Fields aggregated from each file: output name -> (cfgrib filter, variable
+# names that may carry it). GFS/GEFS tmax/tmin are the max/min over the
+# preceding output interval; APCP is the accumulation over that interval.
+FIELD_SOURCES = {
+    't2m': ({'typeOfLevel': 'heightAboveGround', 'level': 2, 'shortName': '2t'}, ('t2m', 'tmp2m')),
+    'tmax': ({'typeOfLevel': 'heightAboveGround', 'level': 2, 'shortName': 'tmax'}, ('tmax', 'mx2t6')),
+    'tmin': ({'typeOfLevel': 'heightAboveGround', 'level': 2, 'shortName': 'tmin'}, ('tmin', 'mn2t6')),
+    'precip': ({'typeOfLevel': 'surface', 'shortName': 'tp'}, ('tp', 'apcp', 'precip')),
+}
+
+NETCDF_SUFFIXES = ('.nc', '.nc4', '.cdf', '.netcdf')
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+@dataclass
+class GridFields:
+    """Decoded forecast steps for one ensemble member (or a deterministic run)."""
+    lats: np.ndarray                  # (nlat,)
+    lons: np.ndarray                  # (nlon,), degrees east in [-180, 180)
+    valid_times: np.ndarray           # (nsteps,) datetime64[s]
+    fields: Dict[str, np.ndarray]     # name -> (nsteps, nlat, nlon), °C / mm
+
+
+# =============================================================================
+# Decoding
+# =============================================================================
+
+def _coord(obj, *names):
+    for name in names:
+        if name in obj.coords:
+            return obj.coords[name]
+    raise KeyError(f"None of {names} found in {list(obj.coords)}")
+
+
+def _to_si(da) -> np.ndarray:
+    """Kelvin -> °C and metres of water -> mm; kg m-2 is already mm."""
+    values = np.asarray(da.values, dtype=float)
+    units = str(da.attrs.get('units', '')).strip()
+    if units == 'K':
+        values = values - 273.15
+    elif units == 'm':
+        values = values * 1000.0
+    return values
+
+
+def _steps_from_dataset(ds, names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Pull the wanted fields out of one xarray Dataset as (steps, lat, lon) arrays."""
+    lat = _coord(ds, 'latitude', 'lat')
+    lon = _coord(ds, 'longitude', 'lon')
+    valid = np.atleast_1d(_coord(ds, 'valid_time', 'time').values).astype('datetime64[s]').ravel()
+
+    fields = {}
+    for out_name, (_, var_names) in FIELD_SOURCES.items():
+        if out_name not in names:
+            continue
+        var = next((v for v in var_names if v in ds.data_vars), None)
+        if var is None:
+            continue
+        da = ds[var]
+        other = [d for d in da.dims if d not in (lat.dims[0], lon.dims[0])]
+        da = da.transpose(*other, lat.dims[0], lon.dims[0])
+        fields[out_name] = _to_si(da).reshape(-1, lat.size, lon.size)
+    return np.asarray(lat.values, dtype=float), np.asarray(lon.values, dtype=float), valid, fields
+
+
+def read_forecast_file(path, names: Sequence[str] = tuple(FIELD_SOURCES)) -> GridFields:
+    """
+    Decode one GRIB2 or NetCDF forecast file.
+
+    GRIB2 files are opened once per field with a cfgrib filter (pgrb2 files
+    mix level types that cannot share one Dataset); NetCDF files are opened
+    once. Fields absent from the file are simply left out.
+    """
+    import xarray as xr
+
+    path = Path(path)
+    if path.suffix.lower() in NETCDF_SUFFIXES:
+        with xr.open_dataset(path) as ds:
+            lats, lons, valid, fields = _steps_from_dataset(ds, names)
+    else:
+        lats = lons = valid = None
+        fields = {}
+        for name in names:
+            keys = FIELD_SOURCES[name][0]
+            try:
+                ds = xr.open_dataset(path, engine='cfgrib',
+                                     backend_kwargs={'filter_by_keys': keys, 'indexpath': ''})
+            except Exception as e:
+                logger.debug(f"{path.name}: no {name} ({e})")
+                continue
+            with ds:
+                lats, lons, valid, got = _steps_from_dataset(ds, [name])
+            fields.update(got)
+        if lats is None:
+            raise ValueError(f"No forecast fields decoded from {path}")
+
+    lons = ((lons + 180.0) % 360.0) - 180.0
+    return GridFields(lats=lats, lons=lons, valid_times=valid, fields=fields)
+
+
+# =============================================================================
+# Daily reduction
+# =============================================================================
+
+class DailyGrids:
+    """
+    Running daily tmax/tmin/precip grids for valid dates run_date+1 ..
+    run_date+days, folded in one decoded file at a time so a member's full
+    step history is never held in memory.
+
+    Steps are period-ending: a step valid at 00Z belongs to the previous
+    day. tmax/tmin fall back to 2 m temperature when a file has no max/min
+    fields. Days without any step stay NaN.
+    """
+
+    # output name -> (source fields in preference order, ufunc, identity)
+    REDUCERS = {
+        'tmax': (('tmax', 't2m'), np.maximum, -np.inf),
+        'tmin': (('tmin', 't2m'), np.minimum, np.inf),
+        'precip': (('precip',), np.add, 0.0),
+    }
+
+    def __init__(self, run_date: date, days: int):
+        self.start = np.datetime64(datetime.combine(run_date + timedelta(days=1), datetime.min.time()), 's')
+        self.days = days
+        self.lats = self.lons = None
+        self._acc: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def add(self, grid: GridFields) -> 'DailyGrids':
+        if self.lats is None:
+            self.lats, self.lons = grid.lats, grid.lons
+        offset = (grid.valid_times - self.start - np.timedelta64(1, 's')).astype('int64')
+        day_idx = np.floor_divide(offset, 86400)
+        keep = (day_idx >= 0) & (day_idx < self.days)
+        if not keep.any():
+            return self
+        idx = day_idx[keep]
+        shape = (self.days, self.lats.size, self.lons.size)
+
+        for name, (sources, ufunc, identity) in self.REDUCERS.items():
+            source = next((grid.fields[s] for s in sources if s in grid.fields), None)
+            if source is None:
+                continue
+            values = source[keep]
+            missing = np.isnan(values)
+            if name not in self._acc:
+                self._acc[name] = (np.full(shape, identity), np.zeros(shape, dtype=bool))
+            acc, seen = self._acc[name]
+            ufunc.at(acc, idx, np.where(missing, identity, values))
+            np.logical_or.at(seen, idx, ~missing)
+        return self
+
+    def result(self) -> GridFields:
+        """Daily grids as GridFields: valid_times are day starts, fields (days, nlat, nlon)."""
+        days = self.start + np.arange(self.days) * np.timedelta64(1, 'D')
+        fields = {name: np.where(seen, acc, np.nan) for name, (acc, seen) in self._acc.items()}
+        return GridFields(lats=self.lats, lons=self.lons, valid_times=days, fields=fields)
+
+
+def daily_fields(grid: GridFields, run_date: date, days: int) -> Dict[str, np.ndarray]:
+    """Daily tmax/tmin (°C) and precip (mm) grids from already-decoded steps."""
+    return DailyGrids(run_date, days).add(grid).result().fields
+
+
+def read_member_daily(files: Sequence, run_date: date, days: int) -> GridFields:
+    """
+    Decode every file of one member once and fold it into daily grids.
+
+    Items may be paths or already-decoded GridFields (fixtures, callers that
+    decode elsewhere).
+    """
+    acc = DailyGrids(run_date, days)
+    for item in files:
+        acc.add(item if isinstance(item, GridFields) else read_forecast_file(item))
+    if acc.lats is None:
+        raise ValueError("No forecast files to read")
+    return acc.result()
+
+
+# =============================================================================
+# Region reduction
+# =============================================================================
+
+class RegionGrid:
+    """
+    Precomputed cell indices and cos(latitude) area weights for every crop
+    region on one lat/lon grid. Build once per grid and reuse across
+    members, days and fields.
+    """
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, bounds: Dict[str, tuple]):
+        self.shape = (lats.size, lons.size)
+        self.codes = list(bounds)
+        self._cells = []
+        for code in self.codes:
+            min_lat, max_lat, min_lon, max_lon = bounds[code]
+            lat_idx = np.flatnonzero((lats >= min_lat) & (lats <= max_lat))
+            lon_idx = np.flatnonzero((lons >= min_lon) & (lons <= max_lon))
+            weights = np.repeat(np.cos(np.deg2rad(lats[lat_idx])), lon_idx.size)
+            flat = (lat_idx[:, None] * lons.size + lon_idx[None, :]).ravel()
+            self._cells.append((flat, weights))
+            if flat.size == 0:
+                logger.warning(f"Region {code} has no grid cells on this grid")
+
+    def reduce(self, field: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Area-weighted region means of field (..., nlat, nlon).
+
+        Returns (means, coverage_pct), both shaped (..., regions). NaN cells
+        are excluded from the mean and lower the coverage.
+        """
+        flat = field.reshape(field.shape[:-2] + (-1,))
+        means = np.full(flat.shape[:-1] + (len(self.codes),), np.nan)
+        coverage = np.zeros_like(means)
+        for r, (cells, weights) in enumerate(self._cells):
+            if cells.size == 0:
+                continue
+            values = flat[..., cells]
+            valid = ~np.isnan(values)
+            w = np.where(valid, weights, 0.0)
+            total = w.sum(axis=-1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means[..., r] = np.where(valid, values, 0.0) @ weights / total
+            means[..., r][total == 0] = np.nan
+            coverage[..., r] = np.round(total / weights.sum() * 100, 2)
+        return means, coverage
+
+
+_REGION_GRIDS: Dict[tuple, RegionGrid] = {}
+
+
+def region_grid(lats: np.ndarray, lons: np.ndarray, bounds: Dict[str, tuple]) -> RegionGrid:
+    """Cached RegionGrid for a grid/region set (GEFS members share one grid)."""
+    key = (lats.tobytes(), lons.tobytes(), tuple((k, tuple(v)) for k, v in bounds.items()))
+    grid = _REGION_GRIDS.get(key)
+    if grid is None:
+        grid = _REGION_GRIDS[key] = RegionGrid(lats, lons, bounds)
+    return grid
+
+
+def gdd(tmin: np.ndarray, tmax: np.ndarray, base_temp: float = 10.0, cap_temp: float = None) -> np.ndarray:
+    """Growing degree days, elementwise (see GFSCollector.calculate_gdd)."""
+    if cap_temp:
+        tmax = np.minimum(tmax, cap_temp)
+    return np.maximum(0, (tmin + tmax) / 2 - base_temp)
+
+
+def dry_run_lengths(precip: np.ndarray, threshold: float = 1.0, axis: int = 0) -> np.ndarray:
+    """Running count of consecutive days with precip below threshold along axis."""
+    precip = np.moveaxis(precip, axis, 0)
+    dry = precip < threshold
+    idx = np.arange(dry.shape[0]).reshape((-1,) + (1,) * (dry.ndim - 1))
+    last_wet = np.maximum.accumulate(np.where(dry, -1, idx), axis=0)
+    return np.moveaxis(idx - last_wet, 0, axis)
+
+
+# =============================================================================
+# Ensemble statistics
+# =============================================================================
+
+def ensemble_stats(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Percentiles, mean and std over the member axis (axis 0), NaN-aware."""
+    with warnings.catch_warnings():
+        # All-missing cells come back NaN; no need for 'All-NaN slice' noise
+        warnings.simplefilter('ignore', RuntimeWarning)
+        pct = np.nanpercentile(values, PERCENTILES, axis=0)
+        stats = {f'p{q}': pct[i] for i, q in enumerate(PERCENTILES)}
+        stats['mean'] = np.nanmean(values, axis=0)
+        stats['std'] = np.nanstd(values, axis=0)
+    return stats
+
+
+def exceedance_probability(values: np.ndarray, threshold: float, above: bool = True) -> np.ndarray:
+    """% of (non-missing) members above/below threshold, over axis 0."""
+    valid = ~np.isnan(values)
+    hits = (values > threshold) if above else (values < threshold)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct = np.where(n > 0, (hits & valid).sum(axis=0) / np.maximum(n, 1) * 100, 0.0)
+    return np.round(pct, 1)
+
+
+def trailing_sum(values: np.ndarray, window: int, axis: int = 1) -> np.ndarray:
+    """Sum over the trailing `window` entries along axis; NaN until a full window."""
+    values = np.moveaxis(values, axis, 0)
+    csum = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return np.moveaxis(out, 0, axis)
+
+
+def member_region_cube(member_files: Dict[str, Sequence], run_date: date, days: int,
+                       bounds: Dict[str, tuple]) -> Dict[str, np.ndarray]:
+    """
+    Daily region means for every member: name -> (members, days, regions).
+
+    Members are processed one at a time (decode, fold to days, reduce to
+    regions) so only region means are kept; the RegionGrid is built once
+    for the shared grid. Also returns 'coverage' (% of region cells with
+    data, from precip when present), 'members' and 'regions' (axis labels)
+    and corn 'gdd' (base 10 °C, 30 °C cap).
+    """
+    order = list(member_files)
+    codes = list(bounds)
+    per_field = {name: [] for name in DailyGrids.REDUCERS}
+    coverage = []
+    for member in order:
+        daily = read_member_daily(member_files[member], run_date, days)
+        regions = region_grid(daily.lats, daily.lons, bounds)
+        member_cov = None
+        for name in DailyGrids.REDUCERS:
+            field = daily.fields.get(name)
+            if field is None:
+                per_field[name].append(np.full((days, len(codes)), np.nan))
+                continue
+            means, cov = regions.reduce(field)
+            per_field[name].append(means)
+            if member_cov is None or name == 'precip':
+                member_cov = cov
+        coverage.append(member_cov if member_cov is not None else np.zeros((days, len(codes))))
+
+    cube = {name: np.stack(arrays) for name, arrays in per_field.items()}
+    cube['coverage'] = np.stack(coverage)
+    cube['gdd'] = gdd(cube['tmin'], cube['tmax'], 10, 30)
+    cube['members'] = order
+    cube['regions'] = codes
+    return cube
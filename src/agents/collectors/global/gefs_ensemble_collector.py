@@ -9,6 +9,10 @@ GEFS (Global Ensemble Forecast System) provides 31 ensemble members:
 Source: AWS Open Data (noaa-gefs-pds bucket)
 Resolution: ~50km, 0-16 days
 
+Each member's GRIB2 files are decoded once and reduced to region means;
+percentiles and exceedance probabilities are then computed for all
+members x lead days x regions in single array operations (forecast_grid).
+
 Usage:
     python gefs_ensemble_collector.py collect --date 2026-01-30
     python gefs_ensemble_collector.py collect --latest --save-db
@@ -16,6 +20,7 @@ Usage:
 """
 
 import os
+import re
 import sys
 import logging
 import argparse
@@ -50,9 +55,31 @@ ENSEMBLE_MEMBERS = ['gec00'] + [f'gep{i:02d}' for i in range(1, 31)]
 # Import crop regions from GFS collector — prefer relative import; fall back to
 # bare import when run as a standalone script from this directory.
 try:
-    from .gfs_forecast_collector import CROP_REGION_BOUNDS, GFSCollector
+    from . import forecast_grid
+    from .gfs_forecast_collector import (
+        CROP_REGION_BOUNDS, DECODE_HOUR_STEP, GFSCollector, region_bounds,
+    )
 except ImportError:
-    from gfs_forecast_collector import CROP_REGION_BOUNDS, GFSCollector
+    import forecast_grid
+    from gfs_forecast_collector import (
+        CROP_REGION_BOUNDS, DECODE_HOUR_STEP, GFSCollector, region_bounds,
+    )
+
+# Exceedance thresholds behind the EnsembleForecast risk metrics
+HEAT_STRESS_C = 30
+EXTREME_HEAT_C = 35
+FROST_C = 0
+DRY_WEEK_MM = 5
+WET_WEEK_MM = 50
+
+# Columns written to silver.weather_forecast_daily by save_ensemble_to_database
+ENSEMBLE_COLUMNS = (
+    'forecast_date', 'valid_date', 'model', 'region_code',
+    'precip_mm', 'tmin_c', 'tmax_c', 'tavg_c',
+    'ensemble_members',
+    'precip_p10', 'precip_p50', 'precip_p90',
+    'temp_p10', 'temp_p50', 'temp_p90',
+)
 
 
 @dataclass
@@ -129,6 +156,7 @@ class GEFSCollector(GFSCollector):
         from botocore.config import Config
 
         s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED))
+        paginator = s3.get_paginator('list_objects_v2')
         members = members or self.ensemble_members[:5]  # Default to subset for testing
 
         date_str = run_date.strftime('%Y%m%d')
@@ -138,14 +166,12 @@ class GEFSCollector(GFSCollector):
             prefix = f"gefs.{date_str}/{run_hour:02d}/atmos/pgrb2ap5/{member}"
 
             try:
-                response = s3.list_objects_v2(
-                    Bucket=AWS_GEFS_BUCKET,
-                    Prefix=prefix,
-                    MaxKeys=50
-                )
-
-                if 'Contents' in response:
-                    files = [obj['Key'] for obj in response['Contents']]
+                files = [
+                    obj['Key']
+                    for page in paginator.paginate(Bucket=AWS_GEFS_BUCKET, Prefix=prefix)
+                    for obj in page.get('Contents', [])
+                ]
+                if files:
                     member_files[member] = files
                     logger.debug(f"Found {len(files)} files for {member}")
 
@@ -154,6 +180,23 @@ class GEFSCollector(GFSCollector):
 
         return member_files
 
+    def select_forecast_keys(
+        self,
+        keys: List[str],
+        run_hour: int = 0,
+        max_lead_days: int = 16
+    ) -> List[str]:
+        """GRIB2 keys (no .idx) at 6-hour steps covering lead days 1..max_lead_days."""
+        last_hour = 24 * (max_lead_days + 1) - run_hour
+        selected = []
+        for key in keys:
+            match = re.search(r'\.f(\d{3})$', key)
+            if match:
+                hour = int(match.group(1))
+                if 0 < hour <= last_hour and hour % DECODE_HOUR_STEP == 0:
+                    selected.append(key)
+        return sorted(selected)
+
     def calculate_ensemble_stats(
         self,
         member_values: List[float]
@@ -162,16 +205,8 @@ class GEFSCollector(GFSCollector):
         if not member_values:
             return {}
 
-        arr = np.array(member_values)
-        return {
-            'p10': float(np.percentile(arr, 10)),
-            'p25': float(np.percentile(arr, 25)),
-            'p50': float(np.percentile(arr, 50)),
-            'p75': float(np.percentile(arr, 75)),
-            'p90': float(np.percentile(arr, 90)),
-            'mean': float(np.mean(arr)),
-            'std': float(np.std(arr)),
-        }
+        stats = forecast_grid.ensemble_stats(np.asarray(member_values, dtype=float))
+        return {k: float(v) for k, v in stats.items()}
 
     def calculate_probability(
         self,
@@ -183,102 +218,134 @@ class GEFSCollector(GFSCollector):
         if not member_values:
             return 0.0
 
-        if above:
-            count = sum(1 for v in member_values if v > threshold)
-        else:
-            count = sum(1 for v in member_values if v < threshold)
+        return float(forecast_grid.exceedance_probability(
+            np.asarray(member_values, dtype=float), threshold, above
+        ))
 
-        return round(count / len(member_values) * 100, 1)
+    def ensemble_tables(self, cube: Dict[str, np.ndarray]) -> Dict[str, object]:
+        """
+        Percentile and exceedance-probability tables over the member axis.
 
-    def aggregate_ensemble_to_region(
+        cube arrays are (members, days, regions) (see
+        forecast_grid.member_region_cube); every table is (days, regions).
+        Missing members (NaN) are left out of each cell's statistics.
+        """
+        tables = {name: forecast_grid.ensemble_stats(cube[name])
+                  for name in ('precip', 'tmax', 'tmin', 'gdd')}
+
+        prob = forecast_grid.exceedance_probability
+        tables['prob_heat_stress'] = prob(cube['tmax'], HEAT_STRESS_C)
+        tables['prob_extreme_heat'] = prob(cube['tmax'], EXTREME_HEAT_C)
+        tables['prob_frost'] = prob(cube['tmin'], FROST_C, above=False)
+
+        # Week totals ending on each lead day (zero until a full week exists)
+        weekly = forecast_grid.trailing_sum(cube['precip'], 7, axis=1)
+        tables['prob_dry_week'] = prob(weekly, DRY_WEEK_MM, above=False)
+        tables['prob_wet_week'] = prob(weekly, WET_WEEK_MM)
+        return tables
+
+    def _forecast_from_tables(
         self,
-        member_data: Dict[str, dict],
+        tables: Dict[str, object],
+        day: int,
+        region: int,
         region_code: str,
         forecast_date: date,
-        valid_date: date
+        valid_date: date,
+        n_members: int
     ) -> EnsembleForecast:
-        """
-        Aggregate ensemble member forecasts to probabilistic regional metrics.
-
-        This is where ensemble spread becomes yield risk information.
-        """
+        """One EnsembleForecast from cell (day, region) of ensemble_tables."""
         forecast = EnsembleForecast(
             region_code=region_code,
             forecast_date=forecast_date,
             valid_date=valid_date,
-            ensemble_members=len(member_data)
+            ensemble_members=n_members
         )
 
-        # Collect values across members
-        precip_values = []
-        tmax_values = []
-        tmin_values = []
-        gdd_values = []
-
-        for member_id, data in member_data.items():
-            if 'precip' in data:
-                precip_values.append(data['precip'])
-            if 'tmax' in data:
-                tmax_values.append(data['tmax'])
-            if 'tmin' in data:
-                tmin_values.append(data['tmin'])
-            if 'gdd' in data:
-                gdd_values.append(data['gdd'])
+        def cell(name, stat):
+            value = tables[name][stat][day, region]
+            return None if np.isnan(value) else float(value)
 
         # Calculate precipitation statistics
-        if precip_values:
-            stats = self.calculate_ensemble_stats(precip_values)
-            forecast.precip_p10 = stats['p10']
-            forecast.precip_p25 = stats['p25']
-            forecast.precip_p50 = stats['p50']
-            forecast.precip_p75 = stats['p75']
-            forecast.precip_p90 = stats['p90']
-            forecast.precip_mean = stats['mean']
-            forecast.precip_std = stats['std']
-            forecast.precip_spread = stats['p90'] - stats['p10']
+        if cell('precip', 'p50') is not None:
+            forecast.precip_p10 = cell('precip', 'p10')
+            forecast.precip_p25 = cell('precip', 'p25')
+            forecast.precip_p50 = cell('precip', 'p50')
+            forecast.precip_p75 = cell('precip', 'p75')
+            forecast.precip_p90 = cell('precip', 'p90')
+            forecast.precip_mean = cell('precip', 'mean')
+            forecast.precip_std = cell('precip', 'std')
+            forecast.precip_spread = forecast.precip_p90 - forecast.precip_p10
+            forecast.prob_dry_week = float(tables['prob_dry_week'][day, region])
+            forecast.prob_wet_week = float(tables['prob_wet_week'][day, region])
 
         # Calculate temperature statistics
-        if tmax_values:
-            stats = self.calculate_ensemble_stats(tmax_values)
-            forecast.tmax_p10 = stats['p10']
-            forecast.tmax_p50 = stats['p50']
-            forecast.tmax_p90 = stats['p90']
+        has_tmax = cell('tmax', 'p50') is not None
+        if has_tmax:
+            forecast.tmax_p10 = cell('tmax', 'p10')
+            forecast.tmax_p50 = cell('tmax', 'p50')
+            forecast.tmax_p90 = cell('tmax', 'p90')
 
             # Heat stress probabilities
-            forecast.prob_heat_stress = self.calculate_probability(tmax_values, 30)
-            forecast.prob_extreme_heat = self.calculate_probability(tmax_values, 35)
+            forecast.prob_heat_stress = float(tables['prob_heat_stress'][day, region])
+            forecast.prob_extreme_heat = float(tables['prob_extreme_heat'][day, region])
 
-        if tmin_values:
-            stats = self.calculate_ensemble_stats(tmin_values)
-            forecast.tmin_p10 = stats['p10']
-            forecast.tmin_p50 = stats['p50']
-            forecast.tmin_p90 = stats['p90']
+        if cell('tmin', 'p50') is not None:
+            forecast.tmin_p10 = cell('tmin', 'p10')
+            forecast.tmin_p50 = cell('tmin', 'p50')
+            forecast.tmin_p90 = cell('tmin', 'p90')
 
             # Frost probability
-            forecast.prob_frost = self.calculate_probability(tmin_values, 0, above=False)
+            forecast.prob_frost = float(tables['prob_frost'][day, region])
 
             # Temperature spread
-            if tmax_values:
+            if has_tmax:
                 forecast.temp_spread = forecast.tmax_p90 - forecast.tmin_p10
 
         # GDD statistics
-        if gdd_values:
-            stats = self.calculate_ensemble_stats(gdd_values)
-            forecast.gdd_p10 = stats['p10']
-            forecast.gdd_p50 = stats['p50']
-            forecast.gdd_p90 = stats['p90']
+        if cell('gdd', 'p50') is not None:
+            forecast.gdd_p10 = cell('gdd', 'p10')
+            forecast.gdd_p50 = cell('gdd', 'p50')
+            forecast.gdd_p90 = cell('gdd', 'p90')
 
         return forecast
 
+    def aggregate_ensemble_to_region(
+        self,
+        member_data: Dict[str, dict],
+        region_code: str,
+        forecast_date: date,
+        valid_date: date
+    ) -> EnsembleForecast:
+        """
+        Aggregate ensemble member forecasts to probabilistic regional metrics.
+
+        This is where ensemble spread becomes yield risk information.
+        """
+        # One (members, 1 day, 1 region) cube; members lacking a field are NaN
+        cube = {
+            name: np.array([data.get(name, np.nan) for data in member_data.values()],
+                           dtype=float).reshape(-1, 1, 1)
+            for name in ('precip', 'tmax', 'tmin', 'gdd')
+        }
+        tables = self.ensemble_tables(cube)
+        return self._forecast_from_tables(
+            tables, 0, 0, region_code, forecast_date, valid_date, len(member_data)
+        )
+
     def collect_ensemble_forecast(
         self,
         run_date: date = None,
         regions: List[str] = None,
         max_lead_days: int = 16,
-        n_members: int = 10  # Subset for efficiency
+        n_members: int = 10,  # Subset for efficiency
+        member_files: Dict[str, List[Path]] = None
     ) -> List[EnsembleForecast]:
         """
         Collect GEFS ensemble forecast and calculate probabilistic metrics.
+
+        member_files maps member ID to local GRIB2/NetCDF files; when omitted
+        the run is listed and downloaded from AWS.
         """
         run_date = run_date or date.today()
         regions = regions or list(CROP_REGION_BOUNDS.keys())
@@ -286,11 +353,8 @@ class GEFSCollector(GFSCollector):
         logger.info(f"Collecting GEFS ensemble for {run_date}")
         logger.info(f"Members: {n_members}, Regions: {len(regions)}")
 
-        # Check data availability
-        member_files = self.fetch_ensemble_from_aws(
-            run_date,
-            members=ENSEMBLE_MEMBERS[:n_members]
-        )
+        if member_files is None:
+            member_files = self.download_ensemble(run_date, n_members, max_lead_days)
 
         if not member_files:
             logger.warning("No GEFS data available")
@@ -298,33 +362,50 @@ class GEFSCollector(GFSCollector):
 
         logger.info(f"Found data for {len(member_files)} ensemble members")
 
+        # Decode each member once, reduce to (members, days, regions)
+        bounds = region_bounds(regions)
+        cube = forecast_grid.member_region_cube(member_files, run_date, max_lead_days, bounds)
+        tables = self.ensemble_tables(cube)
+        n_members = len(cube['members'])
+
         forecasts = []
 
         # For each forecast day
-        for lead_day in range(1, max_lead_days + 1):
-            valid = run_date + timedelta(days=lead_day)
-
-            for region_code in regions:
-                # In production: process GRIB files for each member
-                # Generate placeholder with realistic structure
-                member_data = {}
-                for member in list(member_files.keys()):
-                    # Simulated member data - replace with actual GRIB processing
-                    member_data[member] = {
-                        'precip': np.random.uniform(0, 20),
-                        'tmax': np.random.uniform(20, 35),
-                        'tmin': np.random.uniform(10, 20),
-                        'gdd': np.random.uniform(5, 15),
-                    }
-
-                forecast = self.aggregate_ensemble_to_region(
-                    member_data, region_code, run_date, valid
-                )
-                forecasts.append(forecast)
+        for d in range(max_lead_days):
+            valid = run_date + timedelta(days=d + 1)
+
+            for r, region_code in enumerate(cube['regions']):
+                if all(np.isnan(tables[name]['p50'][d, r]) for name in ('precip', 'tmax', 'tmin')):
+                    continue  # no member has data for this day/region
+                forecasts.append(self._forecast_from_tables(
+                    tables, d, r, region_code, run_date, valid, n_members
+                ))
 
         logger.info(f"Generated {len(forecasts)} ensemble forecast records")
         return forecasts
 
+    def download_ensemble(
+        self,
+        run_date: date,
+        n_members: int = 10,
+        max_lead_days: int = 16,
+        run_hour: int = 0
+    ) -> Dict[str, List[Path]]:
+        """List and download (cached) the GRIB2 files each member needs."""
+        member_keys = self.fetch_ensemble_from_aws(
+            run_date,
+            run_hour=run_hour,
+            members=ENSEMBLE_MEMBERS[:n_members]
+        )
+        member_files = {}
+        for member, keys in member_keys.items():
+            paths = self.download_files(
+                AWS_GEFS_BUCKET, self.select_forecast_keys(keys, run_hour, max_lead_days)
+            )
+            if paths:
+                member_files[member] = paths
+        return member_files
+
     def save_ensemble_to_database(
         self,
         forecasts: List[EnsembleForecast],
@@ -356,50 +437,45 @@ class GEFSCollector(GFSCollector):
 
         count = 0
         try:
+            from psycopg2.extras import execute_values
+
             cur = conn.cursor()
-            for f in forecasts:
-                cur.execute("""
-                    INSERT INTO silver.weather_forecast_daily (
-                        forecast_date, valid_date, model, region_code,
-                        precip_mm, tmin_c, tmax_c, tavg_c,
-                        ensemble_members,
-                        precip_p10, precip_p50, precip_p90,
-                        temp_p10, temp_p50, temp_p90
-                    ) VALUES (
-                        %s, %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s,
-                        %s, %s, %s,
-                        %s, %s, %s
-                    )
-                    ON CONFLICT (model, forecast_date, model_run_hour, valid_date, region_code)
-                    DO UPDATE SET
-                        ensemble_members = EXCLUDED.ensemble_members,
-                        precip_p10 = EXCLUDED.precip_p10,
-                        precip_p50 = EXCLUDED.precip_p50,
-                        precip_p90 = EXCLUDED.precip_p90,
-                        temp_p10 = EXCLUDED.temp_p10,
-                        temp_p50 = EXCLUDED.temp_p50,
-                        temp_p90 = EXCLUDED.temp_p90,
-                        created_at = NOW()
-                """, (
-                    f.forecast_date,
-                    f.valid_date,
-                    f.model,
-                    f.region_code,
-                    f.precip_p50,  # Use median as point estimate
-                    f.tmin_p50,
-                    f.tmax_p50,
-                    (f.tmin_p50 + f.tmax_p50) / 2,
-                    f.ensemble_members,
-                    f.precip_p10,
-                    f.precip_p50,
-                    f.precip_p90,
-                    f.tmin_p10,
-                    (f.tmin_p50 + f.tmax_p50) / 2,
-                    f.tmax_p90
-                ))
-                count += 1
+            rows = [(
+                f.forecast_date,
+                f.valid_date,
+                f.model,
+                f.region_code,
+                f.precip_p50,  # Use median as point estimate
+                f.tmin_p50,
+                f.tmax_p50,
+                (f.tmin_p50 + f.tmax_p50) / 2,
+                f.ensemble_members,
+                f.precip_p10,
+                f.precip_p50,
+                f.precip_p90,
+                f.tmin_p10,
+                (f.tmin_p50 + f.tmax_p50) / 2,
+                f.tmax_p90
+            ) for f in forecasts]
+            execute_values(cur, f"""
+                INSERT INTO silver.weather_forecast_daily ({', '.join(ENSEMBLE_COLUMNS)})
+                VALUES %s
+                ON CONFLICT (model, forecast_date, model_run_hour, valid_date, region_code)
+                DO UPDATE SET
+                    precip_mm = EXCLUDED.precip_mm,
+                    tmin_c = EXCLUDED.tmin_c,
+                    tmax_c = EXCLUDED.tmax_c,
+                    tavg_c = EXCLUDED.tavg_c,
+                    ensemble_members = EXCLUDED.ensemble_members,
+                    precip_p10 = EXCLUDED.precip_p10,
+                    precip_p50 = EXCLUDED.precip_p50,
+                    precip_p90 = EXCLUDED.precip_p90,
+                    temp_p10 = EXCLUDED.temp_p10,
+                    temp_p50 = EXCLUDED.temp_p50,
+                    temp_p90 = EXCLUDED.temp_p90,
+                    created_at = NOW()
+            """, rows, page_size=1000)
+            count = len(rows)
 
             conn.commit()
             logger.info(f"Saved {count} ensemble records to database")
@@ -462,6 +538,15 @@ def check_gefs_availability():
         return False
 
 
+def _parse_member_files(items: List[str]) -> Dict[str, List[Path]]:
+    """['gec00=a.grib2', 'gec00=b.grib2', 'gep01=c.grib2'] -> {member: [paths]}"""
+    member_files = {}
+    for item in items:
+        member, _, path = item.partition('=')
+        member_files.setdefault(member, []).append(Path(path))
+    return member_files
+
+
 def main():
     parser = argparse.ArgumentParser(description='GEFS Ensemble Forecast Collector')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
@@ -474,6 +559,8 @@ def main():
     collect_parser.add_argument('--regions', nargs='+', help='Specific regions')
     collect_parser.add_argument('--days', type=int, default=16, help='Forecast horizon')
     collect_parser.add_argument('--save-db', action='store_true', help='Save to database')
+    collect_parser.add_argument('--files', nargs='+', metavar='MEMBER=PATH',
+                                help='Local GRIB2/NetCDF files instead of AWS, e.g. gec00=gec00.nc')
 
     # Status command
     status_parser = subparsers.add_parser('status', help='Check availability')
@@ -492,7 +579,8 @@ def main():
             run_date=run_date,
             regions=args.regions,
             max_lead_days=args.days,
-            n_members=args.members
+            n_members=args.members,
+            member_files=_parse_member_files(args.files) if args.files else None
         )
 
         print(f"\nCollected {len(forecasts)} ensemble forecast records")
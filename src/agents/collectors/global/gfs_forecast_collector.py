@@ -15,6 +15,7 @@ Dependencies:
 Usage:
     python gfs_forecast_collector.py collect --date 2026-01-30
     python gfs_forecast_collector.py collect --latest
+    python gfs_forecast_collector.py collect --files f024.grib2 f048.grib2 --date 2026-01-30
     python gfs_forecast_collector.py status
 """
 
@@ -34,6 +35,13 @@ import numpy as np
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Prefer relative import; fall back to bare import when run as a standalone
+# script from this directory.
+try:
+    from . import forecast_grid
+except ImportError:
+    import forecast_grid
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -86,6 +94,20 @@ CROP_REGION_BOUNDS = {
 # Forecast hours to collect (0-384 for GFS, but we focus on 0-16 days)
 FORECAST_HOURS = list(range(0, 385, 3))[:129]  # Every 3 hours up to 16 days
 
+# Hours actually decoded: 6-hourly files carry a 6 h APCP bucket and 6 h
+# max/min temperature, so summing/maxing them never double counts.
+DECODE_HOUR_STEP = 6
+
+# Columns written to silver.weather_forecast_daily by save_to_database
+FORECAST_COLUMNS = (
+    'forecast_date', 'valid_date', 'model', 'region_code',
+    'precip_mm', 'tmin_c', 'tmax_c', 'tavg_c',
+    'gdd_base10', 'gdd_corn',
+    'heat_stress_hours', 'extreme_heat_hours', 'frost_risk',
+    'consecutive_dry_days', 'excess_moisture_flag',
+    'coverage_pct',
+)
+
 
 @dataclass
 class RegionForecast:
@@ -239,15 +261,16 @@ class GFSCollector:
             valid_date=valid_date
         )
 
-        # Extract regional means from data
-        # In real implementation, this filters the xarray dataset by bounds
-        # For now, using placeholder structure
+        # data holds region means already reduced from the grid by
+        # forecast_grid.RegionGrid (°C, mm); missing fields keep defaults
         if 'tmin' in data:
             forecast.tmin_c = data['tmin']
         if 'tmax' in data:
             forecast.tmax_c = data['tmax']
         if 'precip' in data:
             forecast.precip_mm = data['precip']
+        if 'coverage' in data:
+            forecast.coverage_pct = data['coverage']
 
         # Calculate derived metrics
         forecast.tavg_c = (forecast.tmin_c + forecast.tmax_c) / 2
@@ -266,39 +289,88 @@ class GFSCollector:
         self,
         run_date: date = None,
         regions: List[str] = None,
-        max_lead_days: int = 16
+        max_lead_days: int = 16,
+        run_hour: int = 0,
+        files: List[Path] = None
     ) -> List[RegionForecast]:
         """
         Collect GFS forecast and aggregate to regions.
 
-        This is a simplified version that works without full GRIB processing.
-        For production, integrate xarray + cfgrib.
+        The run's 6-hourly GRIB2 files (downloaded from AWS, or the local
+        `files` given — GRIB2 or NetCDF) are decoded once, reduced to daily
+        grids, and then to every region in one array pass.
         """
         run_date = run_date or date.today()
-        regions = regions or list(CROP_REGION_BOUNDS.keys())
+        bounds = region_bounds(regions)
 
         logger.info(f"Collecting GFS forecast for {run_date}")
-        logger.info(f"Regions: {len(regions)}, Max lead days: {max_lead_days}")
+        logger.info(f"Regions: {len(bounds)}, Max lead days: {max_lead_days}")
+
+        if files is None:
+            files = self.download_files(
+                AWS_GFS_BUCKET, self.get_run_keys(run_date, run_hour, max_lead_days)
+            )
+        if not files:
+            logger.warning("No GFS data available")
+            return []
+
+        cube = forecast_grid.member_region_cube({'gfs': files}, run_date, max_lead_days, bounds)
+        dry_days = forecast_grid.dry_run_lengths(cube['precip'][0], axis=0)
 
         forecasts = []
 
         # For each day in forecast horizon
-        for lead_day in range(1, max_lead_days + 1):
-            valid = run_date + timedelta(days=lead_day)
-
-            for region_code in regions:
-                # In production: download GRIB, filter, aggregate
-                # Placeholder with realistic structure
-                forecast = RegionForecast(
-                    region_code=region_code,
-                    forecast_date=run_date,
-                    valid_date=valid
-                )
+        for d in range(max_lead_days):
+            valid = run_date + timedelta(days=d + 1)
+
+            for r, region_code in enumerate(cube['regions']):
+                data = {k: float(cube[k][0, d, r]) for k in ('tmin', 'tmax', 'precip')
+                        if not np.isnan(cube[k][0, d, r])}
+                if not data:
+                    continue
+                data['coverage'] = round(float(cube['coverage'][0, d, r]), 1)
+                forecast = self.aggregate_to_region(data, region_code, run_date, valid)
+                forecast.consecutive_dry_days = int(dry_days[d, r])
                 forecasts.append(forecast)
 
         logger.info(f"Generated {len(forecasts)} forecast records")
         return forecasts
 
+    def get_run_keys(self, run_date: date, run_hour: int = 0, max_lead_days: int = 16) -> List[str]:
+        """S3 keys of the 6-hourly 0.25° files covering lead days 1..max_lead_days."""
+        date_str = run_date.strftime('%Y%m%d')
+        last_hour = min(24 * (max_lead_days + 1) - run_hour, FORECAST_HOURS[-1])
+        return [
+            f"gfs.{date_str}/{run_hour:02d}/atmos/gfs.t{run_hour:02d}z.pgrb2.0p25.f{fh:03d}"
+            for fh in range(DECODE_HOUR_STEP, last_hour + 1, DECODE_HOUR_STEP)
+        ]
+
+    def download_files(self, bucket: str, keys: List[str]) -> List[Path]:
+        """Download S3 objects into temp_dir (cached by key); returns local paths."""
+        if not self.has_boto3:
+            logger.error("boto3 required for AWS access")
+            return []
+
+        import boto3
+        from botocore import UNSIGNED
+        from botocore.config import Config
+
+        s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED))
+        paths = []
+        for key in keys:
+            local = self.temp_dir / key.replace('/', '_')
+            if not local.exists():
+                partial = local.with_name(local.name + '.part')
+                try:
+                    s3.download_file(bucket, key, str(partial))
+                    partial.replace(local)
+                except Exception as e:
+                    logger.warning(f"Download failed for {key}: {e}")
+                    continue
+            paths.append(local)
+        logger.info(f"{len(paths)}/{len(keys)} files available from {bucket}")
+        return paths
+
     def fetch_from_aws(
         self,
         run_date: date,
@@ -380,48 +452,47 @@ class GFSCollector:
 
         count = 0
         try:
+            from psycopg2.extras import execute_values
+
             cur = conn.cursor()
-            for f in forecasts:
-                cur.execute("""
-                    INSERT INTO silver.weather_forecast_daily (
-                        forecast_date, valid_date, model, region_code,
-                        precip_mm, tmin_c, tmax_c, tavg_c,
-                        gdd_base10, gdd_corn,
-                        heat_stress_hours, extreme_heat_hours, frost_risk,
-                        consecutive_dry_days, excess_moisture_flag,
-                        coverage_pct
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (model, forecast_date, model_run_hour, valid_date, region_code)
-                    DO UPDATE SET
-                        precip_mm = EXCLUDED.precip_mm,
-                        tmin_c = EXCLUDED.tmin_c,
-                        tmax_c = EXCLUDED.tmax_c,
-                        tavg_c = EXCLUDED.tavg_c,
-                        gdd_base10 = EXCLUDED.gdd_base10,
-                        gdd_corn = EXCLUDED.gdd_corn,
-                        heat_stress_hours = EXCLUDED.heat_stress_hours,
-                        extreme_heat_hours = EXCLUDED.extreme_heat_hours,
-                        frost_risk = EXCLUDED.frost_risk,
-                        created_at = NOW()
-                """, (
-                    f.forecast_date,
-                    f.valid_date,
-                    f.model,
-                    f.region_code,
-                    f.precip_mm,
-                    f.tmin_c,
-                    f.tmax_c,
-                    f.tavg_c,
-                    f.gdd_base10,
-                    f.gdd_corn,
-                    f.heat_stress_hours,
-                    f.extreme_heat_hours,
-                    f.frost_risk,
-                    f.consecutive_dry_days,
-                    f.excess_moisture,
-                    f.coverage_pct
-                ))
-                count += 1
+            rows = [(
+                f.forecast_date,
+                f.valid_date,
+                f.model,
+                f.region_code,
+                f.precip_mm,
+                f.tmin_c,
+                f.tmax_c,
+                f.tavg_c,
+                f.gdd_base10,
+                f.gdd_corn,
+                f.heat_stress_hours,
+                f.extreme_heat_hours,
+                f.frost_risk,
+                f.consecutive_dry_days,
+                f.excess_moisture,
+                f.coverage_pct
+            ) for f in forecasts]
+            execute_values(cur, f"""
+                INSERT INTO silver.weather_forecast_daily ({', '.join(FORECAST_COLUMNS)})
+                VALUES %s
+                ON CONFLICT (model, forecast_date, model_run_hour, valid_date, region_code)
+                DO UPDATE SET
+                    precip_mm = EXCLUDED.precip_mm,
+                    tmin_c = EXCLUDED.tmin_c,
+                    tmax_c = EXCLUDED.tmax_c,
+                    tavg_c = EXCLUDED.tavg_c,
+                    gdd_base10 = EXCLUDED.gdd_base10,
+                    gdd_corn = EXCLUDED.gdd_corn,
+                    heat_stress_hours = EXCLUDED.heat_stress_hours,
+                    extreme_heat_hours = EXCLUDED.extreme_heat_hours,
+                    frost_risk = EXCLUDED.frost_risk,
+                    consecutive_dry_days = EXCLUDED.consecutive_dry_days,
+                    excess_moisture_flag = EXCLUDED.excess_moisture_flag,
+                    coverage_pct = EXCLUDED.coverage_pct,
+                    created_at = NOW()
+            """, rows, page_size=1000)
+            count = len(rows)
 
             conn.commit()
             logger.info(f"Saved {count} forecast records to database")
@@ -437,6 +508,15 @@ class GFSCollector:
         return count
 
 
+def region_bounds(regions: List[str] = None) -> Dict[str, tuple]:
+    """Bounding boxes for the requested regions (all when None); unknown codes are skipped."""
+    regions = regions or list(CROP_REGION_BOUNDS.keys())
+    unknown = [r for r in regions if r not in CROP_REGION_BOUNDS]
+    if unknown:
+        logger.warning(f"No bounds defined for regions: {unknown}")
+    return {r: CROP_REGION_BOUNDS[r]['bounds'] for r in regions if r in CROP_REGION_BOUNDS}
+
+
 def check_aws_availability():
     """Check if AWS GFS data is accessible."""
     try:
@@ -484,6 +564,7 @@ def main():
     collect_parser.add_argument('--latest', action='store_true', help='Collect latest available')
     collect_parser.add_argument('--regions', nargs='+', help='Specific regions to collect')
     collect_parser.add_argument('--days', type=int, default=16, help='Forecast horizon (days)')
+    collect_parser.add_argument('--files', nargs='+', help='Local GRIB2/NetCDF files instead of AWS')
     collect_parser.add_argument('--save-db', action='store_true', help='Save to database')
 
     # Status command
@@ -505,7 +586,8 @@ def main():
         forecasts = collector.collect_forecast(
             run_date=run_date,
             regions=args.regions,
-            max_lead_days=args.days
+            max_lead_days=args.days,
+            files=[Path(f) for f in args.files] if args.files else None
         )
 
         print(f"\nCollected {len(forecasts)} forecast records")
@@ -11,6 +11,7 @@ from src.agents.core.transformation_logger import (
     log_bronze_to_silver,
     log_silver_to_gold,
 )
+from src.agents.core.audit_sink import AuditSink, get_audit_sink
 
 __all__ = [
     'TransformationLogger',
@@ -22,4 +23,6 @@ __all__ = [
     'RelationshipType',
     'log_bronze_to_silver',
     'log_silver_to_gold',
+    'AuditSink',
+    'get_audit_sink',
 ]
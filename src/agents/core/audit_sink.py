@@ -0,0 +1,455 @@
+"""
+Buffered sink for transformation audit records.
+
+TransformationLogger used to call an audit.* stored function and commit
+once per log_operation / register_output / add_lineage, so a job that logs
+hundreds of operations paid hundreds of round trips + commits in its hot
+path. The sink instead queues records in memory and writes them in batches:
+
+    - One FIFO queue for the whole process, so records keep the order they
+      were logged in (operation_order is assigned by the database as
+      MAX+1 per session, which depends on that)
+    - A background thread flushes every `flush_interval` seconds, or as
+      soon as `batch_size` records are pending; checkin() flushes
+      synchronously so a completed session is fully written when it returns
+    - A flush is one connection checkout and one transaction; consecutive
+      records of the same kind go out via psycopg2's execute_batch
+    - If the database is unreachable (a connection-class error) the batch
+      is appended to a JSONL spill file (fsync'd) and replayed, ahead of
+      newer records, by the next successful flush. Replay is at-least-once:
+      a crash between the replay commit and the spill file being removed
+      re-sends those records.
+    - If the database rejects the batch (a data error such as an
+      IntegrityError from one bad record) it is retried record by record;
+      records that still fail are appended to a quarantine file next to the
+      spill file and logged, never put back in the backlog, so one bad
+      record cannot block every later flush.
+    - submit() is timed; stats() reports the per-record overhead against
+      `budget_us` so a regression in the hot path is visible
+
+Configuration (environment):
+    RLC_AUDIT_BUFFERED       0 to write synchronously (default 1)
+    RLC_AUDIT_FLUSH_SECONDS  background flush interval (default 2)
+    RLC_AUDIT_BATCH_SIZE     records that trigger an early flush (default 200)
+    RLC_AUDIT_BUDGET_US      per-record overhead budget in microseconds (default 250)
+    RLC_AUDIT_SPILL_DIR      spill directory (default data/audit_spill)
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+try:
+    from psycopg2 import InterfaceError, OperationalError
+    from psycopg2.extras import execute_batch
+    EXECUTE_BATCH_AVAILABLE = True
+except ImportError:
+    InterfaceError = OperationalError = None
+    EXECUTE_BATCH_AVAILABLE = False
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+from src.services.database.db_config import get_connection
+from src.services.database.pool import PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BUFFERED = os.environ.get("RLC_AUDIT_BUFFERED", "1") != "0"
+FLUSH_INTERVAL = float(os.environ.get("RLC_AUDIT_FLUSH_SECONDS", "2"))
+FLUSH_BATCH_SIZE = int(os.environ.get("RLC_AUDIT_BATCH_SIZE", "200"))
+OVERHEAD_BUDGET_US = float(os.environ.get("RLC_AUDIT_BUDGET_US", "250"))
+SPILL_DIR = Path(os.environ.get("RLC_AUDIT_SPILL_DIR", PROJECT_ROOT / "data" / "audit_spill"))
+
+# Record kind -> stored function call. Parameter order matches the
+# audit.* signatures in database/schemas/005_transformation_logging.sql.
+STATEMENTS = {
+    'operation': (
+        "SELECT audit.log_transformation_operation("
+        "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) AS id"
+    ),
+    'artifact': (
+        "SELECT audit.register_output_artifact("
+        "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) AS id"
+    ),
+    'lineage': (
+        "SELECT audit.add_lineage_edge("
+        "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) AS id"
+    ),
+    'complete': (
+        "SELECT audit.complete_transformation_session(%s, %s, %s, %s)"
+    ),
+}
+
+Record = Tuple[str, List[Any]]
+
+# Errors that mean "the database is unreachable", as opposed to "the
+# database rejected this data". Only these send records to the spill file.
+CONNECTION_ERRORS: Tuple[type, ...] = tuple(
+    e for e in (OperationalError, InterfaceError, PoolTimeout, OSError) if e is not None
+)
+
+
+def _json_safe(value: Any) -> Any:
+    """Normalize a parameter so the record can be spilled as JSON and replayed."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+class AuditSink:
+    """
+    Ordered, batched writer for audit.* records with an on-disk spill.
+
+    Args:
+        connection_fn: Context manager factory yielding a DB-API connection
+        spill_path: JSONL file for records that could not be written
+        quarantine_path: JSONL file for records the database rejected
+        flush_interval: Seconds between background flushes
+        batch_size: Pending records that trigger an early flush
+        budget_us: Per-record submit() overhead budget in microseconds
+    """
+
+    def __init__(
+        self,
+        connection_fn: Callable = get_connection,
+        spill_path: Optional[Path] = None,
+        quarantine_path: Optional[Path] = None,
+        flush_interval: float = FLUSH_INTERVAL,
+        batch_size: int = FLUSH_BATCH_SIZE,
+        budget_us: float = OVERHEAD_BUDGET_US,
+    ):
+        self.connection_fn = connection_fn
+        self.spill_path = Path(spill_path) if spill_path else SPILL_DIR / "audit_spill.jsonl"
+        self.quarantine_path = (
+            Path(quarantine_path) if quarantine_path
+            else self.spill_path.with_name(self.spill_path.stem + "_rejected.jsonl")
+        )
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.budget_us = budget_us
+
+        self._cond = threading.Condition()
+        self._pending: deque = deque()
+        self._flush_lock = threading.Lock()   # one flusher at a time keeps order
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Metrics
+        self._submitted = 0
+        self._written = 0
+        self._batches = 0
+        self._flush_errors = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._quarantined = 0
+        self._overhead_total_us = 0.0
+        self._overhead_max_us = 0.0
+        self._over_budget = 0
+        self._budget_warned = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, params: Sequence[Any]):
+        """Queue one record; returns immediately."""
+        start = time.perf_counter()
+        if kind not in STATEMENTS:
+            raise ValueError(f"Unknown audit record kind: {kind}")
+        record = (kind, _json_safe(params))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AuditSink is closed")
+            self._pending.append(record)
+            self._submitted += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+            self._ensure_thread()
+            self._record_overhead((time.perf_counter() - start) * 1e6)
+
+    def execute_now(self, kind: str, params: Sequence[Any]) -> Any:
+        """Write one record synchronously and return the function's result."""
+        self.flush()
+        with self.connection_fn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(STATEMENTS[kind], _json_safe(params))
+            row = cursor.fetchone() if kind != 'complete' else None
+            conn.commit()
+        if row is None:
+            return None
+        return row['id'] if isinstance(row, dict) else row[0]
+
+    def flush(self) -> bool:
+        """
+        Write everything queued so far (after any spilled backlog).
+
+        Returns:
+            True if all records were handled (written, or quarantined because
+            the database rejected them), False if some were spilled to disk
+            because the database was unreachable.
+        """
+        with self._flush_lock:
+            with self._cond:
+                records = list(self._pending)
+                self._pending.clear()
+
+            backlog = self._read_spill()
+            if backlog:
+                done, rejected, error = self._deliver(backlog)
+                with self._cond:
+                    self._replayed += done - rejected
+                if error is not None:
+                    # Backlog still undeliverable: newer records must queue
+                    # behind it on disk to keep their order.
+                    if done:
+                        self._rewrite_spill(backlog[done:])
+                    self._flush_failed(error, records)
+                    return False
+                self._spill_done()
+                logger.info(f"Replayed {done - rejected} spilled audit records")
+
+            if not records:
+                return True
+            done, rejected, error = self._deliver(records)
+            with self._cond:
+                self._written += done - rejected
+            if error is not None:
+                self._flush_failed(error, records[done:])
+                return False
+            return True
+
+    def close(self):
+        """Flush outstanding records and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(self.flush_interval, 1.0) + 5)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            submitted = self._submitted
+            return {
+                'pending': len(self._pending),
+                'submitted': submitted,
+                'written': self._written,
+                'batches': self._batches,
+                'flush_errors': self._flush_errors,
+                'spilled': self._spilled,
+                'replayed': self._replayed,
+                'quarantined': self._quarantined,
+                'spill_file': str(self.spill_path) if self.spill_path.exists() else None,
+                'overhead_avg_us': round(self._overhead_total_us / submitted, 2) if submitted else 0.0,
+                'overhead_max_us': round(self._overhead_max_us, 2),
+                'over_budget': self._over_budget,
+                'budget_us': self.budget_us,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        # Caller holds self._cond
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="audit-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closed = self._closed
+                has_work = bool(self._pending)
+            if has_work or self.spill_path.exists():
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Audit flush failed: {e}")
+            if closed:
+                return
+
+    def _deliver(self, records: List[Record]) -> Tuple[int, int, Optional[Exception]]:
+        """
+        Write records, isolating any the database rejects.
+
+        Returns:
+            (done, rejected, error): the number of leading records handled,
+            how many of those were quarantined, and the connection error that
+            stopped delivery (None if every record was handled).
+        """
+        try:
+            self._write(records)
+            return len(records), 0, None
+        except CONNECTION_ERRORS as e:
+            return 0, 0, e
+        except Exception as e:
+            if len(records) == 1:
+                self._quarantine(records[0], e)
+                return 1, 1, None
+            logger.warning(
+                f"Audit batch of {len(records)} records rejected ({e}); "
+                f"retrying record by record"
+            )
+
+        rejected = 0
+        for done, record in enumerate(records):
+            try:
+                self._write([record])
+            except CONNECTION_ERRORS as e:
+                return done, rejected, e
+            except Exception as e:
+                self._quarantine(record, e)
+                rejected += 1
+        return len(records), rejected, None
+
+    def _write(self, records: List[Record]):
+        """Write records in order in a single transaction."""
+        with self.connection_fn() as conn:
+            cursor = conn.cursor()
+            for kind, params_list in self._runs(records):
+                sql = STATEMENTS[kind]
+                if EXECUTE_BATCH_AVAILABLE and len(params_list) > 1:
+                    execute_batch(cursor, sql, params_list, page_size=self.batch_size)
+                else:
+                    for params in params_list:
+                        cursor.execute(sql, params)
+            conn.commit()
+        with self._cond:
+            self._batches += 1
+
+    @staticmethod
+    def _runs(records: List[Record]):
+        """Group consecutive records of the same kind, preserving order."""
+        kind, run = None, []
+        for rec_kind, params in records:
+            if rec_kind != kind and run:
+                yield kind, run
+                run = []
+            kind = rec_kind
+            run.append(params)
+        if run:
+            yield kind, run
+
+    def _flush_failed(self, error: Exception, records: List[Record]):
+        with self._cond:
+            self._flush_errors += 1
+        if not records:
+            logger.debug(f"Audit spill replay failed, will retry: {error}")
+            return
+        self._spill(records)
+        logger.warning(
+            f"Audit flush failed ({error}); spilled {len(records)} records to {self.spill_path}"
+        )
+
+    def _spill(self, records: List[Record]):
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            for kind, params in records:
+                f.write(json.dumps({'kind': kind, 'params': params}, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        with self._cond:
+            self._spilled += len(records)
+
+    def _rewrite_spill(self, records: List[Record]):
+        """Replace the spill file with the part of the backlog still undelivered."""
+        tmp = self.spill_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for kind, params in records:
+                f.write(json.dumps({'kind': kind, 'params': params}, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.spill_path)
+
+    def _quarantine(self, record: Record, error: Exception):
+        kind, params = record
+        self.quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.quarantine_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(
+                {'kind': kind, 'params': params, 'error': str(error).strip()}, default=str
+            ) + '\n')
+        with self._cond:
+            self._quarantined += 1
+        logger.error(
+            f"Audit {kind} record rejected by the database ({error}); "
+            f"quarantined to {self.quarantine_path}"
+        )
+
+    def _read_spill(self) -> List[Record]:
+        if not self.spill_path.exists():
+            return []
+        records = []
+        with open(self.spill_path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if entry['kind'] not in STATEMENTS:
+                        raise ValueError(f"unknown kind {entry['kind']!r}")
+                    records.append((entry['kind'], entry['params']))
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn final line from a crash mid-append
+                    logger.warning(f"Skipping bad audit spill line {line_no}: {e}")
+        return records
+
+    def _spill_done(self):
+        try:
+            self.spill_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _record_overhead(self, elapsed_us: float):
+        # Caller holds self._cond
+        self._overhead_total_us += elapsed_us
+        self._overhead_max_us = max(self._overhead_max_us, elapsed_us)
+        if elapsed_us > self.budget_us:
+            self._over_budget += 1
+        if (not self._budget_warned and self._submitted >= 100
+                and self._overhead_total_us / self._submitted > self.budget_us):
+            self._budget_warned = True
+            logger.warning(
+                f"Audit logging overhead {self._overhead_total_us / self._submitted:.1f}us/record "
+                f"exceeds budget of {self.budget_us:.0f}us"
+            )
+
+
+_sink: Optional[AuditSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink() -> AuditSink:
+    """Return the process-wide sink, creating it on first use."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = AuditSink()
+                atexit.register(_sink.close)
+    return _sink
+
+
+def get_audit_stats() -> Dict[str, Any]:
+    return get_audit_sink().stats()
@@ -39,8 +39,17 @@ Usage:
         logger.checkin()
     except Exception as e:
         logger.checkin(status='FAILED', error_message=str(e))
+
+Operations, artifacts and lineage edges are buffered by the process-wide
+AuditSink (see audit_sink.py) and written in batches in the background;
+checkin() flushes them. Database ids on the returned results are therefore
+None unless the logger is created with buffered=False (or
+RLC_AUDIT_BUFFERED=0). checkout() is always synchronous because the session
+id comes from the database.
 """
 
+import json
+
 import logging
 import time
 from dataclasses import dataclass, field
@@ -59,6 +68,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.services.database.db_config import get_connection, DB_TYPE
+from src.agents.core.audit_sink import AUDIT_BUFFERED, AuditSink, get_audit_sink
 
 logger = logging.getLogger(__name__)
 
@@ -146,23 +156,23 @@ class RelationshipType(str, Enum):
 
 @dataclass
 class OperationResult:
-    """Result of logging an operation."""
-    operation_id: int
+    """Result of logging an operation (operation_id is None when buffered)."""
+    operation_id: Optional[int]
     operation_order: int
     execution_time_ms: Optional[int] = None
 
 
 @dataclass
 class ArtifactResult:
-    """Result of registering an artifact."""
-    artifact_id: UUID
+    """Result of registering an artifact (artifact_id is None when buffered)."""
+    artifact_id: Optional[UUID]
     artifact_name: str
 
 
 @dataclass
 class LineageEdgeResult:
-    """Result of adding a lineage edge."""
-    edge_id: int
+    """Result of adding a lineage edge (edge_id is None when buffered)."""
+    edge_id: Optional[int]
     is_new: bool = True
 
 
@@ -201,7 +211,9 @@ class TransformationLogger:
         data_end_date: Optional[date] = None,
         parent_session_id: Optional[UUID] = None,
         ticket_id: Optional[str] = None,
-        auto_checkout: bool = True
+        auto_checkout: bool = True,
+        buffered: Optional[bool] = None,
+        sink: Optional[AuditSink] = None
     ):
         """
         Initialize the transformation logger.
@@ -220,6 +232,9 @@ class TransformationLogger:
             parent_session_id: ID of parent session for chained transformations
             ticket_id: Optional link to Jira/issue tracker
             auto_checkout: Whether to automatically checkout when used as context manager
+            buffered: Queue records for batched writes (default RLC_AUDIT_BUFFERED);
+                False writes each record synchronously and returns its database id
+            sink: AuditSink to write through (default: the process-wide sink)
         """
         self.agent_id = agent_id
         self.session_type = session_type if isinstance(session_type, str) else session_type.value
@@ -234,6 +249,8 @@ class TransformationLogger:
         self.parent_session_id = parent_session_id
         self.ticket_id = ticket_id
         self.auto_checkout = auto_checkout
+        self.buffered = AUDIT_BUFFERED if buffered is None else buffered
+        self._sink = sink
 
         self.session_id: Optional[UUID] = None
         self._operation_count = 0
@@ -369,41 +386,29 @@ class TransformationLogger:
         op_type = operation_type if isinstance(operation_type, str) else operation_type.value
 
         try:
-            with get_connection() as conn:
-                cursor = conn.cursor()
-
-                if DB_TYPE == "postgresql":
-                    import json
-                    cursor.execute("""
-                        SELECT audit.log_transformation_operation(
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        ) AS operation_id
-                    """, (
-                        str(self.session_id),
-                        op_type,
-                        input_tables,
-                        transformation_logic,
-                        output_table,
-                        input_row_count,
-                        output_row_count,
-                        transformation_type,
-                        json.dumps(parameters) if parameters else None,
-                        input_columns,
-                        output_columns,
-                        warnings,
-                        execution_time_ms
-                    ))
-                    result = cursor.fetchone()
-                    operation_id = result['operation_id'] if isinstance(result, dict) else result[0]
-                else:
-                    # SQLite fallback
-                    operation_id = self._operation_count + 1
-                    logger.info(
-                        f"Operation logged (SQLite mode): {op_type} "
-                        f"- {input_tables} -> {output_table}"
-                    )
-
-                conn.commit()
+            if DB_TYPE == "postgresql":
+                operation_id = self._write('operation', (
+                    str(self.session_id),
+                    op_type,
+                    input_tables,
+                    transformation_logic,
+                    output_table,
+                    input_row_count,
+                    output_row_count,
+                    transformation_type,
+                    json.dumps(parameters) if parameters else None,
+                    input_columns,
+                    output_columns,
+                    warnings,
+                    execution_time_ms
+                ))
+            else:
+                # SQLite fallback
+                operation_id = self._operation_count + 1
+                logger.info(
+                    f"Operation logged (SQLite mode): {op_type} "
+                    f"- {input_tables} -> {output_table}"
+                )
 
             self._operation_count += 1
             logger.debug(
@@ -465,41 +470,29 @@ class TransformationLogger:
         art_type = artifact_type if isinstance(artifact_type, str) else artifact_type.value
 
         try:
-            with get_connection() as conn:
-                cursor = conn.cursor()
-
-                if DB_TYPE == "postgresql":
-                    import json
-                    cursor.execute("""
-                        SELECT audit.register_output_artifact(
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        ) AS artifact_id
-                    """, (
-                        str(self.session_id),
-                        art_type,
-                        artifact_name,
-                        artifact_location,
-                        source_tables,
-                        row_count,
-                        column_count,
-                        data_as_of,
-                        data_start_date,
-                        data_end_date,
-                        description,
-                        expires_at,
-                        json.dumps(metadata) if metadata else None
-                    ))
-                    result = cursor.fetchone()
-                    artifact_id = result['artifact_id'] if isinstance(result, dict) else result[0]
-                else:
-                    # SQLite fallback
-                    import uuid
-                    artifact_id = uuid.uuid4()
-                    logger.info(
-                        f"Artifact registered (SQLite mode): {art_type} - {artifact_name}"
-                    )
-
-                conn.commit()
+            if DB_TYPE == "postgresql":
+                artifact_id = self._write('artifact', (
+                    str(self.session_id),
+                    art_type,
+                    artifact_name,
+                    artifact_location,
+                    source_tables,
+                    row_count,
+                    column_count,
+                    data_as_of,
+                    data_start_date,
+                    data_end_date,
+                    description,
+                    expires_at,
+                    json.dumps(metadata) if metadata else None
+                ))
+            else:
+                # SQLite fallback
+                import uuid
+                artifact_id = uuid.uuid4()
+                logger.info(
+                    f"Artifact registered (SQLite mode): {art_type} - {artifact_name}"
+                )
 
             self._output_count += 1
             logger.debug(f"Registered artifact: {artifact_name} ({art_type})")
@@ -547,38 +540,27 @@ class TransformationLogger:
         rel_type = relationship_type if isinstance(relationship_type, str) else relationship_type.value
 
         try:
-            with get_connection() as conn:
-                cursor = conn.cursor()
-
-                if DB_TYPE == "postgresql":
-                    cursor.execute("""
-                        SELECT audit.add_lineage_edge(
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                        ) AS edge_id
-                    """, (
-                        source_type,
-                        source_schema,
-                        source_name,
-                        target_type,
-                        target_schema,
-                        target_name,
-                        rel_type,
-                        str(self.session_id) if self.session_id else None,
-                        source_column,
-                        target_column,
-                        transformation_description
-                    ))
-                    result = cursor.fetchone()
-                    edge_id = result['edge_id'] if isinstance(result, dict) else result[0]
-                else:
-                    # SQLite fallback
-                    edge_id = hash(f"{source_schema}.{source_name}->{target_schema}.{target_name}")
-                    logger.info(
-                        f"Lineage edge added (SQLite mode): "
-                        f"{source_schema}.{source_name} -> {target_schema}.{target_name}"
-                    )
-
-                conn.commit()
+            if DB_TYPE == "postgresql":
+                edge_id = self._write('lineage', (
+                    source_type,
+                    source_schema,
+                    source_name,
+                    target_type,
+                    target_schema,
+                    target_name,
+                    rel_type,
+                    str(self.session_id) if self.session_id else None,
+                    source_column,
+                    target_column,
+                    transformation_description
+                ))
+            else:
+                # SQLite fallback
+                edge_id = hash(f"{source_schema}.{source_name}->{target_schema}.{target_name}")
+                logger.info(
+                    f"Lineage edge added (SQLite mode): "
+                    f"{source_schema}.{source_name} -> {target_schema}.{target_name}"
+                )
 
             logger.debug(
                 f"Added lineage: {source_schema}.{source_name} "
@@ -600,6 +582,10 @@ class TransformationLogger:
         """
         Complete the transformation session (checkin).
 
+        Queues the completion behind the session's buffered records and
+        flushes them all. If the database is unreachable the records are
+        spilled to disk (and replayed later) rather than raising.
+
         Args:
             status: Final status of the session
             error_message: Error message if status is FAILED
@@ -615,28 +601,23 @@ class TransformationLogger:
         stat = status if isinstance(status, str) else status.value
 
         try:
-            with get_connection() as conn:
-                cursor = conn.cursor()
-
-                if DB_TYPE == "postgresql":
-                    import json
-                    cursor.execute("""
-                        SELECT audit.complete_transformation_session(
-                            %s, %s, %s, %s
-                        )
-                    """, (
-                        str(self.session_id),
-                        stat,
-                        error_message,
-                        json.dumps(error_details) if error_details else None
-                    ))
-                else:
-                    logger.info(
-                        f"Transformation session completed (SQLite mode): "
-                        f"{self.session_id} - {stat}"
+            if DB_TYPE == "postgresql":
+                self._write('complete', (
+                    str(self.session_id),
+                    stat,
+                    error_message,
+                    json.dumps(error_details) if error_details else None
+                ))
+                if self.buffered and not self.sink.flush():
+                    logger.warning(
+                        f"Audit records for session {self.session_id} spilled to "
+                        f"{self.sink.spill_path}; they will be written on the next flush"
                     )
-
-                conn.commit()
+            else:
+                logger.info(
+                    f"Transformation session completed (SQLite mode): "
+                    f"{self.session_id} - {stat}"
+                )
 
             self._is_active = False
             logger.info(
@@ -648,6 +629,19 @@ class TransformationLogger:
             logger.error(f"Failed to complete transformation session: {e}")
             raise
 
+    @property
+    def sink(self) -> AuditSink:
+        if self._sink is None:
+            self._sink = get_audit_sink()
+        return self._sink
+
+    def _write(self, kind: str, params: tuple) -> Any:
+        """Queue (buffered) or execute (synchronous) one audit record."""
+        if self.buffered:
+            self.sink.submit(kind, params)
+            return None
+        return self.sink.execute_now(kind, params)
+
     def timed_operation(self, operation_type: OperationType | str, **kwargs):
         """
         Context manager for timing an operation.
@@ -15,14 +15,24 @@ Usage:
     python src/agents/log_review_agent.py              # Run full review and send email
     python src/agents/log_review_agent.py --preview    # Preview report without sending
     python src/agents/log_review_agent.py --daemon     # Run as scheduled daemon
+    python src/agents/log_review_agent.py --trend 14   # Daily error/warning trend
+
+Log files are scanned incrementally: per-file byte offsets and rotation
+state live in output/log_review/scan_state.json, so each run reads only the
+bytes appended since the previous run. Errors/warnings seen within the
+retention window are kept in that state, and per-day counts go to a rolling
+summary index (output/log_review/summary_index.json) for trend questions.
 """
 
 import os
 import sys
 import re
 import json
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
@@ -44,6 +54,7 @@ load_dotenv(PROJECT_ROOT / ".env")
 # Directories
 LOG_DIR = PROJECT_ROOT / "output" / "logs"
 REPORT_DIR = PROJECT_ROOT / "output" / "reports"
+STATE_DIR = PROJECT_ROOT / "output" / "log_review"
 
 # Setup logging
 logging.basicConfig(
@@ -80,6 +91,14 @@ class LogReviewConfig:
         "data_checker.log"
     ])
 
+    # Freshness check: allow MAX() scans of tables with no watermark or index
+    freshness_allow_scan: bool = False
+
+    # Incremental scanning
+    scan_workers: int = 4  # Files scanned in parallel
+    retention_hours: int = 168  # Keep parsed errors/warnings this long (>= lookback)
+    index_days: int = 90  # Days kept in the rolling summary index
+
     # Thresholds
     error_threshold: int = 0  # Alert if any errors
     warning_threshold: int = 5  # Alert if more than 5 warnings
@@ -125,7 +144,8 @@ class DataFreshness:
     row_count: int
     latest_record: Optional[datetime]
     freshness_hours: Optional[float]
-    status: str  # 'FRESH', 'STALE', 'EMPTY', 'ERROR'
+    status: str  # 'FRESH', 'STALE', 'VERY_STALE', 'EMPTY', 'MISSING', 'UNKNOWN', 'ERROR'
+    source: Optional[str] = None  # How latest_record was found: 'watermark', 'index', 'scan'
 
 
 @dataclass
@@ -138,6 +158,7 @@ class SystemStatus:
     overall_status: str = "UNKNOWN"  # 'HEALTHY', 'WARNING', 'ERROR', 'CRITICAL'
     total_errors: int = 0
     total_warnings: int = 0
+    freshness_check_ms: Optional[float] = None
 
 
 # =============================================================================
@@ -162,9 +183,16 @@ class LogParser:
     WARNING_KEYWORDS = ['WARNING', 'WARN', 'Warning:', 'warning:']
     SUCCESS_KEYWORDS = ['SUCCESS', 'COMPLETE', 'successfully', 'Saved', 'Generated']
 
+    # Keyword matchers, compiled once
+    ERROR_RE = re.compile('|'.join(map(re.escape, ERROR_KEYWORDS)))
+    WARNING_RE = re.compile('|'.join(map(re.escape, WARNING_KEYWORDS)))
+    SUCCESS_RE = re.compile('|'.join(map(re.escape, SUCCESS_KEYWORDS)))
+    ERROR_RE_NOCASE = re.compile('|'.join(map(re.escape, ERROR_KEYWORDS)), re.IGNORECASE)
+    WARNING_RE_NOCASE = re.compile('|'.join(map(re.escape, WARNING_KEYWORDS)), re.IGNORECASE)
+
     @classmethod
     def parse_file(cls, file_path: Path, since: datetime) -> LogSummary:
-        """Parse a log file and return summary."""
+        """Parse a whole log file and return summary (non-incremental)."""
         summary = LogSummary(
             file_name=file_path.name,
             total_lines=0
@@ -175,36 +203,43 @@ class LogParser:
 
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+                for line in f:
+                    summary.total_lines += 1
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    entry = cls._parse_line(line, file_path.name)
+                    if not entry:
+                        continue
+
+                    # Filter by time
+                    if entry.timestamp < since:
+                        continue
+
+                    category = cls.categorize(line, entry)
+                    if category == 'error':
+                        summary.errors.append(entry)
+                    elif category == 'warning':
+                        summary.warnings.append(entry)
+                    elif category == 'success':
+                        summary.success_indicators.append(line[:200])
         except Exception as e:
             logger.error(f"Error reading {file_path}: {e}")
-            return summary
-
-        summary.total_lines = len(lines)
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            entry = cls._parse_line(line, file_path.name)
-            if not entry:
-                continue
-
-            # Filter by time
-            if entry.timestamp < since:
-                continue
-
-            # Categorize
-            if entry.level == 'ERROR' or any(kw in line for kw in cls.ERROR_KEYWORDS):
-                summary.errors.append(entry)
-            elif entry.level == 'WARNING' or any(kw in line for kw in cls.WARNING_KEYWORDS):
-                summary.warnings.append(entry)
-            elif any(kw in line for kw in cls.SUCCESS_KEYWORDS):
-                summary.success_indicators.append(line[:200])
 
         return summary
 
+    @classmethod
+    def categorize(cls, line: str, entry: LogEntry) -> Optional[str]:
+        """Classify a parsed line as 'error', 'warning', 'success' or None."""
+        if entry.level == 'ERROR' or cls.ERROR_RE.search(line):
+            return 'error'
+        if entry.level == 'WARNING' or cls.WARNING_RE.search(line):
+            return 'warning'
+        if cls.SUCCESS_RE.search(line):
+            return 'success'
+        return None
+
     @classmethod
     def _parse_line(cls, line: str, file_name: str) -> Optional[LogEntry]:
         """Parse a single log line."""
@@ -213,15 +248,18 @@ class LogParser:
             if match:
                 groups = match.groups()
 
-                # Parse timestamp
+                # Parse timestamp (fromisoformat first -- far cheaper than strptime)
+                ts_str = groups[0].replace(',', '.')
                 try:
-                    ts_str = groups[0].replace(',', '.')
-                    if '.' in ts_str:
-                        timestamp = datetime.strptime(ts_str[:23], '%Y-%m-%d %H:%M:%S.%f')
-                    else:
-                        timestamp = datetime.strptime(ts_str[:19], '%Y-%m-%d %H:%M:%S')
-                except:
-                    timestamp = datetime.now()
+                    timestamp = datetime.fromisoformat(ts_str[:23])
+                except ValueError:
+                    try:
+                        if '.' in ts_str:
+                            timestamp = datetime.strptime(ts_str[:23], '%Y-%m-%d %H:%M:%S.%f')
+                        else:
+                            timestamp = datetime.strptime(ts_str[:19], '%Y-%m-%d %H:%M:%S')
+                    except:
+                        timestamp = datetime.now()
 
                 # Handle different formats
                 if len(groups) == 4:
@@ -235,16 +273,13 @@ class LogParser:
                     )
                 elif len(groups) == 2:
                     # Simple bracket format
-                    level = 'INFO'
                     message = groups[1]
-                    for kw in cls.ERROR_KEYWORDS:
-                        if kw.lower() in message.lower():
-                            level = 'ERROR'
-                            break
-                    for kw in cls.WARNING_KEYWORDS:
-                        if kw.lower() in message.lower():
-                            level = 'WARNING'
-                            break
+                    if cls.WARNING_RE_NOCASE.search(message):
+                        level = 'WARNING'
+                    elif cls.ERROR_RE_NOCASE.search(message):
+                        level = 'ERROR'
+                    else:
+                        level = 'INFO'
                     return LogEntry(
                         timestamp=timestamp,
                         level=level,
@@ -256,6 +291,243 @@ class LogParser:
         return None
 
 
+class LogSummaryIndex:
+    """
+    Rolling per-day, per-file counts of lines, errors, warnings and successes.
+
+    Lets multi-day trend questions ("are errors climbing this week?") be
+    answered from a small JSON file instead of re-reading old logs.
+    """
+
+    FIELDS = ('lines', 'errors', 'warnings', 'successes')
+
+    def __init__(self, path: Optional[Path] = None, keep_days: int = 90):
+        self.path = Path(path) if path else STATE_DIR / "summary_index.json"
+        self.keep_days = keep_days
+        self.days: Dict[str, Dict[str, Dict[str, int]]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.days = json.load(f).get('days', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable summary index {self.path}: {e}")
+
+    def add(self, file_name: str, day_counts: Dict[str, Dict[str, int]], replace: bool = False):
+        """Merge one scan's per-day counts for a file (replace=True for a rescan from byte 0)."""
+        for day, counts in day_counts.items():
+            per_file = self.days.setdefault(day, {})
+            current = per_file.get(file_name) if not replace else None
+            current = current or dict.fromkeys(self.FIELDS, 0)
+            for key in self.FIELDS:
+                current[key] = current.get(key, 0) + counts.get(key, 0)
+            per_file[file_name] = current
+
+    def trend(self, days: int = 7) -> List[Dict]:
+        """Daily totals for the last `days` days, oldest first."""
+        today = date.today()
+        rows = []
+        for offset in range(days - 1, -1, -1):
+            day = (today - timedelta(days=offset)).isoformat()
+            per_file = self.days.get(day, {})
+            row = {'date': day, 'files': len(per_file)}
+            for key in self.FIELDS:
+                row[key] = sum(c.get(key, 0) for c in per_file.values())
+            rows.append(row)
+        return rows
+
+    def save(self):
+        cutoff = (date.today() - timedelta(days=self.keep_days)).isoformat()
+        self.days = {d: v for d, v in self.days.items() if d >= cutoff}
+        _write_json_atomic(self.path, {'days': self.days})
+
+
+class LogScanner:
+    """
+    Incremental log scanner.
+
+    For every file it remembers the byte offset already consumed plus the
+    inode and a hash of the first bytes, so each run streams only newly
+    appended complete lines. A changed inode, a file shorter than the saved
+    offset, or a different head hash means the file was rotated or
+    truncated, and it is read again from the start; like a full rescan,
+    that replaces the file's entries and its per-day index counts rather
+    than adding to them.
+
+    Errors, warnings and success lines are kept in the state for
+    `retention_hours` so a review window that spans several runs still
+    sees them; per-day counts are also folded into a LogSummaryIndex.
+    """
+
+    HEAD_BYTES = 256
+    SUCCESS_KEEP = 50  # Most recent success lines kept per file (reports show a few)
+    _COUNT_KEYS = {'error': 'errors', 'warning': 'warnings', 'success': 'successes'}
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        index: Optional[LogSummaryIndex] = None,
+        workers: int = 4,
+        retention_hours: int = 168,
+    ):
+        self.state_path = Path(state_path) if state_path else STATE_DIR / "scan_state.json"
+        self.index = index
+        self.workers = workers
+        self.retention_hours = retention_hours
+        self.state = self._load()
+        self.force_rescan = False  # One-shot: ignore saved offsets on the next scan
+        self.last_scan_bytes = 0
+
+    def scan(self, files: List[Path], full_rescan: bool = False) -> Dict[str, dict]:
+        """Bring each file's state up to date; returns {str(path): file state}."""
+        if self.force_rescan or self.retention_hours > self.state.get('retention_hours', 0):
+            # Entries older than the previous retention were already pruned
+            full_rescan = True
+            self.force_rescan = False
+        cutoff = (datetime.now() - timedelta(hours=self.retention_hours)).isoformat(timespec='microseconds')
+
+        jobs = [(str(p), None if full_rescan else self.state['files'].get(str(p))) for p in files]
+        workers = max(1, min(self.workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda job: self._scan_file(job[0], job[1], cutoff), jobs))
+
+        self.last_scan_bytes = 0
+        for (key, _), (file_state, day_counts, bytes_read, from_start) in zip(jobs, results):
+            self.state['files'][key] = file_state
+            self.last_scan_bytes += bytes_read
+            if self.index is not None and day_counts:
+                self.index.add(Path(key).name, day_counts, replace=from_start)
+
+        # Forget files that no longer exist
+        self.state['files'] = {k: v for k, v in self.state['files'].items() if os.path.exists(k)}
+        self.state['retention_hours'] = self.retention_hours
+        _write_json_atomic(self.state_path, self.state)
+        if self.index is not None:
+            self.index.save()
+        return {key: self.state['files'][key] for key, _ in jobs if key in self.state['files']}
+
+    @staticmethod
+    def summarize(file_path: Path, file_state: dict, since: datetime) -> LogSummary:
+        """Build the review's LogSummary for one file from its scan state."""
+        summary = LogSummary(file_name=file_path.name, total_lines=file_state.get('lines', 0))
+        since_iso = since.isoformat(timespec='microseconds')
+        for ts, category, level, source, message in file_state.get('entries', []):
+            if ts < since_iso:
+                continue
+            if category == 'success':
+                summary.success_indicators.append(message)
+                continue
+            entry = LogEntry(
+                timestamp=datetime.fromisoformat(ts),
+                level=level,
+                source=source,
+                message=message,
+                file=file_path.name
+            )
+            (summary.errors if category == 'error' else summary.warnings).append(entry)
+        return summary
+
+    def _scan_file(self, path: str, prior: Optional[dict], cutoff: str) -> Tuple[dict, Dict, int, bool]:
+        """
+        Read new complete lines from one file.
+
+        Returns (state, day counts, bytes read, from_start); from_start is
+        True when the file was read from byte 0, so its counts replace
+        rather than add to what the index already holds for it.
+        """
+        state = dict(prior) if prior else {'offset': 0, 'lines': 0, 'entries': []}
+        name = Path(path).name
+        day_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(LogSummaryIndex.FIELDS, 0))
+
+        try:
+            st = os.stat(path)
+            if (prior and st.st_ino == prior.get('inode') and st.st_size == prior.get('offset')
+                    and st.st_mtime == prior.get('mtime')):
+                state['entries'] = self._prune(state['entries'], cutoff)
+                return state, {}, 0, False
+
+            with open(path, 'rb') as f:
+                head = f.read(self.HEAD_BYTES)
+                offset = state['offset']
+                head_len = state.get('head_len', 0)
+                if (state.get('inode') not in (None, st.st_ino) or st.st_size < offset
+                        or hashlib.sha1(head[:head_len]).hexdigest() != state.get('head', hashlib.sha1(b'').hexdigest())):
+                    logger.info(f"{name} was rotated or truncated; rescanning from start")
+                    offset = 0
+                    state['lines'] = 0
+                    state['entries'] = []
+
+                entries = state['entries']
+                lines = state['lines']
+                last_day = state.get('last_day') or date.today().isoformat()
+                start = offset
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break  # Partial line still being written; next run picks it up
+                    offset += len(raw)
+                    lines += 1
+                    line = raw.decode('utf-8', errors='ignore').strip()
+                    entry = LogParser._parse_line(line, name) if line else None
+                    if entry is not None:
+                        last_day = entry.timestamp.date().isoformat()
+                    counts = day_counts[last_day]
+                    counts['lines'] += 1
+                    if entry is None:
+                        continue
+                    category = LogParser.categorize(line, entry)
+                    if category is None:
+                        continue
+                    counts[self._COUNT_KEYS[category]] += 1
+                    message = line[:200] if category == 'success' else entry.message
+                    entries.append([entry.timestamp.isoformat(timespec='microseconds'),
+                                    category, entry.level, entry.source, message])
+
+            new_head_len = min(len(head), offset) if offset else 0
+            state.update({
+                'inode': st.st_ino,
+                'offset': offset,
+                'mtime': st.st_mtime if offset == st.st_size else None,
+                'head': hashlib.sha1(head[:new_head_len]).hexdigest(),
+                'head_len': new_head_len,
+                'lines': lines,
+                'last_day': last_day,
+                'entries': self._prune(entries, cutoff),
+            })
+            return state, dict(day_counts), offset - start, start == 0
+        except Exception as e:
+            logger.error(f"Error scanning {path}: {e}")
+            return prior or state, {}, 0, False
+
+    def _prune(self, entries: List[list], cutoff: str) -> List[list]:
+        """Drop entries older than the retention window; cap success lines."""
+        recent = [e for e in entries if e[0] >= cutoff]
+        successes = [i for i, e in enumerate(recent) if e[1] == 'success']
+        if len(successes) > self.SUCCESS_KEEP:
+            dropped = set(successes[:-self.SUCCESS_KEEP])
+            recent = [e for i, e in enumerate(recent) if i not in dropped]
+        return recent
+
+    def _load(self) -> dict:
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                state.setdefault('files', {})
+                return state
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable scan state {self.state_path}: {e}")
+        return {'files': {}}
+
+
+def _write_json_atomic(path: Path, data: dict):
+    """Write JSON via a temp file + rename so a crash never leaves a torn file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
 # =============================================================================
 # DATABASE CHECKER
 # =============================================================================
@@ -303,9 +575,41 @@ class DatabaseChecker:
         'conab_production': 720,  # Monthly
     }
 
+    # One catalog round trip for every monitored table: existence, row
+    # estimate from statistics, whether ts_col leads a btree index, and the
+    # core.table_watermark row (migration 178) when that table exists.
+    CATALOG_SQL = """
+        WITH monitored AS (
+            SELECT * FROM unnest(%s::text[], %s::text[], %s::text[])
+                AS m(schema_name, table_name, ts_col)
+        )
+        SELECT m.schema_name, m.table_name,
+               c.oid IS NOT NULL AS table_exists,
+               COALESCE(NULLIF(s.n_live_tup, 0), GREATEST(c.reltuples, 0))::bigint AS row_estimate,
+               EXISTS (
+                   SELECT 1 FROM pg_index i
+                   JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+                   WHERE i.indrelid = c.oid AND a.attname = m.ts_col
+               ) AS ts_indexed,
+               {watermark_cols}
+        FROM monitored m
+        LEFT JOIN pg_namespace n ON n.nspname = m.schema_name
+        LEFT JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = m.table_name
+                            AND c.relkind IN ('r', 'p', 'm')
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        {watermark_join}
+    """
+    WATERMARK_COLS = "w.last_write_at::timestamp AS watermark, w.collector_name IS NOT NULL AS runner_maintained"
+    WATERMARK_JOIN = ("LEFT JOIN core.table_watermark w "
+                      "ON w.schema_name = m.schema_name AND w.table_name = m.table_name")
+    NO_WATERMARK_COLS = "NULL::timestamp AS watermark, false AS runner_maintained"
+
     def __init__(self, config: LogReviewConfig):
         self.config = config
         self.conn = None
+        self.use_watermarks = True
+        self.last_check_ms: Optional[float] = None
+        self.last_round_trips = 0
 
     def connect(self):
         """Connect to database."""
@@ -327,9 +631,20 @@ class DatabaseChecker:
         """Close database connection."""
         if self.conn:
             self.conn.close()
+            self.conn = None
 
     def check_all_tables(self) -> List[DataFreshness]:
-        """Check freshness of all monitored tables."""
+        """
+        Check freshness of all monitored tables without scanning them.
+
+        Row counts are catalog estimates. The latest-record time comes from
+        (in order) a runner-maintained watermark, MAX() over an index on the
+        timestamp column, or a seeded watermark; tables with none of these
+        are reported as UNKNOWN unless `freshness_allow_scan` is set.
+        Execution time is recorded in last_check_ms.
+        """
+        started = time.perf_counter()
+        self.last_round_trips = 0
         results = []
 
         if not self.conn:
@@ -337,92 +652,129 @@ class DatabaseChecker:
                 return results
 
         cur = self.conn.cursor()
-
-        for schema, table, ts_col in self.TABLES_TO_MONITOR:
-            freshness = self._check_table(cur, schema, table, ts_col)
-            results.append(freshness)
-
-        cur.close()
-        return results
-
-    def _check_table(self, cur, schema: str, table: str, ts_col: str) -> DataFreshness:
-        """Check a single table's freshness."""
         try:
-            # Check if table exists
-            cur.execute(f"""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = %s AND table_name = %s
-                )
-            """, (schema, table))
-
-            if not cur.fetchone()[0]:
-                return DataFreshness(
-                    schema=schema,
-                    table=table,
-                    row_count=0,
-                    latest_record=None,
-                    freshness_hours=None,
-                    status='MISSING'
-                )
-
-            # Get row count and latest timestamp
-            cur.execute(f"""
-                SELECT COUNT(*), MAX({ts_col})
-                FROM {schema}.{table}
-            """)
-
-            row_count, latest_ts = cur.fetchone()
-
-            if row_count == 0 or latest_ts is None:
-                return DataFreshness(
-                    schema=schema,
-                    table=table,
-                    row_count=row_count or 0,
-                    latest_record=None,
-                    freshness_hours=None,
-                    status='EMPTY'
-                )
-
-            # Calculate freshness
-            now = datetime.now()
-            if latest_ts.tzinfo:
-                latest_ts = latest_ts.replace(tzinfo=None)
-            freshness_hours = (now - latest_ts).total_seconds() / 3600
-
-            # Determine status
-            threshold = self.FRESHNESS_THRESHOLDS.get(table, 24)
-            if freshness_hours <= threshold:
-                status = 'FRESH'
-            elif freshness_hours <= threshold * 2:
-                status = 'STALE'
-            else:
-                status = 'VERY_STALE'
-
-            return DataFreshness(
-                schema=schema,
-                table=table,
-                row_count=row_count,
-                latest_record=latest_ts,
-                freshness_hours=round(freshness_hours, 1),
-                status=status
-            )
-
+            catalog = self._fetch_catalog(cur)
+            latest = self._fetch_index_max(cur, catalog)
+            for (schema, table, _), row in zip(self.TABLES_TO_MONITOR, catalog):
+                results.append(self._classify(schema, table, row, latest))
         except Exception as e:
-            logger.error(f"Error checking {schema}.{table}: {e}")
-            # Rollback to clear the aborted transaction state
+            logger.error(f"Freshness check failed: {e}")
             try:
                 self.conn.rollback()
-            except:
+            except Exception:
                 pass
-            return DataFreshness(
-                schema=schema,
-                table=table,
-                row_count=0,
-                latest_record=None,
-                freshness_hours=None,
-                status='ERROR'
-            )
+            results = [
+                DataFreshness(schema=s, table=t, row_count=0, latest_record=None,
+                              freshness_hours=None, status='ERROR')
+                for s, t, _ in self.TABLES_TO_MONITOR
+            ]
+        finally:
+            cur.close()
+
+        self.last_check_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"Freshness check: {len(results)} tables in {self.last_check_ms} ms "
+            f"({self.last_round_trips} round trips)"
+        )
+        return results
+
+    def _fetch_catalog(self, cur) -> List[tuple]:
+        """Existence, row estimate, index and watermark for every monitored table."""
+        schemas, tables, ts_cols = (list(col) for col in zip(*self.TABLES_TO_MONITOR))
+        params = (schemas, tables, ts_cols)
+        if self.use_watermarks:
+            try:
+                self.last_round_trips += 1
+                cur.execute(self.CATALOG_SQL.format(
+                    watermark_cols=self.WATERMARK_COLS, watermark_join=self.WATERMARK_JOIN
+                ), params)
+                return self._in_monitor_order(cur.fetchall())
+            except Exception as e:
+                if getattr(e, 'pgcode', None) != '42P01':  # undefined_table
+                    raise
+                logger.info("core.table_watermark not found (migration 178); using indexes only")
+                self.conn.rollback()
+                self.use_watermarks = False
+        self.last_round_trips += 1
+        cur.execute(self.CATALOG_SQL.format(
+            watermark_cols=self.NO_WATERMARK_COLS, watermark_join=''
+        ), params)
+        return self._in_monitor_order(cur.fetchall())
+
+    def _in_monitor_order(self, rows) -> List[tuple]:
+        by_key = {(r[0], r[1]): r for r in rows}
+        return [by_key.get((s, t), (s, t, False, 0, False, None, False))
+                for s, t, _ in self.TABLES_TO_MONITOR]
+
+    def _fetch_index_max(self, cur, catalog: List[tuple]) -> Dict[Tuple[str, str], Optional[datetime]]:
+        """MAX(ts_col) for tables that need it, in one UNION ALL round trip."""
+        selects = []
+        for i, ((schema, table, ts_col), row) in enumerate(zip(self.TABLES_TO_MONITOR, catalog)):
+            _, _, exists, _, ts_indexed, watermark, runner_maintained = row
+            if not exists or (runner_maintained and watermark is not None):
+                continue
+            if ts_indexed or (watermark is None and self.config.freshness_allow_scan):
+                selects.append(
+                    f'(SELECT {i} AS idx, MAX("{ts_col}")::timestamp AS latest FROM "{schema}"."{table}")'
+                )
+        if not selects:
+            return {}
+        self.last_round_trips += 1
+        cur.execute(" UNION ALL ".join(selects))
+        latest = {}
+        for idx, value in cur.fetchall():
+            schema, table, _ = self.TABLES_TO_MONITOR[idx]
+            latest[(schema, table)] = value
+        return latest
+
+    def _classify(self, schema: str, table: str, row: tuple,
+                  latest: Dict[Tuple[str, str], Optional[datetime]]) -> DataFreshness:
+        """Turn one catalog row (+ its MAX, if fetched) into a DataFreshness."""
+        _, _, exists, row_estimate, ts_indexed, watermark, runner_maintained = row
+        row_count = int(row_estimate or 0)
+
+        if not exists:
+            return DataFreshness(schema=schema, table=table, row_count=0, latest_record=None,
+                                 freshness_hours=None, status='MISSING')
+
+        if runner_maintained and watermark is not None:
+            latest_ts, source = watermark, 'watermark'
+        elif (schema, table) in latest:
+            latest_ts, source = latest[(schema, table)], 'index' if ts_indexed else 'scan'
+        else:
+            latest_ts, source = watermark, 'watermark' if watermark is not None else None
+
+        if latest_ts is None:
+            if source is None and not ts_indexed and not self.config.freshness_allow_scan:
+                logger.warning(f"{schema}.{table}: no watermark or timestamp index; freshness unknown")
+                return DataFreshness(schema=schema, table=table, row_count=row_count,
+                                     latest_record=None, freshness_hours=None, status='UNKNOWN')
+            return DataFreshness(schema=schema, table=table, row_count=row_count,
+                                 latest_record=None, freshness_hours=None, status='EMPTY',
+                                 source=source)
+
+        if isinstance(latest_ts, datetime) and latest_ts.tzinfo:
+            latest_ts = latest_ts.replace(tzinfo=None)
+        freshness_hours = (datetime.now() - latest_ts).total_seconds() / 3600
+
+        # Determine status
+        threshold = self.FRESHNESS_THRESHOLDS.get(table, 24)
+        if freshness_hours <= threshold:
+            status = 'FRESH'
+        elif freshness_hours <= threshold * 2:
+            status = 'STALE'
+        else:
+            status = 'VERY_STALE'
+
+        return DataFreshness(
+            schema=schema,
+            table=table,
+            row_count=row_count,
+            latest_record=latest_ts,
+            freshness_hours=round(freshness_hours, 1),
+            status=status,
+            source=source
+        )
 
 
 # =============================================================================
@@ -453,7 +805,10 @@ class ReportGenerator:
         lines.append(f"Total Errors: {status.total_errors}")
         lines.append(f"Total Warnings: {status.total_warnings}")
         lines.append(f"Log Files Reviewed: {len(status.log_summaries)}")
-        lines.append(f"Database Tables Checked: {len(status.data_freshness)}")
+        checked = f"Database Tables Checked: {len(status.data_freshness)}"
+        if status.freshness_check_ms is not None:
+            checked += f" (in {status.freshness_check_ms:.0f} ms)"
+        lines.append(checked)
         lines.append("")
 
         # Log file summaries
@@ -764,6 +1119,12 @@ class LogReviewAgent:
         self.config = config or LogReviewConfig()
         self.db_checker = DatabaseChecker(self.config)
         self.email_sender = EmailSender(self.config)
+        self.summary_index = LogSummaryIndex(keep_days=self.config.index_days)
+        self.scanner = LogScanner(
+            index=self.summary_index,
+            workers=self.config.scan_workers,
+            retention_hours=max(self.config.retention_hours, self.config.lookback_hours)
+        )
 
     def run_review(self) -> SystemStatus:
         """Run a full system review."""
@@ -782,6 +1143,7 @@ class LogReviewAgent:
 
         # Check database freshness
         status.data_freshness = self.db_checker.check_all_tables()
+        status.freshness_check_ms = self.db_checker.last_check_ms
         self.db_checker.close()
 
         # Calculate totals
@@ -796,7 +1158,7 @@ class LogReviewAgent:
         return status
 
     def _review_logs(self, since: datetime) -> List[LogSummary]:
-        """Review all configured log files."""
+        """Review all configured log files (incrementally, via the scanner)."""
         summaries = []
 
         if not LOG_DIR.exists():
@@ -804,13 +1166,20 @@ class LogReviewAgent:
             return summaries
 
         # Find matching log files
+        log_files = []
         for pattern in self.config.log_patterns:
             for log_file in LOG_DIR.glob(pattern):
                 # Only review recent files
-                if log_file.stat().st_mtime > since.timestamp():
-                    summary = LogParser.parse_file(log_file, since)
-                    summaries.append(summary)
-                    logger.info(f"Reviewed {log_file.name}: {len(summary.errors)} errors, {len(summary.warnings)} warnings")
+                if log_file not in log_files and log_file.stat().st_mtime > since.timestamp():
+                    log_files.append(log_file)
+
+        states = self.scanner.scan(log_files)
+        logger.info(f"Scanned {self.scanner.last_scan_bytes:,} new bytes across {len(log_files)} log files")
+
+        for log_file in log_files:
+            summary = LogScanner.summarize(log_file, states.get(str(log_file), {}), since)
+            summaries.append(summary)
+            logger.info(f"Reviewed {log_file.name}: {len(summary.errors)} errors, {len(summary.warnings)} warnings")
 
         return summaries
 
@@ -909,12 +1278,24 @@ def main():
     parser.add_argument('--preview', action='store_true', help="Preview report without sending email")
     parser.add_argument('--daemon', action='store_true', help="Run as scheduled daemon")
     parser.add_argument('--hours', type=int, default=24, help="Hours to look back (default: 24)")
+    parser.add_argument('--trend', type=int, metavar='DAYS', help="Print daily log counts for the last DAYS days and exit")
+    parser.add_argument('--full-rescan', action='store_true', help="Ignore saved offsets and re-read log files")
 
     args = parser.parse_args()
 
     config = LogReviewConfig(lookback_hours=args.hours)
     agent = LogReviewAgent(config)
 
+    if args.trend:
+        print(f"{'Date':<12}{'Files':>7}{'Lines':>10}{'Errors':>8}{'Warnings':>10}{'Successes':>11}")
+        for row in agent.summary_index.trend(args.trend):
+            print(f"{row['date']:<12}{row['files']:>7}{row['lines']:>10,}{row['errors']:>8}"
+                  f"{row['warnings']:>10}{row['successes']:>11}")
+        return
+
+    if args.full_rescan:
+        agent.scanner.force_rescan = True
+
     if args.daemon:
         run_daemon()
     else:
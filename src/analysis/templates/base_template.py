@@ -117,13 +117,17 @@ class BaseAnalysisTemplate(ABC):
                 logger.debug("KG node '%s' not found, skipping", key)
         return contexts
 
-    def build_prompt_context(self) -> Dict:
+    def build_prompt_context(self, kg_context: Optional[Dict] = None) -> Dict:
         """
         Main entry point: gather data, compute analysis, add KG context.
 
         Returns a combined dict suitable for passing to a prompt template's
         render() method.
 
+        Args:
+            kg_context: Enriched KG context already fetched for a superset of
+                kg_node_keys (e.g. shared across a batch); fetched here if None
+
         Raises:
             RuntimeError: If check_data_ready() returns False
         """
@@ -135,7 +139,10 @@ class BaseAnalysisTemplate(ABC):
 
         data = self.gather_data()
         analysis = self.compute_analysis(data)
-        kg_context = self.get_kg_context()
+        if kg_context is None:
+            kg_context = self.get_kg_context()
+        else:
+            kg_context = {key: kg_context[key] for key in self.kg_node_keys if key in kg_context}
 
         return {
             'template_id': self.template_id,
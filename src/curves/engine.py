@@ -14,6 +14,12 @@ For each spec in specs.CURVE_SPECS and each observation date in a trailing windo
      series_key == curve_key. The deferred curve_term_tieout trigger then proves
      SUM(term_value) == headline at COMMIT — the engine never bypasses or pre-empts it.
 
+Batched mode (the default) reads every parent mark and volume for the trailing window in one
+query per spec and writes each (curve, obs_date) transaction with two multi-row INSERTs
+(execute_values) instead of one INSERT per term/window. The transaction boundary, and so the
+tie-out, is unchanged. batched=False keeps the per-date/per-row path; compare both with
+scripts/bench_curve_engine.py.
+
 The headline is stored to price_mark rounded; term rows carry full precision. The trigger's
 epsilon GREATEST(0.01, |headline|*1e-4) absorbs the rounding, and nothing else — a real
 decomposition error still fails loud.
@@ -45,12 +51,54 @@ def contract_tenor_to_window(tenor: str) -> str | None:
     return f"{year:04d}-{month:02d}"
 
 
+def assemble_stacks(spec: ParityChainSpec, obs_date, marks) -> list:
+    """Marks -> term stacks, applying the tenor-parse and thin-volume guards.
+
+    marks: iterable of (tenor, value, source, quality_rank, volume).
+    Returns [(window_tenor, [(term_name, value, source, rank, note), ...]), ...].
+    """
+    stacks = []
+    for tenor, value, source, rank, volume in marks:
+        window = contract_tenor_to_window(tenor)
+        if window is None:
+            logger.warning("%s: unparseable contract tenor %s — skipped", spec.curve_key, tenor)
+            continue
+        if volume is None or volume < spec.min_volume:
+            logger.info("%s %s %s: volume %s below %s — tenor refused (thin guard)",
+                        spec.curve_key, obs_date, tenor, volume, spec.min_volume)
+            continue
+        terms = [(
+            "board", float(value) * spec.unit_factor, f"{source} {tenor}", rank,
+            spec.unit_note,
+        )]
+        terms += [(t.name, t.value, t.source, t.quality_rank, t.method_note)
+                  for t in spec.fixed_terms]
+        stacks.append((window, terms))
+    return stacks
+
+
+def stack_rows(spec: ParityChainSpec, obs_date, stacks) -> tuple[list, list]:
+    """Stacks -> (gold.curve_term rows, silver.price_mark headline rows) for a bulk write."""
+    term_values, headline_values = [], []
+    for window, terms in stacks:
+        headline = sum(v for _, v, _, _, _ in terms)
+        term_values += [(spec.curve_key, obs_date, window, name, value, source, rank, note)
+                        for name, value, source, rank, note in terms]
+        headline_values.append(
+            (spec.curve_key, obs_date, "WINDOW", window, round(headline, 4), spec.unit,
+             spec.currency, ENGINE_SOURCE, spec.quality_rank, spec.can_republish))
+    return term_values, headline_values
+
+
 class CurveEngine:
     COLLECTOR_NAME = "curve_builder"
 
-    def __init__(self, specs=None, window_dates: int = 10):
+    def __init__(self, specs=None, window_dates: int = 10, batched: bool = True):
         self.specs = specs if specs is not None else CURVE_SPECS
         self.window_dates = window_dates  # trailing obs_dates re-derived each run (revision heal)
+        # batched: one window read per spec + multi-row writes per (curve, obs_date) transaction.
+        # False keeps the original per-date read / per-row INSERT path (benchmark baseline).
+        self.batched = batched
 
     def collect(self, triggered_by: str | None = None):
         # Dispatcher runs pass NO triggered_by: collector_runner owns the
@@ -83,10 +131,19 @@ class CurveEngine:
         results = []
         with get_connection() as conn:
             for spec in self.specs:
-                for obs_date in self._parent_dates(conn, spec):
-                    res = self.build_curve(conn, spec, obs_date)
-                    if res:
-                        results.append(res)
+                obs_dates = self._parent_dates(conn, spec)
+                if self.batched:
+                    marks_by_date = self._window_marks(conn, spec, obs_dates)
+                    for obs_date in obs_dates:
+                        res = self._build_from_marks(conn, spec, obs_date,
+                                                     marks_by_date.get(obs_date, []))
+                        if res:
+                            results.append(res)
+                else:
+                    for obs_date in obs_dates:
+                        res = self.build_curve(conn, spec, obs_date)
+                        if res:
+                            results.append(res)
         return results
 
     def _parent_dates(self, conn, spec: ParityChainSpec):
@@ -100,6 +157,37 @@ class CurveEngine:
         rows = cur.fetchall()
         return sorted(r["obs_date"] if isinstance(r, dict) else r[0] for r in rows)
 
+    def _window_marks(self, conn, spec: ParityChainSpec, obs_dates) -> dict:
+        """All parent marks + volumes for the trailing window in ONE query.
+
+        Same rows as build_curve's per-date read: the per-mark correlated MAX(volume) subquery
+        becomes one grouped pass over silver.curve_snapshot for the whole window.
+        Returns {obs_date: [(tenor, value, source, quality_rank, volume), ...]} in tenor order.
+        """
+        if not obs_dates:
+            return {}
+        cur = conn.cursor()
+        cur.execute(
+            """SELECT pm.obs_date, pm.tenor, pm.value, pm.source, pm.quality_rank, v.volume
+               FROM gold.price_mark_best pm
+               LEFT JOIN (
+                   SELECT obs_date, contract, MAX(volume) AS volume
+                   FROM silver.curve_snapshot
+                   WHERE series_key = %s AND obs_date = ANY(%s)
+                   GROUP BY obs_date, contract
+               ) v ON v.obs_date = pm.obs_date AND v.contract = pm.tenor
+               WHERE pm.series_key = %s AND pm.obs_date = ANY(%s)
+                 AND pm.tenor_type = 'CONTRACT'
+               ORDER BY pm.obs_date, pm.tenor""",
+            (spec.parent_series, list(obs_dates), spec.parent_series, list(obs_dates)),
+        )
+        marks_by_date: dict = {}
+        for m in cur.fetchall():
+            row = ((m["obs_date"], m["tenor"], m["value"], m["source"], m["quality_rank"],
+                    m["volume"]) if isinstance(m, dict) else tuple(m))
+            marks_by_date.setdefault(row[0], []).append(row[1:])
+        return marks_by_date
+
     def build_curve(self, conn, spec: ParityChainSpec, obs_date) -> dict | None:
         """Build one (curve, obs_date) stack in one transaction. Returns build stats or None."""
         cur = conn.cursor()
@@ -116,43 +204,37 @@ class CurveEngine:
                ORDER BY pm.tenor""",
             (spec.parent_series, obs_date),
         )
-        marks = cur.fetchall()
-        if not marks:
-            return None
-
-        stacks = []  # (window_tenor, [(term_name, value, source, rank, note)])
-        for m in marks:
-            tenor, value, source, rank, volume = (
-                (m["tenor"], m["value"], m["source"], m["quality_rank"], m["volume"])
-                if isinstance(m, dict) else m)
-            window = contract_tenor_to_window(tenor)
-            if window is None:
-                logger.warning("%s: unparseable contract tenor %s — skipped", spec.curve_key, tenor)
-                continue
-            if volume is None or volume < spec.min_volume:
-                logger.info("%s %s %s: volume %s below %s — tenor refused (thin guard)",
-                            spec.curve_key, obs_date, tenor, volume, spec.min_volume)
-                continue
-            terms = [(
-                "board", float(value) * spec.unit_factor, f"{source} {tenor}", rank,
-                spec.unit_note,
-            )]
-            terms += [(t.name, t.value, t.source, t.quality_rank, t.method_note)
-                      for t in spec.fixed_terms]
-            stacks.append((window, terms))
+        marks = [(m["tenor"], m["value"], m["source"], m["quality_rank"], m["volume"])
+                 if isinstance(m, dict) else tuple(m) for m in cur.fetchall()]
+        return self._build_from_marks(conn, spec, obs_date, marks)
 
+    def _build_from_marks(self, conn, spec: ParityChainSpec, obs_date, marks) -> dict | None:
+        stacks = assemble_stacks(spec, obs_date, marks)
         if not stacks:
             return None
+        if self.batched:
+            term_rows = self._write_stacks_bulk(conn, spec, obs_date, stacks)
+        else:
+            term_rows = self._write_stacks(conn, spec, obs_date, stacks)
+        return {"curve_key": spec.curve_key, "obs_date": obs_date,
+                "tenors": len(stacks), "term_rows": term_rows}
+
+    @staticmethod
+    def _delete_previous(cur, spec: ParityChainSpec, obs_date):
+        cur.execute("DELETE FROM gold.curve_term WHERE curve_key = %s AND obs_date = %s",
+                    (spec.curve_key, obs_date))
+        cur.execute(
+            """DELETE FROM silver.price_mark
+               WHERE series_key = %s AND obs_date = %s AND source = %s""",
+            (spec.curve_key, obs_date, ENGINE_SOURCE))
 
+    def _write_stacks(self, conn, spec: ParityChainSpec, obs_date, stacks) -> int:
+        """Row-at-a-time write (original path)."""
         # One transaction: replace the engine's previous stack for this (curve, obs_date),
         # then let the deferred tie-out validate every touched group at COMMIT.
+        cur = conn.cursor()
         try:
-            cur.execute("DELETE FROM gold.curve_term WHERE curve_key = %s AND obs_date = %s",
-                        (spec.curve_key, obs_date))
-            cur.execute(
-                """DELETE FROM silver.price_mark
-                   WHERE series_key = %s AND obs_date = %s AND source = %s""",
-                (spec.curve_key, obs_date, ENGINE_SOURCE))
+            self._delete_previous(cur, spec, obs_date)
             term_rows = 0
             for window, terms in stacks:
                 headline = sum(v for _, v, _, _, _ in terms)
@@ -175,8 +257,41 @@ class CurveEngine:
         except Exception:
             conn.rollback()
             raise
-        return {"curve_key": spec.curve_key, "obs_date": obs_date,
-                "tenors": len(stacks), "term_rows": term_rows}
+        return term_rows
+
+    def _write_stacks_bulk(self, conn, spec: ParityChainSpec, obs_date, stacks) -> int:
+        """Set-based write: same transaction boundary, two multi-row INSERTs.
+
+        Still one transaction per (curve, obs_date) so the deferred curve_term_tieout trigger
+        validates exactly the groups it did before — at COMMIT, never bypassed.
+        """
+        from psycopg2.extras import execute_values
+
+        term_values, headline_values = stack_rows(spec, obs_date, stacks)
+        cur = conn.cursor()
+        try:
+            self._delete_previous(cur, spec, obs_date)
+            execute_values(
+                cur,
+                """INSERT INTO gold.curve_term
+                   (curve_key, obs_date, tenor, term_name, term_value,
+                    term_source, quality_rank, method_note)
+                   VALUES %s""",
+                term_values, page_size=1000,
+            )
+            execute_values(
+                cur,
+                """INSERT INTO silver.price_mark
+                   (series_key, obs_date, tenor_type, tenor, value, unit, currency,
+                    source, quality_rank, can_republish)
+                   VALUES %s""",
+                headline_values, page_size=1000,
+            )
+            conn.commit()  # deferred curve_term_tieout fires HERE
+        except Exception:
+            conn.rollback()
+            raise
+        return len(term_values)
 
     def _log_run(self, started, status, rows, data_period=None, error=None, triggered_by="manual"):
         try:
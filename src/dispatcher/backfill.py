@@ -13,17 +13,29 @@ Usage:
     python -m src.dispatcher backfill --since 7             # Last 7 days
     python -m src.dispatcher backfill --resume              # Resume interrupted
     python -m src.dispatcher backfill --dry-run             # Show plan only
+    python -m src.dispatcher backfill --workers 6           # Parallel backfill
+
+Parallel mode (--workers N > 1) runs independent collectors side by side,
+and splits annual chunks of the same collector across up to
+MAX_LANES_PER_SOURCE lanes. Collectors built on BaseCollector share one
+token bucket per source (rate_limit_per_minute), so the aggregate request
+rate never exceeds what a serial run would send. Collectors that don't go
+through BaseCollector's rate limiter keep a single lane and their
+chunk_delay pacing.
 """
 
 import json
 import logging
+import os
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from src.dispatcher.collector_registry import CollectorRegistry
 from src.dispatcher.collector_runner import CollectorRunner
@@ -32,6 +44,9 @@ logger = logging.getLogger(__name__)
 
 PROGRESS_FILE = Path(__file__).parent.parent.parent / "data" / "backfill_progress.json"
 
+# Parallel mode: max concurrent annual chunks of one rate-limited collector
+MAX_LANES_PER_SOURCE = 3
+
 
 # ---------------------------------------------------------------------------
 # Backfill Plan
@@ -171,10 +186,11 @@ EXCLUDED = {
 # ---------------------------------------------------------------------------
 
 class ProgressTracker:
-    """Tracks completed backfill task keys in a JSON file."""
+    """Tracks completed backfill task keys in a JSON file (thread-safe)."""
 
     def __init__(self, path: Path = PROGRESS_FILE):
         self.path = path
+        self._lock = threading.RLock()
         self.data: Dict[str, Any] = self._load()
 
     def _load(self) -> Dict:
@@ -186,24 +202,31 @@ class ProgressTracker:
         return {"completed": {}, "started_at": None}
 
     def save(self):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(self.data, indent=2, default=str))
+        # Write-then-rename so a crash mid-write never corrupts the file
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self.data, indent=2, default=str))
+            os.replace(tmp, self.path)
 
     def is_done(self, task_key: str) -> bool:
-        return task_key in self.data.get("completed", {})
+        with self._lock:
+            return task_key in self.data.get("completed", {})
 
     def mark_done(self, task_key: str, rows: int = 0):
-        if "completed" not in self.data:
-            self.data["completed"] = {}
-        self.data["completed"][task_key] = {
-            "finished_at": datetime.now().isoformat(),
-            "rows": rows,
-        }
-        self.save()
+        with self._lock:
+            if "completed" not in self.data:
+                self.data["completed"] = {}
+            self.data["completed"][task_key] = {
+                "finished_at": datetime.now().isoformat(),
+                "rows": rows,
+            }
+            self.save()
 
     def mark_started(self):
-        self.data["started_at"] = datetime.now().isoformat()
-        self.save()
+        with self._lock:
+            self.data["started_at"] = datetime.now().isoformat()
+            self.save()
 
     def get_summary(self) -> Dict:
         completed = self.data.get("completed", {})
@@ -388,10 +411,15 @@ class BackfillRunner:
         since_days: int = None,
         resume: bool = False,
         dry_run: bool = False,
+        workers: int = 1,
     ) -> Dict:
         """
         Execute the backfill plan.
 
+        Args:
+            workers: Worker threads. 1 (default) runs the plan strictly in
+                order; >1 runs independent collectors/chunks concurrently.
+
         Returns summary dict with counts of success/fail/skipped.
         """
         tasks = self.get_tasks(tiers=tiers, collectors=collectors, since_days=since_days)
@@ -417,6 +445,7 @@ class BackfillRunner:
                          'collectors': collectors,
                          'since_days': since_days,
                          'resume': resume,
+                         'workers': workers,
                      }),
                      3)
                 )
@@ -427,58 +456,14 @@ class BackfillRunner:
         results = {"success": 0, "failed": 0, "skipped": 0, "total_rows": 0}
         total = len(tasks)
 
-        print(f"\n=== Starting Backfill: {total} tasks ===\n")
-
-        for i, task in enumerate(tasks, 1):
-            if self._interrupted:
-                print(f"\nStopped at task {i}/{total}. Use --resume to continue.")
-                break
-
-            task_key = task['task_key']
-
-            # Skip completed tasks in resume mode
-            if resume and self.progress.is_done(task_key):
-                results["skipped"] += 1
-                continue
-
-            # Skip unregistered collectors
-            if not self.registry.is_registered(task['collector']):
-                logger.warning(f"Skipping unregistered: {task['collector']}")
-                results["skipped"] += 1
-                continue
+        mode = f", {workers} workers" if workers > 1 else ""
+        print(f"\n=== Starting Backfill: {total} tasks{mode} ===\n")
+        started = time.monotonic()
 
-            year_str = f" ({task['year']})" if task['year'] else ""
-            print(f"[{i}/{total}] {task['collector']}{year_str}...", end=" ", flush=True)
-
-            try:
-                result = self.runner.run_collector(
-                    task['collector'],
-                    triggered_by='backfill',
-                    **task['kwargs'],
-                )
-
-                if result.success:
-                    rows = result.rows_collected
-                    elapsed = (result.finished_at - result.started_at).total_seconds()
-                    print(f"OK ({rows} rows, {elapsed:.1f}s)")
-                    results["success"] += 1
-                    results["total_rows"] += rows
-                    self.progress.mark_done(task_key, rows)
-                else:
-                    print(f"FAILED: {result.error_message}")
-                    results["failed"] += 1
-                    # Don't mark as done — will retry on --resume
-
-            except Exception as e:
-                print(f"ERROR: {e}")
-                results["failed"] += 1
-                logger.error(f"Backfill task {task_key} exception: {e}", exc_info=True)
-
-            # Inter-chunk delay
-            if i < total and not self._interrupted:
-                delay = task['chunk_delay']
-                if delay > 0:
-                    time.sleep(delay)
+        if workers > 1:
+            self._run_parallel(tasks, resume, workers, results)
+        else:
+            self._run_serial(tasks, resume, results)
 
         # Final summary
         self.cleanup()
@@ -487,6 +472,7 @@ class BackfillRunner:
         print(f"  Failed:   {results['failed']}")
         print(f"  Skipped:  {results['skipped']}")
         print(f"  Rows:     {results['total_rows']:,}")
+        print(f"  Elapsed:  {time.monotonic() - started:.0f}s")
 
         # Log completion event
         try:
@@ -506,3 +492,179 @@ class BackfillRunner:
             logger.warning(f"Could not log backfill completion: {e}")
 
         return results
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _should_skip(self, task: Dict, resume: bool) -> bool:
+        """Completed (in resume mode) or unregistered tasks are skipped."""
+        if resume and self.progress.is_done(task['task_key']):
+            return True
+        if not self.registry.is_registered(task['collector']):
+            logger.warning(f"Skipping unregistered: {task['collector']}")
+            return True
+        return False
+
+    def _execute_task(self, task: Dict) -> Tuple[bool, int, str]:
+        """
+        Run one backfill task through CollectorRunner.
+
+        Returns (success, rows, message). Successful tasks are recorded in
+        the progress file; failures are left for --resume to retry.
+        """
+        task_key = task['task_key']
+        try:
+            result = self.runner.run_collector(
+                task['collector'],
+                triggered_by='backfill',
+                **task['kwargs'],
+            )
+
+            if result.success:
+                rows = result.rows_collected
+                elapsed = (result.finished_at - result.started_at).total_seconds()
+                self.progress.mark_done(task_key, rows)
+                return True, rows, f"OK ({rows} rows, {elapsed:.1f}s)"
+            # Don't mark as done — will retry on --resume
+            return False, 0, f"FAILED: {result.error_message}"
+
+        except Exception as e:
+            logger.error(f"Backfill task {task_key} exception: {e}", exc_info=True)
+            return False, 0, f"ERROR: {e}"
+
+    @staticmethod
+    def _record(results: Dict, ok: bool, rows: int):
+        if ok:
+            results["success"] += 1
+            results["total_rows"] += rows
+        else:
+            results["failed"] += 1
+
+    def _run_serial(self, tasks: List[Dict], resume: bool, results: Dict):
+        """Run tasks one at a time, sleeping chunk_delay between them."""
+        total = len(tasks)
+        for i, task in enumerate(tasks, 1):
+            if self._interrupted:
+                print(f"\nStopped at task {i}/{total}. Use --resume to continue.")
+                break
+
+            if self._should_skip(task, resume):
+                results["skipped"] += 1
+                continue
+
+            year_str = f" ({task['year']})" if task['year'] else ""
+            print(f"[{i}/{total}] {task['collector']}{year_str}...", end=" ", flush=True)
+
+            ok, rows, message = self._execute_task(task)
+            print(message)
+            self._record(results, ok, rows)
+
+            # Inter-chunk delay
+            if i < total and not self._interrupted:
+                delay = task['chunk_delay']
+                if delay > 0:
+                    time.sleep(delay)
+
+    def _shared_rate_limit(self, collector_name: str) -> Optional[Tuple[str, int]]:
+        """
+        (source_name, rate_limit_per_minute) if the collector paces its
+        requests through BaseCollector._respect_rate_limit, else None.
+        """
+        from src.agents.base.base_collector import BaseCollector
+
+        cls = self.registry.get_collector_class(collector_name)
+        if cls is None or not issubclass(cls, BaseCollector):
+            return None
+        collector = self.registry.get_collector(collector_name)
+        config = getattr(collector, 'config', None)
+        rate = getattr(config, 'rate_limit_per_minute', None)
+        if not rate:
+            return None
+        return config.source_name, rate
+
+    def _build_lanes(self, tasks: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """
+        Group tasks into lanes: each lane runs its tasks in order on one
+        worker. Rate-limited collectors get up to MAX_LANES_PER_SOURCE lanes
+        (chunks dealt round-robin) and a shared token bucket; everything else
+        gets one lane that keeps chunk_delay pacing.
+
+        Returns (lanes, installed limiter keys).
+        """
+        from src.utils.rate_limit import install_shared_limiter
+
+        by_collector: Dict[str, List[Dict]] = {}
+        for task in tasks:
+            by_collector.setdefault(task['collector'], []).append(task)
+
+        lanes = []
+        limiter_keys = []
+        for collector_name, chunk_tasks in by_collector.items():
+            limit = self._shared_rate_limit(collector_name) if len(chunk_tasks) > 1 else None
+            if limit is None:
+                lanes.append({'collector': collector_name, 'tasks': chunk_tasks, 'paced': True})
+                continue
+
+            source_name, rate = limit
+            install_shared_limiter(source_name, rate)
+            limiter_keys.append(source_name)
+            n_lanes = min(MAX_LANES_PER_SOURCE, len(chunk_tasks))
+            for k in range(n_lanes):
+                lanes.append({
+                    'collector': collector_name,
+                    'tasks': chunk_tasks[k::n_lanes],
+                    'paced': False,
+                })
+            logger.info(
+                f"{collector_name}: {n_lanes} lanes sharing {rate}/min ({source_name})"
+            )
+
+        return lanes, limiter_keys
+
+    def _run_parallel(self, tasks: List[Dict], resume: bool, workers: int, results: Dict):
+        """Run lanes concurrently on a thread pool (tier order is preserved
+        in submission order, so tier 1 lanes start first)."""
+        from src.utils.rate_limit import remove_shared_limiter
+
+        runnable = []
+        for task in tasks:
+            if self._should_skip(task, resume):
+                results["skipped"] += 1
+            else:
+                runnable.append(task)
+
+        total = len(runnable)
+        lanes, limiter_keys = self._build_lanes(runnable)
+        lock = threading.Lock()
+        counter = {'done': 0}
+
+        def run_lane(lane: Dict):
+            lane_tasks = lane['tasks']
+            for j, task in enumerate(lane_tasks):
+                if self._interrupted:
+                    return
+                ok, rows, message = self._execute_task(task)
+                year_str = f" ({task['year']})" if task['year'] else ""
+                with lock:
+                    counter['done'] += 1
+                    self._record(results, ok, rows)
+                    print(f"[{counter['done']}/{total}] {task['collector']}{year_str} {message}",
+                          flush=True)
+                if lane['paced'] and j < len(lane_tasks) - 1 and task['chunk_delay'] > 0:
+                    time.sleep(task['chunk_delay'])
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix='backfill') as executor:
+                futures = [executor.submit(run_lane, lane) for lane in lanes]
+                for future in as_completed(futures):
+                    exc = future.exception()
+                    if exc is not None:
+                        logger.error(f"Backfill lane crashed: {exc}", exc_info=exc)
+        finally:
+            for key in limiter_keys:
+                remove_shared_limiter(key)
+
+        if self._interrupted:
+            print(f"\nStopped after {counter['done']}/{total} tasks. Use --resume to continue.")
@@ -11,6 +11,7 @@ Usage:
     python -m src.dispatcher list           # List registered collectors
     python -m src.dispatcher schedule       # Show weekly schedule
     python -m src.dispatcher backfill       # Backfill historical data
+    python -m src.dispatcher backfill --workers 6   # ... in parallel
 """
 
 import argparse
@@ -220,6 +221,7 @@ def cmd_backfill(args):
         since_days=args.since,
         resume=args.resume,
         dry_run=args.dry_run,
+        workers=args.workers,
     )
 
 
@@ -270,6 +272,9 @@ def main():
                            help='Show plan without executing')
     bf_parser.add_argument('--delay', type=int, default=None,
                            help='Override inter-chunk delay (seconds)')
+    bf_parser.add_argument('--workers', type=int, default=1,
+                           help='Run independent collectors/chunks in parallel '
+                                '(default 1 = serial)')
 
     args = parser.parse_args()
 
@@ -11,7 +11,10 @@ Usage:
     collector.collect()
 """
 
+import dataclasses
 import logging
+import sys
+import typing
 from typing import Dict, Optional, Callable, Any, List
 
 logger = logging.getLogger(__name__)
@@ -248,6 +251,7 @@ COLLECTOR_MAP: Dict[str, Dict[str, str]] = {
     'usda_ams_cash_prices': {
         'module': 'src.agents.collectors.us.ams_cash_price_collector',
         'class': 'AMSCashPriceCollector',
+        'source_url': 'https://marsapi.ams.usda.gov/services/v1.2',  # config built at runtime; host for executor caps
     },
 
     # === South America — Tier 2 (newly wired) ===
@@ -322,16 +326,19 @@ COLLECTOR_MAP: Dict[str, Dict[str, str]] = {
     'gfs_forecast': {
         'module': 'src.agents.collectors.global.gfs_forecast_adapter',
         'class': 'GFSForecastCollector',
+        'source_url': 's3://noaa-gfs-bdp-pds',  # config built at runtime; host for executor caps
     },
 
     'gefs_ensemble': {
         'module': 'src.agents.collectors.global.gefs_ensemble_adapter',
         'class': 'GEFSEnsembleCollector',
+        'source_url': 's3://noaa-gefs-pds',  # config built at runtime; host for executor caps
     },
 
     'ndvi_charts': {
         'module': 'src.agents.collectors.global.ndvi_adapter',
         'class': 'NDVIChartCollector',
+        'source_url': 'https://ipad.fas.usda.gov',  # config built at runtime; host for executor caps
     },
 
     # === Tier 1 New Collectors ===
@@ -448,6 +455,22 @@ class CollectorRegistry:
             logger.error(f"Failed to instantiate collector '{name}': {e}")
             return None
 
+    def get_source_url(self, name: str) -> Optional[str]:
+        """
+        Upstream URL for a collector, read without instantiating it.
+
+        An explicit 'source_url' in COLLECTOR_MAP wins; otherwise this is the
+        source_url default of the config dataclass the collector's __init__
+        takes (e.g. CFTCCOTConfig.source_url for CFTCCOTCollector).
+        """
+        entry = COLLECTOR_MAP.get(name)
+        if entry is None:
+            return None
+        if entry.get('source_url'):
+            return entry['source_url']
+        cls = self.get_collector_class(name)
+        return _config_source_url(cls) if cls is not None else None
+
     def list_collectors(self) -> List[Dict[str, str]]:
         """List all registered collectors with their module/class info."""
         result = []
@@ -463,3 +486,30 @@ class CollectorRegistry:
     def is_registered(self, name: str) -> bool:
         """Check if a collector name is registered."""
         return name in COLLECTOR_MAP
+
+
+def _config_source_url(cls: type) -> Optional[str]:
+    """
+    source_url default of the collector's config dataclass: the one its
+    __init__ `config` parameter is annotated with, else the only config
+    dataclass defined in the collector's module (for collectors that build
+    their config inside __init__).
+    """
+    try:
+        hints = typing.get_type_hints(cls.__init__)
+    except Exception:
+        hints = getattr(cls.__init__, '__annotations__', {})
+    config_type = hints.get('config')
+    candidates = [c for c in typing.get_args(config_type) or (config_type,) if isinstance(c, type)]
+    if not candidates:
+        module = sys.modules.get(cls.__module__)
+        candidates = [obj for obj in vars(module).values()
+                      if isinstance(obj, type) and obj.__module__ == cls.__module__] if module else []
+
+    urls = set()
+    for candidate in candidates:
+        if dataclasses.is_dataclass(candidate):
+            for f in dataclasses.fields(candidate):
+                if f.name == 'source_url' and isinstance(f.default, str) and f.default:
+                    urls.add(f.default)
+    return urls.pop() if len(urls) == 1 else None
@@ -10,21 +10,26 @@ Workflow:
     2. Instantiate collector from registry
     3. Call collector.collect()
     4. Update collection_status (status='success'|'failed'|'partial')
-    5. Write event_log entry (for LLM briefing)
-    6. Return result
+    5. Advance core.table_watermark for the collector's tables (new data only)
+    6. Write event_log entry (for LLM briefing)
+    7. Return result
 """
 
 import logging
 import json
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List
 
 from src.dispatcher.collector_registry import CollectorRegistry
 
 logger = logging.getLogger(__name__)
 
+# Status-row writes are tiny; never let a locked row stall a collector run.
+STATUS_WRITE_TIMEOUT_MS = 30000
+
 
 @dataclass
 class CollectorRunResult:
@@ -57,11 +62,17 @@ class CollectorRunner:
 
     def __init__(self, registry: CollectorRegistry = None):
         self.registry = registry or CollectorRegistry()
+        # Set by stop(); retry back-off waits on it so shutdown never does
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Abandon pending retries: back-off waits return and no new attempt starts."""
+        self._stop.set()
 
-    def _get_connection(self):
-        """Get database connection via db_config."""
+    def _get_connection(self, statement_timeout_ms: int = None):
+        """Get a pooled database connection via db_config."""
         from src.services.database.db_config import get_connection
-        return get_connection()
+        return get_connection(statement_timeout_ms=statement_timeout_ms)
 
     def _insert_status_running(self, conn, collector_name: str,
                                 triggered_by: str, commodities: List[str] = None) -> int:
@@ -110,6 +121,22 @@ class CollectorRunner:
         )
         conn.commit()
 
+    def _advance_watermarks(self, conn, collector_name: str, rows_collected: int) -> int:
+        """Mark the collector's tables in core.table_watermark as written now.
+
+        The log review freshness check reads these instead of scanning
+        MAX(ts) on every monitored table. Returns the number of tables advanced."""
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE core.table_watermark SET
+                last_write_at = NOW(),
+                last_rows = %s,
+                updated_at = NOW()
+            WHERE collector_name = %s
+        """, (rows_collected, collector_name))
+        conn.commit()
+        return cursor.rowcount
+
     def _normalize_dict_result(self, collector_name: str, d: Dict[str, Any]):
         """Adapt a legacy dict return from collect() to the CollectorResult contract.
 
@@ -171,7 +198,7 @@ class CollectorRunner:
         # Step 1: Record the run as 'running' in the database
         status_id = None
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(STATUS_WRITE_TIMEOUT_MS) as conn:
                 status_id = self._insert_status_running(
                     conn, collector_name, triggered_by, commodities
                 )
@@ -251,7 +278,7 @@ class CollectorRunner:
             finalize_delays = {1: 60, 2: 120, 3: 300}
             for attempt in (1, 2, 3, 4):
                 try:
-                    with self._get_connection() as conn:
+                    with self._get_connection(STATUS_WRITE_TIMEOUT_MS) as conn:
                         self._update_status_result(
                             conn, status_id,
                             run_result.status,
@@ -271,7 +298,16 @@ class CollectorRunner:
                     if attempt in finalize_delays:
                         time.sleep(finalize_delays[attempt])
 
-        # Step 5: Log event for LLM briefing
+        # Step 5: Advance table watermarks (best-effort; the table may not exist
+        # before migration 178, and a failure must not touch the event write)
+        if run_result.success and run_result.is_new_data:
+            try:
+                with self._get_connection(STATUS_WRITE_TIMEOUT_MS) as conn:
+                    self._advance_watermarks(conn, collector_name, run_result.rows_collected)
+            except Exception as e:
+                logger.debug(f"Watermark update skipped for {collector_name}: {e}")
+
+        # Step 6: Log event for LLM briefing
         if status_id:
             try:
                 with self._get_connection() as conn:
@@ -438,6 +474,7 @@ class CollectorRunner:
         retry_delay_minutes: int = 15,
         triggered_by: str = 'scheduler',
         commodities: List[str] = None,
+        run_fn: Callable[..., CollectorRunResult] = None,
         **collector_kwargs
     ) -> CollectorRunResult:
         """
@@ -449,15 +486,19 @@ class CollectorRunner:
             retry_delay_minutes: Delay between retries
             triggered_by: Who triggered this run
             commodities: Commodity list override
+            run_fn: Runs one attempt (run_collector's signature); defaults
+                to self.run_collector
             **collector_kwargs: Passed to collector
 
         Returns:
-            CollectorRunResult from the last attempt
+            CollectorRunResult from the last attempt (retries stop early
+            once stop() is called)
         """
+        run_fn = run_fn or self.run_collector
         for attempt in range(1, max_retries + 1):
             logger.info(f"Running {collector_name} (attempt {attempt}/{max_retries})")
 
-            result = self.run_collector(
+            result = run_fn(
                 collector_name,
                 triggered_by=triggered_by,
                 commodities=commodities,
@@ -472,6 +513,8 @@ class CollectorRunner:
                 logger.info(
                     f"{collector_name} failed, retrying in {retry_delay_minutes} minutes..."
                 )
-                time.sleep(delay)
+                if self._stop.wait(delay):
+                    logger.info(f"{collector_name}: shutting down, remaining retries skipped")
+                    break
 
         return result
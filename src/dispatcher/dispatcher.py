@@ -10,6 +10,10 @@ Usage:
     dispatcher.stop()        # Graceful shutdown
     dispatcher.run_collector('cftc_cot')   # Manual run
     dispatcher.run_todays_collectors()      # Run all scheduled for today
+
+Collector runs are executed by a CollectorExecutor (see executor.py):
+APScheduler jobs only enqueue, so collectors due at the same time run
+concurrently with price feeds in a priority lane and per-host caps.
 """
 
 import json
@@ -31,6 +35,7 @@ from src.schedulers.master_scheduler import (
 )
 from src.dispatcher.collector_registry import CollectorRegistry
 from src.dispatcher.collector_runner import CollectorRunner, CollectorRunResult
+from src.dispatcher.executor import CollectorExecutor, ExecutorConfig
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +61,7 @@ class Dispatcher:
     APScheduler jobs to fire collector_runner at the right times.
     """
 
-    def __init__(self):
+    def __init__(self, executor_config: ExecutorConfig = None):
         self.scheduler = BackgroundScheduler(
             timezone='America/New_York',
             job_defaults={
@@ -67,9 +72,17 @@ class Dispatcher:
         )
         self.registry = CollectorRegistry()
         self.runner = CollectorRunner(self.registry)
+        self.executor_config = executor_config or ExecutorConfig.from_env()
+        self.executor: Optional[CollectorExecutor] = None
         self.report_scheduler = ReportScheduler()
         self._running = False
 
+    def _get_executor(self) -> CollectorExecutor:
+        """Create the execution engine on first use."""
+        if self.executor is None:
+            self.executor = CollectorExecutor(self.runner, self.executor_config)
+        return self.executor
+
     def start(self):
         """Start the dispatcher daemon."""
         if self._running:
@@ -77,6 +90,7 @@ class Dispatcher:
             return
 
         logger.info("Starting RLC-Agent Dispatcher Daemon...")
+        self._get_executor()
         self._register_all_jobs()
         self.scheduler.start()
         self._running = True
@@ -110,8 +124,13 @@ class Dispatcher:
 
         logger.info("Stopping dispatcher...")
         self.scheduler.shutdown(wait=True)
+        if self.executor is not None:
+            # Drop queued runs and retry back-offs; only in-flight attempts finish
+            self.executor.shutdown(wait=True, cancel_pending=True)
         self._running = False
         HEARTBEAT_FILE.unlink(missing_ok=True)
+        from src.services.database.db_config import close_pool
+        close_pool()
         logger.info("Dispatcher stopped")
 
     def _register_all_jobs(self):
@@ -181,18 +200,20 @@ class Dispatcher:
         )
         logger.debug("Registered failure alert check every 2h (Mon-Fri)")
 
-        # Register heartbeat every 60 minutes so the watchdog can detect a zombie
+        # Register heartbeat every 5 minutes so the watchdog can detect a zombie
+        # and the executor/pool metrics are fresh during release bursts
         self.scheduler.add_job(
             func=self._write_heartbeat,
-            trigger=IntervalTrigger(minutes=60),
+            trigger=IntervalTrigger(minutes=5),
             id='_heartbeat',
             name='Dispatcher Heartbeat',
             replace_existing=True,
         )
-        logger.debug("Registered heartbeat (every 60 min)")
+        logger.debug("Registered heartbeat (every 5 min)")
 
     def _write_heartbeat(self):
         """Write a heartbeat timestamp so the watchdog can detect a zombie dispatcher."""
+        from src.services.database.db_config import get_pool_stats
         try:
             jobs = self.scheduler.get_jobs()
             payload = {
@@ -200,6 +221,8 @@ class Dispatcher:
                 'pid': os.getpid(),
                 'job_count': len(jobs),
                 'running': self._running,
+                'executor': self.executor.stats() if self.executor else None,
+                'db_pool': get_pool_stats(),
             }
             HEARTBEAT_FILE.write_text(json.dumps(payload))
         except Exception as e:
@@ -498,7 +521,7 @@ class Dispatcher:
         retry_delay_minutes: int = 15,
         commodities: List[str] = None,
     ):
-        """Called by APScheduler — runs a collector with retry.
+        """Called by APScheduler — queues a collector run on the executor.
 
         For collectors with exact release_dates, verify today is actually
         a release day (the CronTrigger fires on all possible days in the
@@ -518,8 +541,9 @@ class Dispatcher:
                 return
 
         logger.info(f"Scheduler firing: {schedule_key}")
-        self.runner.run_with_retry(
-            collector_name=schedule_key,
+        self._get_executor().submit(
+            schedule_key,
+            priority=schedule.priority if schedule else 5,
             max_retries=max_retries,
             retry_delay_minutes=retry_delay_minutes,
             triggered_by='scheduler',
@@ -543,11 +567,15 @@ class Dispatcher:
         """
         Run all collectors scheduled for today, immediately.
 
+        Runs go through the executor, so independent collectors run
+        concurrently; results come back in schedule order.
+
         Returns:
             List of CollectorRunResult for each collector run
         """
         scheduled = self.report_scheduler.get_todays_collections()
         results = []
+        futures = []
 
         if not scheduled:
             logger.info("No collectors scheduled for today")
@@ -571,14 +599,20 @@ class Dispatcher:
                 logger.debug(f"Skipping unregistered: {schedule_key}")
                 continue
 
-            result = self.runner.run_with_retry(
-                collector_name=schedule_key,
+            futures.append(self._get_executor().submit(
+                schedule_key,
+                priority=schedule.priority,
                 max_retries=schedule.retry_attempts,
                 retry_delay_minutes=schedule.retry_delay_minutes,
                 triggered_by='manual',
                 commodities=schedule.commodities,
-            )
-            results.append(result)
+            ))
+
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Collector run failed in executor: {e}")
 
         successes = sum(1 for r in results if r.success)
         logger.info(f"Today's collection complete: {successes}/{len(results)} succeeded")
@@ -587,6 +621,7 @@ class Dispatcher:
 
     def get_status(self) -> Dict[str, Any]:
         """Get dispatcher status including all job states."""
+        from src.services.database.db_config import get_pool_stats
         jobs = self.scheduler.get_jobs() if self._running else []
 
         job_info = []
@@ -603,6 +638,8 @@ class Dispatcher:
             'job_count': len(jobs),
             'jobs': job_info,
             'registered_collectors': len(self.registry.list_collectors()),
+            'executor': self.executor.stats() if self.executor else None,
+            'db_pool': get_pool_stats(),
         }
 
     def get_schedule_summary(self) -> str:
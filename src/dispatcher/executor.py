@@ -0,0 +1,336 @@
+"""
+Collector Executor
+
+Execution engine behind the Dispatcher. APScheduler jobs and
+run_todays_collectors() hand collector runs to a CollectorExecutor instead
+of running them inline, so a dozen collectors due at the same minute
+(WASDE / Crop Progress days) run side by side rather than queueing behind
+the slowest PDF parser.
+
+Scheduling rules:
+    - Priority lanes: price feeds (PRICE_LANE) always sort ahead of
+      everything else, and `price_workers` threads are reserved for them,
+      so a settlement feed never waits behind a monthly load.
+    - Within a lane, lower CollectorSchedule.priority runs first, then FIFO.
+    - Per-source-host caps: at most `host_limit` runs against the same
+      upstream host at once (hosts from the collector's config.source_url).
+    - A collector already queued or running is not queued again (mirrors
+      APScheduler's max_instances=1 now that jobs return immediately).
+
+Modes:
+    thread  - runs CollectorRunner.run_with_retry on the worker thread
+    process - the retry loop stays on the worker thread but each attempt
+              runs in a ProcessPoolExecutor, so CPU-bound parsers don't
+              contend for the GIL
+
+shutdown(cancel_pending=True) drops queued runs and stops the runner, so
+runs in retry back-off return instead of holding shutdown for up to the
+full retry delay.
+
+Configuration (env):
+    RLC_DISPATCH_MODE           thread | process        (default thread)
+    RLC_DISPATCH_WORKERS        total worker threads    (default 6)
+    RLC_DISPATCH_PRICE_WORKERS  reserved for price lane (default 2)
+    RLC_DISPATCH_HOST_LIMIT     max in-flight per host  (default 2)
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.dispatcher.collector_registry import CollectorRegistry
+from src.dispatcher.collector_runner import CollectorRunner, CollectorRunResult
+
+logger = logging.getLogger(__name__)
+
+LANE_PRICE = 'price'
+LANE_DEFAULT = 'default'
+LANE_RANK = {LANE_PRICE: 0, LANE_DEFAULT: 1}
+
+# Price feeds: settlement/curve data the desk needs minutes after the close.
+PRICE_LANE = {
+    'ams_grain_settlement',
+    'ams_dco_prices',
+    'cme_settlements',
+    'curve_builder',
+    'ecb_fx',
+    'eia_crude_price_bridge',
+    'eia_v2_crude',
+    'fred_fx',
+    'futures_overnight',
+    'futures_price_mark_bridge',
+    'futures_settlement',
+    'futures_us_session',
+    'usda_ams_cash_prices',
+    'yfinance_futures',
+}
+
+
+@dataclass
+class ExecutorConfig:
+    """Execution engine settings for the Dispatcher."""
+    mode: str = 'thread'              # 'thread' or 'process'
+    max_workers: int = 6
+    price_workers: int = 2            # subset of max_workers reserved for LANE_PRICE
+    host_limit: int = 2               # max concurrent runs per upstream host
+    host_limits: Dict[str, int] = field(default_factory=dict)  # per-host overrides
+
+    def __post_init__(self):
+        if self.mode not in ('thread', 'process'):
+            raise ValueError(f"mode must be 'thread' or 'process', got {self.mode!r}")
+        self.max_workers = max(1, self.max_workers)
+        self.price_workers = max(0, min(self.price_workers, self.max_workers - 1))
+
+    @classmethod
+    def from_env(cls) -> 'ExecutorConfig':
+        return cls(
+            mode=os.environ.get('RLC_DISPATCH_MODE', 'thread'),
+            max_workers=int(os.environ.get('RLC_DISPATCH_WORKERS', '6')),
+            price_workers=int(os.environ.get('RLC_DISPATCH_PRICE_WORKERS', '2')),
+            host_limit=int(os.environ.get('RLC_DISPATCH_HOST_LIMIT', '2')),
+        )
+
+
+@dataclass
+class _Job:
+    collector_name: str
+    lane: str
+    priority: int
+    host: str
+    kwargs: Dict[str, Any]
+    future: Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _run_in_subprocess(collector_name: str, kwargs: Dict[str, Any]) -> CollectorRunResult:
+    """ProcessPoolExecutor entry point for one attempt (module-level so it pickles)."""
+    return CollectorRunner(CollectorRegistry()).run_collector(collector_name, **kwargs)
+
+
+class CollectorExecutor:
+    """
+    Thread-pool scheduler for collector runs with priority lanes and
+    per-host concurrency caps.
+
+    Usage:
+        executor = CollectorExecutor(runner)
+        future = executor.submit('cftc_cot', priority=2, triggered_by='scheduler')
+        result = future.result()       # CollectorRunResult
+        executor.stats()               # queue depth, waits, in-flight per host
+        executor.shutdown()
+    """
+
+    def __init__(self, runner: CollectorRunner, config: ExecutorConfig = None):
+        self.runner = runner
+        self.config = config or ExecutorConfig.from_env()
+
+        self._cond = threading.Condition()
+        self._queue: List = []                  # heap of (lane_rank, priority, seq, job)
+        self._seq = itertools.count()
+        self._active: Dict[str, _Job] = {}      # collector_name -> queued/running job
+        self._host_inflight: Dict[str, int] = {}
+        self._hosts: Dict[str, str] = {}
+        self._running = 0
+        self._shutdown = False
+
+        # Metrics
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._deduplicated = 0
+        self._waits = {LANE_PRICE: deque(maxlen=500), LANE_DEFAULT: deque(maxlen=500)}
+        self._max_queue_depth = 0
+
+        self._process_pool = None
+        if self.config.mode == 'process':
+            self._process_pool = ProcessPoolExecutor(max_workers=self.config.max_workers)
+
+        self._threads = []
+        for i in range(self.config.max_workers):
+            price_only = i < self.config.price_workers
+            t = threading.Thread(
+                target=self._worker,
+                args=(price_only,),
+                name=f"collector-{'price' if price_only else 'worker'}-{i}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def lane_for(collector_name: str) -> str:
+        return LANE_PRICE if collector_name in PRICE_LANE else LANE_DEFAULT
+
+    def submit(self, collector_name: str, priority: int = 5, **run_kwargs) -> Future:
+        """
+        Queue a collector run (kwargs go to CollectorRunner.run_with_retry).
+
+        Returns a Future resolving to CollectorRunResult. If the collector
+        is already queued or running, returns that run's Future instead.
+        """
+        host = self._host_for(collector_name)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Executor is shut down")
+            existing = self._active.get(collector_name)
+            if existing is not None:
+                self._deduplicated += 1
+                logger.info(f"{collector_name} already queued/running — not queued again")
+                return existing.future
+
+            lane = self.lane_for(collector_name)
+            job = _Job(collector_name, lane, priority, host, run_kwargs, Future())
+            self._active[collector_name] = job
+            heapq.heappush(self._queue, (LANE_RANK[lane], priority, next(self._seq), job))
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify_all()
+            return job.future
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop accepting work; optionally wait for queued/running jobs.
+
+        cancel_pending also cancels queued runs and stops the runner's
+        retries, so waiting only covers attempts already in progress.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_pending:
+                while self._queue:
+                    _, _, _, job = heapq.heappop(self._queue)
+                    self._active.pop(job.collector_name, None)
+                    job.future.cancel()
+            self._cond.notify_all()
+        if cancel_pending:
+            self.runner.stop()
+        if wait:
+            for t in self._threads:
+                t.join()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-depth and wait-time metrics (JSON-serializable)."""
+        with self._cond:
+            depth = {LANE_PRICE: 0, LANE_DEFAULT: 0}
+            for _, _, _, job in self._queue:
+                depth[job.lane] += 1
+            waits = {}
+            for lane, samples in self._waits.items():
+                ordered = sorted(samples)
+                waits[lane] = {
+                    'avg_s': round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+                    'p95_s': round(ordered[int(0.95 * (len(ordered) - 1))], 2) if ordered else 0.0,
+                    'max_s': round(ordered[-1], 2) if ordered else 0.0,
+                }
+            return {
+                'mode': self.config.mode,
+                'workers': self.config.max_workers,
+                'price_workers': self.config.price_workers,
+                'running': self._running,
+                'queue_depth': depth,
+                'max_queue_depth': self._max_queue_depth,
+                'queue_wait': waits,
+                'host_inflight': {h: n for h, n in self._host_inflight.items() if n},
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'deduplicated': self._deduplicated,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _host_for(self, collector_name: str) -> str:
+        """Upstream host for per-host caps (falls back to the collector name)."""
+        if collector_name not in self._hosts:
+            host = None
+            try:
+                url = self.runner.registry.get_source_url(collector_name)
+                host = urlparse(url).hostname if url else None
+            except Exception as e:
+                logger.debug(f"Could not resolve host for {collector_name}: {e}")
+            self._hosts[collector_name] = host or collector_name
+        return self._hosts[collector_name]
+
+    def _host_limit(self, host: str) -> int:
+        return self.config.host_limits.get(host, self.config.host_limit)
+
+    def _next_job(self, price_only: bool) -> Optional[_Job]:
+        """Pop the best runnable job (called with the lock held)."""
+        deferred = []
+        chosen = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            job = entry[3]
+            if price_only and job.lane != LANE_PRICE:
+                deferred.append(entry)
+                break   # heap order: nothing later is in the price lane
+            if self._host_inflight.get(job.host, 0) >= self._host_limit(job.host):
+                deferred.append(entry)
+                continue
+            chosen = job
+            break
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        return chosen
+
+    def _worker(self, price_only: bool):
+        while True:
+            with self._cond:
+                job = None
+                while True:
+                    job = self._next_job(price_only)
+                    if job is not None or (self._shutdown and not self._queue):
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                self._running += 1
+                self._host_inflight[job.host] = self._host_inflight.get(job.host, 0) + 1
+                self._waits[job.lane].append(time.monotonic() - job.enqueued_at)
+
+            if not job.future.set_running_or_notify_cancel():
+                self._finish(job, failed=False)
+                continue
+
+            try:
+                if self._process_pool is not None:
+                    result = self.runner.run_with_retry(
+                        job.collector_name, run_fn=self._run_attempt_in_process, **job.kwargs
+                    )
+                else:
+                    result = self.runner.run_with_retry(job.collector_name, **job.kwargs)
+                job.future.set_result(result)
+                self._finish(job, failed=not getattr(result, 'success', False))
+            except BaseException as e:
+                logger.error(f"Executor run of {job.collector_name} raised: {e}", exc_info=True)
+                job.future.set_exception(e)
+                self._finish(job, failed=True)
+
+    def _run_attempt_in_process(self, collector_name: str, **kwargs) -> CollectorRunResult:
+        return self._process_pool.submit(_run_in_subprocess, collector_name, kwargs).result()
+
+    def _finish(self, job: _Job, failed: bool):
+        with self._cond:
+            self._running -= 1
+            self._host_inflight[job.host] -= 1
+            self._active.pop(job.collector_name, None)
+            self._completed += 1
+            if failed:
+                self._failed += 1
+            self._cond.notify_all()
@@ -15,22 +15,36 @@ manager thinks:
 The engine runs month-by-month, tracking cumulative supply consumption
 so that early-allocated plants reduce availability for later ones.
 
+Months carry no allocation state into each other, so multi-month,
+multi-scenario sweeps run in batch mode: facility, supply, price, tallow
+and forecast panels are loaded once for the whole range, every
+(month, scenario) pair is allocated on a process pool, and all results
+land in gold.feedstock_allocation in one bulk insert.
+
 Usage:
     python -m src.engines.feedstock_allocation.allocator --period 2025-01
     python -m src.engines.feedstock_allocation.allocator --range 2024-01 2024-12
     python -m src.engines.feedstock_allocation.allocator --period 2025-01 --scenario high_sbo
+    python -m src.engines.feedstock_allocation.allocator --range 2022-01 2024-12 --batch \
+        --scenario base high_sbo --scenario-file scenarios.json
 """
 
 import argparse
+import copy
+import json
 import logging
+import os
 import sys
 import uuid
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
@@ -50,6 +64,76 @@ from src.engines.feedstock_allocation.margin_model import (
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 
+ALLOCATION_WORKERS = int(os.environ.get('RLC_ALLOCATION_WORKERS', os.cpu_count() or 1))
+
+# Price series tried, in order, for each feedstock's as-of price
+PRICE_REGION_PRIORITY = {
+    'SBO': ['central_il', 'central_il_rbd', 'central_il_rbd_wk', 'us_gulf', 'cbot_futures'],
+    'CO': ['central_us', 'canada_cnf', 'los_angeles', 'canada_cnf_raw'],
+    'DCO': ['il_wi', 'west_coast'],
+    'EBFT': ['chicago', 'west_coast'],       # Edible = packer/BFT grade
+    'IBFT': ['chicago', 'central_us'],       # Inedible = renderer grade
+    'BFT': ['chicago', 'west_coast'],        # Legacy fallback
+    'CWG': ['missouri_river', 'west_coast'],
+    'PF': ['southeast', 'west_coast'],
+    'YG': ['il_wi', 'los_angeles'],
+    'UCO': ['il_wi', 'socal'],
+}
+
+# EIA tallow guardrail sources, newest format first
+EIA_TALLOW_SHEETS = [
+    ('table_2b', 'table_2c'),  # Form 819 (2022+)
+    ('old_table3',),           # EIA old biodiesel report (2012-2021)
+    ('usda_fo',),              # USDA F&O methyl esters (2006-2011)
+]
+
+ALLOCATION_COLUMNS = (
+    'period', 'run_id', 'scenario', 'facility_id', 'fuel_type',
+    'feedstock_code', 'allocated_mil_lbs', 'allocated_mil_gal',
+    'pct_of_facility', 'feedstock_cost_lb', 'margin_per_gal',
+    'margin_rank', 'constraint_binding',
+)
+TALLOW_IV_COLUMNS = (
+    'period', 'grade_code', 'pathway', 'fuel_type',
+    'fuel_price_per_gal', 'rin_value_per_gal',
+    'lcfs_value_per_gal', 'btc_45z_per_gal',
+    'state_credit_per_gal', 'total_revenue_per_gal',
+    'processing_cost_per_gal', 'lbs_per_gal',
+    'implied_value_per_lb', 'market_price_per_lb',
+    'margin_spread_per_lb', 'pull_flag',
+    'ci_score_used', 'run_id',
+)
+TALLOW_DETAIL_COLUMNS = (
+    'period', 'run_id', 'eia_total_tallow_mil_lbs',
+    'grade_code', 'allocated_mil_lbs', 'allocated_pct',
+    'best_pathway', 'implied_value_per_lb',
+    'market_price_per_lb', 'margin_spread_per_lb',
+    'allocation_method', 'constraint_notes',
+)
+
+
+def month_range(start: date, end: date) -> List[date]:
+    """First-of-month dates from start's month through end's month."""
+    periods = []
+    current = start.replace(day=1)
+    while current <= end:
+        periods.append(current)
+        if current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+    return periods
+
+
+def _as_of(dates: list, values: list, d: date):
+    """Latest value dated on/before d from parallel ascending lists, else None."""
+    i = bisect_right(dates, d)
+    return values[i - 1] if i else None
+
+
+def _insert_sql(table: str, columns: tuple, values: str) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}"
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION — Behavioral parameters (tunable during calibration)
@@ -137,6 +221,17 @@ class AllocationResult:
     constraint_binding: str    # 'none', 'supply', 'pathway', 'diversification', 'switching_cost'
 
 
+@dataclass
+class MonthInputs:
+    """Everything one month's allocation reads from the database."""
+    period: date
+    facilities: list
+    supply: dict               # {(feedstock_code, padd): RegionalSupply}
+    prices: dict
+    forecasts: dict = field(default_factory=dict)
+    tallow_guardrail: Optional[float] = None   # RLC biofuel tallow, else EIA; None = no data
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # THE ALLOCATOR
 # ═══════════════════════════════════════════════════════════════════════════
@@ -154,8 +249,9 @@ class FeedstockAllocator:
     6. Write results to gold.feedstock_allocation
     """
 
-    def __init__(self, config: AllocationConfig = None):
+    def __init__(self, config: AllocationConfig = None, indexed: bool = False):
         self.config = config or AllocationConfig()
+        self.indexed = indexed
         self.margin_calc = MarginCalculator()
         self.credit_resolver = CreditResolver()
 
@@ -186,36 +282,37 @@ class FeedstockAllocator:
                     ORDER BY h.nameplate_mmgy DESC
                 """, (period,))
                 for row in cur.fetchall():
-                    yr = row['year_online']
-
-                    # Expand BFT → EBFT/IBFT in eligible feedstocks
-                    eligible = list(row['eligible_feedstocks'] or [])
-                    if 'BFT' in eligible:
-                        if 'EBFT' not in eligible:
-                            eligible.append('EBFT')
-                        if 'IBFT' not in eligible:
-                            eligible.append('IBFT')
-
-                    f = Facility(
-                        facility_id=row['facility_id'],
-                        company=row['company'],
-                        facility_name=row['facility_name'],
-                        state=row['state'] or '',
-                        padd=row['padd'] or 'PADD2',
-                        fuel_type=row['fuel_type'],
-                        technology=row['technology'] or self._infer_technology(row['fuel_type']),
-                        nameplate_mmgy=float(row['nameplate_mmgy']),
-                        status=row['status'],
-                        year_online=yr,
-                        eligible_feedstocks=eligible,
-                        primary_feedstock=row['primary_feedstock'],
-                        feedstock_mix=row['feedstock_mix'],
-                    )
-                    facilities.append(f)
+                    facilities.append(self._facility_from_row(row))
 
         logger.info(f"  Loaded {len(facilities)} active facilities for {period}")
         return facilities
 
+    def _facility_from_row(self, row) -> Facility:
+        """Build a Facility from a facility row joined to its as-of capacity state."""
+        # Expand BFT → EBFT/IBFT in eligible feedstocks
+        eligible = list(row['eligible_feedstocks'] or [])
+        if 'BFT' in eligible:
+            if 'EBFT' not in eligible:
+                eligible.append('EBFT')
+            if 'IBFT' not in eligible:
+                eligible.append('IBFT')
+
+        return Facility(
+            facility_id=row['facility_id'],
+            company=row['company'],
+            facility_name=row['facility_name'],
+            state=row['state'] or '',
+            padd=row['padd'] or 'PADD2',
+            fuel_type=row['fuel_type'],
+            technology=row['technology'] or self._infer_technology(row['fuel_type']),
+            nameplate_mmgy=float(row['nameplate_mmgy']),
+            status=row['status'],
+            year_online=row['year_online'],
+            eligible_feedstocks=eligible,
+            primary_feedstock=row['primary_feedstock'],
+            feedstock_mix=row['feedstock_mix'],
+        )
+
     def _infer_technology(self, fuel_type: str) -> str:
         """Infer technology from fuel type if not specified."""
         return {
@@ -284,7 +381,7 @@ class FeedstockAllocator:
                         WHERE period = %s AND production_mmgal IS NOT NULL
                     """, (period,))
                     for row in cur.fetchall():
-                        forecasts[row[0]] = float(row[1])
+                        forecasts[row['fuel_type']] = float(row['production_mmgal'])
         except Exception as e:
             logger.debug(f"  No production forecasts available: {e}")
 
@@ -350,14 +447,7 @@ class FeedstockAllocator:
                 rows = cur.fetchall()
 
                 if rows:
-                    for row in rows:
-                        key = (row['feedstock_code'], row['region'])
-                        supply[key] = RegionalSupply(
-                            feedstock_code=row['feedstock_code'],
-                            region=row['region'],
-                            available_mil_lbs=float(row['net_available_biofuel'] or 0),
-                            price_per_lb=float(row['avg_price_per_lb'] or 0),
-                        )
+                    supply = self._supply_from_rows(rows)
                     logger.info(f"  Loaded {len(supply)} supply records from database")
                     return supply
 
@@ -366,6 +456,19 @@ class FeedstockAllocator:
         supply = self._estimate_supply(period)
         return supply
 
+    def _supply_from_rows(self, rows) -> dict:
+        """Index silver.feedstock_supply rows by (feedstock_code, region)."""
+        supply = {}
+        for row in rows:
+            key = (row['feedstock_code'], row['region'])
+            supply[key] = RegionalSupply(
+                feedstock_code=row['feedstock_code'],
+                region=row['region'],
+                available_mil_lbs=float(row['net_available_biofuel'] or 0),
+                price_per_lb=float(row['avg_price_per_lb'] or 0),
+            )
+        return supply
+
     def _load_real_prices(self, period: date) -> dict:
         """
         Load actual feedstock prices from bronze.feedstock_prices for the period.
@@ -377,21 +480,7 @@ class FeedstockAllocator:
         with get_connection() as conn:
             with conn.cursor() as cur:
                 # Get the most recent price for each feedstock near this period
-                # Map our regions to feedstock codes for US-relevant prices
-                region_priority = {
-                    'SBO': ['central_il', 'central_il_rbd', 'central_il_rbd_wk', 'us_gulf', 'cbot_futures'],
-                    'CO': ['central_us', 'canada_cnf', 'los_angeles', 'canada_cnf_raw'],
-                    'DCO': ['il_wi', 'west_coast'],
-                    'EBFT': ['chicago', 'west_coast'],       # Edible = packer/BFT grade
-                    'IBFT': ['chicago', 'central_us'],       # Inedible = renderer grade
-                    'BFT': ['chicago', 'west_coast'],        # Legacy fallback
-                    'CWG': ['missouri_river', 'west_coast'],
-                    'PF': ['southeast', 'west_coast'],
-                    'YG': ['il_wi', 'los_angeles'],
-                    'UCO': ['il_wi', 'socal'],
-                }
-
-                for fs_code, regions in region_priority.items():
+                for fs_code, regions in PRICE_REGION_PRIORITY.items():
                     for region in regions:
                         cur.execute("""
                             SELECT price_per_lb FROM bronze.feedstock_prices
@@ -401,13 +490,21 @@ class FeedstockAllocator:
                         """, (fs_code, region, period))
                         row = cur.fetchone()
                         if row and row['price_per_lb']:
-                            val = float(row['price_per_lb'])
-                            # Some values are in cents (>1), convert to $/lb
-                            if val > 1.0:
-                                val = val / 100.0
-                            prices[fs_code] = val
+                            prices[fs_code] = self._price_per_lb(row['price_per_lb'])
                             break
 
+        return self._derive_tallow_prices(prices)
+
+    @staticmethod
+    def _price_per_lb(value) -> float:
+        val = float(value)
+        # Some values are in cents (>1), convert to $/lb
+        if val > 1.0:
+            val = val / 100.0
+        return val
+
+    def _derive_tallow_prices(self, prices: dict) -> dict:
+        """Fill EBFT/IBFT prices from BFT where grade-specific prices are missing."""
         # Derive EBFT/IBFT from BFT if no grade-specific prices exist yet
         # BFT (packer Chicago) ≈ edible grade; inedible trades at ~85% of edible
         if 'EBFT' not in prices and 'BFT' in prices:
@@ -420,10 +517,11 @@ class FeedstockAllocator:
 
         return prices
 
-    def _estimate_supply(self, period: date) -> dict:
+    def _estimate_supply(self, period: date, real_prices: dict = None) -> dict:
         """
         Generate estimated feedstock supply by PADD using real prices
         from the database where available, falling back to defaults.
+        Pass real_prices to skip the price lookup (batch mode).
         """
         # Approximate annual US feedstock availability for biofuel (million lbs)
         annual_supply_mil_lbs = {
@@ -447,7 +545,8 @@ class FeedstockAllocator:
         }
 
         # Try to load real prices from database
-        real_prices = self._load_real_prices(period)
+        if real_prices is None:
+            real_prices = self._load_real_prices(period)
 
         default_prices = {
             'SBO': 0.45, 'CO': 0.52, 'DCO': 0.38,
@@ -487,16 +586,10 @@ class FeedstockAllocator:
         """
         from src.services.database.db_config import get_connection
 
-        prices = {
-            'rin_d4_cents': self.config.default_rin_price_cents,
-            'lcfs_per_gal': self.config.default_lcfs_per_gal,
-            'ulsd': self.config.default_ulsd_price,
-            'b100': self.config.default_b100_price,
-        }
-
         with get_connection() as conn:
             with conn.cursor() as cur:
                 # Credit prices — try weekly first (more granular), then monthly
+                credit_rows = []
                 for freq in ['weekly', 'monthly']:
                     cur.execute("""
                         SELECT d4_rin, lcfs_ca
@@ -504,12 +597,7 @@ class FeedstockAllocator:
                         WHERE price_date <= %s AND frequency = %s
                         ORDER BY price_date DESC LIMIT 1
                     """, (period, freq))
-                    row = cur.fetchone()
-                    if row:
-                        if row['d4_rin'] and prices['rin_d4_cents'] == self.config.default_rin_price_cents:
-                            prices['rin_d4_cents'] = float(row['d4_rin'])
-                        if row['lcfs_ca'] and prices['lcfs_per_gal'] == self.config.default_lcfs_per_gal:
-                            prices['lcfs_per_gal'] = float(row['lcfs_ca'])
+                    credit_rows.append(cur.fetchone())
 
                 # Fuel prices — BD regional and RD
                 cur.execute("""
@@ -518,13 +606,9 @@ class FeedstockAllocator:
                     WHERE price_date <= %s
                     ORDER BY price_date DESC LIMIT 1
                 """, (period,))
-                row = cur.fetchone()
-                if row:
-                    if row['b100_upper_midwest']:
-                        prices['b100'] = float(row['b100_upper_midwest'])
-                    if row['rd_california']:
-                        prices['rd_ca'] = float(row['rd_california'])
+                fuel_row = cur.fetchone()
 
+        prices = self._resolve_prices(credit_rows, fuel_row)
         logger.info(f"  Prices: D4 RIN={prices['rin_d4_cents']:.1f}c, "
                     f"LCFS=${prices['lcfs_per_gal']:.2f}, "
                     f"B100=${prices['b100']:.2f}/gal, "
@@ -532,6 +616,27 @@ class FeedstockAllocator:
 
         return prices
 
+    def _resolve_prices(self, credit_rows: list, fuel_row) -> dict:
+        """Price dict from the as-of credit rows (weekly, monthly) and fuel row."""
+        prices = {
+            'rin_d4_cents': self.config.default_rin_price_cents,
+            'lcfs_per_gal': self.config.default_lcfs_per_gal,
+            'ulsd': self.config.default_ulsd_price,
+            'b100': self.config.default_b100_price,
+        }
+        for row in credit_rows:
+            if row:
+                if row['d4_rin'] and prices['rin_d4_cents'] == self.config.default_rin_price_cents:
+                    prices['rin_d4_cents'] = float(row['d4_rin'])
+                if row['lcfs_ca'] and prices['lcfs_per_gal'] == self.config.default_lcfs_per_gal:
+                    prices['lcfs_per_gal'] = float(row['lcfs_ca'])
+        if fuel_row:
+            if fuel_row['b100_upper_midwest']:
+                prices['b100'] = float(fuel_row['b100_upper_midwest'])
+            if fuel_row['rd_california']:
+                prices['rd_ca'] = float(fuel_row['rd_california'])
+        return prices
+
     def load_rlc_tallow_guardrail(self, period: date) -> Optional[float]:
         """
         RLC-canonical tallow biofuel-available guardrail (Tallow Ruling §2).
@@ -579,15 +684,9 @@ class FeedstockAllocator:
 
         # New format takes precedence (2022+); fall back to historical sources
         # if new-format data is missing for the period.
-        source_sheets_in_order = [
-            ('table_2b', 'table_2c'),  # Form 819 (2022+)
-            ('old_table3',),           # EIA old biodiesel report (2012-2021)
-            ('usda_fo',),              # USDA F&O methyl esters (2006-2011)
-        ]
-
         with get_connection() as conn:
             with conn.cursor() as cur:
-                for sheets in source_sheets_in_order:
+                for sheets in EIA_TALLOW_SHEETS:
                     placeholders = ','.join(['%s'] * len(sheets))
                     cur.execute(f"""
                         SELECT quantity_mil_lbs
@@ -609,20 +708,31 @@ class FeedstockAllocator:
         logger.info(f"  No tallow data for {period} - using supply estimates")
         return None
 
-    def run_tallow_split(self, period: date, prices: dict, supply: dict) -> Optional[dict]:
+    def load_tallow_guardrail(self, period: date) -> Optional[float]:
         """
-        Run the tallow grade split and update supply dict with EBFT/IBFT volumes.
+        Tallow total (million lbs) to split between grades.
 
         Guardrail source (Tallow Ruling §2, Ruling 1 — RLC-canonical, EIA disregarded):
         prefer RLC biofuel-available tallow from silver.tallow_balance; fall back to the
-        EIA guardrail only where RLC has no data (pre-2013, before Census trade). The
-        total is then split between grades based on economic pull.
+        EIA guardrail only where RLC has no data (pre-2013, before Census trade).
+        """
+        rlc_total = self.load_rlc_tallow_guardrail(period)
+        return rlc_total if rlc_total is not None else self.load_eia_tallow(period)
+
+    def run_tallow_split(self, period: date, prices: dict, supply: dict) -> Optional[dict]:
+        """
+        Run the tallow grade split and update supply dict with EBFT/IBFT volumes.
 
         Returns the tallow split result dict, or None if using defaults.
         """
-        rlc_total = self.load_rlc_tallow_guardrail(period)
-        eia_total = rlc_total if rlc_total is not None else self.load_eia_tallow(period)
+        return self.apply_tallow_split(period, prices, supply, self.load_tallow_guardrail(period))
 
+    def apply_tallow_split(self, period: date, prices: dict, supply: dict,
+                           eia_total: Optional[float]) -> Optional[dict]:
+        """
+        Split an already-loaded tallow guardrail total between EBFT and IBFT based
+        on economic pull, and scale the supply dict's grade volumes to match.
+        """
         if eia_total is None or eia_total <= 0:
             return None  # Use default supply estimates (EBFT/IBFT already in supply dict)
 
@@ -677,21 +787,59 @@ class FeedstockAllocator:
 
         return result
 
-    def allocate_month(self, period: date, scenario: str = 'base') -> list:
+    def load_month_inputs(self, period: date) -> MonthInputs:
+        """Load one month's facilities, supply, prices, forecasts and tallow guardrail."""
+        return MonthInputs(
+            period=period,
+            facilities=self.load_facilities(period),
+            supply=self.load_feedstock_supply(period),
+            prices=self.load_prices(period),
+            forecasts=self.load_production_forecasts(period),
+            tallow_guardrail=self.load_tallow_guardrail(period),
+        )
+
+    def allocate_month(self, period: date, scenario: str = 'base',
+                       overrides: dict = None) -> list:
         """
         Run the allocation engine for one month.
 
         Returns list of AllocationResult for every (facility, feedstock) pair.
         """
+        return self.allocate_inputs(self.load_month_inputs(period), scenario, overrides)
+
+    @staticmethod
+    def apply_scenario(prices: dict, supply: dict, overrides: dict):
+        """
+        Apply scenario overrides in place.
+
+        overrides = {'prices': {'rin_d4_cents': 95.0, ...},       # replace price inputs
+                     'feedstock_price_mult': {'SBO': 1.10, ...}}   # scale feedstock prices
+        """
+        for key, value in (overrides.get('prices') or {}).items():
+            prices[key] = float(value)
+        mults = overrides.get('feedstock_price_mult') or {}
+        for (fs_code, _), regional in supply.items():
+            if fs_code in mults:
+                regional.price_per_lb *= float(mults[fs_code])
+
+    def allocate_inputs(self, inputs: MonthInputs, scenario: str = 'base',
+                        overrides: dict = None) -> list:
+        """
+        Allocate one month from preloaded inputs. The supply dict and facilities
+        in `inputs` are updated in place, so pass a copy to reuse them.
+        """
+        period = inputs.period
         logger.info(f"=== ALLOCATING {period.strftime('%Y-%m')} (scenario: {scenario}) ===")
 
-        # 1. Load data
-        facilities = self.load_facilities(period)
-        supply = self.load_feedstock_supply(period)
-        prices = self.load_prices(period)
+        # 1. Inputs (scenario overrides applied before anything reads prices)
+        facilities = inputs.facilities
+        supply = inputs.supply
+        prices = inputs.prices
+        if overrides:
+            self.apply_scenario(prices, supply, overrides)
 
         # 1a. Run tallow grade split (EIA guardrail)
-        tallow_result = self.run_tallow_split(period, prices, supply)
+        tallow_result = self.apply_tallow_split(period, prices, supply, inputs.tallow_guardrail)
         self._last_tallow_result = tallow_result  # Stored for save_tallow_split
 
         # 1a-fix: retire the legacy generic BFT bucket. Tallow must flow ONLY through the
@@ -707,10 +855,213 @@ class FeedstockAllocator:
             logger.warning("  No active facilities — skipping")
             return []
 
-        # 1b. Load balance-sheet production forecasts and distribute to facilities
-        forecasts = self.load_production_forecasts(period)
-        self.distribute_production_forecasts(facilities, forecasts, period)
+        # 1b. Distribute balance-sheet production forecasts to facilities
+        self.distribute_production_forecasts(facilities, inputs.forecasts, period)
+
+        # 2-4. Margin every eligible (facility, feedstock) pair, allocate greedily
+        if self.indexed:
+            results = self._allocate_indexed(period, facilities, supply, prices)
+        else:
+            results = self._allocate_pairs(period, facilities, supply, prices)
+
+        # 5. Assign margin ranks per facility
+        fac_results = defaultdict(list)
+        for r in results:
+            fac_results[r.facility_id].append(r)
+        for fid, fac_res in fac_results.items():
+            fac_res.sort(key=lambda x: x.margin_per_gal, reverse=True)
+            for i, r in enumerate(fac_res):
+                r.margin_rank = i + 1
+
+        # Summary
+        total_lbs = sum(r.allocated_mil_lbs for r in results)
+        total_gal = sum(r.allocated_mil_gal for r in results)
+        fac_count = len(set(r.facility_id for r in results))
+        logger.info(f"  Allocated {total_lbs:,.0f} mil lbs ({total_gal:,.0f} mil gal) across {fac_count} facilities")
+
+        # Feedstock breakdown
+        fs_totals = defaultdict(float)
+        for r in results:
+            fs_totals[r.feedstock_code] += r.allocated_mil_lbs
+        for fs, total in sorted(fs_totals.items(), key=lambda x: -x[1]):
+            pct = total / total_lbs * 100 if total_lbs > 0 else 0
+            logger.info(f"    {fs}: {total:,.0f} mil lbs ({pct:.1f}%)")
+
+        return results
+
+    def _allocate_indexed(self, period: date, facilities: list, supply: dict,
+                          prices: dict) -> list:
+        """
+        Array-backed allocation core; gives the same results as _allocate_pairs.
+
+        Credit stacks depend only on (fuel_type, LCFS, state), so
+        build_credit_stack is called once per distinct credit key. margin_calc
+        is called once per distinct line -- the exact arguments calculate()
+        receives: facility_id, credit stack, technology, feedstock and price.
+        facility_id is part of the key because calculate() takes it and may
+        apply facility-specific terms, and nothing is interpolated between
+        prices, so no assumption is made about how margins vary with price.
+        The greedy pass then runs over flat arrays instead of per-pair dicts.
+
+        Opt-in (indexed=True). calculate() lives in margin_model and is opaque
+        here, so it still runs once per facility x feedstock pair and this core
+        is no faster than _allocate_pairs on the synthetic 500-facility month
+        (scripts/bench_feedstock_allocation.py); _allocate_pairs stays the default.
+        """
+        supply_keys = list(supply)
+        supply_index = {key: j for j, key in enumerate(supply_keys)}
+        available = [supply[key].available_mil_lbs for key in supply_keys]
+        consumed = [supply[key].consumed_mil_lbs for key in supply_keys]
+        supply_price = [supply[key].price_per_lb for key in supply_keys]
+
+        # Facility state is keyed by facility_id, as in _allocate_pairs
+        slots = {}
+        fac_slot = [slots.setdefault(fac.facility_id, len(slots)) for fac in facilities]
+        need = [0.0] * len(slots)
+        for fac, s in zip(facilities, fac_slot):
+            need[s] = self.get_monthly_feedstock_need(fac, period)
+
+        # Pairs in _allocate_pairs order (ties keep it through the stable sort)
+        credit_cache = {}
+        lines = {}          # calculate() arguments -> line index
+        line_args = []      # (facility, fs_code, fuel_price, credits, price)
+        codes = {}
+        pair_fac, pair_supply, pair_line, pair_code = [], [], [], []
+        for i, fac in enumerate(facilities):
+            fuel_price = prices['b100'] if fac.fuel_type == 'biodiesel' else prices['ulsd']
+            lcfs = prices['lcfs_per_gal'] if fac.padd == 'PADD5' else 0.0
+            credit_key = (fac.fuel_type, lcfs, fac.state if fac.state else None)
 
+            tech_rates = CONVERSION_RATES.get(fac.technology, {})
+            eligible = fac.eligible_feedstocks if fac.eligible_feedstocks else list(tech_rates.keys())
+            for fs_code in eligible:
+                if fs_code == 'OTHER':
+                    continue
+                j = supply_index.get((fs_code, fac.padd))
+                if j is None or available[j] <= 0:
+                    continue
+
+                line_key = (fac.facility_id, credit_key, fuel_price, fac.technology,
+                            fs_code, supply_price[j])
+                k = lines.get(line_key)
+                if k is None:
+                    credits = credit_cache.get(credit_key)
+                    if credits is None:
+                        credits = credit_cache[credit_key] = self.credit_resolver.build_credit_stack(
+                            calc_date=period,
+                            fuel_type=fac.fuel_type,
+                            rin_price_cents=prices['rin_d4_cents'],
+                            lcfs_credit_per_gal=lcfs,
+                            destination_state=credit_key[2],
+                        )
+                    k = lines[line_key] = len(line_args)
+                    line_args.append((fac, fs_code, fuel_price, credits, supply_price[j]))
+
+                pair_fac.append(i)
+                pair_supply.append(j)
+                pair_line.append(k)
+                pair_code.append(codes.setdefault(fs_code, len(codes)))
+
+        if not pair_fac:
+            return []
+
+        # One margin_calc evaluation per line
+        n_lines = len(line_args)
+        line_margin = np.empty(n_lines)
+        line_cost = np.empty(n_lines)
+        line_lbs = []
+        for k, (fac, fs_code, fuel_price, credits, price) in enumerate(line_args):
+            margin = self.margin_calc.calculate(
+                facility_id=fac.facility_id,
+                fuel_type=fac.fuel_type,
+                technology=fac.technology,
+                feedstock=FeedstockCost(
+                    feedstock_code=fs_code,
+                    price_per_lb=price,
+                    freight_per_lb=0.02,  # Default intra-PADD freight
+                ),
+                fuel_price=fuel_price,
+                credits=credits,
+                period=period,
+            )
+            line_margin[k] = margin.margin_per_gal
+            line_cost[k] = margin.feedstock_cost_per_lb
+            line_lbs.append(self.margin_calc.get_conversion_rate(fac.technology, fs_code))
+
+        line_idx = np.array(pair_line, dtype=np.intp)
+        margins = line_margin[line_idx]
+        costs = line_cost[line_idx]
+        order = np.argsort(-margins, kind='stable').tolist()
+        margins = margins.tolist()
+        costs = costs.tolist()
+
+        # Greedy pass over flat arrays: allocated per facility slot, consumed per
+        # supply cell, share per (slot, feedstock)
+        max_pct = self.config.max_single_feedstock_pct
+        n_codes = len(codes)
+        allocated = [0.0] * len(slots)
+        pct = [0.0] * (len(slots) * n_codes)
+        results = []
+
+        for p in order:
+            fac = facilities[pair_fac[p]]
+            s = fac_slot[pair_fac[p]]
+            fac_need = need[s]
+            remaining_need = fac_need - allocated[s]
+            if remaining_need <= 0.01:
+                continue  # Facility fully supplied
+
+            # --- SUPPLY CONSTRAINT ---
+            j = pair_supply[p]
+            available_now = max(0.0, available[j] - consumed[j])
+            if available_now <= 0.01:
+                continue
+
+            # --- DIVERSIFICATION CONSTRAINT ---
+            c = s * n_codes + pair_code[p]
+            share = pct[c]
+            if share and share >= max_pct:
+                continue
+
+            max_from_diversification = fac_need * max_pct - share * fac_need
+            allocate = min(remaining_need, available_now, max(max_from_diversification, 0.01))
+            if allocate <= 0.001:
+                continue
+
+            lbs_per_gal = line_lbs[pair_line[p]]
+            gal_produced = allocate / lbs_per_gal if lbs_per_gal > 0 else 0
+
+            allocated[s] += allocate
+            consumed[j] += allocate
+            pct[c] = share + (allocate / fac_need if fac_need > 0 else 0)
+
+            constraint = 'none'
+            if allocate < remaining_need and available_now <= allocate:
+                constraint = 'supply'
+            elif allocate < remaining_need and max_from_diversification <= allocate:
+                constraint = 'diversification'
+
+            results.append(AllocationResult(
+                facility_id=fac.facility_id,
+                fuel_type=fac.fuel_type,
+                feedstock_code=line_args[pair_line[p]][1],
+                allocated_mil_lbs=allocate,
+                allocated_mil_gal=gal_produced,
+                pct_of_facility=allocate / fac_need if fac_need > 0 else 0,
+                feedstock_cost_lb=costs[p],
+                margin_per_gal=margins[p],
+                margin_rank=0,
+                constraint_binding=constraint,
+            ))
+
+        for key, used in zip(supply_keys, consumed):
+            supply[key].consumed_mil_lbs = used
+
+        return results
+
+    def _allocate_pairs(self, period: date, facilities: list, supply: dict,
+                        prices: dict) -> list:
+        """Reference allocation core: one margin_calc.calculate call per pair."""
         # 2. Calculate margins for every (facility, feedstock) pair
         all_margins = []
 
@@ -843,29 +1194,6 @@ class FeedstockAllocator:
                 constraint_binding=constraint,
             ))
 
-        # 5. Assign margin ranks per facility
-        fac_results = defaultdict(list)
-        for r in results:
-            fac_results[r.facility_id].append(r)
-        for fid, fac_res in fac_results.items():
-            fac_res.sort(key=lambda x: x.margin_per_gal, reverse=True)
-            for i, r in enumerate(fac_res):
-                r.margin_rank = i + 1
-
-        # Summary
-        total_lbs = sum(r.allocated_mil_lbs for r in results)
-        total_gal = sum(r.allocated_mil_gal for r in results)
-        fac_count = len(set(r.facility_id for r in results))
-        logger.info(f"  Allocated {total_lbs:,.0f} mil lbs ({total_gal:,.0f} mil gal) across {fac_count} facilities")
-
-        # Feedstock breakdown
-        fs_totals = defaultdict(float)
-        for r in results:
-            fs_totals[r.feedstock_code] += r.allocated_mil_lbs
-        for fs, total in sorted(fs_totals.items(), key=lambda x: -x[1]):
-            pct = total / total_lbs * 100 if total_lbs > 0 else 0
-            logger.info(f"    {fs}: {total:,.0f} mil lbs ({pct:.1f}%)")
-
         return results
 
     def save_results(self, period: date, results: list, scenario: str = 'base'):
@@ -877,22 +1205,12 @@ class FeedstockAllocator:
         with get_connection() as conn:
             with conn.cursor() as cur:
                 loaded = 0
+                sql = _insert_sql('gold.feedstock_allocation', ALLOCATION_COLUMNS,
+                                  '(' + ', '.join(['%s'] * len(ALLOCATION_COLUMNS)) + ')')
                 for r in results:
                     try:
                         cur.execute("SAVEPOINT sp_alloc")
-                        cur.execute("""
-                            INSERT INTO gold.feedstock_allocation
-                                (period, run_id, scenario, facility_id, fuel_type,
-                                 feedstock_code, allocated_mil_lbs, allocated_mil_gal,
-                                 pct_of_facility, feedstock_cost_lb, margin_per_gal,
-                                 margin_rank, constraint_binding)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (
-                            period, run_id, scenario, r.facility_id, r.fuel_type,
-                            r.feedstock_code, r.allocated_mil_lbs, r.allocated_mil_gal,
-                            r.pct_of_facility, r.feedstock_cost_lb, r.margin_per_gal,
-                            r.margin_rank, r.constraint_binding,
-                        ))
+                        cur.execute(sql, self._allocation_row(period, run_id, scenario, r))
                         cur.execute("RELEASE SAVEPOINT sp_alloc")
                         loaded += 1
                     except Exception as e:
@@ -904,65 +1222,73 @@ class FeedstockAllocator:
 
         return run_id
 
+    @staticmethod
+    def _allocation_row(period: date, run_id: str, scenario: str, r: AllocationResult) -> tuple:
+        return (
+            period, run_id, scenario, r.facility_id, r.fuel_type,
+            r.feedstock_code, r.allocated_mil_lbs, r.allocated_mil_gal,
+            r.pct_of_facility, r.feedstock_cost_lb, r.margin_per_gal,
+            r.margin_rank, r.constraint_binding,
+        )
+
+    @staticmethod
+    def _tallow_rows(period: date, tallow_result: dict, run_id: str) -> Tuple[list, list]:
+        """(silver.tallow_implied_value rows, gold.tallow_allocation_detail rows)."""
+        iv_rows = []
+        for grade_key in ['ebft_iv', 'ibft_iv']:
+            iv = tallow_result[grade_key]
+            grade_data = tallow_result[grade_key.replace('_iv', '')]
+            iv_rows.append((
+                period, iv.grade_code, iv.pathway, iv.fuel_type,
+                iv.fuel_price_per_gal, iv.rin_value_per_gal,
+                iv.lcfs_value_per_gal, iv.btc_45z_per_gal,
+                iv.state_credit_per_gal, iv.total_revenue_per_gal,
+                iv.processing_cost_per_gal, iv.lbs_per_gal,
+                iv.implied_value_per_lb, grade_data['market_price_per_lb'],
+                grade_data['margin_spread_per_lb'], grade_data['pull_flag'],
+                iv.ci_score_used, run_id,
+            ))
+
+        eia_total = tallow_result['eia_total_mil_lbs']
+        detail_rows = []
+        for grade_key in ['ebft', 'ibft']:
+            g = tallow_result[grade_key]
+            detail_rows.append((
+                period, run_id, eia_total,
+                grade_key.upper(), g['allocated_mil_lbs'], g['allocated_pct'],
+                g['best_pathway'], g['implied_value_per_lb'],
+                g['market_price_per_lb'], g['margin_spread_per_lb'],
+                g['allocation_method'], g['constraint_notes'],
+            ))
+        return iv_rows, detail_rows
+
     def save_tallow_split(self, period: date, tallow_result: dict, run_id: str):
         """Write tallow grade split results to gold.tallow_allocation_detail and silver.tallow_implied_value."""
         from src.services.database.db_config import get_connection
 
+        iv_rows, detail_rows = self._tallow_rows(period, tallow_result, run_id)
+        iv_sql = _insert_sql('silver.tallow_implied_value', TALLOW_IV_COLUMNS,
+                             '(' + ', '.join(['%s'] * len(TALLOW_IV_COLUMNS)) + ')')
+        detail_sql = _insert_sql('gold.tallow_allocation_detail', TALLOW_DETAIL_COLUMNS,
+                                 '(' + ', '.join(['%s'] * len(TALLOW_DETAIL_COLUMNS)) + ')')
+
         with get_connection() as conn:
             with conn.cursor() as cur:
                 # Save implied values to silver
-                for grade_key in ['ebft_iv', 'ibft_iv']:
-                    iv = tallow_result[grade_key]
-                    grade_data = tallow_result[grade_key.replace('_iv', '')]
+                for row in iv_rows:
                     try:
                         cur.execute("SAVEPOINT sp_tiv")
-                        cur.execute("""
-                            INSERT INTO silver.tallow_implied_value
-                                (period, grade_code, pathway, fuel_type,
-                                 fuel_price_per_gal, rin_value_per_gal,
-                                 lcfs_value_per_gal, btc_45z_per_gal,
-                                 state_credit_per_gal, total_revenue_per_gal,
-                                 processing_cost_per_gal, lbs_per_gal,
-                                 implied_value_per_lb, market_price_per_lb,
-                                 margin_spread_per_lb, pull_flag,
-                                 ci_score_used, run_id)
-                            VALUES (%s,%s,%s,%s, %s,%s,%s,%s, %s,%s,%s,%s, %s,%s,%s,%s, %s,%s)
-                        """, (
-                            period, iv.grade_code, iv.pathway, iv.fuel_type,
-                            iv.fuel_price_per_gal, iv.rin_value_per_gal,
-                            iv.lcfs_value_per_gal, iv.btc_45z_per_gal,
-                            iv.state_credit_per_gal, iv.total_revenue_per_gal,
-                            iv.processing_cost_per_gal, iv.lbs_per_gal,
-                            iv.implied_value_per_lb, grade_data['market_price_per_lb'],
-                            grade_data['margin_spread_per_lb'], grade_data['pull_flag'],
-                            iv.ci_score_used, run_id,
-                        ))
+                        cur.execute(iv_sql, row)
                         cur.execute("RELEASE SAVEPOINT sp_tiv")
                     except Exception as e:
                         cur.execute("ROLLBACK TO SAVEPOINT sp_tiv")
                         logger.warning(f"  Tallow IV save error: {e}")
 
                 # Save allocation detail to gold
-                eia_total = tallow_result['eia_total_mil_lbs']
-                for grade_key in ['ebft', 'ibft']:
-                    g = tallow_result[grade_key]
+                for row in detail_rows:
                     try:
                         cur.execute("SAVEPOINT sp_tad")
-                        cur.execute("""
-                            INSERT INTO gold.tallow_allocation_detail
-                                (period, run_id, eia_total_tallow_mil_lbs,
-                                 grade_code, allocated_mil_lbs, allocated_pct,
-                                 best_pathway, implied_value_per_lb,
-                                 market_price_per_lb, margin_spread_per_lb,
-                                 allocation_method, constraint_notes)
-                            VALUES (%s,%s,%s, %s,%s,%s, %s,%s, %s,%s, %s,%s)
-                        """, (
-                            period, run_id, eia_total,
-                            grade_key.upper(), g['allocated_mil_lbs'], g['allocated_pct'],
-                            g['best_pathway'], g['implied_value_per_lb'],
-                            g['market_price_per_lb'], g['margin_spread_per_lb'],
-                            g['allocation_method'], g['constraint_notes'],
-                        ))
+                        cur.execute(detail_sql, row)
                         cur.execute("RELEASE SAVEPOINT sp_tad")
                     except Exception as e:
                         cur.execute("ROLLBACK TO SAVEPOINT sp_tad")
@@ -1012,20 +1338,311 @@ class FeedstockAllocator:
 
     def run_range(self, start: date, end: date, scenario: str = 'base', save: bool = True):
         """Run allocation for a date range."""
-        current = start
         all_results = {}
-        while current <= end:
-            period = current.replace(day=1)
-            results = self.run(period, scenario, save)
-            all_results[period] = results
-
-            # Advance to next month
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
+        for period in month_range(start, end):
+            all_results[period] = self.run(period, scenario, save)
+        return all_results
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Batch mode — panels loaded once, (month, scenario) pairs in parallel
+    # ───────────────────────────────────────────────────────────────────────
+
+    def load_range_inputs(self, start: date, end: date,
+                          connection_fn: Callable = None) -> Dict[date, MonthInputs]:
+        """
+        Load MonthInputs for every month in [start, end] with one query per
+        source table, resolving as-of facility state and prices in memory.
+        Gives the same inputs as load_month_inputs month by month.
+        """
+        if connection_fn is None:
+            from src.services.database.db_config import get_connection as connection_fn
+
+        periods = month_range(start, end)
+        if not periods:
+            return {}
+
+        with connection_fn() as conn:
+            with conn.cursor() as cur:
+                facilities = self._facility_panel(cur, periods)
+                supply = self._supply_panel(cur, periods)
+                prices = self._price_panel(cur, periods)
+                estimated = [p for p in periods if p not in supply]
+                real_prices = self._feedstock_price_panel(cur, estimated) if estimated else {}
+                tallow = self._tallow_panel(cur, periods)
+            # Optional table — a failure must not abort the loads above
+            try:
+                with conn.cursor() as cur:
+                    forecasts = self._forecast_panel(cur, periods)
+            except Exception as e:
+                conn.rollback()
+                logger.debug(f"  No production forecasts available: {e}")
+                forecasts = {}
+
+        inputs = {}
+        for period in periods:
+            if period in supply:
+                month_supply = supply[period]
             else:
-                current = current.replace(month=current.month + 1)
+                month_supply = self._estimate_supply(period, real_prices=real_prices[period])
+            inputs[period] = MonthInputs(
+                period=period,
+                facilities=facilities[period],
+                supply=month_supply,
+                prices=prices[period],
+                forecasts=forecasts.get(period, {}),
+                tallow_guardrail=tallow.get(period),
+            )
 
-        return all_results
+        logger.info(f"  Loaded panels for {len(periods)} months "
+                    f"({periods[0]:%Y-%m}..{periods[-1]:%Y-%m}); "
+                    f"{len(estimated)} months on estimated supply")
+        return inputs
+
+    def _facility_panel(self, cur, periods: List[date]) -> Dict[date, list]:
+        """As-of active facilities per period from the full capacity history."""
+        cur.execute("""
+            SELECT f.facility_id, f.company, f.facility_name, f.state, f.padd,
+                   f.fuel_type, f.technology, f.year_online, f.eligible_feedstocks,
+                   f.primary_feedstock, f.feedstock_mix,
+                   h.effective_date, h.nameplate_mmgy, h.status
+            FROM reference.biofuel_facilities f
+            JOIN reference.facility_capacity_history h ON h.facility_id = f.facility_id
+            WHERE h.effective_date <= %s
+            ORDER BY f.facility_id, h.effective_date
+        """, (periods[-1],))
+        history = defaultdict(lambda: ([], []))
+        for row in cur.fetchall():
+            dates, rows = history[row['facility_id']]
+            dates.append(row['effective_date'])
+            rows.append(row)
+
+        panel = {}
+        for period in periods:
+            active = []
+            for dates, rows in history.values():
+                row = _as_of(dates, rows, period)
+                if (row and row['status'] in ('operating', 'under_construction')
+                        and row['nameplate_mmgy'] and row['nameplate_mmgy'] > 0):
+                    active.append(self._facility_from_row(row))
+            active.sort(key=lambda f: -f.nameplate_mmgy)
+            panel[period] = active
+        return panel
+
+    def _supply_panel(self, cur, periods: List[date]) -> Dict[date, dict]:
+        """silver.feedstock_supply per period; periods without rows are absent."""
+        cur.execute("""
+            SELECT period, feedstock_code, region, net_available_biofuel, avg_price_per_lb
+            FROM silver.feedstock_supply
+            WHERE period = ANY(%s)
+        """, (periods,))
+        by_period = defaultdict(list)
+        for row in cur.fetchall():
+            by_period[row['period']].append(row)
+        return {p: self._supply_from_rows(rows) for p, rows in by_period.items()}
+
+    def _price_panel(self, cur, periods: List[date]) -> Dict[date, dict]:
+        """Credit and fuel price dicts per period (see load_prices)."""
+        first, last = periods[0], periods[-1]
+        # Rows in the range plus the latest row at/before its start, per series
+        cur.execute("""
+            SELECT c.frequency, c.price_date, c.d4_rin, c.lcfs_ca
+            FROM bronze.credit_prices c
+            WHERE c.frequency IN ('weekly', 'monthly') AND c.price_date <= %s
+              AND c.price_date >= COALESCE((
+                  SELECT MAX(p.price_date) FROM bronze.credit_prices p
+                  WHERE p.frequency = c.frequency AND p.price_date <= %s), %s)
+            ORDER BY c.frequency, c.price_date
+        """, (last, first, first))
+        credit = {'weekly': ([], []), 'monthly': ([], [])}
+        for row in cur.fetchall():
+            dates, rows = credit[row['frequency']]
+            dates.append(row['price_date'])
+            rows.append(row)
+
+        cur.execute("""
+            SELECT price_date, b100_upper_midwest, rd_california
+            FROM bronze.fuel_prices
+            WHERE price_date <= %s
+              AND price_date >= COALESCE((
+                  SELECT MAX(price_date) FROM bronze.fuel_prices WHERE price_date <= %s), %s)
+            ORDER BY price_date
+        """, (last, first, first))
+        fuel_rows = cur.fetchall()
+        fuel_dates = [r['price_date'] for r in fuel_rows]
+
+        return {
+            p: self._resolve_prices(
+                [_as_of(*credit[freq], p) for freq in ('weekly', 'monthly')],
+                _as_of(fuel_dates, fuel_rows, p),
+            )
+            for p in periods
+        }
+
+    def _feedstock_price_panel(self, cur, periods: List[date]) -> Dict[date, dict]:
+        """_load_real_prices for each period from one bronze.feedstock_prices read."""
+        pairs = [(fs, region) for fs, regions in PRICE_REGION_PRIORITY.items() for region in regions]
+        first, last = min(periods), max(periods)
+        cur.execute("""
+            SELECT p.feedstock_code, p.region, p.price_date, p.price_per_lb
+            FROM bronze.feedstock_prices p
+            JOIN unnest(%s::text[], %s::text[]) AS k(feedstock_code, region)
+              ON p.feedstock_code = k.feedstock_code AND p.region = k.region
+            WHERE p.price_per_lb > 0 AND p.price_date <= %s
+              AND p.price_date >= COALESCE((
+                  SELECT MAX(q.price_date) FROM bronze.feedstock_prices q
+                  WHERE q.feedstock_code = k.feedstock_code AND q.region = k.region
+                    AND q.price_per_lb > 0 AND q.price_date <= %s), %s)
+            ORDER BY p.feedstock_code, p.region, p.price_date
+        """, ([p[0] for p in pairs], [p[1] for p in pairs], last, first, first))
+        series = {}
+        for row in cur.fetchall():
+            dates, values = series.setdefault((row['feedstock_code'], row['region']), ([], []))
+            dates.append(row['price_date'])
+            values.append(row['price_per_lb'])
+
+        panel = {}
+        for period in periods:
+            prices = {}
+            for fs_code, regions in PRICE_REGION_PRIORITY.items():
+                for region in regions:
+                    value = _as_of(*series.get((fs_code, region), ([], [])), period)
+                    if value:
+                        prices[fs_code] = self._price_per_lb(value)
+                        break
+            panel[period] = self._derive_tallow_prices(prices)
+        return panel
+
+    def _tallow_panel(self, cur, periods: List[date]) -> Dict[date, float]:
+        """Tallow guardrail per period: RLC canonical, else EIA by source era."""
+        cur.execute("""
+            SELECT period, value_lbs FROM silver.tallow_balance
+            WHERE series = 'tallow_biofuel_use' AND class = 'ALL'
+              AND period = ANY(%s)
+        """, (periods,))
+        panel = {row['period']: float(row['value_lbs']) / 1e6
+                 for row in cur.fetchall() if row['value_lbs'] is not None}
+
+        missing = [p for p in periods if p not in panel]
+        if not missing:
+            return panel
+        cur.execute("""
+            SELECT year, month, source_sheet, quantity_mil_lbs
+            FROM bronze.eia_feedstock_monthly
+            WHERE LOWER(feedstock_name) LIKE '%%tallow%%'
+              AND (year, month) IN (SELECT * FROM unnest(%s::int[], %s::int[]))
+              AND source_sheet = ANY(%s)
+              AND is_withheld = FALSE
+              AND quantity_mil_lbs IS NOT NULL
+        """, ([p.year for p in missing], [p.month for p in missing],
+              [s for sheets in EIA_TALLOW_SHEETS for s in sheets]))
+        totals = defaultdict(float)
+        for row in cur.fetchall():
+            totals[(row['year'], row['month'], row['source_sheet'])] += float(row['quantity_mil_lbs'] or 0)
+        for p in missing:
+            for sheets in EIA_TALLOW_SHEETS:
+                keys = [(p.year, p.month, s) for s in sheets if (p.year, p.month, s) in totals]
+                if keys:
+                    panel[p] = sum(totals[k] for k in keys)
+                    break
+        return panel
+
+    def _forecast_panel(self, cur, periods: List[date]) -> Dict[date, dict]:
+        cur.execute("""
+            SELECT period, fuel_type, production_mmgal
+            FROM silver.fuel_production_forecast
+            WHERE period = ANY(%s) AND production_mmgal IS NOT NULL
+        """, (periods,))
+        panel = defaultdict(dict)
+        for row in cur.fetchall():
+            panel[row['period']][row['fuel_type']] = float(row['production_mmgal'])
+        return dict(panel)
+
+    def run_batch(self, start: date, end: date, scenarios=('base',), save: bool = True,
+                  workers: int = None, connection_fn: Callable = None) -> Dict[Tuple[date, str], list]:
+        """
+        Allocate every (month, scenario) pair in [start, end] from panels loaded once.
+
+        scenarios is a list of names (base inputs, labelled) or a dict of
+        name -> overrides (see apply_scenario). Pairs are independent and run
+        on a process pool; results are written in one bulk insert.
+
+        Returns {(period, scenario): [AllocationResult, ...]}.
+        """
+        specs = scenarios if isinstance(scenarios, dict) else {name: {} for name in scenarios}
+        panel = self.load_range_inputs(start, end, connection_fn)
+        jobs = [(period, name) for period in panel for name in specs]
+        workers = ALLOCATION_WORKERS if workers is None else workers
+        logger.info(f"Batch: {len(panel)} months x {len(specs)} scenarios on "
+                    f"{min(workers, max(len(jobs), 1))} workers")
+
+        outputs = {}
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [(job, pool.submit(_allocate_job, self.config, panel[job[0]],
+                                             job[1], specs[job[1]], self.indexed))
+                           for job in jobs]
+                for job, future in futures:
+                    outputs[job] = future.result()
+        else:
+            for period, name in jobs:
+                outputs[(period, name)] = _allocate_job(
+                    self.config, copy.deepcopy(panel[period]), name, specs[name], self.indexed)
+
+        if save and any(results for results, _ in outputs.values()):
+            self.save_batch(outputs, connection_fn)
+            try:
+                self._write_to_eia_data()
+            except Exception as e:
+                logger.warning(f"Post-run eia_data.xlsm sync failed: {e}")
+
+        return {job: results for job, (results, _) in outputs.items()}
+
+    def save_batch(self, outputs: dict, connection_fn: Callable = None) -> Dict[Tuple[date, str], str]:
+        """
+        Bulk-insert batch results in one transaction.
+
+        outputs maps (period, scenario) -> (results, tallow_result). Each pair
+        gets its own run_id, as a single run() would. Returns the run_ids.
+        """
+        from psycopg2.extras import execute_values
+
+        if connection_fn is None:
+            from src.services.database.db_config import get_connection as connection_fn
+
+        run_ids = {}
+        alloc_rows, iv_rows, detail_rows = [], [], []
+        for (period, scenario), (results, tallow_result) in outputs.items():
+            if not results:
+                continue
+            run_id = run_ids[(period, scenario)] = str(uuid.uuid4())
+            alloc_rows.extend(self._allocation_row(period, run_id, scenario, r) for r in results)
+            if tallow_result:
+                ivs, details = self._tallow_rows(period, tallow_result, run_id)
+                iv_rows.extend(ivs)
+                detail_rows.extend(details)
+
+        with connection_fn() as conn:
+            with conn.cursor() as cur:
+                for table, columns, rows in (
+                    ('gold.feedstock_allocation', ALLOCATION_COLUMNS, alloc_rows),
+                    ('silver.tallow_implied_value', TALLOW_IV_COLUMNS, iv_rows),
+                    ('gold.tallow_allocation_detail', TALLOW_DETAIL_COLUMNS, detail_rows),
+                ):
+                    if rows:
+                        execute_values(cur, _insert_sql(table, columns, '%s'), rows, page_size=1000)
+            conn.commit()
+
+        logger.info(f"  Saved {len(alloc_rows)} allocation records for {len(run_ids)} "
+                    f"(month, scenario) runs")
+        return run_ids
+
+
+def _allocate_job(config: AllocationConfig, inputs: MonthInputs, scenario: str,
+                  overrides: dict, indexed: bool = False) -> Tuple[list, Optional[dict]]:
+    """Process-pool entry point: one (month, scenario) allocation."""
+    allocator = FeedstockAllocator(config, indexed=indexed)
+    results = allocator.allocate_inputs(inputs, scenario, overrides)
+    return results, allocator._last_tallow_result
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1037,19 +1654,41 @@ def main():
     parser.add_argument('--period', type=str, help='Single month (YYYY-MM)')
     parser.add_argument('--range', nargs=2, type=str, metavar=('START', 'END'),
                        help='Date range (YYYY-MM YYYY-MM)')
-    parser.add_argument('--scenario', type=str, default='base', help='Scenario name')
+    parser.add_argument('--scenario', type=str, nargs='+', default=['base'],
+                        help='Scenario name(s); several imply --batch')
+    parser.add_argument('--scenario-file', type=str,
+                        help='JSON {name: {"prices": {...}, "feedstock_price_mult": {...}}}')
+    parser.add_argument('--batch', action='store_true',
+                        help='Preload the range and run (month, scenario) pairs in parallel')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Batch worker processes (default RLC_ALLOCATION_WORKERS={ALLOCATION_WORKERS})')
     parser.add_argument('--no-save', action='store_true', help='Do not save to database')
     args = parser.parse_args()
 
     allocator = FeedstockAllocator()
 
-    if args.period:
+    specs = {}
+    if args.scenario_file:
+        with open(args.scenario_file) as f:
+            specs = json.load(f)
+    scenarios = {name: specs.get(name, {}) for name in args.scenario}
+
+    if args.batch or len(scenarios) > 1 or args.scenario_file:
+        if args.range:
+            start = datetime.strptime(args.range[0], '%Y-%m').date()
+            end = datetime.strptime(args.range[1], '%Y-%m').date()
+        elif args.period:
+            start = end = datetime.strptime(args.period, '%Y-%m').date()
+        else:
+            start = end = date.today().replace(day=1)
+        allocator.run_batch(start, end, scenarios, save=not args.no_save, workers=args.workers)
+    elif args.period:
         period = datetime.strptime(args.period, '%Y-%m').date()
-        allocator.run(period, args.scenario, save=not args.no_save)
+        allocator.run(period, args.scenario[0], save=not args.no_save)
     elif args.range:
         start = datetime.strptime(args.range[0], '%Y-%m').date()
         end = datetime.strptime(args.range[1], '%Y-%m').date()
-        allocator.run_range(start, end, args.scenario, save=not args.no_save)
+        allocator.run_range(start, end, args.scenario[0], save=not args.no_save)
     else:
         # Default: run current month
         today = date.today().replace(day=1)
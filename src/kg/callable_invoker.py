@@ -11,26 +11,32 @@ from __future__ import annotations
 import importlib
 import inspect
 import json
-import os
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import psycopg2
 from dotenv import load_dotenv
 
+from src.services.database.db_config import get_pool
+
 load_dotenv(Path(__file__).resolve().parent.parent.parent / '.env')
 
 
 def _connect():
-    return psycopg2.connect(
-        host=os.environ['RLC_PG_HOST'],
-        port=os.environ.get('RLC_PG_PORT', 5432),
-        database=os.environ.get('RLC_PG_DATABASE', 'rlc_commodities'),
-        user=os.environ['RLC_PG_USER'],
-        password=os.environ['RLC_PG_PASSWORD'],
-        sslmode='require',
-    )
+    """
+    Check out a pooled connection with tuple rows. Pair with _release().
+
+    Always TLS: these helpers talk to the hosted database and must not fall
+    back to libpq's default 'prefer' when RLC_PG_SSLMODE is unset.
+    """
+    conn = get_pool(min_sslmode='require').getconn()
+    conn.cursor_factory = None
+    return conn
+
+
+def _release(conn):
+    """Return a connection from _connect() to the shared pool."""
+    get_pool(min_sslmode='require').putconn(conn)
 
 
 class CallableNotFound(Exception):
@@ -235,7 +241,7 @@ def invoke(
             'duration_ms': duration_ms,
         }
     finally:
-        conn.close()
+        _release(conn)
 
 
 if __name__ == '__main__':
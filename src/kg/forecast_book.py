@@ -26,15 +26,15 @@ Design goals:
 from __future__ import annotations
 
 import json
-import os
 import uuid
 from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import psycopg2
 from dotenv import load_dotenv
 
+from src.services.database.db_config import get_pool
+
 load_dotenv(Path(__file__).resolve().parent.parent.parent / '.env')
 
 
@@ -44,14 +44,20 @@ SOURCE_USDA = 'usda_wasde'
 
 
 def _connect():
-    return psycopg2.connect(
-        host=os.environ['RLC_PG_HOST'],
-        port=os.environ.get('RLC_PG_PORT', 5432),
-        database=os.environ.get('RLC_PG_DATABASE', 'rlc_commodities'),
-        user=os.environ['RLC_PG_USER'],
-        password=os.environ['RLC_PG_PASSWORD'],
-        sslmode='require',
-    )
+    """
+    Check out a pooled connection with tuple rows. Pair with _release().
+
+    Always TLS: these helpers talk to the hosted database and must not fall
+    back to libpq's default 'prefer' when RLC_PG_SSLMODE is unset.
+    """
+    conn = get_pool(min_sslmode='require').getconn()
+    conn.cursor_factory = None
+    return conn
+
+
+def _release(conn):
+    """Return a connection from _connect() to the shared pool."""
+    get_pool(min_sslmode='require').putconn(conn)
 
 
 # =============================================================================
@@ -110,7 +116,7 @@ def record_forecast(
               marketing_year, notes, source, analyst))
         conn.commit()
     finally:
-        conn.close()
+        _release(conn)
     return forecast_id
 
 
@@ -140,7 +146,7 @@ def get_latest_forecast(commodity: str, forecast_type: str,
             'notes': json.loads(row[9]) if row[9] else None,
         }
     finally:
-        conn.close()
+        _release(conn)
 
 
 def get_forecasts_for_target(commodity: str, forecast_type: str,
@@ -161,7 +167,7 @@ def get_forecasts_for_target(commodity: str, forecast_type: str,
             'as_of': r[4], 'analyst': r[5], 'forecast_id': r[6],
         } for r in cur.fetchall()]
     finally:
-        conn.close()
+        _release(conn)
 
 
 # =============================================================================
@@ -198,7 +204,7 @@ def record_actual(commodity: str, forecast_type: str, target_date: date,
               revision_number, f'Recorded via forecast_book.record_actual'))
         conn.commit()
     finally:
-        conn.close()
+        _release(conn)
     return actual_id
 
 
@@ -256,7 +262,7 @@ def reconcile(commodity: str, forecast_type: str, target_date: date,
             'error': error, 'pct_error': pct_error, 'days_ahead': days_ahead,
         }
     finally:
-        conn.close()
+        _release(conn)
 
 
 # =============================================================================
@@ -286,7 +292,7 @@ def accuracy_summary(commodity: str, forecast_type: str,
             'source': source,
         }
     finally:
-        conn.close()
+        _release(conn)
 
 
 # =============================================================================
@@ -362,7 +368,7 @@ def build_forecast_context(commodity: str, forecast_type: str,
             'competing_forecasts': competing,
         }
     finally:
-        conn.close()
+        _release(conn)
 
 
 # =============================================================================
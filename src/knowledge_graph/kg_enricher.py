@@ -86,9 +86,16 @@ class KGEnricher:
         key_contexts = []
         key_relationships = []
 
+        # All nodes, contexts and edges for this collector in one round trip
+        try:
+            enriched_by_key = self.kg.get_enriched_contexts(node_keys)
+        except Exception as e:
+            logger.debug(f"KG lookup failed for {collector_name}: {e}")
+            return None
+
         for node_key in node_keys:
             try:
-                enriched = self.kg.get_enriched_context(node_key)
+                enriched = enriched_by_key.get(node_key)
                 if enriched is None:
                     continue
 
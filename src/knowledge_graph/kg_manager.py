@@ -12,16 +12,36 @@ Usage:
     stats = kg.get_stats()
     nodes = kg.search_nodes(node_type='commodity')
     context = kg.get_enriched_context('corn')
+    many = kg.get_enriched_contexts(['corn', 'soybeans'])   # one round trip
 """
 
 import json as _json
 import logging
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from typing import Iterable, List, Dict, Optional, Any
 from datetime import datetime, date
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+KG_STATEMENT_TIMEOUT_MS = 60000
+
+# Rows per INSERT ... SELECT FROM unnest() in bulk_upsert_contexts
+BULK_UPSERT_CHUNK = 5000
+
+# Seconds a resolved node_key -> id mapping is trusted
+NODE_ID_CACHE_TTL = 600
+
+_node_ids: Dict[str, tuple] = {}       # node_key -> (id, cached_at)
+_node_ids_lock = threading.Lock()
+
+
+def clear_node_id_cache():
+    """Drop cached node ids (after deleting or re-keying nodes)."""
+    with _node_ids_lock:
+        _node_ids.clear()
+
 
 def _serialize(obj):
     """Convert non-serializable types to JSON-safe values."""
@@ -44,12 +64,13 @@ class KGManager:
     Read methods return plain dicts/lists (JSON-serializable).
     Write methods (upsert_context, bulk_upsert_contexts) enable
     automated calculators to store computed context.
-    Each call opens and closes its own DB connection.
+    Each call checks a connection out of the shared db_config pool.
+    node_key -> id lookups are cached in-process (NODE_ID_CACHE_TTL).
     """
 
     def _get_connection(self):
         from src.services.database.db_config import get_connection
-        return get_connection()
+        return get_connection(statement_timeout_ms=KG_STATEMENT_TIMEOUT_MS)
 
     # ------------------------------------------------------------------
     # search_nodes
@@ -196,7 +217,41 @@ class KGManager:
             return [_clean_row(dict(row)) for row in cur.fetchall()]
 
     # ------------------------------------------------------------------
-    # get_enriched_context
+    # resolve_node_ids
+    # ------------------------------------------------------------------
+    def resolve_node_ids(self, node_keys: Iterable[str], cur=None) -> Dict[str, int]:
+        """
+        Map node_keys to kg_node ids, using the in-process cache and one
+        query for any misses. Keys that don't exist are omitted.
+        """
+        keys = set(node_keys)
+        now = time.monotonic()
+        found = {}
+        with _node_ids_lock:
+            for key in keys:
+                cached = _node_ids.get(key)
+                if cached is not None and now - cached[1] < NODE_ID_CACHE_TTL:
+                    found[key] = cached[0]
+        missing = [k for k in keys if k not in found]
+        if not missing:
+            return found
+
+        sql = "SELECT node_key, id FROM core.kg_node WHERE node_key = ANY(%s)"
+        if cur is None:
+            with self._get_connection() as conn:
+                c = conn.cursor()
+                c.execute(sql, (missing,))
+                rows = c.fetchall()
+        else:
+            cur.execute(sql, (missing,))
+            rows = cur.fetchall()
+
+        _cache_node_ids({row['node_key']: row['id'] for row in rows})
+        found.update({row['node_key']: row['id'] for row in rows})
+        return found
+
+    # ------------------------------------------------------------------
+    # get_enriched_context(s)
     # ------------------------------------------------------------------
     def get_enriched_context(self, node_key: str) -> Optional[Dict[str, Any]]:
         """
@@ -205,24 +260,88 @@ class KGManager:
         This is the "what would an analyst think about this?" query.
         Returns None if node_key does not exist.
         """
-        node = self.get_node(node_key)
-        if node is None:
-            return None
+        return self.get_enriched_contexts([node_key]).get(node_key)
 
-        contexts = self.get_node_context(node_key)
-        edges = self.get_node_edges(node_key, direction='both')
+    def get_enriched_contexts(self, node_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        get_enriched_context for many nodes in one round trip.
 
-        return {
-            "node": node,
-            "contexts": contexts,
-            "edges": edges,
-            "summary": {
-                "context_count": len(contexts),
-                "edge_count": len(edges),
-                "context_types": sorted(set(c["context_type"] for c in contexts)),
-                "edge_types": sorted(set(e["edge_type"] for e in edges)),
+        Nodes, their contexts and their edges (both directions) come back
+        from a single statement with contexts/edges aggregated per node.
+        Returns {node_key: enriched}, omitting keys that don't exist.
+        """
+        if not node_keys:
+            return {}
+
+        sql = """
+            WITH n AS (
+                SELECT id, node_type, node_key, label, properties
+                FROM core.kg_node
+                WHERE node_key = ANY(%s)
+            )
+            SELECT
+                n.id, n.node_type, n.node_key, n.label, n.properties,
+                COALESCE((
+                    SELECT jsonb_agg(jsonb_build_object(
+                               'id', c.id,
+                               'context_type', c.context_type,
+                               'context_key', c.context_key,
+                               'context_value', c.context_value,
+                               'applicable_when', c.applicable_when,
+                               'source', c.source,
+                               'last_updated', c.last_updated)
+                           ORDER BY c.context_type, c.context_key)
+                    FROM core.kg_context c
+                    WHERE c.node_id = n.id
+                ), '[]'::jsonb) AS contexts,
+                COALESCE((
+                    SELECT jsonb_agg(to_jsonb(ed) ORDER BY ed.edge_type, ed.direction)
+                    FROM (
+                        SELECT e.id, e.edge_type, e.weight, e.properties,
+                               e.confidence, e.created_by,
+                               'outgoing' AS direction,
+                               n.node_key AS source_key, n.label AS source_label,
+                               tn.node_key AS target_key, tn.label AS target_label
+                        FROM core.kg_edge e
+                        JOIN core.kg_node tn ON tn.id = e.target_node_id
+                        WHERE e.source_node_id = n.id
+                        UNION ALL
+                        SELECT e.id, e.edge_type, e.weight, e.properties,
+                               e.confidence, e.created_by,
+                               'incoming' AS direction,
+                               sn.node_key AS source_key, sn.label AS source_label,
+                               n.node_key AS target_key, n.label AS target_label
+                        FROM core.kg_edge e
+                        JOIN core.kg_node sn ON sn.id = e.source_node_id
+                        WHERE e.target_node_id = n.id
+                    ) ed
+                ), '[]'::jsonb) AS edges
+            FROM n
+        """
+        with self._get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (list(node_keys),))
+            rows = cur.fetchall()
+
+        _cache_node_ids({row['node_key']: row['id'] for row in rows})
+
+        result = {}
+        for row in rows:
+            row = dict(row)
+            contexts = row.pop('contexts') or []
+            edges = row.pop('edges') or []
+            result[row['node_key']] = {
+                "node": _clean_row(row),
+                "contexts": contexts,
+                "edges": edges,
+                "summary": {
+                    "context_count": len(contexts),
+                    "edge_count": len(edges),
+                    "context_types": sorted(set(c["context_type"] for c in contexts)),
+                    "edge_types": sorted(set(e["edge_type"] for e in edges)),
+                }
             }
-        }
+        return result
 
     # ------------------------------------------------------------------
     # get_stats
@@ -349,6 +468,11 @@ class KGManager:
         """
         Upsert multiple contexts in a single transaction.
 
+        node_keys are resolved to ids once (cached), then rows go in as
+        set-based INSERT ... SELECT FROM unnest(...) statements of up to
+        BULK_UPSERT_CHUNK rows. If the same (node_key, context_type,
+        context_key) appears more than once, the last entry wins.
+
         Each dict in contexts must have:
             node_key, context_type, context_key, context_value
         Optional: applicable_when (default 'always')
@@ -357,57 +481,97 @@ class KGManager:
             Dict with 'total', 'inserted', 'updated', 'failed', 'errors'
         """
         sql = """
-            WITH target_node AS (
-                SELECT id FROM core.kg_node WHERE node_key = %s
-            )
             INSERT INTO core.kg_context
                 (node_id, context_type, context_key, context_value,
                  applicable_when, source, last_updated)
-            SELECT
-                tn.id, %s, %s, %s::jsonb, %s, %s, NOW()
-            FROM target_node tn
+            SELECT v.node_id, v.context_type, v.context_key, v.context_value,
+                   v.applicable_when, %s, NOW()
+            FROM unnest(%s::int[], %s::text[], %s::text[], %s::jsonb[], %s::text[])
+                 AS v(node_id, context_type, context_key, context_value, applicable_when)
+            JOIN core.kg_node n ON n.id = v.node_id
             ON CONFLICT (node_id, context_type, context_key) DO UPDATE SET
                 context_value = EXCLUDED.context_value,
                 applicable_when = EXCLUDED.applicable_when,
                 source = EXCLUDED.source,
                 last_updated = NOW()
-            RETURNING id, (xmax = 0) AS was_inserted
+            RETURNING node_id, (xmax = 0) AS was_inserted
         """
 
-        inserted = 0
-        updated = 0
         failed = 0
         errors = []
 
+        # Validate and de-duplicate (last wins, as sequential upserts would)
+        rows: Dict[tuple, tuple] = {}
+        for ctx in contexts:
+            try:
+                key = (ctx['node_key'], ctx['context_type'], ctx['context_key'])
+                rows[key] = (
+                    _json.dumps(ctx['context_value'], default=str),
+                    ctx.get('applicable_when', 'always'),
+                )
+            except Exception as e:
+                failed += 1
+                errors.append(f"{ctx.get('node_key', '?')}/{ctx.get('context_key', '?')}: {e}")
+        duplicates = len(contexts) - failed - len(rows)
+
+        inserted = 0
+        updated = 0
         with self._get_connection() as conn:
             cur = conn.cursor()
-            for ctx in contexts:
-                try:
-                    cur.execute(sql, (
-                        ctx['node_key'],
-                        ctx['context_type'],
-                        ctx['context_key'],
-                        _json.dumps(ctx['context_value'], default=str),
-                        ctx.get('applicable_when', 'always'),
-                        source,
-                    ))
-                    row = cur.fetchone()
-                    if row is None:
-                        failed += 1
-                        errors.append(f"Node not found: {ctx['node_key']}")
-                    elif row['was_inserted']:
-                        inserted += 1
-                    else:
-                        updated += 1
-                except Exception as e:
+            node_ids = self.resolve_node_ids({k[0] for k in rows}, cur=cur)
+
+            batch = []
+            for key, (value, when) in rows.items():
+                if key[0] not in node_ids:
                     failed += 1
-                    errors.append(f"{ctx.get('node_key', '?')}/{ctx.get('context_key', '?')}: {e}")
-            conn.commit()
+                    errors.append(f"Node not found: {key[0]}")
+                    continue
+                batch.append((node_ids[key[0]], key[1], key[2], value, when))
+
+            written = set()
+            try:
+                for start in range(0, len(batch), BULK_UPSERT_CHUNK):
+                    chunk = batch[start:start + BULK_UPSERT_CHUNK]
+                    cur.execute(sql, (source, *[list(col) for col in zip(*chunk)]))
+                    for row in cur.fetchall():
+                        written.add(row['node_id'])
+                        if row['was_inserted']:
+                            inserted += 1
+                        else:
+                            updated += 1
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                failed += len(batch)
+                inserted = updated = 0
+                errors.append(f"Bulk upsert rolled back: {e}")
+            else:
+                # Cached ids for nodes deleted since they were cached
+                stale = inserted + updated < len(batch)
+                if stale:
+                    gone = {r[0] for r in batch} - written
+                    _evict_node_ids([k for k, i in node_ids.items() if i in gone])
+                    failed += len(batch) - inserted - updated
+                    errors.append(f"{len(batch) - inserted - updated} context(s) skipped: "
+                                  f"node deleted since its id was cached")
 
         return {
             'total': len(contexts),
             'inserted': inserted,
-            'updated': updated,
+            'updated': updated + duplicates,
             'failed': failed,
             'errors': errors[:10],
         }
+
+
+def _cache_node_ids(mapping: Dict[str, int]):
+    now = time.monotonic()
+    with _node_ids_lock:
+        for key, node_id in mapping.items():
+            _node_ids[key] = (node_id, now)
+
+
+def _evict_node_ids(keys: Iterable[str]):
+    with _node_ids_lock:
+        for key in keys:
+            _node_ids.pop(key, None)
@@ -16,7 +16,7 @@ To use with Claude Code, add to your MCP settings:
 }
 
 Tools provided:
-- query_database: Execute SQL queries
+- query_database: Execute SQL queries (optionally paged via server-side cursors)
 - list_tables: List available tables
 - describe_table: Get table schema
 - get_balance_sheet: Get S&D balance sheet for commodity/country
@@ -31,12 +31,31 @@ Tools provided:
 - search_knowledge_graph: Search analyst knowledge graph nodes
 - get_kg_context: Get full analyst context for a KG node
 - get_kg_relationships: Get relationships for a KG node
+- get_cache_stats: Hit/miss statistics for the tool result cache
+
+Execution model:
+    call_tool hands every tool to a thread pool (RLC_MCP_WORKERS, default 8)
+    and awaits it with a per-tool timeout (TOOL_TIMEOUTS), so concurrent
+    tool calls run side by side instead of blocking the event loop. Tools
+    draw connections from one shared pool sized to the workers; .env is
+    read once at import. A timed-out or cancelled call has its running
+    queries cancelled server-side, and each checkout carries a matching
+    statement_timeout.
+
+Result cache:
+    The S&D tools in CACHED_TOOLS are served from a ToolResultCache keyed
+    on tool + arguments. An entry stays valid until a collector that feeds
+    its table records a new successful run (core.collection_status) or a
+    completion event (core.event_log); see result_cache.py.
 """
 
 import os
 import sys
 import json
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Any, Optional
@@ -57,6 +76,36 @@ except ImportError:
 import psycopg2
 import psycopg2.extras
 
+from src.mcp.query_pager import ENCODINGS, QueryPager, encode_page
+from src.mcp.result_cache import ToolResultCache
+from src.services.database.pool import ConnectionPool
+
+# Worker threads for tool calls; the connection pool is sized to match
+MCP_WORKERS = int(os.environ.get('RLC_MCP_WORKERS', '8'))
+
+# Per-tool timeouts in seconds (also applied as the statement_timeout)
+DEFAULT_TOOL_TIMEOUT = 30
+TOOL_TIMEOUTS = {
+    'query_database': 60,
+    'analyze_supply_demand': 60,
+    'generate_report': 120,
+    'get_forecast_accuracy': 60,
+    'get_kg_context': 45,
+}
+
+# Cached tools -> collectors whose runs invalidate them
+FAS_PSD_COLLECTORS = ('usda_wasde', 'usda_fas_psd')        # bronze.fas_psd
+CONAB_COLLECTORS = ('conab', 'conab_direct')               # gold.brazil_*_production
+CACHED_TOOLS = {
+    'get_balance_sheet': FAS_PSD_COLLECTORS,
+    'get_production_ranking': FAS_PSD_COLLECTORS,
+    'get_stocks_to_use': FAS_PSD_COLLECTORS,
+    'get_commodity_summary': FAS_PSD_COLLECTORS,
+    'analyze_supply_demand': FAS_PSD_COLLECTORS,
+    'get_brazil_production': CONAB_COLLECTORS,
+}
+CACHE_POLL_SECONDS = float(os.environ.get('RLC_MCP_CACHE_POLL_SECONDS', '10'))
+
 
 def load_env():
     """Load environment variables from .env file."""
@@ -69,15 +118,17 @@ def load_env():
                     os.environ.setdefault(key, value)
 
 
+load_env()
+
+
 def get_connection():
-    """Get database connection.
+    """Open a new (unpooled) database connection.
 
     Uses the same RLC_PG_* env vars as the rest of the system (collectors,
     dispatcher, etc.) so that the MCP server reads from the same database
     that collectors write to.  Falls back to DB_HOST/DB_PORT for backwards
-    compatibility.
+    compatibility. Tools use pooled_connection() instead.
     """
-    load_env()
     return psycopg2.connect(
         host=os.environ.get('RLC_PG_HOST', os.environ.get('DB_HOST', 'localhost')),
         port=os.environ.get('RLC_PG_PORT', os.environ.get('DB_PORT', '5432')),
@@ -88,6 +139,107 @@ def get_connection():
     )
 
 
+_pool: Optional[ConnectionPool] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
+_call_state = threading.local()
+
+
+class _ToolCall:
+    """A running tool call: its timeout and the connections it holds."""
+
+    def __init__(self, name: str, timeout: float):
+        self.name = name
+        self.timeout = timeout
+        self.cancelled = False
+        self._connections = set()
+        self._lock = threading.Lock()
+
+    def attach(self, conn):
+        with self._lock:
+            if self.cancelled:
+                raise RuntimeError(f"{self.name} was cancelled")
+            self._connections.add(conn)
+
+    def detach(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+
+    def cancel(self):
+        """Cancel queries still running for this call (thread-safe)."""
+        with self._lock:
+            self.cancelled = True
+            for conn in self._connections:
+                try:
+                    conn.cancel()
+                except Exception:
+                    pass
+
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                _pool = ConnectionPool(get_connection, minconn=0, maxconn=MCP_WORKERS)
+    return _pool
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MCP_WORKERS,
+                                               thread_name_prefix='mcp-tool')
+    return _executor
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Check a connection out of the shared pool for the current tool call.
+
+    Inside run_tool the checkout gets the tool's statement_timeout and is
+    registered so a timeout/cancel can interrupt it. The pool never
+    commits; writers call conn.commit() themselves.
+    """
+    call = getattr(_call_state, 'call', None)
+    timeout_ms = int(call.timeout * 1000) if call is not None else None
+    with _get_pool().connection(statement_timeout_ms=timeout_ms) as conn:
+        if call is None:
+            yield conn
+            return
+        call.attach(conn)
+        try:
+            yield conn
+        finally:
+            call.detach(conn)
+
+
+def source_data_version(collectors: tuple) -> tuple:
+    """
+    Data version for a set of collectors: latest finished successful run
+    plus latest event they logged. Changes whenever any of them lands data.
+    """
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT
+                (SELECT MAX(run_finished_at) FROM core.collection_status
+                  WHERE collector_name = ANY(%s) AND status IN ('success', 'partial')),
+                (SELECT MAX(id) FROM core.event_log WHERE source = ANY(%s))
+        """, (list(collectors), list(collectors)))
+        row = cur.fetchone()
+    return tuple(row)
+
+
+_result_cache = ToolResultCache(source_data_version, poll_interval=CACHE_POLL_SECONDS)
+
+# Paged query_database cursors; each open cursor pins one pooled connection
+_pager = QueryPager(lambda: _get_pool(), max_open=max(1, MCP_WORKERS // 2))
+
+
 def json_serializer(obj):
     """JSON serializer for objects not serializable by default."""
     if isinstance(obj, (datetime, date)):
@@ -97,6 +249,12 @@ def json_serializer(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def _is_read_only(sql_upper: str) -> bool:
+    """Safety: block dangerous operations."""
+    dangerous = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
+    return not any(d in sql_upper for d in dangerous)
+
+
 def execute_query(sql: str, params: tuple = None, limit: int = 500) -> dict:
     """Execute a SQL query and return results as dict."""
     # Safety: add LIMIT if not present for SELECT queries
@@ -104,49 +262,88 @@ def execute_query(sql: str, params: tuple = None, limit: int = 500) -> dict:
     if sql_upper.startswith('SELECT') and 'LIMIT' not in sql_upper:
         sql = f"{sql.rstrip(';')} LIMIT {limit}"
 
-    # Safety: block dangerous operations
-    dangerous = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-    if any(d in sql_upper for d in dangerous):
+    if not _is_read_only(sql_upper):
         return {"error": "Only SELECT queries are allowed"}
 
-    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(sql, params)
-
-        if cur.description:
-            rows = cur.fetchall()
-            columns = [desc[0] for desc in cur.description]
-            return {
-                "columns": columns,
-                "rows": [dict(row) for row in rows],
-                "row_count": len(rows)
-            }
-        return {"status": "success", "rowcount": cur.rowcount}
+        with pooled_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.execute(sql, params)
+
+            if cur.description:
+                rows = cur.fetchall()
+                columns = [desc[0] for desc in cur.description]
+                return {
+                    "columns": columns,
+                    "rows": [dict(row) for row in rows],
+                    "row_count": len(rows)
+                }
+            return {"status": "success", "rowcount": cur.rowcount}
 
     except Exception as e:
         return {"error": str(e)}
 
-    finally:
-        conn.close()
-
 
 # ============================================================================
 # TOOL IMPLEMENTATIONS
 # ============================================================================
 
-def query_database(sql: str, limit: int = 100) -> str:
+def query_database(sql: str = None, limit: int = 100, page_size: int = None,
+                   cursor: str = None, encoding: str = 'records',
+                   close: bool = False) -> str:
     """
     Execute a SQL query against the commodities database.
 
+    Without page_size/cursor this is the original one-shot query, capped by
+    `limit`. With page_size the query runs on a server-side cursor (no
+    LIMIT is added) and each call returns one page plus `next_cursor`;
+    pass that token back as `cursor` to get the next page, or with
+    close=True to release it early.
+
     Args:
-        sql: SELECT query to execute
-        limit: Maximum rows to return (default 100)
+        sql: SELECT query to execute (not needed when continuing a cursor)
+        limit: Maximum rows to return for one-shot queries (default 100)
+        page_size: Rows per page; enables paging
+        cursor: Token from a previous page's next_cursor
+        encoding: 'records' (list of row dicts) or 'columnar'
+            (column name -> list of values; smaller for wide pages)
+        close: Release `cursor` without fetching
 
     Returns:
         JSON string with query results
     """
-    result = execute_query(sql, limit=limit)
+    call = getattr(_call_state, 'call', None)
+    timeout_ms = int((call.timeout if call is not None else DEFAULT_TOOL_TIMEOUT) * 1000)
+    paged = page_size is not None or cursor is not None
+    try:
+        if encoding not in ENCODINGS:
+            result = {"error": f"encoding must be one of {list(ENCODINGS)}"}
+        elif cursor is not None and close:
+            result = {"closed": _pager.close(cursor)}
+        elif cursor is not None:
+            result = _pager.next(cursor, encoding, page_size, call=call)
+        elif sql is None:
+            result = {"error": "sql is required"}
+        elif page_size is not None:
+            sql_upper = sql.upper().strip()
+            if not sql_upper.startswith(('SELECT', 'WITH')) or not _is_read_only(sql_upper):
+                result = {"error": "Only SELECT queries are allowed"}
+            else:
+                result = _pager.open(sql.rstrip().rstrip(';'), None, page_size, encoding,
+                                     statement_timeout_ms=timeout_ms, call=call)
+        else:
+            result = execute_query(sql, limit=limit)
+            if encoding == 'columnar' and 'rows' in result:
+                columns = result['columns']
+                result = dict(
+                    encode_page(columns, [[r[c] for c in columns] for r in result['rows']], 'columnar'),
+                    row_count=result['row_count'],
+                )
+    except Exception as e:
+        result = {"error": str(e)}
+
+    if paged or encoding == 'columnar':
+        return json.dumps(result, separators=(',', ':'), default=json_serializer)
     return json.dumps(result, indent=2, default=json_serializer)
 
 
@@ -534,15 +731,15 @@ def acknowledge_events(event_ids: list) -> str:
     except (ValueError, TypeError):
         return json.dumps({"error": "event_ids must be a list of integers"})
 
-    conn = get_connection()
     try:
-        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute(
-            "SELECT core.acknowledge_events(%s::integer[]) AS acknowledged_count",
-            (event_ids,)
-        )
-        result = cur.fetchone()
-        conn.commit()
+        with pooled_connection() as conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.execute(
+                "SELECT core.acknowledge_events(%s::integer[]) AS acknowledged_count",
+                (event_ids,)
+            )
+            result = cur.fetchone()
+            conn.commit()
 
         return json.dumps({
             "acknowledged_count": result['acknowledged_count'],
@@ -550,10 +747,7 @@ def acknowledge_events(event_ids: list) -> str:
             "status": "success"
         }, indent=2, default=json_serializer)
     except Exception as e:
-        conn.rollback()
         return json.dumps({"error": str(e)})
-    finally:
-        conn.close()
 
 
 def get_collection_history(collector_name: str, last_n: int = 10) -> str:
@@ -615,8 +809,10 @@ def _get_kg_manager():
     """Get or create KGManager singleton."""
     global _kg_manager
     if _kg_manager is None:
-        from src.knowledge_graph.kg_manager import KGManager
-        _kg_manager = KGManager()
+        with _init_lock:
+            if _kg_manager is None:
+                from src.knowledge_graph.kg_manager import KGManager
+                _kg_manager = KGManager()
     return _kg_manager
 
 
@@ -658,6 +854,23 @@ def get_kg_relationships(node_key: str, edge_type: str = None,
     }, indent=2, default=json_serializer)
 
 
+# ============================================================================
+# CACHE TOOLS
+# ============================================================================
+
+def get_cache_stats() -> str:
+    """
+    Hit/miss statistics for the tool result cache.
+
+    saved_seconds is the summed original run time of every result served
+    from cache, i.e. the database time the cache avoided.
+    """
+    stats = _result_cache.stats()
+    stats['query_cursors'] = _pager.stats()
+    stats['cached_tools'] = {tool: list(src) for tool, src in CACHED_TOOLS.items()}
+    return json.dumps(stats, indent=2, default=json_serializer)
+
+
 # ============================================================================
 # REPORT GENERATION TOOLS
 # ============================================================================
@@ -907,25 +1120,24 @@ def record_forecast(commodity: str, forecast_type: str, value: float,
     ]).replace("/", "-").replace(" ", "_")
 
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO core.forecasts
-                (forecast_id, forecast_date, target_date, commodity, country,
-                 forecast_type, value, unit, marketing_year, source, notes)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (forecast_id) DO UPDATE SET
-                value = EXCLUDED.value,
-                notes = EXCLUDED.notes,
-                created_at = NOW()
-            RETURNING id, forecast_id
-        """, (
-            forecast_id, forecast_date, target_date, commodity.lower(),
-            country, forecast_type, value, unit, marketing_year, source, notes
-        ))
-        row = cur.fetchone()
-        conn.commit()
-        conn.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO core.forecasts
+                    (forecast_id, forecast_date, target_date, commodity, country,
+                     forecast_type, value, unit, marketing_year, source, notes)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (forecast_id) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    notes = EXCLUDED.notes,
+                    created_at = NOW()
+                RETURNING id, forecast_id
+            """, (
+                forecast_id, forecast_date, target_date, commodity.lower(),
+                country, forecast_type, value, unit, marketing_year, source, notes
+            ))
+            row = cur.fetchone()
+            conn.commit()
 
         return json.dumps({
             "success": True,
@@ -941,6 +1153,175 @@ def record_forecast(commodity: str, forecast_type: str, value: float,
         return json.dumps({"error": str(e)}, default=json_serializer)
 
 
+# ============================================================================
+# TOOL DISPATCH
+# ============================================================================
+
+def dispatch_tool(name: str, arguments: dict) -> str:
+    """Run a tool synchronously (on a worker thread when called from run_tool)."""
+    sources = CACHED_TOOLS.get(name)
+    if sources is not None:
+        return _result_cache.get_or_compute(
+            name, arguments, sources, lambda: _dispatch_uncached(name, arguments)
+        )
+    return _dispatch_uncached(name, arguments)
+
+
+def _dispatch_uncached(name: str, arguments: dict) -> str:
+    if name == "query_database":
+        result = query_database(
+            arguments.get("sql"),
+            arguments.get("limit", 100),
+            arguments.get("page_size"),
+            arguments.get("cursor"),
+            arguments.get("encoding", "records"),
+            arguments.get("close", False)
+        )
+    elif name == "list_tables":
+        result = list_tables(arguments.get("schema"))
+    elif name == "describe_table":
+        result = describe_table(arguments["table_name"])
+    elif name == "get_balance_sheet":
+        result = get_balance_sheet(
+            arguments["commodity"],
+            arguments.get("country", "US"),
+            arguments.get("years", 3)
+        )
+    elif name == "get_production_ranking":
+        result = get_production_ranking(
+            arguments["commodity"],
+            arguments.get("year", 2025),
+            arguments.get("top_n", 15)
+        )
+    elif name == "get_stocks_to_use":
+        result = get_stocks_to_use(
+            arguments.get("commodity"),
+            arguments.get("country")
+        )
+    elif name == "get_commodity_summary":
+        result = get_commodity_summary()
+    elif name == "analyze_supply_demand":
+        result = analyze_supply_demand(
+            arguments["commodity"],
+            arguments.get("country", "US")
+        )
+    elif name == "get_brazil_production":
+        result = get_brazil_production(
+            arguments.get("commodity", "soybeans"),
+            arguments.get("crop_year")
+        )
+    # CNS Tools
+    elif name == "get_data_freshness":
+        result = get_data_freshness(
+            arguments.get("collector_name"),
+            arguments.get("category")
+        )
+    elif name == "get_briefing":
+        result = get_briefing(
+            arguments.get("priority"),
+            arguments.get("event_type")
+        )
+    elif name == "acknowledge_events":
+        result = acknowledge_events(arguments["event_ids"])
+    elif name == "get_collection_history":
+        result = get_collection_history(
+            arguments["collector_name"],
+            arguments.get("last_n", 10)
+        )
+    # Report Generation Tools
+    elif name == "generate_report":
+        result = generate_report(
+            arguments["report_type"],
+            arguments.get("commodity"),
+            arguments.get("country", "US"),
+            arguments.get("include_kg", True)
+        )
+    elif name == "get_forecast_accuracy":
+        result = get_forecast_accuracy(
+            arguments.get("commodity"),
+            arguments.get("forecast_type"),
+            arguments.get("period", "12_months")
+        )
+    elif name == "record_forecast":
+        result = record_forecast(
+            arguments["commodity"],
+            arguments["forecast_type"],
+            arguments["value"],
+            arguments["target_date"],
+            arguments.get("marketing_year"),
+            arguments.get("unit"),
+            arguments.get("source", "user"),
+            arguments.get("notes"),
+            arguments.get("country", "US")
+        )
+    # Knowledge Graph Tools
+    elif name == "search_knowledge_graph":
+        result = search_knowledge_graph(
+            arguments.get("node_type"),
+            arguments.get("label"),
+            arguments.get("key_pattern"),
+            arguments.get("limit", 50)
+        )
+    elif name == "get_kg_context":
+        result = get_kg_context(arguments["node_key"])
+    elif name == "get_kg_relationships":
+        result = get_kg_relationships(
+            arguments["node_key"],
+            arguments.get("edge_type"),
+            arguments.get("direction", "both")
+        )
+    elif name == "get_cache_stats":
+        result = get_cache_stats()
+    else:
+        result = json.dumps({"error": f"Unknown tool: {name}"})
+    return result
+
+
+async def run_tool(name: str, arguments: dict) -> str:
+    """
+    Run a tool on the worker pool with its timeout.
+
+    The event loop only awaits, so concurrent tool calls run side by side.
+    On timeout or cancellation the call's in-flight queries are cancelled
+    server-side; the per-tool statement_timeout backs that up.
+    """
+    timeout = TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT)
+    call = _ToolCall(name, timeout)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), _run_call, call, arguments)
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        call.cancel()
+        return json.dumps({"error": f"{name} timed out after {timeout}s"})
+    except asyncio.CancelledError:
+        call.cancel()
+        raise
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+
+
+def _run_call(call: '_ToolCall', arguments: dict) -> str:
+    _call_state.call = call
+    try:
+        return dispatch_tool(call.name, arguments)
+    finally:
+        _call_state.call = None
+
+
+def shutdown():
+    """Stop the worker pool and close pooled connections."""
+    global _executor, _pool
+    _pager.close_all()
+    with _init_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
 # ============================================================================
 # MCP SERVER SETUP
 # ============================================================================
@@ -958,9 +1339,12 @@ if MCP_AVAILABLE:
                     "type": "object",
                     "properties": {
                         "sql": {"type": "string", "description": "SQL SELECT query"},
-                        "limit": {"type": "integer", "description": "Max rows (default 100)", "default": 100}
-                    },
-                    "required": ["sql"]
+                        "limit": {"type": "integer", "description": "Max rows (default 100)", "default": 100},
+                        "page_size": {"type": "integer", "description": "Page through a large result on a server-side cursor, this many rows per call (max 5000). Ignores limit."},
+                        "cursor": {"type": "string", "description": "next_cursor token from the previous page; sql not needed"},
+                        "encoding": {"type": "string", "description": "'records' (row objects) or 'columnar' (column -> values, more compact)", "default": "records", "enum": ["records", "columnar"]},
+                        "close": {"type": "boolean", "description": "With cursor: release it without fetching more", "default": False}
+                    }
                 }
             ),
             Tool(
@@ -1190,117 +1574,28 @@ if MCP_AVAILABLE:
                     "required": ["node_key"]
                 }
             ),
+            # Cache Tools
+            Tool(
+                name="get_cache_stats",
+                description="Show hit/miss statistics for the S&D tool result cache, including how much database time it has saved.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
         ]
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-        try:
-            if name == "query_database":
-                result = query_database(arguments["sql"], arguments.get("limit", 100))
-            elif name == "list_tables":
-                result = list_tables(arguments.get("schema"))
-            elif name == "describe_table":
-                result = describe_table(arguments["table_name"])
-            elif name == "get_balance_sheet":
-                result = get_balance_sheet(
-                    arguments["commodity"],
-                    arguments.get("country", "US"),
-                    arguments.get("years", 3)
-                )
-            elif name == "get_production_ranking":
-                result = get_production_ranking(
-                    arguments["commodity"],
-                    arguments.get("year", 2025),
-                    arguments.get("top_n", 15)
-                )
-            elif name == "get_stocks_to_use":
-                result = get_stocks_to_use(
-                    arguments.get("commodity"),
-                    arguments.get("country")
-                )
-            elif name == "get_commodity_summary":
-                result = get_commodity_summary()
-            elif name == "analyze_supply_demand":
-                result = analyze_supply_demand(
-                    arguments["commodity"],
-                    arguments.get("country", "US")
-                )
-            elif name == "get_brazil_production":
-                result = get_brazil_production(
-                    arguments.get("commodity", "soybeans"),
-                    arguments.get("crop_year")
-                )
-            # CNS Tools
-            elif name == "get_data_freshness":
-                result = get_data_freshness(
-                    arguments.get("collector_name"),
-                    arguments.get("category")
-                )
-            elif name == "get_briefing":
-                result = get_briefing(
-                    arguments.get("priority"),
-                    arguments.get("event_type")
-                )
-            elif name == "acknowledge_events":
-                result = acknowledge_events(arguments["event_ids"])
-            elif name == "get_collection_history":
-                result = get_collection_history(
-                    arguments["collector_name"],
-                    arguments.get("last_n", 10)
-                )
-            # Report Generation Tools
-            elif name == "generate_report":
-                result = generate_report(
-                    arguments["report_type"],
-                    arguments.get("commodity"),
-                    arguments.get("country", "US"),
-                    arguments.get("include_kg", True)
-                )
-            elif name == "get_forecast_accuracy":
-                result = get_forecast_accuracy(
-                    arguments.get("commodity"),
-                    arguments.get("forecast_type"),
-                    arguments.get("period", "12_months")
-                )
-            elif name == "record_forecast":
-                result = record_forecast(
-                    arguments["commodity"],
-                    arguments["forecast_type"],
-                    arguments["value"],
-                    arguments["target_date"],
-                    arguments.get("marketing_year"),
-                    arguments.get("unit"),
-                    arguments.get("source", "user"),
-                    arguments.get("notes"),
-                    arguments.get("country", "US")
-                )
-            # Knowledge Graph Tools
-            elif name == "search_knowledge_graph":
-                result = search_knowledge_graph(
-                    arguments.get("node_type"),
-                    arguments.get("label"),
-                    arguments.get("key_pattern"),
-                    arguments.get("limit", 50)
-                )
-            elif name == "get_kg_context":
-                result = get_kg_context(arguments["node_key"])
-            elif name == "get_kg_relationships":
-                result = get_kg_relationships(
-                    arguments["node_key"],
-                    arguments.get("edge_type"),
-                    arguments.get("direction", "both")
-                )
-            else:
-                result = json.dumps({"error": f"Unknown tool: {name}"})
-
-            return [TextContent(type="text", text=result)]
-
-        except Exception as e:
-            return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+        result = await run_tool(name, arguments)
+        return [TextContent(type="text", text=result)]
 
     async def main():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, server.create_initialization_options())
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+        finally:
+            shutdown()
 
     if __name__ == "__main__":
         asyncio.run(main())
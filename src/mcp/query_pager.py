@@ -0,0 +1,251 @@
+"""
+Server-side-cursor paging for MCP query results.
+
+query_database normally fetches the whole (LIMIT-capped) result and
+returns it as a list of dicts. For exploratory queries over big tables
+(bronze.census_trade, silver.weather_observation) the pager instead opens
+a named PostgreSQL cursor in a read-only transaction and returns one page
+at a time plus an opaque cursor token for the next page. Memory is bounded
+by the page size, and the first page arrives as soon as Postgres produces
+page_size rows rather than after the whole result is built.
+
+Each open cursor holds one pooled connection until it is exhausted, closed,
+or idle for `idle_timeout` seconds. At most `max_open` cursors exist at a
+time; opening another evicts the least recently used one.
+
+Encodings:
+    records   {"columns": [...], "rows": [{col: val, ...}, ...]}
+    columnar  {"columns": [...], "data": {col: [val, ...], ...}}
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+ENCODINGS = ('records', 'columnar')
+MAX_PAGE_SIZE = 5000
+
+
+class _CursorSession:
+    def __init__(self, token: str, conn, cursor, page_size: int):
+        self.token = token
+        self.conn = conn
+        self.cursor = cursor
+        self.page_size = page_size
+        self.columns: Optional[List[str]] = None
+        self.lookahead: Optional[tuple] = None
+        self.pages = 0
+        self.rows = 0
+        self.last_used = time.monotonic()
+        self.lock = threading.RLock()
+
+
+def encode_page(columns: Sequence[str], rows: Sequence[Sequence[Any]], encoding: str) -> Dict[str, Any]:
+    """Shape tuple rows as records (list of dicts) or columnar (dict of lists)."""
+    if encoding == 'columnar':
+        return {
+            "columns": list(columns),
+            "data": {c: [row[i] for row in rows] for i, c in enumerate(columns)},
+        }
+    return {
+        "columns": list(columns),
+        "rows": [dict(zip(columns, row)) for row in rows],
+    }
+
+
+class QueryPager:
+    """
+    Registry of open server-side cursors, keyed by cursor token.
+
+    Args:
+        pool_fn: Callable returning the ConnectionPool to check out of
+        max_open: Cap on simultaneously open cursors (each pins a connection)
+        idle_timeout: Seconds before an unused cursor is closed
+    """
+
+    def __init__(self, pool_fn, max_open: int = 4, idle_timeout: float = 300.0):
+        self._pool_fn = pool_fn
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions: 'OrderedDict[str, _CursorSession]' = OrderedDict()
+
+        # Metrics
+        self._opened = 0
+        self._pages = 0
+        self._expired = 0
+        self._evicted = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def open(self, sql: str, params: Optional[tuple], page_size: int,
+             encoding: str = 'records', statement_timeout_ms: int = 60000,
+             call=None) -> Dict[str, Any]:
+        """Declare a cursor for `sql` and return its first page."""
+        page_size = self._check(page_size, encoding)
+        self.reap()
+
+        pool = self._pool_fn()
+        conn = pool.getconn()
+        token = secrets.token_urlsafe(12)
+        try:
+            setup = conn.cursor()
+            setup.execute("SET TRANSACTION READ ONLY")
+            setup.execute("SET LOCAL statement_timeout = %s", (int(statement_timeout_ms),))
+            setup.close()
+            cursor = conn.cursor(name=f"mcp_page_{token.replace('-', '_')}")
+            cursor.itersize = page_size
+        except BaseException:
+            self._release_conn(conn)
+            raise
+
+        session = _CursorSession(token, conn, cursor, page_size)
+        evicted = []
+        with self._lock:
+            self._sessions[token] = session
+            self._opened += 1
+            while len(self._sessions) > self.max_open:
+                evicted.append(self._sessions.popitem(last=False)[1])
+                self._evicted += 1
+        for oldest in evicted:
+            self._close_session(oldest)
+
+        with session.lock:
+            return self._fetch(session, encoding, call, sql=sql, params=params)
+
+    def next(self, token: str, encoding: str = 'records', page_size: Optional[int] = None,
+             call=None) -> Dict[str, Any]:
+        """Return the next page for a cursor token."""
+        self.reap()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None:
+                self._sessions.move_to_end(token)
+        if session is None:
+            return {"error": "Unknown or expired cursor token; re-run the query"}
+        if page_size is not None:
+            session.page_size = self._check(page_size, encoding)
+        else:
+            self._check(session.page_size, encoding)
+        with session.lock:
+            return self._fetch(session, encoding, call)
+
+    def close(self, token: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(token, None)
+        if session is None:
+            return False
+        self._close_session(session)
+        return True
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._close_session(session)
+
+    def reap(self):
+        """Close cursors idle longer than idle_timeout."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [t for t, s in self._sessions.items() if now - s.last_used > self.idle_timeout]
+            expired = [self._sessions.pop(t) for t in stale]
+            self._expired += len(expired)
+        for session in expired:
+            self._close_session(session)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'open_cursors': len(self._sessions),
+                'max_open': self.max_open,
+                'opened': self._opened,
+                'pages_served': self._pages,
+                'expired': self._expired,
+                'evicted': self._evicted,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _check(page_size: int, encoding: str) -> int:
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {ENCODINGS}, got {encoding!r}")
+        return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+    def _fetch(self, session: _CursorSession, encoding: str, call,
+               sql: Optional[str] = None, params: Optional[tuple] = None) -> Dict[str, Any]:
+        if session.conn is None:
+            return {"error": "Cursor was closed (evicted or idle); re-run the query"}
+        conn = session.conn
+        if call is not None:
+            call.attach(conn)
+        try:
+            if sql is not None:
+                session.cursor.execute(sql, params)
+            # One row of lookahead tells us whether another page exists
+            want = session.page_size + (0 if session.lookahead is not None else 1)
+            fetched = session.cursor.fetchmany(want)
+            if session.columns is None:
+                session.columns = [d[0] for d in session.cursor.description or []]
+        except Exception:
+            with self._lock:
+                self._sessions.pop(session.token, None)
+            self._close_session(session)
+            raise
+        finally:
+            if call is not None:
+                call.detach(conn)
+
+        rows = ([session.lookahead] if session.lookahead is not None else []) + list(fetched)
+        session.lookahead = rows[session.page_size] if len(rows) > session.page_size else None
+        rows = rows[:session.page_size]
+
+        session.pages += 1
+        session.rows += len(rows)
+        session.last_used = time.monotonic()
+        with self._lock:
+            self._pages += 1
+
+        has_more = session.lookahead is not None
+        page = encode_page(session.columns, rows, encoding)
+        page.update({
+            "row_count": len(rows),
+            "page": session.pages,
+            "rows_so_far": session.rows,
+            "next_cursor": session.token if has_more else None,
+        })
+        if not has_more:
+            self.close(session.token)
+        return page
+
+    def _close_session(self, session: _CursorSession):
+        with session.lock:
+            if session.conn is None:
+                return
+            try:
+                session.cursor.close()
+            except Exception as e:
+                logger.debug(f"Closing cursor {session.token} failed: {e}")
+            self._release_conn(session.conn)
+            session.conn = None
+
+    def _release_conn(self, conn):
+        pool = self._pool_fn()
+        discard = bool(getattr(conn, 'closed', False))
+        try:
+            if not discard:
+                conn.rollback()
+        except Exception:
+            discard = True
+        pool.putconn(conn, discard=discard)
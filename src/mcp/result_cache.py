@@ -0,0 +1,158 @@
+"""
+Result cache for read-only MCP tools.
+
+The S&D tools re-run the same aggregations every time a session asks,
+but their answers only change when a collector that feeds the underlying
+table finishes. Each cached entry therefore records a data version for
+its source collectors (from core.collection_status / core.event_log) and
+is served only while that version is unchanged.
+
+The version lookup itself is one indexed query per source group, made at
+most once every `poll_interval` seconds, so a burst of calls costs one
+query instead of one aggregation each. Answers can lag a collector
+finishing by up to `poll_interval`.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCache:
+    """
+    LRU cache of tool results keyed on tool + arguments, invalidated by
+    source data versions.
+
+    Args:
+        version_fn: Callable taking a tuple of collector names and
+            returning a hashable token that changes when any of them
+            delivers new data
+        max_entries: LRU bound on cached results
+        poll_interval: Seconds to reuse a fetched version token
+    """
+
+    def __init__(
+        self,
+        version_fn: Callable[[Tuple[str, ...]], Hashable],
+        max_entries: int = 256,
+        poll_interval: float = 10.0,
+    ):
+        self.version_fn = version_fn
+        self.max_entries = max_entries
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[Hashable, str, float]]' = OrderedDict()
+        self._versions: Dict[Tuple[str, ...], Tuple[Hashable, float]] = {}
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+        self._bypassed = 0
+        self._saved_seconds = 0.0
+        self._version_queries = 0
+        self._by_tool: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_or_compute(self, tool: str, arguments: Dict[str, Any],
+                       sources: Sequence[str], compute: Callable[[], str]) -> str:
+        """Return the cached result for tool+arguments, or compute and cache it."""
+        sources = tuple(sorted(sources))
+        key = (tool, json.dumps(arguments or {}, sort_keys=True, default=str))
+
+        try:
+            version = self._current_version(sources)
+        except Exception as e:
+            logger.warning(f"Cache version lookup failed for {tool}; bypassing cache: {e}")
+            with self._lock:
+                self._bypassed += 1
+            return compute()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    self._saved_seconds += entry[2]
+                    self._tool_stats(tool)['hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._invalidations += 1
+            self._misses += 1
+            self._tool_stats(tool)['misses'] += 1
+
+        start = time.perf_counter()
+        result = compute()
+        elapsed = time.perf_counter() - start
+
+        if self._cacheable(result):
+            with self._lock:
+                self._entries[key] = (version, result, elapsed)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and estimated DB time saved (JSON-serializable)."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+                'invalidations': self._invalidations,
+                'evictions': self._evictions,
+                'bypassed': self._bypassed,
+                'version_queries': self._version_queries,
+                'saved_seconds': round(self._saved_seconds, 3),
+                'poll_interval_s': self.poll_interval,
+                'by_tool': {t: dict(s) for t, s in self._by_tool.items()},
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _current_version(self, sources: Tuple[str, ...]) -> Hashable:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(sources)
+            if cached is not None and now - cached[1] < self.poll_interval:
+                return cached[0]
+        version = self.version_fn(sources)
+        with self._lock:
+            self._versions[sources] = (version, now)
+            self._version_queries += 1
+        return version
+
+    def _tool_stats(self, tool: str) -> Dict[str, int]:
+        return self._by_tool.setdefault(tool, {'hits': 0, 'misses': 0})
+
+    @staticmethod
+    def _cacheable(result: str) -> bool:
+        """Don't cache errors (timeouts, DB hiccups) — retry them next call."""
+        try:
+            parsed = json.loads(result)
+        except (TypeError, ValueError):
+            return False
+        return not (isinstance(parsed, dict) and 'error' in parsed)
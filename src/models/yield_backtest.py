@@ -0,0 +1,347 @@
+"""
+Yield Model Backtest Engine
+
+Leave-one-year-out (or walk-forward) backtesting without the database in
+the inner loop:
+
+  1. The panel for a crop — every silver.yield_features row joined to its
+     bronze.nass_state_yields actual, plus linear trend yields — is loaded
+     in one query and held as numpy arrays. A compressed .npz snapshot is
+     kept under data/cache/yield_backtest and reused while the source
+     tables are unchanged.
+  2. Each (crop, test_year, week) fold is fit and scored from its slice of
+     the panel, fanned out across a process pool.
+  3. Fold results are persisted keyed by a hash of exactly the rows and
+     settings the fold used, so a rerun only recomputes folds whose
+     inputs changed.
+
+Usage:
+    engine = BacktestEngine()
+    folds = engine.run(['corn', 'soybeans'], test_years=range(2015, 2025),
+                       weeks=[18, 22, 26, 30, 34, 38])
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.yield_prediction_model import (
+    ALL_NUMERIC_FEATURES, CROP_DB, YieldPredictionModel, fit_submodels, get_db_connection,
+)
+
+CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "yield_backtest"
+
+# Bump when fitting or scoring logic changes so cached folds are recomputed
+FOLD_VERSION = 1
+# Bump when the panel query or array layout changes so .npz snapshots are reloaded
+PANEL_VERSION = 1
+
+FIRST_TRAIN_YEAR = 2005
+MIN_TRAIN_YEARS = 10
+MIN_TRAIN_SAMPLES = 5
+
+BACKTEST_WORKERS = int(os.environ.get("RLC_BACKTEST_WORKERS", os.cpu_count() or 1))
+
+
+@dataclass
+class Panel:
+    """All feature rows for one crop, one array element per (state, year, week)."""
+    crop: str
+    fingerprint: str
+    states: np.ndarray        # str
+    years: np.ndarray         # int
+    weeks: np.ndarray         # int
+    stages: np.ndarray        # str, '' where growth_stage is NULL
+    features: np.ndarray      # float (rows x ALL_NUMERIC_FEATURES), NaN -> 0
+    actuals: np.ndarray       # float, NaN where no final yield
+    trend_yields: np.ndarray  # float, NaN where no trend coefficients
+
+    ARRAYS = ('states', 'years', 'weeks', 'stages', 'features', 'actuals', 'trend_yields')
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + '.tmp.npz')
+        np.savez_compressed(tmp, crop=self.crop, fingerprint=self.fingerprint,
+                            **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'Panel':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(crop=str(data['crop']), fingerprint=str(data['fingerprint']),
+                       **{name: data[name] for name in cls.ARRAYS})
+
+    def years_with_actuals(self) -> List[int]:
+        return sorted(set(self.years[~np.isnan(self.actuals)].tolist()))
+
+
+def _panel_fingerprint(cur, crop: str, crop_db: str) -> str:
+    """
+    Panel layout (PANEL_VERSION, feature columns, state names) plus row counts
+    and last-write times of the three source tables.
+    """
+    from src.models.yield_feature_engine import US_STATES
+
+    layout = json.dumps([PANEL_VERSION, ALL_NUMERIC_FEATURES, sorted(US_STATES.items())])
+    cur.execute("""
+        SELECT
+            (SELECT COUNT(*) || '|' || COALESCE(MAX(updated_at)::text, '')
+             FROM silver.yield_features WHERE crop = %s),
+            (SELECT COUNT(*) || '|' || COALESCE(MAX(collected_at)::text, '')
+             FROM bronze.nass_state_yields WHERE commodity = %s),
+            (SELECT COUNT(*) || '|' || COALESCE(MAX(updated_at)::text, '')
+             FROM silver.yield_trend WHERE commodity = %s AND trend_type = 'linear')
+    """, (crop, crop_db, crop_db))
+    return ';'.join([hashlib.sha1(layout.encode()).hexdigest()[:12],
+                     *(str(v) for v in cur.fetchone())])
+
+
+def load_panel(crop: str, cache_dir: Path = CACHE_DIR, refresh: bool = False,
+               connection_fn: Callable = get_db_connection) -> Panel:
+    """Load the backtest panel for a crop, from the .npz snapshot when current."""
+    from src.models.yield_feature_engine import US_STATES
+
+    crop_db = CROP_DB.get(crop, crop.upper())
+    path = Path(cache_dir) / f"{crop}_panel.npz"
+    conn = connection_fn()
+    cur = conn.cursor()
+    try:
+        fingerprint = _panel_fingerprint(cur, crop, crop_db)
+        if not refresh and path.exists():
+            try:
+                panel = Panel.load(path)
+                if panel.fingerprint == fingerprint:
+                    logger.info(f"{crop}: panel snapshot current ({len(panel.years)} rows)")
+                    return panel
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"{crop}: unreadable panel snapshot {path}: {e}")
+
+        feature_cols = ", ".join(f"f.{c}" for c in ALL_NUMERIC_FEATURES)
+        cur.execute(f"""
+            SELECT f.state, f.year, f.week, f.growth_stage, {feature_cols}, y.yield_per_acre
+            FROM silver.yield_features f
+            LEFT JOIN bronze.nass_state_yields y
+                ON f.state = y.state_abbrev
+                AND f.year = y.year
+                AND y.commodity = %s
+            WHERE f.crop = %s
+            ORDER BY f.week, f.year, f.state
+        """, (crop_db, crop))
+        rows = cur.fetchall()
+
+        cur.execute("""
+            SELECT state, slope, intercept
+            FROM silver.yield_trend
+            WHERE commodity = %s AND trend_type = 'linear'
+        """, (crop_db,))
+        # Same filter as YieldPredictionModel._trend_coefficients
+        trends = {state: (float(slope), float(intercept))
+                  for state, slope, intercept in cur.fetchall()
+                  if slope is not None and intercept is not None}
+    finally:
+        cur.close()
+        conn.close()
+
+    n_features = len(ALL_NUMERIC_FEATURES)
+    states = np.array([r[0] for r in rows], dtype=str)
+    years = np.array([r[1] for r in rows], dtype=int)
+    coef = np.array([trends.get(US_STATES.get(st, st), (np.nan, np.nan)) for st in states],
+                    dtype=float).reshape(-1, 2)
+    panel = Panel(
+        crop=crop,
+        fingerprint=fingerprint,
+        states=states,
+        years=years,
+        weeks=np.array([r[2] for r in rows], dtype=int),
+        stages=np.array([r[3] or '' for r in rows], dtype=str),
+        features=np.nan_to_num(
+            np.array([r[4:4 + n_features] for r in rows], dtype=float).reshape(-1, n_features),
+            nan=0.0),
+        actuals=np.array([r[4 + n_features] for r in rows], dtype=float),
+        trend_yields=coef[:, 0] * years + coef[:, 1],
+    )
+    panel.save(path)
+    logger.info(f"{crop}: loaded panel ({len(rows)} rows) and saved snapshot")
+    return panel
+
+
+# ----------------------------------------------------------------------
+# FOLDS
+# ----------------------------------------------------------------------
+
+def build_fold(panel: Panel, test_year: int, week: int, train_years: List[int]) -> dict:
+    """Training and test slices of the panel for one fold."""
+    at_week = panel.weeks == week
+    has_actual = ~np.isnan(panel.actuals)
+    train = at_week & has_actual & np.isin(panel.years, train_years)
+    test = at_week & has_actual & (panel.years == test_year) & ~np.isnan(panel.trend_yields)
+
+    def part(mask):
+        return {name: getattr(panel, name)[mask] for name in Panel.ARRAYS}
+
+    return {'crop': panel.crop, 'test_year': int(test_year), 'week': int(week),
+            'train': part(train), 'test': part(test)}
+
+
+def fold_key(fold: dict, fit_fn: Callable) -> str:
+    """Content hash of everything a fold's result depends on."""
+    h = hashlib.sha1()
+    h.update(f"{FOLD_VERSION}|{fold['crop']}|{fold['test_year']}|{fold['week']}|"
+             f"{fit_fn.__module__}.{fit_fn.__qualname__}".encode())
+    for part in ('train', 'test'):
+        for name in Panel.ARRAYS:
+            arr = np.ascontiguousarray(fold[part][name])
+            h.update(name.encode())
+            h.update(str(arr.shape).encode())
+            h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def run_fold(fold: dict, fit_fn: Callable = fit_submodels) -> dict:
+    """Fit on the fold's training slice and predict its test slice."""
+    train, test = fold['train'], fold['test']
+    y = train['actuals']
+    trend = train['trend_yields'].copy()
+    trend[np.isnan(trend)] = np.mean(y)
+
+    models = fit_fn(train['states'].tolist(), train['years'], train['features'], y, trend)
+    stages = [s or 'vegetative' for s in test['stages'].tolist()]
+    ensemble, _ = YieldPredictionModel()._ensemble_matrix(
+        fold['crop'], fold['test_year'], test['features'], test['trend_yields'], stages, models)
+
+    return {
+        'crop': fold['crop'],
+        'test_year': fold['test_year'],
+        'week': fold['week'],
+        'n_train': int(len(y)),
+        'states': test['states'].tolist(),
+        'predicted': [float(round(v, 1)) for v in ensemble],
+        'actual': test['actuals'].tolist(),
+    }
+
+
+class BacktestEngine:
+    """Runs backtest folds in parallel and caches their results on disk."""
+
+    def __init__(self, workers: int = None, cache_dir: Path = CACHE_DIR,
+                 use_cache: bool = True, fit_fn: Callable = fit_submodels,
+                 connection_fn: Callable = get_db_connection):
+        self.workers = workers or BACKTEST_WORKERS
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self.fit_fn = fit_fn
+        self.connection_fn = connection_fn
+        self.panels: Dict[str, Panel] = {}
+        self.stats = {'folds': 0, 'cached': 0, 'computed': 0}
+
+    def panel(self, crop: str) -> Panel:
+        """Panel for a crop, loaded once per engine."""
+        if crop not in self.panels:
+            self.panels[crop] = load_panel(crop, cache_dir=self.cache_dir,
+                                           connection_fn=self.connection_fn)
+        return self.panels[crop]
+
+    def plan(self, crop: str, test_years, weeks, walk_forward: bool = False) -> List[dict]:
+        """Folds to evaluate for one crop, skipping those without enough data."""
+        panel = self.panel(crop)
+        actual_years = panel.years_with_actuals()
+        folds = []
+        for test_year in test_years:
+            if test_year not in actual_years:
+                logger.warning(f"No actual yields for {crop} {test_year}, skipping")
+                continue
+            train_yrs = [y for y in actual_years
+                         if y != test_year and y >= FIRST_TRAIN_YEAR
+                         and (not walk_forward or y < test_year)]
+            if len(train_yrs) < MIN_TRAIN_YEARS:
+                logger.warning(f"Only {len(train_yrs)} training years for {crop} {test_year}")
+                continue
+            for week in weeks:
+                fold = build_fold(panel, test_year, week, train_yrs)
+                if len(fold['test']['years']) == 0:
+                    continue
+                if len(fold['train']['years']) < MIN_TRAIN_SAMPLES:
+                    logger.warning(f"Only {len(fold['train']['years'])} training samples "
+                                   f"for {crop} {test_year} week {week}")
+                    continue
+                folds.append(fold)
+        return folds
+
+    def run(self, crops: List[str], test_years, weeks,
+            walk_forward: bool = False) -> Dict[str, List[dict]]:
+        """
+        Evaluate every (crop, test_year, week) fold.
+
+        Returns fold results per crop, ordered by test year then week.
+        """
+        folds = []
+        for crop in crops:
+            folds.extend(self.plan(crop, test_years, weeks, walk_forward))
+
+        results: List[Optional[dict]] = [None] * len(folds)
+        pending = []
+        for i, fold in enumerate(folds):
+            key = fold_key(fold, self.fit_fn)
+            cached = self._read_cached(fold, key) if self.use_cache else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, key))
+
+        self.stats['folds'] += len(folds)
+        self.stats['cached'] += len(folds) - len(pending)
+        self.stats['computed'] += len(pending)
+        logger.info(f"Backtest: {len(folds)} folds, {len(folds) - len(pending)} cached, "
+                    f"{len(pending)} to run on {min(self.workers, max(len(pending), 1))} workers")
+
+        if self.workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [(i, key, pool.submit(run_fold, folds[i], self.fit_fn))
+                           for i, key in pending]
+                for i, key, future in futures:
+                    results[i] = future.result()
+                    self._write_cached(results[i], key)
+        else:
+            for i, key in pending:
+                results[i] = run_fold(folds[i], self.fit_fn)
+                self._write_cached(results[i], key)
+
+        by_crop: Dict[str, List[dict]] = {crop: [] for crop in crops}
+        for result in results:
+            by_crop[result['crop']].append(result)
+        return by_crop
+
+    def _fold_path(self, crop: str, test_year: int, week: int) -> Path:
+        return self.cache_dir / "folds" / f"{crop}_{test_year}_wk{week}.json"
+
+    def _read_cached(self, fold: dict, key: str) -> Optional[dict]:
+        path = self._fold_path(fold['crop'], fold['test_year'], fold['week'])
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return payload['result'] if payload.get('key') == key else None
+
+    def _write_cached(self, result: dict, key: str):
+        if not self.use_cache:
+            return
+        path = self._fold_path(result['crop'], result['test_year'], result['week'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'key': key, 'result': result}, f)
+        os.replace(tmp, path)
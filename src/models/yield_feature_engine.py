@@ -9,6 +9,7 @@ One row per (state, crop, year, week) — the input to the yield prediction mode
 Usage:
     python -m src.models.yield_feature_engine --state IA --crop corn --year 2024
     python -m src.models.yield_feature_engine --all --year 2024
+    python -m src.models.yield_feature_engine --all --year 2024 --incremental
     python -m src.models.yield_feature_engine --verify
 """
 
@@ -50,10 +51,59 @@ US_STATES = {
 }
 STATE_FULL_TO_ABBREV = {v.upper(): k for k, v in US_STATES.items()}
 
+
+def to_state_abbrev(state: str) -> str:
+    """'Iowa' / 'IOWA' / 'IA' -> 'IA' (unknown names pass through unchanged)."""
+    return state if len(state) == 2 else STATE_FULL_TO_ABBREV.get(state.upper(), state)
+
 # Crop name mapping between systems
 CROP_CPC_MAP = {'corn': 'corn', 'soybeans': 'soybeans', 'winter_wheat': 'winter_wheat', 'cotton': 'cotton'}
 CROP_NASS_MAP = {'corn': 'CORN', 'soybeans': 'SOYBEANS', 'winter_wheat': 'WHEAT_ALL', 'cotton': 'COTTON'}
 
+# Feature columns of silver.yield_features, in upsert order
+FEATURE_COLUMNS = [
+    'gdd_cum', 'gdd_vs_normal_pct', 'precip_cum_mm', 'precip_vs_normal_pct',
+    'stress_days_heat', 'stress_days_drought', 'excess_moisture_days', 'frost_events',
+    'tmax_weekly_avg', 'tmin_weekly_avg', 'tavg_weekly',
+    'ndvi_mean', 'ndvi_anomaly', 'ndvi_trend_4wk',
+    'condition_index', 'condition_vs_5yr', 'progress_index', 'progress_vs_normal',
+    'pct_planted', 'pct_emerged', 'pct_silking', 'pct_dough', 'pct_mature', 'pct_harvested',
+    'good_excellent_pct',
+    'ww_risk_score', 'ww_outlook_sentiment',
+]
+# Counters stored as 0 rather than NULL when no data
+COUNT_FEATURES = ('stress_days_heat', 'stress_days_drought', 'excess_moisture_days', 'frost_events')
+
+UPSERT_SQL = f"""
+    INSERT INTO silver.yield_features
+        (state, crop, year, week, week_ending_date,
+         {', '.join(FEATURE_COLUMNS)},
+         growth_stage, feature_version)
+    VALUES %s
+    ON CONFLICT (state, crop, year, week)
+    DO UPDATE SET
+        week_ending_date = EXCLUDED.week_ending_date,
+        {', '.join(f'{c} = EXCLUDED.{c}' for c in FEATURE_COLUMNS)},
+        growth_stage = EXCLUDED.growth_stage,
+        updated_at = NOW()
+"""
+UPSERT_TEMPLATE = "(" + ",".join(["%s"] * (5 + len(FEATURE_COLUMNS) + 1)) + ",'v1')"
+
+# Climatology regions, in order of preference, for season-to-date normals
+CLIMATOLOGY_REGIONS = ('US_CORN_BELT', 'US_SOY_BELT', 'US_WHEAT_WINTER', 'US_WHEAT_SPRING')
+
+# World Weather email keyword weights
+WW_RISK_KEYWORDS = {
+    'drought': 3, 'flooding': 3, 'flood': 2, 'excessive': 2,
+    'stress': 2, 'drier-bias': 1, 'net drying': 1, 'significant': 1,
+    'severe': 2, 'heat': 1, 'frost': 2, 'freeze': 3,
+}
+WW_FAVORABLE_KEYWORDS = {
+    'favorable': -1, 'adequate': -1, 'improved': -1, 'beneficial': -1,
+    'normal': -0.5, 'no significant': -0.5, 'unchanged': -0.5,
+}
+
+
 # NASS week → approximate calendar date (week 1 starts early April)
 def nass_week_to_date(year: int, week: int) -> date:
     """Convert NASS week number to approximate week-ending date (Sunday)."""
@@ -122,120 +172,75 @@ class YieldFeatureEngine:
     # ------------------------------------------------------------------
 
     def build_features(self, state: str, crop: str, year: int,
-                       week_start: int = 1, week_end: int = 40) -> int:
+                       week_start: int = 1, week_end: int = 40,
+                       incremental: bool = False) -> int:
         """Build feature vectors for a specific state/crop/year."""
-        conn = self._get_conn()
-        cur = conn.cursor()
-        count = 0
+        return self.build_season(crop, year, [state], week_start, week_end, incremental)
 
-        state_abbrev = state if len(state) == 2 else STATE_FULL_TO_ABBREV.get(state.upper(), state)
+    def build_season(self, crop: str, year: int, states: list,
+                     week_start: int = 1, week_end: int = 40,
+                     incremental: bool = False) -> int:
+        """
+        Build feature vectors for many states of one crop/year in one pass.
+
+        Each source is read once for the whole span of weeks (weather as one
+        daily series per state), cumulative weather features come from
+        prefix sums over that series, and all rows are upserted with one
+        multi-row statement. With incremental=True only the newest completed
+        week in the range is computed. States may be abbreviations or full
+        names, as with build_features.
+        """
+        from psycopg2.extras import execute_values
 
+        states = list(dict.fromkeys(to_state_abbrev(st) for st in states))
+
+        weeks = []
         for week in range(week_start, week_end + 1):
             week_date = nass_week_to_date(year, week)
             if week_date > date.today():
                 break
+            weeks.append((week, week_date))
+        if incremental:
+            weeks = weeks[-1:]
+        if not weeks or not states:
+            return 0
 
-            features = {}
-
-            # Weather
-            wx = self._get_weather_features(cur, state_abbrev, crop, year, week, week_date)
-            features.update(wx)
-
-            # CPC gridded condition/progress (national)
-            cpc = self._get_cpc_features(cur, crop, year, week)
-            features.update(cpc)
-
-            # NASS tabular progress/condition (state-level)
-            nass = self._get_nass_progress(cur, crop, state_abbrev, year, week, week_date)
-            features.update(nass)
-
-            # NDVI (may be empty)
-            ndvi = self._get_ndvi_features(cur, state_abbrev, crop, year, week, week_date)
-            features.update(ndvi)
-
-            # World Weather signals
-            ww = self._get_ww_signals(cur, year, week, week_date)
-            features.update(ww)
-
-            # Growth stage
-            growth_stage = self._determine_growth_stage(crop, week)
-            features['growth_stage'] = growth_stage
-
-            # Upsert
-            cur.execute("""
-                INSERT INTO silver.yield_features
-                    (state, crop, year, week, week_ending_date,
-                     gdd_cum, gdd_vs_normal_pct, precip_cum_mm, precip_vs_normal_pct,
-                     stress_days_heat, stress_days_drought, excess_moisture_days, frost_events,
-                     tmax_weekly_avg, tmin_weekly_avg, tavg_weekly,
-                     ndvi_mean, ndvi_anomaly, ndvi_trend_4wk,
-                     condition_index, condition_vs_5yr, progress_index, progress_vs_normal,
-                     pct_planted, pct_emerged, pct_silking, pct_dough, pct_mature, pct_harvested,
-                     good_excellent_pct,
-                     ww_risk_score, ww_outlook_sentiment,
-                     growth_stage, feature_version)
-                VALUES (%s,%s,%s,%s,%s,
-                        %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,
-                        %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,'v1')
-                ON CONFLICT (state, crop, year, week)
-                DO UPDATE SET
-                    week_ending_date = EXCLUDED.week_ending_date,
-                    gdd_cum = EXCLUDED.gdd_cum,
-                    gdd_vs_normal_pct = EXCLUDED.gdd_vs_normal_pct,
-                    precip_cum_mm = EXCLUDED.precip_cum_mm,
-                    precip_vs_normal_pct = EXCLUDED.precip_vs_normal_pct,
-                    stress_days_heat = EXCLUDED.stress_days_heat,
-                    stress_days_drought = EXCLUDED.stress_days_drought,
-                    excess_moisture_days = EXCLUDED.excess_moisture_days,
-                    frost_events = EXCLUDED.frost_events,
-                    tmax_weekly_avg = EXCLUDED.tmax_weekly_avg,
-                    tmin_weekly_avg = EXCLUDED.tmin_weekly_avg,
-                    tavg_weekly = EXCLUDED.tavg_weekly,
-                    ndvi_mean = EXCLUDED.ndvi_mean,
-                    ndvi_anomaly = EXCLUDED.ndvi_anomaly,
-                    ndvi_trend_4wk = EXCLUDED.ndvi_trend_4wk,
-                    condition_index = EXCLUDED.condition_index,
-                    condition_vs_5yr = EXCLUDED.condition_vs_5yr,
-                    progress_index = EXCLUDED.progress_index,
-                    progress_vs_normal = EXCLUDED.progress_vs_normal,
-                    pct_planted = EXCLUDED.pct_planted,
-                    pct_emerged = EXCLUDED.pct_emerged,
-                    pct_silking = EXCLUDED.pct_silking,
-                    pct_dough = EXCLUDED.pct_dough,
-                    pct_mature = EXCLUDED.pct_mature,
-                    pct_harvested = EXCLUDED.pct_harvested,
-                    good_excellent_pct = EXCLUDED.good_excellent_pct,
-                    ww_risk_score = EXCLUDED.ww_risk_score,
-                    ww_outlook_sentiment = EXCLUDED.ww_outlook_sentiment,
-                    growth_stage = EXCLUDED.growth_stage,
-                    updated_at = NOW()
-            """, (
-                state_abbrev, crop, year, week, week_date,
-                features.get('gdd_cum'), features.get('gdd_vs_normal_pct'),
-                features.get('precip_cum_mm'), features.get('precip_vs_normal_pct'),
-                features.get('stress_days_heat', 0), features.get('stress_days_drought', 0),
-                features.get('excess_moisture_days', 0), features.get('frost_events', 0),
-                features.get('tmax_weekly_avg'), features.get('tmin_weekly_avg'),
-                features.get('tavg_weekly'),
-                features.get('ndvi_mean'), features.get('ndvi_anomaly'),
-                features.get('ndvi_trend_4wk'),
-                features.get('condition_index'), features.get('condition_vs_5yr'),
-                features.get('progress_index'), features.get('progress_vs_normal'),
-                features.get('pct_planted'), features.get('pct_emerged'),
-                features.get('pct_silking'), features.get('pct_dough'),
-                features.get('pct_mature'), features.get('pct_harvested'),
-                features.get('good_excellent_pct'),
-                features.get('ww_risk_score'), features.get('ww_outlook_sentiment'),
-                growth_stage,
-            ))
-            count += 1
+        conn = self._get_conn()
+        cur = conn.cursor()
 
+        wx_cfg = self._weather_config(crop, year)
+        daily = self._load_daily_weather(
+            cur, states, min(wx_cfg['planting_date'], weeks[0][1] - timedelta(days=6)), weeks[-1][1]
+        )
+        climatology = self._load_climatology(cur)
+        national = {week: {} for week, _ in weeks}
+        for source in (self._cpc_by_week(cur, crop, year, weeks),
+                       self._nass_by_week(cur, crop, weeks),
+                       self._ww_by_week(cur, weeks)):
+            for week, values in source.items():
+                national[week].update(values)
+        ndvi = self._ndvi_by_week(conn, cur, states, weeks)
+        stages = {week: self._determine_growth_stage(crop, week) for week, _ in weeks}
+
+        rows = []
+        for state in states:
+            weather = self._season_weather(daily.get(state.lower()), wx_cfg, climatology, weeks)
+            for (week, week_date), features in zip(weeks, weather):
+                features.update(national[week])
+                features.update(ndvi.get((state, week), {}))
+                rows.append((state, crop, year, week, week_date,
+                             *[features.get(c, 0 if c in COUNT_FEATURES else None)
+                               for c in FEATURE_COLUMNS],
+                             stages[week]))
+
+        execute_values(cur, UPSERT_SQL, rows, template=UPSERT_TEMPLATE, page_size=500)
         conn.commit()
-        logger.info(f"Built {count} feature rows for {state_abbrev}/{crop}/{year}")
-        return count
+        logger.info(f"Built {len(rows)} feature rows for {crop}/{year} "
+                    f"({len(states)} states, weeks {weeks[0][0]}-{weeks[-1][0]})")
+        return len(rows)
 
     def build_all_features(self, year: int, crops: list = None,
-                           states: list = None) -> dict:
+                           states: list = None, incremental: bool = False) -> dict:
         """Build features for all state/crop combinations."""
         conn = self._get_conn()
         cur = conn.cursor()
@@ -259,7 +264,6 @@ class YieldFeatureEngine:
         summary = {'total_rows': 0, 'crops': {}}
 
         for crop in crops:
-            crop_count = 0
             crop_db = CROP_NASS_MAP.get(crop, crop.upper())
 
             # Only process states that actually grow this crop
@@ -273,9 +277,7 @@ class YieldFeatureEngine:
             crop_states = [r[0] for r in cur.fetchall()]
             relevant_states = [s for s in states if s in crop_states]
 
-            for state in relevant_states:
-                count = self.build_features(state, crop, year)
-                crop_count += count
+            crop_count = self.build_season(crop, year, relevant_states, incremental=incremental)
 
             summary['crops'][crop] = {'rows': crop_count, 'states': len(relevant_states)}
             summary['total_rows'] += crop_count
@@ -284,360 +286,377 @@ class YieldFeatureEngine:
         return summary
 
     # ------------------------------------------------------------------
-    # FEATURE EXTRACTORS
+    # WEATHER
     # ------------------------------------------------------------------
 
-    def _get_weather_features(self, cur, state_abbrev: str, crop: str,
-                              year: int, week: int, week_date: date) -> dict:
-        """Extract weather features from silver.weather_observation."""
-        result = {
-            'gdd_cum': None, 'gdd_vs_normal_pct': None,
-            'precip_cum_mm': None, 'precip_vs_normal_pct': None,
-            'stress_days_heat': 0, 'stress_days_drought': 0,
-            'excess_moisture_days': 0, 'frost_events': 0,
-            'tmax_weekly_avg': None, 'tmin_weekly_avg': None, 'tavg_weekly': None,
-        }
-
-        # location_ids use format "city_ST" — match by state suffix
-        state_lower = state_abbrev.lower()
-
+    def _weather_config(self, crop: str, year: int) -> dict:
+        """Crop thresholds and planting date for the weather features."""
         crop_cfg = self.thresholds.get('crops', {}).get(
             'wheat' if 'wheat' in crop else crop, {}
         )
-        gdd_base_c = crop_cfg.get('gdd_base_c', 10)
-        gdd_cap_c = crop_cfg.get('gdd_cap_c')
-        heat_thresh_c = crop_cfg.get('severe_heat_threshold_c', 35)
-        frost_thresh_c = crop_cfg.get('frost_threshold_c', 0)
-        drought_mm_week = crop_cfg.get('drought_threshold_mm_week', 13)
-        excess_mm_week = crop_cfg.get('excess_moisture_mm_week', 75)
-
         # Determine planting date for cumulative calculations
         stages = crop_cfg.get('growth_stages', crop_cfg.get('growth_stages_winter', {}))
         planting = stages.get('planting', {})
         plant_month = planting.get('start_month', 4)
         plant_day = planting.get('start_day', 15)
-        planting_date = date(year, plant_month, plant_day)
-
-        week_start = week_date - timedelta(days=6)
-
-        # Current week temperature summary
-        # silver.weather_observation uses: observation_date (date), temp_high_f,
-        # temp_low_f, temp_avg_f, precipitation_in, precipitation_mm,
-        # location_id (e.g. 'des_moines_ia')
-        cur.execute("""
-            SELECT
-                AVG(temp_avg_f) as avg_temp,
-                AVG(temp_high_f) as max_temp,
-                AVG(temp_low_f) as min_temp,
-                SUM(COALESCE(precipitation_mm, 0)) as precip_mm,
-                COUNT(*) as obs_days
-            FROM silver.weather_observation
-            WHERE location_id LIKE '%%_' || %s
-              AND observation_date >= %s AND observation_date <= %s
-        """, (state_lower, week_start, week_date))
-        row = cur.fetchone()
+        return {
+            'gdd_base_c': crop_cfg.get('gdd_base_c', 10),
+            'gdd_cap_c': crop_cfg.get('gdd_cap_c'),
+            'heat_thresh_c': crop_cfg.get('severe_heat_threshold_c', 35),
+            'frost_thresh_c': crop_cfg.get('frost_threshold_c', 0),
+            'excess_mm_week': crop_cfg.get('excess_moisture_mm_week', 75),
+            'plant_month': plant_month,
+            'planting_date': date(year, plant_month, plant_day),
+        }
 
-        if row and row[0] is not None:
-            result['tavg_weekly'] = round((float(row[0]) - 32) * 5 / 9, 1)
-            result['tmax_weekly_avg'] = round((float(row[1]) - 32) * 5 / 9, 1)
-            result['tmin_weekly_avg'] = round((float(row[2]) - 32) * 5 / 9, 1)
+    def _load_daily_weather(self, cur, states: list, start: date, end: date) -> dict:
+        """
+        Daily weather per state from silver.weather_observation, one query.
 
-        # Cumulative GDD and precip from planting date
+        location_ids use format "city_ST" — matched by state suffix. Temperature
+        sums and non-null counts are kept per day so weekly averages over the
+        raw observations can be rebuilt from prefix sums.
+        """
         cur.execute("""
-            SELECT
-                observation_date as obs_date,
-                AVG(temp_high_f) as daily_max_f,
-                AVG(temp_low_f) as daily_min_f,
-                SUM(COALESCE(precipitation_mm, 0)) as daily_precip_mm
+            SELECT RIGHT(location_id, 2) AS st, observation_date,
+                   SUM(temp_avg_f), COUNT(temp_avg_f),
+                   SUM(temp_high_f), COUNT(temp_high_f),
+                   SUM(temp_low_f), COUNT(temp_low_f),
+                   SUM(COALESCE(precipitation_mm, 0))
             FROM silver.weather_observation
-            WHERE location_id LIKE '%%_' || %s
+            WHERE location_id LIKE ANY(%s)
               AND observation_date >= %s AND observation_date <= %s
-            GROUP BY observation_date
-            ORDER BY obs_date
-        """, (state_lower, planting_date, week_date))
-        daily_rows = cur.fetchall()
-
-        if daily_rows:
-            gdd_cum = 0.0
-            precip_cum = 0.0
-            heat_days = 0
-            frost_events = 0
-            excess_days = 0
-            consecutive_dry = 0
-            max_consecutive_dry = 0
-
-            for obs_date, max_f, min_f, precip_mm in daily_rows:
-                max_c = (float(max_f) - 32) * 5 / 9 if max_f else 0
-                min_c = (float(min_f) - 32) * 5 / 9 if min_f else 0
-
-                # GDD
-                tmax_adj = min(max_c, gdd_cap_c) if gdd_cap_c else max_c
-                tavg = (min_c + tmax_adj) / 2
-                gdd = max(0, tavg - gdd_base_c)
-                gdd_cum += gdd
-
-                # Precip
-                precip_mm = float(precip_mm) if precip_mm else 0
-                precip_cum += precip_mm
-
-                # Stress indicators
-                if max_c > heat_thresh_c:
-                    heat_days += 1
-                if min_c < frost_thresh_c:
-                    frost_events += 1
-                if precip_mm > excess_mm_week / 7:
-                    excess_days += 1
-
-                # Consecutive dry days
-                if precip_mm < 1.0:
-                    consecutive_dry += 1
-                    max_consecutive_dry = max(max_consecutive_dry, consecutive_dry)
-                else:
-                    consecutive_dry = 0
-
-            result['gdd_cum'] = round(gdd_cum, 1)
-            result['precip_cum_mm'] = round(precip_cum, 1)
-            result['stress_days_heat'] = heat_days
-            result['frost_events'] = frost_events
-            result['excess_moisture_days'] = excess_days
-            result['stress_days_drought'] = max_consecutive_dry
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+        """, (['%_' + s.lower() for s in states], start, end))
+
+        by_state = {}
+        for st, obs_date, *values in cur.fetchall():
+            by_state.setdefault(st.lower(), []).append((obs_date, *values))
+
+        daily = {}
+        for st, rows in by_state.items():
+            cols = list(zip(*rows))
+            arrays = [np.array([float(v) if v is not None else 0.0 for v in col]) for col in cols[1:]]
+            daily[st] = dict(zip(
+                ('avg_sum', 'avg_n', 'high_sum', 'high_n', 'low_sum', 'low_n', 'precip'), arrays
+            ))
+            daily[st]['dates'] = np.array(cols[0], dtype='datetime64[D]')
+        return daily
+
+    def _season_weather(self, day: dict, cfg: dict, climatology: dict,
+                        weeks: list) -> list:
+        """Weather features for every week from one state's daily series."""
+        results = []
+        for _ in weeks:
+            results.append({
+                'gdd_cum': None, 'gdd_vs_normal_pct': None,
+                'precip_cum_mm': None, 'precip_vs_normal_pct': None,
+                'stress_days_heat': 0, 'stress_days_drought': 0,
+                'excess_moisture_days': 0, 'frost_events': 0,
+                'tmax_weekly_avg': None, 'tmin_weekly_avg': None, 'tavg_weekly': None,
+            })
+        if day is None:
+            return results
+
+        dates = day['dates']
+        prefix = {k: np.concatenate(([0.0], np.cumsum(day[k])))
+                  for k in ('avg_sum', 'avg_n', 'high_sum', 'high_n', 'low_sum', 'low_n')}
+
+        # Daily series from planting: GDD, precip and stress flags
+        s0 = np.searchsorted(dates, np.datetime64(cfg['planting_date']))
+        season_dates = dates[s0:]
+
+        def daily_mean(key):
+            n = day[key + '_n'][s0:]
+            return np.divide(day[key + '_sum'][s0:], n, out=np.zeros(len(n)), where=n > 0)
+
+        max_f, min_f = daily_mean('high'), daily_mean('low')
+        max_c = np.where(max_f != 0, (max_f - 32) * 5 / 9, 0.0)
+        min_c = np.where(min_f != 0, (min_f - 32) * 5 / 9, 0.0)
+        precip = day['precip'][s0:]
+
+        gdd_cap_c = cfg['gdd_cap_c']
+        tmax_adj = np.minimum(max_c, gdd_cap_c) if gdd_cap_c else max_c
+        gdd = np.maximum(0, (min_c + tmax_adj) / 2 - cfg['gdd_base_c'])
+
+        # Longest dry spell so far: run length of consecutive dry days, then running max
+        dry = precip < 1.0
+        idx = np.arange(len(dry))
+        last_wet = np.maximum.accumulate(np.where(dry, -1, idx)) if len(dry) else idx
+        max_dry = np.maximum.accumulate(np.where(dry, idx - last_wet, 0)) if len(dry) else idx
+
+        gdd_cum = np.cumsum(gdd)
+        precip_cum = np.cumsum(precip)
+        heat_days = np.cumsum(max_c > cfg['heat_thresh_c'])
+        frost_events = np.cumsum(min_c < cfg['frost_thresh_c'])
+        excess_days = np.cumsum(precip > cfg['excess_mm_week'] / 7)
+
+        for result, (week, week_date) in zip(results, weeks):
+            end = np.datetime64(week_date)
+
+            # Current week temperature summary
+            lo = np.searchsorted(dates, end - np.timedelta64(6, 'D'))
+            hi = np.searchsorted(dates, end, side='right')
+            for out, key in (('tavg_weekly', 'avg'), ('tmax_weekly_avg', 'high'),
+                             ('tmin_weekly_avg', 'low')):
+                n = prefix[key + '_n'][hi] - prefix[key + '_n'][lo]
+                if n > 0:
+                    mean_f = (prefix[key + '_sum'][hi] - prefix[key + '_sum'][lo]) / n
+                    result[out] = round((float(mean_f) - 32) * 5 / 9, 1)
+            if result['tavg_weekly'] is None:
+                result['tmax_weekly_avg'] = result['tmin_weekly_avg'] = None
+
+            # Cumulative from planting date
+            k = np.searchsorted(season_dates, end, side='right')
+            if k == 0:
+                continue
+            gdd_total = float(gdd_cum[k - 1])
+            precip_total = float(precip_cum[k - 1])
+            result['gdd_cum'] = round(gdd_total, 1)
+            result['precip_cum_mm'] = round(precip_total, 1)
+            result['stress_days_heat'] = int(heat_days[k - 1])
+            result['frost_events'] = int(frost_events[k - 1])
+            result['excess_moisture_days'] = int(excess_days[k - 1])
+            result['stress_days_drought'] = int(max_dry[k - 1])
 
             # Compare to climatology normals
-            cur.execute("""
-                SELECT region_code,
-                       SUM(gdd_normal) as total_gdd_normal,
-                       SUM(precip_normal_mm) as total_precip_normal
-                FROM reference.weather_climatology
-                WHERE region_code IN ('US_CORN_BELT', 'US_SOY_BELT', 'US_WHEAT_WINTER', 'US_WHEAT_SPRING')
-                  AND month >= %s AND month <= %s
-                GROUP BY region_code
-            """, (plant_month, week_date.month))
-            clim_rows = cur.fetchall()
-
-            if clim_rows:
-                # Use the first matching region as proxy
-                _, gdd_normal, precip_normal = clim_rows[0]
-                if gdd_normal and float(gdd_normal) > 0:
-                    result['gdd_vs_normal_pct'] = round(
-                        (gdd_cum - float(gdd_normal)) / float(gdd_normal) * 100, 1
-                    )
-                if precip_normal and float(precip_normal) > 0:
-                    result['precip_vs_normal_pct'] = round(
-                        (precip_cum - float(precip_normal)) / float(precip_normal) * 100, 1
-                    )
-
-        return result
+            gdd_normal, precip_normal = self._climatology_normals(
+                climatology, cfg['plant_month'], week_date.month)
+            if gdd_normal and gdd_normal > 0:
+                result['gdd_vs_normal_pct'] = round((gdd_total - gdd_normal) / gdd_normal * 100, 1)
+            if precip_normal and precip_normal > 0:
+                result['precip_vs_normal_pct'] = round(
+                    (precip_total - precip_normal) / precip_normal * 100, 1)
+
+        return results
+
+    def _load_climatology(self, cur) -> dict:
+        """Monthly GDD/precip normals by region: {region: {month: (gdd, precip)}}."""
+        cur.execute("""
+            SELECT region_code, month,
+                   SUM(gdd_normal) as gdd_normal,
+                   SUM(precip_normal_mm) as precip_normal
+            FROM reference.weather_climatology
+            WHERE region_code = ANY(%s)
+            GROUP BY region_code, month
+        """, (list(CLIMATOLOGY_REGIONS),))
+        climatology = {}
+        for region, month, gdd, precip in cur.fetchall():
+            climatology.setdefault(region, {})[month] = (
+                float(gdd) if gdd is not None else None,
+                float(precip) if precip is not None else None,
+            )
+        return climatology
+
+    @staticmethod
+    def _climatology_normals(climatology: dict, month_start: int, month_end: int):
+        """Season-to-date normals from the first region with data in the month range."""
+        for region in CLIMATOLOGY_REGIONS:
+            months = [v for m, v in climatology.get(region, {}).items()
+                      if month_start <= m <= month_end]
+            if months:
+                gdd = [g for g, _ in months if g is not None]
+                precip = [p for _, p in months if p is not None]
+                return (sum(gdd) if gdd else None), (sum(precip) if precip else None)
+        return None, None
 
-    def _get_cpc_features(self, cur, crop: str, year: int, week: int) -> dict:
-        """Extract CPC gridded condition/progress features (national level)."""
-        result = {
-            'condition_index': None, 'condition_vs_5yr': None,
-            'progress_index': None, 'progress_vs_normal': None,
-        }
+    # ------------------------------------------------------------------
+    # NATIONAL AND REMOTE-SENSING SOURCES
+    # ------------------------------------------------------------------
 
+    def _cpc_by_week(self, cur, crop: str, year: int, weeks: list) -> dict:
+        """CPC gridded condition/progress features (national level), by week."""
         cpc_crop = CROP_CPC_MAP.get(crop, crop)
 
+        def first_by_week(rows):
+            out = {}
+            for week, value in rows:
+                out.setdefault(week, value)
+            return out
+
         # Condition from gold view
         cur.execute("""
-            SELECT condition_mean
+            SELECT nass_week, condition_mean
             FROM gold.cpc_condition_weekly
-            WHERE crop = %s AND year = %s AND nass_week = %s AND region_id = 'US'
-            LIMIT 1
-        """, (cpc_crop, year, week))
-        row = cur.fetchone()
-        if row and row[0] is not None:
-            result['condition_index'] = float(row[0])
+            WHERE crop = %s AND year = %s AND region_id = 'US'
+        """, (cpc_crop, year))
+        condition = first_by_week(cur.fetchall())
 
         # YoY comparison
         cur.execute("""
-            SELECT vs_5yr_avg
+            SELECT nass_week, vs_5yr_avg
             FROM gold.cpc_condition_yoy
-            WHERE crop = %s AND nass_week = %s
-            LIMIT 1
-        """, (cpc_crop, week))
-        row = cur.fetchone()
-        if row and row[0] is not None:
-            result['condition_vs_5yr'] = float(row[0])
-
-        # Progress from gold view
+            WHERE crop = %s
+        """, (cpc_crop,))
+        condition_yoy = first_by_week(cur.fetchall())
+
+        # Progress for this year and the prior five
         cur.execute("""
-            SELECT progress_mean
+            SELECT year, nass_week, progress_mean
             FROM gold.cpc_progress_weekly
-            WHERE crop = %s AND year = %s AND nass_week = %s AND region_id = 'US'
-            LIMIT 1
-        """, (cpc_crop, year, week))
-        row = cur.fetchone()
-        if row and row[0] is not None:
-            result['progress_index'] = float(row[0])
-
-            # Compare progress to 5-year average
-            cur.execute("""
-                SELECT AVG(progress_mean)
-                FROM gold.cpc_progress_weekly
-                WHERE crop = %s AND nass_week = %s AND region_id = 'US'
-                  AND year BETWEEN %s AND %s
-            """, (cpc_crop, week, year - 5, year - 1))
-            avg_row = cur.fetchone()
-            if avg_row and avg_row[0] is not None:
-                result['progress_vs_normal'] = round(
-                    float(row[0]) - float(avg_row[0]), 3
-                )
-
+            WHERE crop = %s AND region_id = 'US'
+              AND year BETWEEN %s AND %s
+        """, (cpc_crop, year - 5, year))
+        progress, history = {}, {}
+        for yr, week, value in cur.fetchall():
+            if yr == year:
+                progress.setdefault(week, value)
+            elif value is not None:
+                history.setdefault(week, []).append(float(value))
+
+        result = {}
+        for week, _ in weeks:
+            features = {
+                'condition_index': None, 'condition_vs_5yr': None,
+                'progress_index': None, 'progress_vs_normal': None,
+            }
+            if condition.get(week) is not None:
+                features['condition_index'] = float(condition[week])
+            if condition_yoy.get(week) is not None:
+                features['condition_vs_5yr'] = float(condition_yoy[week])
+            if progress.get(week) is not None:
+                features['progress_index'] = float(progress[week])
+                # Compare progress to 5-year average
+                if history.get(week):
+                    features['progress_vs_normal'] = round(
+                        float(progress[week]) - float(np.mean(history[week])), 3
+                    )
+            result[week] = features
         return result
 
-    def _get_nass_progress(self, cur, crop: str, state_abbrev: str,
-                           year: int, week: int, week_date: date) -> dict:
-        """Extract NASS tabular crop progress and condition data.
+    def _nass_by_week(self, cur, crop: str, weeks: list) -> dict:
+        """NASS tabular crop progress and condition, by week.
 
         Note: NASS condition/progress data is currently national-level only
         (state = 'US'). We use national data as a proxy for all states.
         Condition data is stored as rows per category (EXCELLENT, GOOD, etc.).
         """
-        result = {
-            'pct_planted': None, 'pct_emerged': None, 'pct_silking': None,
-            'pct_dough': None, 'pct_mature': None, 'pct_harvested': None,
-            'good_excellent_pct': None,
-        }
-
         nass_commodity = CROP_NASS_MAP.get(crop, crop.upper()).lower()
-        week_start = week_date - timedelta(days=6)
+        start, end = weeks[0][1] - timedelta(days=6), weeks[-1][1]
 
-        # Condition ratings — pivoted: one row per condition_category per week
-        # Use 'US' for national level since state data may not be available
         cur.execute("""
-            SELECT condition_category, value
+            SELECT week_ending, condition_category, value
             FROM bronze.nass_crop_condition
             WHERE commodity = %s
               AND week_ending >= %s AND week_ending <= %s
             ORDER BY week_ending DESC
-        """, (nass_commodity, week_start, week_date))
-        condition_vals = {}
-        for cat, val in cur.fetchall():
-            # Take the first (most recent) value for each category
-            if cat not in condition_vals and val is not None:
-                condition_vals[cat] = float(val)
-
-        excellent = condition_vals.get('EXCELLENT', 0)
-        good = condition_vals.get('GOOD', 0)
-        if excellent or good:
-            result['good_excellent_pct'] = excellent + good
-
-        # Progress — national level
+        """, (nass_commodity, start, end))
+        condition_rows = cur.fetchall()
+
         cur.execute("""
-            SELECT value
+            SELECT week_ending, value
             FROM bronze.nass_crop_progress
             WHERE commodity = %s
               AND week_ending >= %s AND week_ending <= %s
-            ORDER BY week_ending DESC LIMIT 1
-        """, (nass_commodity, week_start, week_date))
-        row = cur.fetchone()
-        if row and row[0] is not None:
-            result['pct_planted'] = float(row[0])
-
+            ORDER BY week_ending DESC
+        """, (nass_commodity, start, end))
+        progress_rows = cur.fetchall()
+
+        result = {}
+        for week, week_date in weeks:
+            week_start = week_date - timedelta(days=6)
+            features = {
+                'pct_planted': None, 'pct_emerged': None, 'pct_silking': None,
+                'pct_dough': None, 'pct_mature': None, 'pct_harvested': None,
+                'good_excellent_pct': None,
+            }
+
+            condition_vals = {}
+            for week_ending, cat, val in condition_rows:
+                # Take the first (most recent) value for each category
+                if week_start <= week_ending <= week_date and cat not in condition_vals \
+                        and val is not None:
+                    condition_vals[cat] = float(val)
+            excellent = condition_vals.get('EXCELLENT', 0)
+            good = condition_vals.get('GOOD', 0)
+            if excellent or good:
+                features['good_excellent_pct'] = excellent + good
+
+            latest = next((val for week_ending, val in progress_rows
+                           if week_start <= week_ending <= week_date), None)
+            if latest is not None:
+                features['pct_planted'] = float(latest)
+
+            result[week] = features
         return result
 
-    def _get_ndvi_features(self, cur, state_abbrev: str, crop: str,
-                           year: int, week: int, week_date: date) -> dict:
-        """Extract NDVI features (may be empty — graceful fallback).
+    def _ndvi_by_week(self, conn, cur, states: list, weeks: list) -> dict:
+        """NDVI features by (state, week) (may be empty — graceful fallback).
 
-        bronze.ndvi_observation is currently empty. This function will
-        work once NDVI data is ingested via the AppEEARS pipeline.
-        Falls back gracefully with None values.
+        bronze.ndvi_observation is currently empty. This will work once
+        NDVI data is ingested via the AppEEARS pipeline.
         """
-        result = {
-            'ndvi_mean': None, 'ndvi_anomaly': None, 'ndvi_trend_4wk': None,
-        }
-
         try:
-            # Try bronze.ndvi_observation (region_code, observation_date, ndvi_value, ndvi_anomaly)
             cur.execute("""
-                SELECT ndvi_value, ndvi_anomaly
+                SELECT region_code, observation_date, ndvi_value, ndvi_anomaly
                 FROM bronze.ndvi_observation
-                WHERE region_code = %s
-                  AND observation_date >= %s - interval '10 days'
-                  AND observation_date <= %s
-                ORDER BY observation_date DESC LIMIT 1
-            """, (state_abbrev, week_date, week_date))
-            row = cur.fetchone()
-            if row and row[0] is not None:
-                result['ndvi_mean'] = float(row[0])
-                if row[1] is not None:
-                    result['ndvi_anomaly'] = float(row[1])
-
-                # 4-week trend
-                four_weeks_ago = week_date - timedelta(weeks=4)
-                cur.execute("""
-                    SELECT ndvi_value, observation_date
-                    FROM bronze.ndvi_observation
-                    WHERE region_code = %s
-                      AND observation_date >= %s AND observation_date <= %s
-                    ORDER BY observation_date
-                """, (state_abbrev, four_weeks_ago, week_date))
-                trend_rows = cur.fetchall()
-                if len(trend_rows) >= 2:
-                    vals = [float(r[0]) for r in trend_rows if r[0] is not None]
-                    if len(vals) >= 2:
-                        x = np.arange(len(vals))
-                        coeffs = np.polyfit(x, vals, 1)
-                        result['ndvi_trend_4wk'] = round(coeffs[0], 4)
+                WHERE region_code = ANY(%s)
+                  AND observation_date >= %s AND observation_date <= %s
+                ORDER BY region_code, observation_date
+            """, (list(states), weeks[0][1] - timedelta(weeks=4), weeks[-1][1]))
+            rows = cur.fetchall()
         except Exception:
-            # Table may not exist or be empty — that's OK
-            pass
+            # Table may not exist — that's OK, but clear the failed statement
+            conn.rollback()
+            return {}
+
+        by_state = {}
+        for region, obs_date, value, anomaly in rows:
+            by_state.setdefault(region, []).append((obs_date, value, anomaly))
+
+        result = {}
+        for state, obs in by_state.items():
+            for week, week_date in weeks:
+                recent = [o for o in obs if week_date - timedelta(days=10) <= o[0] <= week_date]
+                if not recent or recent[-1][1] is None:
+                    continue
+                _, value, anomaly = recent[-1]
+                features = {'ndvi_mean': float(value), 'ndvi_anomaly': None, 'ndvi_trend_4wk': None}
+                if anomaly is not None:
+                    features['ndvi_anomaly'] = float(anomaly)
 
+                # 4-week trend
+                trend_rows = [o for o in obs if week_date - timedelta(weeks=4) <= o[0] <= week_date]
+                vals = [float(o[1]) for o in trend_rows if o[1] is not None]
+                if len(trend_rows) >= 2 and len(vals) >= 2:
+                    coeffs = np.polyfit(np.arange(len(vals)), vals, 1)
+                    features['ndvi_trend_4wk'] = round(coeffs[0], 4)
+                result[(state, week)] = features
         return result
 
-    def _get_ww_signals(self, cur, year: int, week: int, week_date: date) -> dict:
-        """Extract World Weather signals from email content."""
-        result = {
-            'ww_risk_score': None, 'ww_outlook_sentiment': None,
-        }
-
-        week_start = week_date - timedelta(days=6)
-
+    def _ww_by_week(self, cur, weeks: list) -> dict:
+        """World Weather signals from email content, by week."""
+        # The five latest emails in each week's window, for every week at once
         cur.execute("""
-            SELECT weather_summary
-            FROM bronze.weather_email_extract
-            WHERE email_date >= %s AND email_date <= %s + interval '1 day'
-            ORDER BY email_date DESC LIMIT 5
-        """, (week_start, week_date))
-        rows = cur.fetchall()
-
-        if not rows:
-            return result
-
-        # Simple keyword-based risk/sentiment scoring
-        risk_keywords = {
-            'drought': 3, 'flooding': 3, 'flood': 2, 'excessive': 2,
-            'stress': 2, 'drier-bias': 1, 'net drying': 1, 'significant': 1,
-            'severe': 2, 'heat': 1, 'frost': 2, 'freeze': 3,
-        }
-        favorable_keywords = {
-            'favorable': -1, 'adequate': -1, 'improved': -1, 'beneficial': -1,
-            'normal': -0.5, 'no significant': -0.5, 'unchanged': -0.5,
-        }
-
-        risk_total = 0
-        sentiment_total = 0
-        email_count = 0
-
-        for (text,) in rows:
-            if not text:
-                continue
-            text_lower = text.lower()
-            email_count += 1
-
-            for kw, weight in risk_keywords.items():
-                if kw in text_lower:
-                    risk_total += weight
-            for kw, weight in favorable_keywords.items():
-                if kw in text_lower:
-                    sentiment_total += weight
-
-        if email_count > 0:
-            result['ww_risk_score'] = min(10.0, round(risk_total / email_count, 1))
-            raw_sentiment = -sentiment_total / email_count  # flip so positive = bullish
-            result['ww_outlook_sentiment'] = max(-1.0, min(1.0, round(raw_sentiment / 3, 2)))
-
+            SELECT w.week, e.weather_summary
+            FROM unnest(%s::int[], %s::date[]) AS w(week, week_date)
+            CROSS JOIN LATERAL (
+                SELECT weather_summary
+                FROM bronze.weather_email_extract
+                WHERE email_date >= w.week_date - 6
+                  AND email_date <= w.week_date + interval '1 day'
+                ORDER BY email_date DESC LIMIT 5
+            ) e
+        """, ([w for w, _ in weeks], [d for _, d in weeks]))
+        texts = {}
+        for week, text in cur.fetchall():
+            texts.setdefault(week, []).append(text)
+
+        result = {}
+        for week, _ in weeks:
+            features = {'ww_risk_score': None, 'ww_outlook_sentiment': None}
+            emails = [t.lower() for t in texts.get(week, []) if t]
+            if emails:
+                # Simple keyword-based risk/sentiment scoring
+                risk_total = sum(weight for text in emails
+                                 for kw, weight in WW_RISK_KEYWORDS.items() if kw in text)
+                sentiment_total = sum(weight for text in emails
+                                      for kw, weight in WW_FAVORABLE_KEYWORDS.items() if kw in text)
+                features['ww_risk_score'] = min(10.0, round(risk_total / len(emails), 1))
+                raw_sentiment = -sentiment_total / len(emails)  # flip so positive = bullish
+                features['ww_outlook_sentiment'] = max(-1.0, min(1.0, round(raw_sentiment / 3, 2)))
+            result[week] = features
         return result
 
     def _determine_growth_stage(self, crop: str, week: int) -> str:
@@ -729,6 +748,8 @@ def main():
     parser.add_argument("--crop", type=str, help="Crop name (corn, soybeans, winter_wheat, cotton)")
     parser.add_argument("--year", type=int, help="Year to process")
     parser.add_argument("--all", action="store_true", help="Process all states/crops for the year")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only compute the newest completed week")
     parser.add_argument("--verify", action="store_true", help="Print verification summary")
     parser.add_argument("--verbose", "-v", action="store_true")
 
@@ -753,13 +774,15 @@ def main():
         if args.all:
             crops = [args.crop] if args.crop else None
             states = [args.state] if args.state else None
-            summary = engine.build_all_features(args.year, crops=crops, states=states)
+            summary = engine.build_all_features(args.year, crops=crops, states=states,
+                                                incremental=args.incremental)
             print(f"\nFeature Summary for {args.year}:")
             for crop, info in summary['crops'].items():
                 print(f"  {crop}: {info['rows']} rows, {info['states']} states")
             print(f"  Total: {summary['total_rows']} rows")
         elif args.state and args.crop:
-            count = engine.build_features(args.state, args.crop, args.year)
+            count = engine.build_features(args.state, args.crop, args.year,
+                                          incremental=args.incremental)
             print(f"Built {count} feature rows for {args.state}/{args.crop}/{args.year}")
         else:
             parser.error("Use --all or provide both --state and --crop")
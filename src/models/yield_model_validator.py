@@ -63,136 +63,88 @@ class YieldModelValidator:
     bias analysis, and comparison to benchmarks.
     """
 
-    def __init__(self):
+    def __init__(self, engine=None):
+        from src.models.yield_backtest import BacktestEngine
         from src.models.yield_prediction_model import YieldPredictionModel
         self.model = YieldPredictionModel()
+        self.engine = engine or BacktestEngine()
 
     # ------------------------------------------------------------------
     # BACKTESTING
     # ------------------------------------------------------------------
 
     def run_backtest(self, crop: str, test_years: list,
-                     forecast_weeks: list = None) -> dict:
+                     forecast_weeks: list = None, walk_forward: bool = False) -> dict:
         """
         Leave-one-year-out backtesting.
 
-        For each test year: train on all other years, predict at each
-        forecast_week, compare to actual final yield.
+        For each test year: train on all other years (only earlier years
+        when walk_forward), predict at each forecast_week, compare to
+        actual final yield. Folds run through the BacktestEngine.
 
         Returns metrics by week.
         """
+        return self.run_backtests([crop], test_years, forecast_weeks, walk_forward)[crop]
+
+    def run_backtests(self, crops: list, test_years: list,
+                      forecast_weeks: list = None, walk_forward: bool = False) -> dict:
+        """Backtest several crops in one pass; folds share one process pool."""
         if forecast_weeks is None:
             forecast_weeks = BACKTEST_WEEKS
 
-        crop_db = CROP_DB_MAP.get(crop, crop.upper())
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        try:
-            # Get actual yields
-            cur.execute("""
-                SELECT year, state_abbrev, yield_per_acre
-                FROM bronze.nass_state_yields
-                WHERE commodity = %s AND yield_per_acre IS NOT NULL
-                  AND state_abbrev IS NOT NULL
-                ORDER BY year, state_abbrev
-            """, (crop_db,))
-            actuals_by_year = {}
-            for year, state, yld in cur.fetchall():
-                actuals_by_year.setdefault(year, {})[state] = float(yld)
+        folds = self.engine.run(crops, test_years, forecast_weeks, walk_forward=walk_forward)
 
-            all_years = sorted(actuals_by_year.keys())
+        results = {}
+        for crop in crops:
             week_results = {w: {'predictions': [], 'actuals': [], 'states': [], 'years': []}
                             for w in forecast_weeks}
-
-            for test_year in test_years:
-                if test_year not in actuals_by_year:
-                    logger.warning(f"No actual yields for {crop} {test_year}, skipping")
-                    continue
-
-                actuals = actuals_by_year[test_year]
-                train_yrs = [y for y in all_years if y != test_year and y >= 2005]
-
-                if len(train_yrs) < 10:
-                    logger.warning(f"Only {len(train_yrs)} training years for {test_year}")
-                    continue
-
-                for week in forecast_weeks:
-                    # Check feature availability
-                    cur.execute("""
-                        SELECT COUNT(*) FROM silver.yield_features
-                        WHERE crop = %s AND year = %s AND week = %s
-                    """, (crop, test_year, week))
-                    if cur.fetchone()[0] == 0:
-                        continue
-
-                    # Train on other years
-                    metrics = self.model.train(
-                        crop,
-                        train_years=range(min(train_yrs), max(train_yrs) + 1),
-                        target_week=week,
-                    )
-                    if 'error' in metrics:
-                        continue
-
-                    # Predict test year
-                    predictions = self.model.predict(crop, test_year, week)
-                    for p in predictions:
-                        if p.state in actuals:
-                            week_results[week]['predictions'].append(p.yield_forecast)
-                            week_results[week]['actuals'].append(actuals[p.state])
-                            week_results[week]['states'].append(p.state)
-                            week_results[week]['years'].append(test_year)
-
-                logger.info(f"  Year {test_year}: "
-                            + ", ".join(f"wk{w}={len(week_results[w]['predictions'])}pts"
-                                        for w in forecast_weeks
-                                        if week_results[w]['predictions']))
-
-            # Compute metrics
-            results = {}
-            for week in forecast_weeks:
-                data = week_results[week]
-                n = len(data['predictions'])
-                if n == 0:
-                    results[f'week_{week}'] = {'n': 0}
-                    continue
-
-                preds = np.array(data['predictions'])
-                acts = np.array(data['actuals'])
-                errors = preds - acts
-
-                mean_yield = np.mean(acts)
-                dir_correct = np.sum((preds > mean_yield) == (acts > mean_yield))
-
-                ss_res = np.sum(errors ** 2)
-                ss_tot = np.sum((acts - np.mean(acts)) ** 2)
-                r2 = 1 - ss_res / ss_tot if ss_tot > 0 else None
-
-                results[f'week_{week}'] = {
-                    'n': n,
-                    'rmse': round(float(np.sqrt(np.mean(errors ** 2))), 2),
-                    'mae': round(float(np.mean(np.abs(errors))), 2),
-                    'mean_error': round(float(np.mean(errors)), 2),
-                    'median_error': round(float(np.median(errors)), 2),
-                    'max_abs_error': round(float(np.max(np.abs(errors))), 2),
-                    'r2': round(float(r2), 3) if r2 is not None else None,
-                    'dir_accuracy': round(float(dir_correct / n), 3),
-                    'raw': data,  # Preserved for downstream analysis
-                }
-
-            return results
-
-        finally:
-            cur.close()
-            conn.close()
+            for fold in folds[crop]:
+                data = week_results[fold['week']]
+                data['predictions'].extend(fold['predicted'])
+                data['actuals'].extend(fold['actual'])
+                data['states'].extend(fold['states'])
+                data['years'].extend([fold['test_year']] * len(fold['states']))
+            results[crop] = {f'week_{w}': self._week_metrics(week_results[w])
+                             for w in forecast_weeks}
+        return results
+
+    @staticmethod
+    def _week_metrics(data: dict) -> dict:
+        """Accuracy metrics for one forecast week's backtest points."""
+        n = len(data['predictions'])
+        if n == 0:
+            return {'n': 0}
+
+        preds = np.array(data['predictions'])
+        acts = np.array(data['actuals'])
+        errors = preds - acts
+
+        mean_yield = np.mean(acts)
+        dir_correct = np.sum((preds > mean_yield) == (acts > mean_yield))
+
+        ss_res = np.sum(errors ** 2)
+        ss_tot = np.sum((acts - np.mean(acts)) ** 2)
+        r2 = 1 - ss_res / ss_tot if ss_tot > 0 else None
+
+        return {
+            'n': n,
+            'rmse': round(float(np.sqrt(np.mean(errors ** 2))), 2),
+            'mae': round(float(np.mean(np.abs(errors))), 2),
+            'mean_error': round(float(np.mean(errors)), 2),
+            'median_error': round(float(np.median(errors)), 2),
+            'max_abs_error': round(float(np.max(np.abs(errors))), 2),
+            'r2': round(float(r2), 3) if r2 is not None else None,
+            'dir_accuracy': round(float(dir_correct / n), 3),
+            'raw': data,  # Preserved for downstream analysis
+        }
 
     # ------------------------------------------------------------------
     # SKILL SCORE
     # ------------------------------------------------------------------
 
     def compute_skill_score(self, crop: str, test_years: list,
-                            forecast_weeks: list = None) -> dict:
+                            forecast_weeks: list = None,
+                            backtest: dict = None) -> dict:
         """
         Compute skill score vs naive benchmarks.
 
@@ -203,6 +155,9 @@ class YieldModelValidator:
 
         Skill = 1 - (MSE_model / MSE_benchmark)
         Positive means model is better; negative means worse.
+
+        Model forecasts come from `backtest` (a run_backtest result) when
+        given, otherwise from gold.yield_forecast.
         """
         if forecast_weeks is None:
             forecast_weeks = BACKTEST_WEEKS
@@ -232,17 +187,25 @@ class YieldModelValidator:
             """, (crop_db,))
             trends = {r[0]: (float(r[1]), float(r[2])) for r in cur.fetchall()}
 
-            # Fetch forecasts from gold.yield_forecast (if they exist from backtest runs)
-            cur.execute("""
-                SELECT state, year, forecast_week, yield_forecast
-                FROM gold.yield_forecast
-                WHERE commodity = %s AND model_type = 'ensemble'
-                  AND year = ANY(%s)
-                ORDER BY year, forecast_week, state
-            """, (crop_db, list(test_years)))
             forecasts = {}
-            for state, year, week, yld in cur.fetchall():
-                forecasts.setdefault(year, {}).setdefault(week, {})[state] = float(yld)
+            if backtest is not None:
+                for key, metrics in backtest.items():
+                    raw = metrics.get('raw', {})
+                    week = int(key.split('_')[1])
+                    for state, year, yld in zip(raw.get('states', []), raw.get('years', []),
+                                                raw.get('predictions', [])):
+                        forecasts.setdefault(year, {}).setdefault(week, {})[state] = yld
+            else:
+                # Fetch forecasts from gold.yield_forecast (if they exist from backtest runs)
+                cur.execute("""
+                    SELECT state, year, forecast_week, yield_forecast
+                    FROM gold.yield_forecast
+                    WHERE commodity = %s AND model_type = 'ensemble'
+                      AND year = ANY(%s)
+                    ORDER BY year, forecast_week, state
+                """, (crop_db, list(test_years)))
+                for state, year, week, yld in cur.fetchall():
+                    forecasts.setdefault(year, {}).setdefault(week, {})[state] = float(yld)
 
             results = {}
             for week in forecast_weeks:
@@ -507,7 +470,7 @@ class YieldModelValidator:
 
         # Section 2: Skill scores
         lines.append("\n## 2. Skill Scores vs Benchmarks\n")
-        skill_results = self.compute_skill_score(crop, test_years)
+        skill_results = self.compute_skill_score(crop, test_years, backtest=bt_results)
 
         lines.append("| Week | Skill vs Trend | Skill vs Last Year | Skill vs 5yr Avg |")
         lines.append("|:---:|:---:|:---:|:---:|")
@@ -622,8 +585,15 @@ def main():
 
     # Backtest
     bt_parser = subparsers.add_parser('backtest', help='Run backtesting')
-    bt_parser.add_argument('--crop', type=str, required=True)
+    bt_parser.add_argument('--crop', type=str, required=True,
+                           help="Crop, comma-separated crops, or 'all'")
     bt_parser.add_argument('--years', type=str, default='2020-2024')
+    bt_parser.add_argument('--walk-forward', action='store_true',
+                           help='Train only on years before each test year')
+    bt_parser.add_argument('--workers', type=int, default=None,
+                           help='Fold worker processes (default RLC_BACKTEST_WORKERS / CPU count)')
+    bt_parser.add_argument('--no-cache', action='store_true',
+                           help='Recompute every fold instead of reusing cached results')
 
     # Skill scores
     skill_parser = subparsers.add_parser('skill', help='Compute skill scores')
@@ -658,19 +628,29 @@ def main():
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    validator = YieldModelValidator()
+    if args.command == 'backtest':
+        from src.models.yield_backtest import BacktestEngine
+        validator = YieldModelValidator(engine=BacktestEngine(
+            workers=args.workers, use_cache=not args.no_cache))
+    else:
+        validator = YieldModelValidator()
 
     if args.command == 'backtest':
         start, end = map(int, args.years.split('-'))
-        results = validator.run_backtest(args.crop, list(range(start, end + 1)))
-        print(f"\nBacktest Results — {args.crop}:")
-        print(f"{'Week':>6} {'N':>5} {'RMSE':>7} {'MAE':>7} {'Bias':>7} {'Dir Acc':>8}")
-        print(f"{'-'*6} {'-'*5} {'-'*7} {'-'*7} {'-'*7} {'-'*8}")
-        for key in sorted(results.keys()):
-            m = results[key]
-            if m.get('n', 0) > 0:
-                print(f"{key:>6} {m['n']:>5} {m['rmse']:>7.2f} {m['mae']:>7.2f} "
-                      f"{m['mean_error']:>7.2f} {m['dir_accuracy']:>7.1%}")
+        crops = ALL_CROPS if args.crop == 'all' else args.crop.split(',')
+        all_results = validator.run_backtests(crops, list(range(start, end + 1)),
+                                              walk_forward=args.walk_forward)
+        for crop, results in all_results.items():
+            print(f"\nBacktest Results — {crop}:")
+            print(f"{'Week':>6} {'N':>5} {'RMSE':>7} {'MAE':>7} {'Bias':>7} {'Dir Acc':>8}")
+            print(f"{'-'*6} {'-'*5} {'-'*7} {'-'*7} {'-'*7} {'-'*8}")
+            for key in sorted(results.keys()):
+                m = results[key]
+                if m.get('n', 0) > 0:
+                    print(f"{key:>6} {m['n']:>5} {m['rmse']:>7.2f} {m['mae']:>7.2f} "
+                          f"{m['mean_error']:>7.2f} {m['dir_accuracy']:>7.1%}")
+        stats = validator.engine.stats
+        print(f"\nFolds: {stats['folds']} ({stats['cached']} cached, {stats['computed']} computed)")
 
     elif args.command == 'skill':
         start, end = map(int, args.years.split('-'))
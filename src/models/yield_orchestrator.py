@@ -115,12 +115,9 @@ class YieldOrchestrator:
         feature_summary = {}
         for crop in crops:
             crop_states = states or self._get_crop_states(crop)
-            crop_rows = 0
-            for st in crop_states:
-                count = self.feature_engine.build_features(st, crop, year,
-                                                           week_start=max(1, week - 2),
-                                                           week_end=week)
-                crop_rows += count
+            crop_rows = self.feature_engine.build_season(crop, year, crop_states,
+                                                         week_start=max(1, week - 2),
+                                                         week_end=week)
             feature_summary[crop] = crop_rows
             logger.info(f"  {crop}: {crop_rows} feature rows built across {len(crop_states)} states")
 
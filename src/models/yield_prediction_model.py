@@ -17,6 +17,7 @@ import logging
 import os
 import pickle
 import sys
+import time
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
@@ -88,6 +89,9 @@ ENSEMBLE_WEIGHTS = {
     },
 }
 
+CROP_DB = {'corn': 'CORN', 'soybeans': 'SOYBEANS',
+           'winter_wheat': 'WHEAT_ALL', 'cotton': 'COTTON'}
+
 # Confidence multiplier by week (earlier → less confident)
 CONFIDENCE_BY_WEEK = {
     10: 0.30, 15: 0.40, 18: 0.45, 20: 0.50, 22: 0.55, 24: 0.60,
@@ -118,6 +122,51 @@ class YieldPrediction:
     feature_importance: dict = field(default_factory=dict)
 
 
+def fit_submodels(states: list, years: np.ndarray, X_raw: np.ndarray,
+                  y: np.ndarray, trend_yields: np.ndarray) -> dict:
+    """
+    Fit models A, B and the analog store on one training matrix.
+
+    X_raw is (samples x ALL_NUMERIC_FEATURES) with NaN already replaced;
+    the sub-models learn the deviation of y from trend_yields.
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+
+    y_deviation = y - trend_yields
+
+    # Scale features
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X_raw)
+
+    # --- Model A: Trend-Adjusted Regression ---
+    a_idx = [ALL_NUMERIC_FEATURES.index(f) for f in MODEL_A_FEATURES
+             if f in ALL_NUMERIC_FEATURES]
+    model_a = LinearRegression()
+    model_a.fit(X_raw[:, a_idx], y_deviation)
+
+    # --- Model B: Gradient Boosting ---
+    model_b = GradientBoostingRegressor(
+        n_estimators=200, max_depth=4, learning_rate=0.1,
+        min_samples_leaf=max(3, len(y) // 20),
+        subsample=0.8, random_state=42,
+    )
+    model_b.fit(X_scaled, y_deviation)
+
+    # --- Model C: Store feature profiles for analog lookup ---
+    analog_data = {
+        'states': list(states),
+        'years': np.asarray(years).tolist(),
+        'yields': y.tolist(),
+        'trend_yields': trend_yields.tolist(),
+        'features': X_raw.tolist(),
+        'feature_names': ALL_NUMERIC_FEATURES,
+    }
+    return {'model_a': model_a, 'model_b': model_b, 'scaler': scaler,
+            'analog_data': analog_data}
+
+
 def get_db_connection():
     """Get PostgreSQL connection."""
     import psycopg2
@@ -142,6 +191,8 @@ class YieldPredictionModel:
 
     def __init__(self, model_dir: Path = None):
         self.model_dir = model_dir or MODEL_DIR
+        self._model_cache: Dict[str, tuple] = {}
+        self._trend_cache: Dict[str, Dict[str, Tuple[float, float]]] = {}
 
     # ------------------------------------------------------------------
     # TRAINING
@@ -155,7 +206,6 @@ class YieldPredictionModel:
         Returns training metrics dict.
         """
         from sklearn.ensemble import GradientBoostingRegressor
-        from sklearn.linear_model import LinearRegression
         from sklearn.preprocessing import StandardScaler
 
         conn = get_db_connection()
@@ -163,8 +213,7 @@ class YieldPredictionModel:
 
         try:
             # Build training data: features at target_week + actual yield
-            crop_db = {'corn': 'CORN', 'soybeans': 'SOYBEANS',
-                       'winter_wheat': 'WHEAT_ALL', 'cotton': 'COTTON'}.get(crop, crop.upper())
+            crop_db = CROP_DB.get(crop, crop.upper())
 
             feature_cols = ", ".join(ALL_NUMERIC_FEATURES)
             cur.execute(f"""
@@ -191,7 +240,7 @@ class YieldPredictionModel:
             states = [r[0] for r in rows]
             years = np.array([r[1] for r in rows])
             n_features = len(ALL_NUMERIC_FEATURES)
-            X_raw = np.array([[r[i + 2] for i in range(n_features)] for r in rows], dtype=float)
+            X_raw = np.array([r[2:2 + n_features] for r in rows], dtype=float)
             y = np.array([r[n_features + 2] for r in rows], dtype=float)
 
             # Replace NaN with 0
@@ -200,57 +249,22 @@ class YieldPredictionModel:
             # Get trend yields for each sample
             # Note: yield_trend stores full state names, features use abbreviations
             from src.models.yield_feature_engine import US_STATES
-            trend_yields = np.zeros(len(rows))
-            for i, (state, year) in enumerate(zip(states, years)):
-                state_full = US_STATES.get(state, state)
-                cur.execute("""
-                    SELECT trend_yield_current, slope, intercept
-                    FROM silver.yield_trend
-                    WHERE commodity = %s AND state = %s AND trend_type = 'linear'
-                """, (crop_db, state_full))
-                trend_row = cur.fetchone()
-                if trend_row and trend_row[2] is not None:
-                    trend_yields[i] = float(trend_row[2]) + float(trend_row[1]) * year
-                else:
-                    trend_yields[i] = np.mean(y)
+            trends = self._trend_coefficients(cur, crop_db)
+            coef = np.array([trends.get(US_STATES.get(st, st), (np.nan, np.nan)) for st in states])
+            trend_yields = coef[:, 1] + coef[:, 0] * years
+            trend_yields[np.isnan(trend_yields)] = np.mean(y)
 
             # Yield deviations from trend
             y_deviation = y - trend_yields
 
-            # Scale features
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X_raw)
-
-            # --- Model A: Trend-Adjusted Regression ---
-            a_idx = [ALL_NUMERIC_FEATURES.index(f) for f in MODEL_A_FEATURES
-                     if f in ALL_NUMERIC_FEATURES]
-            X_a = X_raw[:, a_idx]
-            X_a = np.nan_to_num(X_a, nan=0.0)
-            model_a = LinearRegression()
-            model_a.fit(X_a, y_deviation)
-
-            # --- Model B: Gradient Boosting ---
-            model_b = GradientBoostingRegressor(
-                n_estimators=200, max_depth=4, learning_rate=0.1,
-                min_samples_leaf=max(3, len(rows) // 20),
-                subsample=0.8, random_state=42,
-            )
-            model_b.fit(X_scaled, y_deviation)
+            fitted = fit_submodels(states, years, X_raw, y, trend_yields)
+            model_a, model_b = fitted['model_a'], fitted['model_b']
+            scaler, analog_data = fitted['scaler'], fitted['analog_data']
 
             # Feature importance
             importances = dict(zip(ALL_NUMERIC_FEATURES, model_b.feature_importances_))
             top_features = sorted(importances.items(), key=lambda x: x[1], reverse=True)[:10]
 
-            # --- Model C: Store feature profiles for analog lookup ---
-            analog_data = {
-                'states': states,
-                'years': years.tolist(),
-                'yields': y.tolist(),
-                'trend_yields': trend_yields.tolist(),
-                'features': X_raw.tolist(),
-                'feature_names': ALL_NUMERIC_FEATURES,
-            }
-
             # --- Cross-validation (leave-one-year-out) ---
             unique_years = sorted(set(years))
             cv_errors = []
@@ -323,137 +337,125 @@ class YieldPredictionModel:
     def predict(self, crop: str, year: int, week: int,
                 states: list = None) -> List[YieldPrediction]:
         """Generate yield predictions for current conditions."""
+        return self.predict_batch(crop, year, [week], states=states)
+
+    def predict_batch(self, crop: str, year: int, weeks: List[int],
+                      states: list = None) -> List[YieldPrediction]:
+        """
+        Predict every state for several forecast weeks at once.
+
+        Features for all (state, week) rows come back in one query, trend
+        coefficients and last-year yields in one query each, and each
+        sub-model runs once on the full feature matrix.
+        """
+        models = self._load_models(crop)
+        if models is None:
+            logger.error(f"No trained models found for {crop}")
+            return []
+
+        crop_db = CROP_DB.get(crop, crop.upper())
         conn = get_db_connection()
         cur = conn.cursor()
 
         try:
-            # Load trained models
-            model_a = self._load_pickle(f"{crop}_model_a.pkl")
-            model_b = self._load_pickle(f"{crop}_model_b.pkl")
-            scaler = self._load_pickle(f"{crop}_scaler.pkl")
-            analog_data = self._load_pickle(f"{crop}_analog_data.pkl")
-            metadata = self._load_json(f"{crop}_metadata.json")
-
-            if model_a is None or model_b is None:
-                logger.error(f"No trained models found for {crop}")
-                return []
-
-            crop_db = {'corn': 'CORN', 'soybeans': 'SOYBEANS',
-                       'winter_wheat': 'WHEAT_ALL', 'cotton': 'COTTON'}.get(crop, crop.upper())
-
-            # Get features for current week
             feature_cols = ", ".join(ALL_NUMERIC_FEATURES)
             state_filter = ""
-            params = [crop, week, year]
+            params = [crop, list(weeks), year]
             if states:
                 state_filter = "AND f.state = ANY(%s)"
                 params.append(states)
 
             cur.execute(f"""
-                SELECT f.state, f.growth_stage, {feature_cols}
+                SELECT f.state, f.week, f.growth_stage, {feature_cols}
                 FROM silver.yield_features f
-                WHERE f.crop = %s AND f.week = %s AND f.year = %s
+                WHERE f.crop = %s AND f.week = ANY(%s) AND f.year = %s
                 {state_filter}
-                ORDER BY f.state
+                ORDER BY f.week, f.state
             """, params)
             rows = cur.fetchall()
 
             if not rows:
-                logger.warning(f"No features found for {crop} year={year} week={week}")
+                logger.warning(f"No features found for {crop} year={year} weeks={list(weeks)}")
                 return []
 
-            predictions = []
-            from src.models.yield_feature_engine import nass_week_to_date
-            forecast_date = nass_week_to_date(year, week)
-
-            for row in rows:
-                state = row[0]
-                growth_stage = row[1] or 'vegetative'
-                features = np.array([row[i + 2] for i in range(len(ALL_NUMERIC_FEATURES))], dtype=float)
-                features = np.nan_to_num(features, nan=0.0)
-
-                # Get trend yield (yield_trend stores full state name, features use abbreviation)
-                from src.models.yield_feature_engine import US_STATES
-                state_full = US_STATES.get(state, state)
-                cur.execute("""
-                    SELECT slope, intercept, trend_yield_current
-                    FROM silver.yield_trend
-                    WHERE commodity = %s AND state = %s AND trend_type = 'linear'
-                """, (crop_db, state_full))
-                trend_row = cur.fetchone()
-                if not trend_row:
-                    continue
-                trend_yield = float(trend_row[0]) * year + float(trend_row[1])
-
-                # Model A prediction
-                a_idx = [ALL_NUMERIC_FEATURES.index(f) for f in MODEL_A_FEATURES
-                         if f in ALL_NUMERIC_FEATURES]
-                x_a = features[a_idx].reshape(1, -1)
-                dev_a = model_a.predict(x_a)[0]
-                yield_a = trend_yield + dev_a
-
-                # Model B prediction
-                x_b = scaler.transform(features.reshape(1, -1))
-                dev_b = model_b.predict(x_b)[0]
-                yield_b = trend_yield + dev_b
-
-                # Model C: analog year
-                yield_c, analog_yrs = self._analog_predict(
-                    features, analog_data, trend_yield, year
-                )
-
-                # Ensemble
-                weights = self._get_ensemble_weights(crop, growth_stage)
-                yield_ensemble = (
-                    weights['model_a'] * yield_a +
-                    weights['model_b'] * yield_b +
-                    weights['model_c'] * yield_c
-                )
-
-                # Prediction interval
-                rmse = metadata.get('rmse_cv', 10)
-                confidence = self._get_confidence(week)
-                width_mult = 2.5 - (confidence * 1.5)  # wider at low confidence
-                yield_low = yield_ensemble - rmse * width_mult
-                yield_high = yield_ensemble + rmse * width_mult
-
-                # Last year's yield
-                cur.execute("""
-                    SELECT yield_per_acre FROM bronze.nass_state_yields
-                    WHERE commodity = %s AND state_abbrev = %s AND year = %s
-                """, (crop_db, state, year - 1))
-                ly_row = cur.fetchone()
-                last_year_yield = float(ly_row[0]) if ly_row and ly_row[0] else None
-
-                # Primary driver
-                primary_driver = self._identify_driver(features, ALL_NUMERIC_FEATURES)
-
-                pred = YieldPrediction(
-                    commodity=crop_db,
-                    state=state,
-                    year=int(year),
-                    forecast_week=int(week),
-                    forecast_date=forecast_date,
-                    yield_forecast=float(round(yield_ensemble, 1)),
-                    yield_low=float(round(yield_low, 1)),
-                    yield_high=float(round(yield_high, 1)),
-                    trend_yield=float(round(trend_yield, 1)),
-                    vs_trend_pct=float(round((yield_ensemble - trend_yield) / trend_yield * 100, 1)) if trend_yield else 0.0,
-                    last_year_yield=float(last_year_yield) if last_year_yield else None,
-                    vs_last_year_pct=float(round((yield_ensemble - last_year_yield) / last_year_yield * 100, 1)) if last_year_yield else None,
-                    model_type='ensemble',
-                    confidence=float(round(confidence, 2)),
-                    primary_driver=primary_driver,
-                    analog_years=analog_yrs,
-                )
-                predictions.append(pred)
-
-            return predictions
+            trends = self._trend_coefficients(cur, crop_db)
+            from src.models.yield_feature_engine import US_STATES
+            rows = [r for r in rows if US_STATES.get(r[0], r[0]) in trends]
+            if not rows:
+                return []
 
+            row_states = [r[0] for r in rows]
+            cur.execute("""
+                SELECT state_abbrev, yield_per_acre FROM bronze.nass_state_yields
+                WHERE commodity = %s AND state_abbrev = ANY(%s) AND year = %s
+            """, (crop_db, sorted(set(row_states)), year - 1))
+            last_year = {st: float(y) for st, y in cur.fetchall() if y}
         finally:
             cur.close()
             conn.close()
 
+        t0 = time.perf_counter()
+        row_weeks = np.array([r[1] for r in rows], dtype=int)
+        stages = [r[2] or 'vegetative' for r in rows]
+        features = np.array([r[3:3 + len(ALL_NUMERIC_FEATURES)] for r in rows], dtype=float)
+        features = np.nan_to_num(features, nan=0.0)
+        slope, intercept = np.array([trends[US_STATES.get(st, st)] for st in row_states]).T
+        trend_yields = slope * year + intercept
+
+        ensemble, analog_yrs = self._ensemble_matrix(
+            crop, year, features, trend_yields, stages, models)
+
+        rmse = models['metadata'].get('rmse_cv', 10)
+        confidence = np.array([self._get_confidence(w) for w in row_weeks])
+        width = rmse * (2.5 - confidence * 1.5)   # wider at low confidence
+        low, high = ensemble - width, ensemble + width
+        logger.debug(f"{crop}: {len(rows)} predictions in {(time.perf_counter() - t0) * 1000:.1f} ms model time")
+
+        from src.models.yield_feature_engine import nass_week_to_date
+        forecast_dates = {w: nass_week_to_date(year, int(w)) for w in set(row_weeks.tolist())}
+
+        predictions = []
+        for i, state in enumerate(row_states):
+            trend_yield = trend_yields[i]
+            yield_ensemble = ensemble[i]
+            last_year_yield = last_year.get(state)
+            predictions.append(YieldPrediction(
+                commodity=crop_db,
+                state=state,
+                year=int(year),
+                forecast_week=int(row_weeks[i]),
+                forecast_date=forecast_dates[row_weeks[i]],
+                yield_forecast=float(round(yield_ensemble, 1)),
+                yield_low=float(round(low[i], 1)),
+                yield_high=float(round(high[i], 1)),
+                trend_yield=float(round(trend_yield, 1)),
+                vs_trend_pct=float(round((yield_ensemble - trend_yield) / trend_yield * 100, 1)) if trend_yield else 0.0,
+                last_year_yield=last_year_yield,
+                vs_last_year_pct=float(round((yield_ensemble - last_year_yield) / last_year_yield * 100, 1)) if last_year_yield else None,
+                model_type='ensemble',
+                confidence=float(round(confidence[i], 2)),
+                primary_driver=self._identify_driver(features[i], ALL_NUMERIC_FEATURES),
+                analog_years=analog_yrs[i],
+            ))
+        return predictions
+
+    def _ensemble_matrix(self, crop: str, year: int, features: np.ndarray,
+                         trend_yields: np.ndarray, stages: List[str],
+                         models: dict) -> Tuple[np.ndarray, List[str]]:
+        """Growth-stage-weighted ensemble for a (rows x features) matrix."""
+        a_idx = [ALL_NUMERIC_FEATURES.index(f) for f in MODEL_A_FEATURES
+                 if f in ALL_NUMERIC_FEATURES]
+        yield_a = trend_yields + models['model_a'].predict(features[:, a_idx])
+        yield_b = trend_yields + models['model_b'].predict(models['scaler'].transform(features))
+        yield_c, analog_yrs = self._analog_predict_batch(
+            features, models['analog_data'], trend_yields, year
+        )
+
+        weights = [self._get_ensemble_weights(crop, stage) for stage in stages]
+        w = np.array([[wt['model_a'], wt['model_b'], wt['model_c']] for wt in weights])
+        ensemble = w[:, 0] * yield_a + w[:, 1] * yield_b + w[:, 2] * yield_c
+        return ensemble, analog_yrs
+
     def save_predictions(self, predictions: List[YieldPrediction], run_id: str = None):
         """Save predictions to gold.yield_forecast."""
         if not predictions:
@@ -533,58 +535,61 @@ class YieldPredictionModel:
     def _analog_predict(self, features: np.ndarray, analog_data: dict,
                         trend_yield: float, current_year: int) -> Tuple[float, str]:
         """Find analog years and predict yield."""
+        yields, labels = self._analog_predict_batch(
+            features.reshape(1, -1), analog_data, np.array([trend_yield]), current_year
+        )
+        return float(yields[0]), labels[0]
+
+    def _analog_predict_batch(self, features: np.ndarray, analog_data: dict,
+                              trend_yields: np.ndarray,
+                              current_year: int) -> Tuple[np.ndarray, List[str]]:
+        """Analog-year prediction for every row of a feature matrix."""
+        n = len(features)
         if analog_data is None:
-            return trend_yield, ''
+            return trend_yields.astype(float), [''] * n
 
         a_idx = [analog_data['feature_names'].index(f) for f in ANALOG_FEATURES
                  if f in analog_data['feature_names']]
 
-        stored_features = np.array(analog_data['features'])
+        stored_features = np.array(analog_data['features'], dtype=float)
         stored_years = np.array(analog_data['years'])
-        stored_yields = np.array(analog_data['yields'])
-        stored_trends = np.array(analog_data['trend_yields'])
+        stored_yields = np.array(analog_data['yields'], dtype=float)
+        stored_trends = np.array(analog_data['trend_yields'], dtype=float)
 
-        # Standardize
-        current_subset = features[a_idx]
+        # Standardize against the full stored set, then drop the current year
         stored_subset = stored_features[:, a_idx]
-
         mean = np.mean(stored_subset, axis=0)
         std = np.std(stored_subset, axis=0)
         std[std == 0] = 1
 
-        current_std = (current_subset - mean) / std
-        stored_std = (stored_subset - mean) / std
-
-        # Euclidean distances
-        distances = np.sqrt(np.sum((stored_std - current_std) ** 2, axis=1))
-
-        # Exclude current year
         mask = stored_years != current_year
-        distances = distances[mask]
+        if not mask.any():
+            return trend_yields.astype(float), [''] * n
+        current_std = (features[:, a_idx] - mean) / std
+        stored_std = (stored_subset[mask] - mean) / std
         years = stored_years[mask]
-        yields = stored_yields[mask]
-        trends = stored_trends[mask]
+        deviations = stored_yields[mask] - stored_trends[mask]
 
-        if len(distances) == 0:
-            return trend_yield, ''
+        # (rows x stored) Euclidean distances
+        diff = current_std[:, None, :] - stored_std[None, :, :]
+        distances = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
 
-        # Top 5 analogs
-        top_idx = np.argsort(distances)[:5]
-        top_years = years[top_idx]
-        top_yields = yields[top_idx]
-        top_trends = trends[top_idx]
-        top_distances = distances[top_idx]
+        # Top 5 analogs per row, nearest first
+        k = min(5, distances.shape[1])
+        top_idx = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        top_distances = np.take_along_axis(distances, top_idx, axis=1)
+        order = np.argsort(top_distances, axis=1)
+        top_idx = np.take_along_axis(top_idx, order, axis=1)
+        top_distances = np.take_along_axis(top_distances, order, axis=1)
 
         # Yield deviations weighted by inverse distance
         weights = 1.0 / (top_distances + 0.01)
-        weights /= weights.sum()
-        deviations = top_yields - top_trends
-        weighted_dev = np.sum(weights * deviations)
+        weights /= weights.sum(axis=1, keepdims=True)
+        yields_c = trend_yields + np.sum(weights * deviations[top_idx], axis=1)
 
-        yield_c = trend_yield + weighted_dev
-        analog_str = "Similar to " + ", ".join([str(int(y)) for y in top_years[:3]])
-
-        return yield_c, analog_str
+        top_years = years[top_idx[:, :3]]
+        labels = ["Similar to " + ", ".join(str(int(y)) for y in row) for row in top_years]
+        return yields_c, labels
 
     def _get_ensemble_weights(self, crop: str, growth_stage: str) -> dict:
         """Get ensemble weights for crop/growth stage."""
@@ -637,6 +642,48 @@ class YieldPredictionModel:
 
         return 'Normal conditions'
 
+    def _load_models(self, crop: str) -> Optional[dict]:
+        """Trained sub-models for a crop, cached until the files change on disk."""
+        names = [f"{crop}_model_a.pkl", f"{crop}_model_b.pkl", f"{crop}_scaler.pkl",
+                 f"{crop}_analog_data.pkl", f"{crop}_metadata.json"]
+        stamp = tuple((self.model_dir / n).stat().st_mtime_ns
+                      if (self.model_dir / n).exists() else None for n in names)
+        cached = self._model_cache.get(crop)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        models = {
+            'model_a': self._load_pickle(names[0]),
+            'model_b': self._load_pickle(names[1]),
+            'scaler': self._load_pickle(names[2]),
+            'analog_data': self._load_pickle(names[3]),
+            'metadata': self._load_json(names[4]),
+        }
+        if models['model_a'] is None or models['model_b'] is None:
+            return None
+        self._model_cache[crop] = (stamp, models)
+        return models
+
+    def _trend_coefficients(self, cur, crop_db: str) -> Dict[str, Tuple[float, float]]:
+        """Linear trend (slope, intercept) by full state name, one query per commodity."""
+        if crop_db not in self._trend_cache:
+            cur.execute("""
+                SELECT state, slope, intercept
+                FROM silver.yield_trend
+                WHERE commodity = %s AND trend_type = 'linear'
+            """, (crop_db,))
+            self._trend_cache[crop_db] = {
+                state: (float(slope), float(intercept))
+                for state, slope, intercept in cur.fetchall()
+                if slope is not None and intercept is not None
+            }
+        return self._trend_cache[crop_db]
+
+    def clear_caches(self):
+        """Drop cached models and trend coefficients (e.g. after re-fitting trends)."""
+        self._model_cache.clear()
+        self._trend_cache.clear()
+
     def _load_pickle(self, filename: str):
         """Load a pickle file from model directory."""
         path = self.model_dir / filename
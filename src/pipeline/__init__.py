@@ -1,5 +1,6 @@
 """Pipeline orchestration for the autonomous report generation system."""
 
 from src.pipeline.report_pipeline import ReportPipeline, PipelineResult
+from src.pipeline.batch_runner import ReportBatchRunner, BatchResult
 
-__all__ = ['ReportPipeline', 'PipelineResult']
+__all__ = ['ReportPipeline', 'PipelineResult', 'ReportBatchRunner', 'BatchResult']
@@ -0,0 +1,186 @@
+"""
+Report Batch Runner
+
+Runs several analysis templates through ReportPipeline in one scheduled run,
+concurrently, so report-day turnaround is bounded by the slowest template
+rather than the sum of all of them.
+
+  - KG context for the union of every template's kg_node_keys is fetched once
+    (KGManager.get_enriched_contexts, one round trip) and shared.
+  - Prompt contexts are built concurrently, at most RLC_REPORT_CONTEXT_WORKERS
+    at a time, on the process-wide DB connection pool.
+  - LLM calls are capped per provider (RLC_LLM_CONCURRENCY_ANTHROPIC /
+    RLC_LLM_CONCURRENCY_OLLAMA) and fall back along the ModelRouter chain.
+  - Every PipelineResult carries its per-stage timings; BatchResult adds the
+    shared KG fetch and the batch wall time.
+
+Like ReportPipeline.run(), run() never raises.
+
+Usage:
+    from src.analysis.templates.wasde_template import WASDeAnalysisTemplate
+    from src.pipeline.batch_runner import ReportBatchRunner
+
+    runner = ReportBatchRunner([WASDeAnalysisTemplate(), ...])
+    batch = runner.run(triggered_by='usda_wasde')
+    for result in batch.results:
+        print(result.template_id, result.success, result.stage_timings)
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.pipeline.report_pipeline import PipelineResult, ReportPipeline
+
+logger = logging.getLogger(__name__)
+
+# Prompt contexts built at once; each holds a pooled DB connection (RLC_PG_POOL_MAX)
+REPORT_CONTEXT_WORKERS = int(os.getenv('RLC_REPORT_CONTEXT_WORKERS', 4))
+# LLM calls in flight per provider; a local Ollama server serves one model at a time
+LLM_PROVIDER_CONCURRENCY = {
+    'anthropic': int(os.getenv('RLC_LLM_CONCURRENCY_ANTHROPIC', 4)),
+    'ollama': int(os.getenv('RLC_LLM_CONCURRENCY_OLLAMA', 1)),
+}
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch: a PipelineResult per template, in input order."""
+    batch_id: uuid.UUID
+    triggered_by: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    results: List[PipelineResult] = field(default_factory=list)
+    stage_timings: Dict[str, int] = field(default_factory=dict)   # 'kg_prefetch', 'total' -> ms
+
+    @property
+    def success(self) -> bool:
+        return bool(self.results) and all(r.success for r in self.results)
+
+    @property
+    def failed(self) -> List[PipelineResult]:
+        return [r for r in self.results if not r.success]
+
+
+class ReportBatchRunner:
+    """
+    Runs a list of analysis templates concurrently, one ReportPipeline each.
+
+    The pipelines share one ModelRouter, one CallLogger and one set of
+    per-provider LLM semaphores.
+    """
+
+    def __init__(
+        self,
+        templates: List,
+        router=None,
+        call_logger=None,
+        context_workers: Optional[int] = None,
+        provider_concurrency: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            templates: BaseAnalysisTemplate subclass instances
+            router: Optional ModelRouter (lazy-created if None)
+            call_logger: Optional CallLogger (lazy-created if None)
+            context_workers: Prompt contexts built at once
+                (default RLC_REPORT_CONTEXT_WORKERS)
+            provider_concurrency: {provider: max LLM calls in flight}
+                (default LLM_PROVIDER_CONCURRENCY)
+        """
+        self.templates = list(templates)
+        self._router = router
+        self._call_logger = call_logger
+        self.context_workers = max(1, context_workers or REPORT_CONTEXT_WORKERS)
+        self.provider_concurrency = dict(LLM_PROVIDER_CONCURRENCY, **(provider_concurrency or {}))
+        self._kg_manager = None
+
+    def _get_router(self):
+        if self._router is None:
+            from src.services.llm.model_router import ModelRouter
+            self._router = ModelRouter()
+        return self._router
+
+    def _get_call_logger(self):
+        if self._call_logger is None:
+            from src.services.llm.call_logger import CallLogger
+            self._call_logger = CallLogger()
+        return self._call_logger
+
+    def _get_kg_manager(self):
+        if self._kg_manager is None:
+            from src.knowledge_graph.kg_manager import KGManager
+            self._kg_manager = KGManager()
+        return self._kg_manager
+
+    def _prefetch_kg_context(self) -> Optional[Dict]:
+        """
+        Enriched context for every template's kg_node_keys in one query.
+        Returns None on failure, and each template then fetches its own.
+        """
+        keys = list(dict.fromkeys(key for t in self.templates for key in t.kg_node_keys))
+        if not keys:
+            return {}
+        try:
+            return self._get_kg_manager().get_enriched_contexts(keys)
+        except Exception as e:
+            logger.warning("Shared KG context fetch failed, templates will fetch their own: %s", e)
+            return None
+
+    def run(self, triggered_by: str = 'manual') -> BatchResult:
+        """
+        Run every template's pipeline concurrently. Never raises -- each
+        template's errors are stored in its PipelineResult.
+
+        Args:
+            triggered_by: Who/what triggered this run (e.g. collector name)
+
+        Returns:
+            BatchResult with one PipelineResult per template, in input order
+        """
+        batch = BatchResult(
+            batch_id=uuid.uuid4(),
+            triggered_by=triggered_by,
+            started_at=datetime.now(timezone.utc),
+        )
+        start = time.perf_counter()
+        if not self.templates:
+            batch.finished_at = datetime.now(timezone.utc)
+            return batch
+
+        kg_context = self._prefetch_kg_context()
+        batch.stage_timings['kg_prefetch'] = int((time.perf_counter() - start) * 1000)
+
+        router = self._get_router()
+        call_logger = self._get_call_logger()
+        context_limit = threading.Semaphore(self.context_workers)
+        llm_limits = {provider: threading.Semaphore(max(1, n))
+                      for provider, n in self.provider_concurrency.items()}
+
+        pipelines = [
+            ReportPipeline(template, router=router, call_logger=call_logger,
+                           llm_limits=llm_limits, context_limit=context_limit)
+            for template in self.templates
+        ]
+        logger.info("Batch %s: running %d templates", batch.batch_id, len(pipelines))
+        with ThreadPoolExecutor(max_workers=len(pipelines),
+                                thread_name_prefix='report-pipeline') as pool:
+            futures = [pool.submit(p.run, triggered_by, kg_context) for p in pipelines]
+            batch.results = [f.result() for f in futures]
+
+        batch.stage_timings['total'] = int((time.perf_counter() - start) * 1000)
+        batch.finished_at = datetime.now(timezone.utc)
+
+        slowest = max(batch.results, key=lambda r: r.finished_at - r.started_at)
+        logger.info(
+            "Batch %s: %d/%d templates succeeded in %d ms (slowest: %s)",
+            batch.batch_id, len(batch.results) - len(batch.failed), len(batch.results),
+            batch.stage_timings['total'], slowest.template_id,
+        )
+        return batch
@@ -12,13 +12,19 @@ to produce an end-to-end autonomous report. Each run goes through 6 stages:
   6. Write report_generated event to core.event_log
 
 The run() method never raises. All exceptions are caught and stored in
-PipelineResult for downstream inspection.
+PipelineResult for downstream inspection, along with per-stage timings.
+
+A failed LLM call is logged and retried on the ModelRouter fallback chain.
+To run several templates at once, see src/pipeline/batch_runner.py.
 """
 
 import hashlib
 import json
 import logging
+import threading
+import time
 import uuid
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
@@ -44,6 +50,8 @@ class PipelineResult:
     docx_path: Optional[str] = None                        # Phase 2.5
     validation_passed: bool = False
     event_log_id: Optional[int] = None
+    llm_model_id: Optional[str] = None                     # Model that answered (after fallbacks)
+    stage_timings: Dict[str, int] = field(default_factory=dict)   # stage -> ms
 
 
 class ReportPipeline:
@@ -59,16 +67,24 @@ class ReportPipeline:
         result = pipeline.run(triggered_by='usda_wasde')
     """
 
-    def __init__(self, template, router=None, call_logger=None):
+    # pyplot state is process-global, so concurrent pipelines draw one at a time
+    _charts_lock = threading.Lock()
+
+    def __init__(self, template, router=None, call_logger=None,
+                 llm_limits: Optional[Dict] = None, context_limit=None):
         """
         Args:
             template: A BaseAnalysisTemplate subclass instance
             router: Optional ModelRouter (lazy-created if None)
             call_logger: Optional CallLogger (lazy-created if None)
+            llm_limits: Optional {provider: Semaphore} held around each LLM call
+            context_limit: Optional Semaphore held while building the prompt context
         """
         self.template = template
         self._router = router
         self._call_logger = call_logger
+        self._llm_limits = llm_limits or {}
+        self._context_limit = context_limit
 
     def _get_router(self):
         if self._router is None:
@@ -86,12 +102,24 @@ class ReportPipeline:
         from src.services.database.db_config import get_connection
         return get_connection()
 
-    def run(self, triggered_by: str = 'manual') -> PipelineResult:
+    @contextmanager
+    def _timed(self, result: PipelineResult, stage: str):
+        """Add the wall time of the block to result.stage_timings[stage] (ms)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = int((time.perf_counter() - start) * 1000)
+            result.stage_timings[stage] = result.stage_timings.get(stage, 0) + elapsed
+
+    def run(self, triggered_by: str = 'manual', kg_context: Optional[Dict] = None) -> PipelineResult:
         """
         Execute the full pipeline. Never raises -- all errors stored in result.
 
         Args:
             triggered_by: Who/what triggered this run (e.g. collector name)
+            kg_context: Pre-fetched enriched KG context shared across templates
+                (optional; the template fetches its own if None)
 
         Returns:
             PipelineResult with full execution details
@@ -108,28 +136,35 @@ class ReportPipeline:
         try:
             # Stage 1: Build prompt context
             logger.info("Pipeline %s stage 1: building prompt context", run_id)
-            prompt_context = self.template.build_prompt_context()
+            with self._timed(result, 'prompt_context'):
+                with self._context_limit or nullcontext():
+                    prompt_context = self.template.build_prompt_context(kg_context=kg_context)
             result.prompt_context = prompt_context
 
             # Stage 2: Route -> Render -> Call LLM -> Log
             logger.info("Pipeline %s stage 2: LLM call", run_id)
-            self._stage_llm(result, prompt_context)
+            with self._timed(result, 'llm'):
+                self._stage_llm(result, prompt_context)
 
             # Stage 3: Chart generation
             logger.info("Pipeline %s stage 3: charts", run_id)
-            result.chart_paths = self._stage_charts(prompt_context)
+            with self._timed(result, 'charts'):
+                result.chart_paths = self._stage_charts(prompt_context)
 
             # Stage 4: Document assembly & publish
             logger.info("Pipeline %s stage 4: publish", run_id)
-            self._stage_publish(result)
+            with self._timed(result, 'publish'):
+                self._stage_publish(result)
 
             # Stage 5: Validate narrative
             logger.info("Pipeline %s stage 5: validation", run_id)
-            result.validation_passed = self._validate_narrative(result.llm_narrative)
+            with self._timed(result, 'validation'):
+                result.validation_passed = self._validate_narrative(result.llm_narrative)
 
             # Stage 6: Write event_log entry
             logger.info("Pipeline %s stage 6: event log", run_id)
-            self._stage_event_log(result)
+            with self._timed(result, 'event_log'):
+                self._stage_event_log(result)
 
             result.success = True
             result.finished_at = datetime.now(timezone.utc)
@@ -149,7 +184,6 @@ class ReportPipeline:
     def _stage_llm(self, result: PipelineResult, prompt_context: Dict):
         """Route model, render prompt, call LLM, log the call."""
         from src.prompts.analysis.wasde_analysis_v1 import WASDeAnalysisV1
-        from src.services.llm.llm_client import call_llm
 
         # Build prompt variables from analysis output
         analysis = prompt_context.get('analysis', {})
@@ -174,21 +208,27 @@ class ReportPipeline:
             complexity='high',
         )
 
-        # Call LLM
-        response = call_llm(
-            model,
-            rendered.system_prompt,
-            rendered.user_prompt,
-            max_tokens=1800,
-        )
+        # Call LLM, falling back along the router's chain on failure
+        response, model = self._call_llm_with_fallback(result, router, model, rendered)
         result.llm_narrative = response.text
+        result.llm_model_id = model.model_id
 
         # Log the call
         call_logger = self._get_call_logger(result.pipeline_run_id)
         output_hash = hashlib.sha256(response.text.encode('utf-8')).hexdigest()
-        cost_in = (response.tokens_in / 1000) * model.cost_per_1k_in
-        cost_out = (response.tokens_out / 1000) * model.cost_per_1k_out
-        cost = round(cost_in + cost_out, 6)
+        if response.cached:
+            cost = 0.0
+        else:
+            cost_in = (response.tokens_in / 1000) * model.cost_per_1k_in
+            cost_out = (response.tokens_out / 1000) * model.cost_per_1k_out
+            cost = round(cost_in + cost_out, 6)
+        details = {
+            'template_id': rendered.template_id,
+            'template_version': rendered.version,
+            'response_preview': response.text[:500],
+        }
+        if response.cached:
+            details['cache_hit'] = True
 
         call_id = call_logger.log_call(
             task_type=rendered.task_type,
@@ -201,16 +241,63 @@ class ReportPipeline:
             tokens_out=response.tokens_out,
             cost_usd=cost,
             latency_ms=response.latency_ms,
-            details={
-                'template_id': rendered.template_id,
-                'template_version': rendered.version,
-                'response_preview': response.text[:500],
-            },
+            details=details,
             context_keys=rendered.context_keys,
             pipeline_run_id=result.pipeline_run_id,
+            ttft_ms=response.ttft_ms,
         )
         result.llm_call_id = call_id
 
+    def _call_llm_with_fallback(self, result: PipelineResult, router, model, rendered):
+        """
+        Call the routed model; on failure log the error and try the next
+        model from router.get_fallback(). Each attempt holds the provider's
+        slot in llm_limits. Returns (response, model that answered).
+        """
+        from src.services.llm.llm_client import call_llm
+
+        while True:
+            wait_start = time.perf_counter()
+            try:
+                with self._llm_limits.get(model.provider) or nullcontext():
+                    result.stage_timings['llm_queue'] = (
+                        result.stage_timings.get('llm_queue', 0)
+                        + int((time.perf_counter() - wait_start) * 1000))
+                    # Cached on prompt_hash when RLC_LLM_CACHE_DIR is set; never
+                    # for sensitivity >= 2, whose text stays out of local storage
+                    response = call_llm(
+                        model,
+                        rendered.system_prompt,
+                        rendered.user_prompt,
+                        max_tokens=1800,
+                        cache=False if rendered.sensitivity >= 2 else None,
+                        prompt_hash=rendered.prompt_hash,
+                    )
+                return response, model
+            except Exception as e:
+                fallback = router.get_fallback(model.model_id)
+                self._log_llm_error(result, model, rendered, e)
+                if fallback is None:
+                    raise
+                logger.warning("Pipeline %s: %s failed (%s), falling back to %s",
+                               result.pipeline_run_id, model.model_id, e, fallback.model_id)
+                model = fallback
+
+    def _log_llm_error(self, result: PipelineResult, model, rendered, error: Exception):
+        try:
+            self._get_call_logger(result.pipeline_run_id).log_error(
+                task_type=rendered.task_type,
+                model_id=model.model_id,
+                error_message=str(error),
+                provider=model.provider,
+                sensitivity=rendered.sensitivity,
+                prompt_hash=rendered.prompt_hash,
+                context_keys=rendered.context_keys,
+                pipeline_run_id=result.pipeline_run_id,
+            )
+        except Exception as e:
+            logger.error("Failed to log LLM error: %s", e)
+
     # ------------------------------------------------------------------
     # Stage 5: Validation
     # ------------------------------------------------------------------
@@ -271,6 +358,10 @@ class ReportPipeline:
                 }
                 if result.llm_call_id:
                     details['llm_call_id'] = str(result.llm_call_id)
+                if result.llm_model_id:
+                    details['llm_model_id'] = result.llm_model_id
+                if result.stage_timings:
+                    details['stage_timings_ms'] = dict(result.stage_timings)
 
                 cur.execute(
                     "SELECT core.log_event(%s, %s, %s, %s, %s)",
@@ -292,8 +383,9 @@ class ReportPipeline:
         """Generate charts for the report using the graphics generator."""
         try:
             from src.agents.graphics_generator_agent import GraphicsGeneratorAgent
-            agent = GraphicsGeneratorAgent()
-            return agent.generate_report_charts(self.template.report_type)
+            with self._charts_lock:
+                agent = GraphicsGeneratorAgent()
+                return agent.generate_report_charts(self.template.report_type)
         except ImportError:
             logger.debug("Graphics generator not available, skipping charts")
             return []
@@ -28,6 +28,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from dotenv import load_dotenv
 load_dotenv(PROJECT_ROOT / '.env')
 from src.services.database.db_config import get_connection
+from src.reports.feedstock_report.price_lookup import PriceLookup, series_key
 
 logger = logging.getLogger(__name__)
 
@@ -164,147 +165,62 @@ class DataPack:
 
 
 # =============================================================
-# Price fetchers
+# Price dashboard
 # =============================================================
-def _fetch_feedstock_price(cur, fs_code: str, region: str, target_date: date) -> Optional[Dict[str, Any]]:
-    """Latest feedstock price on or before target_date for (fs, region).
-
-    Reads silver.feedstock_prices_consolidated which UNIONs the legacy
-    fastmarkets feed (frozen ~2025-04) with USDA AMS byproducts
-    (live since 2022). For client-facing rendering, prefer non-proprietary
-    rows — but ORDER BY price_date will naturally surface the most recent
-    AMS data after fastmarkets went dark.
+def _entry_unit(entry: Dict[str, Any]) -> str:
+    return {'feedstock': '$/lb', 'fuel': '$/gal', 'credit': '$/credit'}.get(entry['source_table'], '')
+
+
+def build_price_dashboard(week_ending: date, lookup: Optional[PriceLookup] = None) -> List[PriceRow]:
+    """Build the price dashboard rows for one week.
+
+    All non-placeholder series are loaded through one PriceLookup (one query
+    per source table); pass `lookup` to reuse one already loaded through
+    week_ending.
     """
-    cur.execute("""
-        SELECT price_date, price_per_lb, source
-        FROM silver.feedstock_prices_consolidated
-        WHERE feedstock_code = %s AND region = %s
-          AND price_date <= %s AND price_per_lb > 0
-        ORDER BY price_date DESC LIMIT 1
-    """, (fs_code, region, target_date))
-    r = cur.fetchone()
-    if not r:
-        return None
-    return {'date': r['price_date'], 'value': float(r['price_per_lb']), 'source': r['source']}
-
-
-def _fetch_table_col_price(cur, table: str, col: str, target_date: date) -> Optional[Dict[str, Any]]:
-    """Latest value of a specific column in fuel_prices or credit_prices on/before target_date."""
-    cur.execute(f"""
-        SELECT price_date, {col} AS val, source
-        FROM bronze.{table}_prices
-        WHERE price_date <= %s AND {col} IS NOT NULL
-        ORDER BY price_date DESC LIMIT 1
-    """, (target_date,))
-    r = cur.fetchone()
-    if not r or r['val'] is None:
-        return None
-    return {'date': r['price_date'], 'value': float(r['val']), 'source': r['source']}
-
-
-def _fetch_52w_range(cur, source_table: str, **kwargs) -> Optional[Dict[str, float]]:
-    """52-week min/max for the given series, ending at target_date."""
-    target_date = kwargs['target_date']
-    range_start = target_date - timedelta(weeks=52)
-    if source_table == 'feedstock':
-        cur.execute("""
-            SELECT MIN(price_per_lb) AS lo, MAX(price_per_lb) AS hi
-            FROM silver.feedstock_prices_consolidated
-            WHERE feedstock_code = %s AND region = %s
-              AND price_date BETWEEN %s AND %s
-              AND price_per_lb > 0
-        """, (kwargs['fs'], kwargs['region'], range_start, target_date))
-    else:  # fuel or credit
-        col = kwargs['col']
-        cur.execute(f"""
-            SELECT MIN({col}) AS lo, MAX({col}) AS hi
-            FROM bronze.{source_table}_prices
-            WHERE price_date BETWEEN %s AND %s AND {col} IS NOT NULL
-        """, (range_start, target_date))
-    r = cur.fetchone()
-    if not r or r['lo'] is None:
-        return None
-    return {'low': float(r['lo']), 'high': float(r['hi'])}
-
-
-def _pct_change(curr: Optional[float], prior: Optional[float]) -> Optional[float]:
-    if curr is None or prior is None or prior == 0:
-        return None
-    return round((curr - prior) / prior * 100, 2)
-
-
-def build_price_dashboard(week_ending: date) -> List[PriceRow]:
-    """Build the price dashboard rows for one week."""
+    live = [e for e in PRICE_DASHBOARD if not e.get('is_placeholder', False)]
+    if lookup is None:
+        lookup = PriceLookup.load([series_key(e) for e in live], end_date=week_ending)
+
     rows: List[PriceRow] = []
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            for entry in PRICE_DASHBOARD:
-                src_table = entry['source_table']
-                is_ph = entry.get('is_placeholder', False)
-
-                # Skip the DB query for known placeholders to avoid noise
-                if is_ph:
-                    rows.append(PriceRow(
-                        group=entry['group'], product=entry['product'], location=entry['location'],
-                        week_ending=None, weekly_avg=None, wow_change_pct=None,
-                        mom_change_pct=None, yoy_change_pct=None,
-                        range_52w_low=None, range_52w_high=None,
-                        unit='$/lb' if src_table == 'feedstock' else '',
-                        source='placeholder', is_placeholder=True,
-                    ))
-                    continue
-
-                # Fetch current week
-                if src_table == 'feedstock':
-                    curr = _fetch_feedstock_price(cur, entry['fs'], entry['region'], week_ending)
-                    rng_args = {'fs': entry['fs'], 'region': entry['region'], 'target_date': week_ending}
-                    unit = '$/lb'
-                elif src_table == 'fuel':
-                    curr = _fetch_table_col_price(cur, 'fuel', entry['col'], week_ending)
-                    rng_args = {'col': entry['col'], 'target_date': week_ending}
-                    unit = '$/gal' if 'ulsd' in entry['col'] or 'b100' in entry['col'] or 'rd_' in entry['col'] else '$/gal'
-                elif src_table == 'credit':
-                    curr = _fetch_table_col_price(cur, 'credit', entry['col'], week_ending)
-                    rng_args = {'col': entry['col'], 'target_date': week_ending}
-                    unit = '$/credit'
-                else:
-                    curr = None
-                    rng_args = {}
-                    unit = ''
-
-                if not curr:
-                    rows.append(PriceRow(
-                        group=entry['group'], product=entry['product'], location=entry['location'],
-                        week_ending=None, weekly_avg=None, wow_change_pct=None,
-                        mom_change_pct=None, yoy_change_pct=None,
-                        range_52w_low=None, range_52w_high=None,
-                        unit=unit, source='no_data', is_placeholder=False,
-                    ))
-                    continue
-
-                # Fetch prior periods
-                def _hist(d):
-                    if src_table == 'feedstock':
-                        return _fetch_feedstock_price(cur, entry['fs'], entry['region'], d)
-                    return _fetch_table_col_price(cur, src_table, entry['col'], d)
-
-                wow = _hist(week_ending - timedelta(weeks=1))
-                mom = _hist(week_ending - timedelta(weeks=4))
-                yoy = _hist(week_ending - timedelta(weeks=52))
-
-                # 52-week range
-                rng = _fetch_52w_range(cur, src_table, **rng_args)
-
-                rows.append(PriceRow(
-                    group=entry['group'], product=entry['product'], location=entry['location'],
-                    week_ending=curr['date'], weekly_avg=curr['value'],
-                    wow_change_pct=_pct_change(curr['value'], wow['value'] if wow else None),
-                    mom_change_pct=_pct_change(curr['value'], mom['value'] if mom else None),
-                    yoy_change_pct=_pct_change(curr['value'], yoy['value'] if yoy else None),
-                    range_52w_low=rng['low'] if rng else None,
-                    range_52w_high=rng['high'] if rng else None,
-                    unit=unit, source=curr['source'] or 'unknown', is_placeholder=False,
-                ))
+    for entry in PRICE_DASHBOARD:
+        unit = _entry_unit(entry)
+
+        # Known placeholders are never queried
+        if entry.get('is_placeholder', False):
+            rows.append(PriceRow(
+                group=entry['group'], product=entry['product'], location=entry['location'],
+                week_ending=None, weekly_avg=None, wow_change_pct=None,
+                mom_change_pct=None, yoy_change_pct=None,
+                range_52w_low=None, range_52w_high=None,
+                unit=unit if entry['source_table'] == 'feedstock' else '',
+                source='placeholder', is_placeholder=True,
+            ))
+            continue
+
+        key = series_key(entry)
+        curr = lookup.as_of(key, week_ending)
+        if not curr:
+            rows.append(PriceRow(
+                group=entry['group'], product=entry['product'], location=entry['location'],
+                week_ending=None, weekly_avg=None, wow_change_pct=None,
+                mom_change_pct=None, yoy_change_pct=None,
+                range_52w_low=None, range_52w_high=None,
+                unit=unit, source='no_data', is_placeholder=False,
+            ))
+            continue
+
+        rng = lookup.range(key, week_ending, weeks=52)
+        rows.append(PriceRow(
+            group=entry['group'], product=entry['product'], location=entry['location'],
+            week_ending=curr.date, weekly_avg=curr.value,
+            wow_change_pct=lookup.pct_change(key, week_ending, weeks=1),
+            mom_change_pct=lookup.pct_change(key, week_ending, weeks=4),
+            yoy_change_pct=lookup.pct_change(key, week_ending, weeks=52),
+            range_52w_low=rng[0] if rng else None,
+            range_52w_high=rng[1] if rng else None,
+            unit=unit, source=curr.source or 'unknown', is_placeholder=False,
+        ))
     return rows
 
 
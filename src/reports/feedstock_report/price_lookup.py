@@ -0,0 +1,203 @@
+"""The Feedstock Report — as-of price lookup.
+
+Loads a window of history for many price series in one query per source
+table, then answers "latest on or before", period-change and N-week range
+questions in memory with binary search. Replaces the per-entry query fan-out
+the dashboard used to do (five round trips per product/location).
+
+Usage:
+    from src.reports.feedstock_report.price_lookup import PriceLookup
+    lookup = PriceLookup.load([('feedstock', 'SBO', 'iowa'), ('credit', 'd4_rin')],
+                              end_date=date(2026, 5, 22))
+    lookup.as_of(('feedstock', 'SBO', 'iowa'), date(2026, 5, 22))
+    lookup.pct_change(('credit', 'd4_rin'), date(2026, 5, 22), weeks=4)
+    lookup.range(('credit', 'd4_rin'), date(2026, 5, 22), weeks=52)
+
+Series keys:
+    ('feedstock', feedstock_code, region)   silver.feedstock_prices_consolidated
+    ('fuel', column)                        bronze.fuel_prices
+    ('credit', column)                      bronze.credit_prices
+
+Only the loaded window is searchable: an as-of date with no observation
+between the window start and that date returns None rather than reaching
+further back. The default 53 weeks covers the dashboard's YoY and 52-week
+range with one week of slack.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(PROJECT_ROOT))
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / '.env')
+from src.services.database.db_config import get_connection
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, ...]
+
+DEFAULT_WINDOW_WEEKS = 53
+
+# Wide tables: one column per series. Column names are interpolated into
+# SQL, so they must look like plain identifiers.
+WIDE_TABLES = {'fuel': 'bronze.fuel_prices', 'credit': 'bronze.credit_prices'}
+_IDENT_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+def series_key(entry: Dict[str, Any]) -> SeriesKey:
+    """Series key for a PRICE_DASHBOARD-style entry."""
+    if entry['source_table'] == 'feedstock':
+        return ('feedstock', entry['fs'], entry['region'])
+    return (entry['source_table'], entry['col'])
+
+
+@dataclass
+class PricePoint:
+    date: date
+    value: float
+    source: Optional[str]
+
+
+@dataclass
+class PriceSeries:
+    """One series as parallel arrays sorted by date (one value per date)."""
+    dates: List[date] = field(default_factory=list)
+    values: List[float] = field(default_factory=list)
+    sources: List[Optional[str]] = field(default_factory=list)
+
+    def append(self, d: date, value: float, source: Optional[str]) -> None:
+        # Rows arrive ordered by date; a repeated date (the consolidated view
+        # can carry the same day from two feeds) keeps the later row.
+        if self.dates and self.dates[-1] == d:
+            self.values[-1], self.sources[-1] = value, source
+            return
+        self.dates.append(d)
+        self.values.append(value)
+        self.sources.append(source)
+
+    def as_of(self, d: date) -> Optional[PricePoint]:
+        """Latest observation on or before d."""
+        i = bisect.bisect_right(self.dates, d) - 1
+        if i < 0:
+            return None
+        return PricePoint(self.dates[i], self.values[i], self.sources[i])
+
+    def range(self, start: date, end: date) -> Optional[Tuple[float, float]]:
+        """(min, max) over observations with start <= date <= end."""
+        lo = bisect.bisect_left(self.dates, start)
+        hi = bisect.bisect_right(self.dates, end)
+        if lo >= hi:
+            return None
+        window = self.values[lo:hi]
+        return min(window), max(window)
+
+
+def pct_change(curr: Optional[float], prior: Optional[float]) -> Optional[float]:
+    if curr is None or prior is None or prior == 0:
+        return None
+    return round((curr - prior) / prior * 100, 2)
+
+
+class PriceLookup:
+    """In-memory as-of index over a window of price history."""
+
+    def __init__(self, series: Dict[SeriesKey, PriceSeries], start_date: date, end_date: date):
+        self.series = series
+        self.start_date = start_date
+        self.end_date = end_date
+        self.queries = 0
+
+    @classmethod
+    def load(cls, keys: Iterable[SeriesKey], end_date: date,
+             weeks: int = DEFAULT_WINDOW_WEEKS,
+             connection_fn: Callable = get_connection) -> 'PriceLookup':
+        """Fetch `weeks` of history ending at end_date for every key.
+
+        One query per source table regardless of how many series are asked
+        for. Keys with no rows in the window are present but empty.
+        """
+        keys = list(dict.fromkeys(keys))
+        start_date = end_date - timedelta(weeks=weeks)
+        lookup = cls({k: PriceSeries() for k in keys}, start_date, end_date)
+
+        pairs = [(k[1], k[2]) for k in keys if k[0] == 'feedstock']
+        wide: Dict[str, List[str]] = {}
+        for k in keys:
+            if k[0] in WIDE_TABLES:
+                if not _IDENT_RE.match(k[1]):
+                    raise ValueError(f"Invalid price column: {k[1]!r}")
+                wide.setdefault(k[0], []).append(k[1])
+            elif k[0] != 'feedstock':
+                raise ValueError(f"Unknown price source: {k[0]!r}")
+
+        with connection_fn() as conn:
+            with conn.cursor() as cur:
+                if pairs:
+                    lookup._load_feedstock(cur, pairs)
+                for source, cols in wide.items():
+                    lookup._load_wide(cur, source, cols)
+        logger.debug(f"PriceLookup: {len(keys)} series, {start_date}..{end_date}, "
+                     f"{lookup.queries} queries")
+        return lookup
+
+    def _load_feedstock(self, cur, pairs: List[Tuple[str, str]]) -> None:
+        codes = [p[0] for p in pairs]
+        regions = [p[1] for p in pairs]
+        cur.execute("""
+            SELECT feedstock_code, region, price_date, price_per_lb, source
+            FROM silver.feedstock_prices_consolidated
+            WHERE feedstock_code = ANY(%s)
+              AND (feedstock_code, region) IN (
+                  SELECT * FROM unnest(%s::text[], %s::text[]))
+              AND price_date BETWEEN %s AND %s
+              AND price_per_lb > 0
+            ORDER BY feedstock_code, region, price_date
+        """, (sorted(set(codes)), codes, regions, self.start_date, self.end_date))
+        self.queries += 1
+        for r in cur.fetchall():
+            s = self.series.get(('feedstock', r['feedstock_code'], r['region']))
+            if s is not None:
+                s.append(r['price_date'], float(r['price_per_lb']), r['source'])
+
+    def _load_wide(self, cur, source: str, cols: List[str]) -> None:
+        select = ', '.join(cols)
+        not_null = ' OR '.join(f"{c} IS NOT NULL" for c in cols)
+        cur.execute(f"""
+            SELECT price_date, source, {select}
+            FROM {WIDE_TABLES[source]}
+            WHERE price_date BETWEEN %s AND %s AND ({not_null})
+            ORDER BY price_date
+        """, (self.start_date, self.end_date))
+        self.queries += 1
+        targets = [(c, self.series[(source, c)]) for c in cols]
+        for r in cur.fetchall():
+            for col, s in targets:
+                if r[col] is not None:
+                    s.append(r['price_date'], float(r[col]), r['source'])
+
+    # ── queries ──────────────────────────────────────────────
+    def get(self, key: SeriesKey) -> PriceSeries:
+        return self.series.get(key) or PriceSeries()
+
+    def as_of(self, key: SeriesKey, d: date) -> Optional[PricePoint]:
+        return self.get(key).as_of(d)
+
+    def pct_change(self, key: SeriesKey, d: date, weeks: int) -> Optional[float]:
+        """Percent change from the as-of value `weeks` before d to the as-of value at d."""
+        s = self.get(key)
+        curr = s.as_of(d)
+        prior = s.as_of(d - timedelta(weeks=weeks))
+        return pct_change(curr.value if curr else None, prior.value if prior else None)
+
+    def range(self, key: SeriesKey, d: date, weeks: int = 52) -> Optional[Tuple[float, float]]:
+        """(low, high) over the `weeks` ending at d, inclusive."""
+        return self.get(key).range(d - timedelta(weeks=weeks), d)
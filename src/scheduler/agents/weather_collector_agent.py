@@ -7,9 +7,14 @@ Sources:
 - OpenWeather API: Current weather and 5-day forecast
 - Open-Meteo API: Historical data (free, no key required)
 
+Batch collection fetches all locations concurrently through WeatherFetchEngine
+(weather_fetch.py), bulk-inserts them into bronze and runs the silver
+transform once per batch.
+
 Round Lakes Commodities
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -37,7 +42,7 @@ else:
 # Try to import database connectivity
 try:
     import psycopg2
-    from psycopg2.extras import Json
+    from psycopg2.extras import Json, execute_values
     DB_AVAILABLE = True
 except ImportError:
     DB_AVAILABLE = False
@@ -49,6 +54,8 @@ try:
 except ImportError:
     LOCATION_SERVICE_AVAILABLE = False
 
+from src.scheduler.agents.weather_fetch import WeatherFetchEngine, WeatherRecord
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -87,6 +94,7 @@ class WeatherCollectorAgent:
     OPENWEATHER_BASE = "https://api.openweathermap.org/data/2.5"
     OPENWEATHER_ONECALL = "https://api.openweathermap.org/data/3.0/onecall"
     OPEN_METEO_BASE = "https://api.open-meteo.com/v1"
+    OPEN_METEO_ARCHIVE = "https://archive-api.open-meteo.com/v1/archive"
 
     def __init__(self):
         """Initialize the weather collector."""
@@ -282,7 +290,7 @@ class WeatherCollectorAgent:
         Returns:
             API response dict or None on error
         """
-        url = "https://archive-api.open-meteo.com/v1/archive"
+        url = self.OPEN_METEO_ARCHIVE
         params = {
             'latitude': lat,
             'longitude': lon,
@@ -363,6 +371,122 @@ class WeatherCollectorAgent:
                 conn.close()
             return False
 
+    def save_batch_to_bronze(self, records: List[WeatherRecord], batch_id: str) -> int:
+        """
+        Bulk-save fetched weather records to bronze in one statement.
+
+        Args:
+            records: WeatherRecords from WeatherFetchEngine
+            batch_id: Batch UUID
+
+        Returns:
+            Number of rows written (0 if the database is unavailable)
+        """
+        if not records:
+            return 0
+
+        conn = self._get_db_connection()
+        if not conn:
+            logger.warning("Database not available, skipping bronze save")
+            return 0
+
+        # ON CONFLICT cannot touch the same row twice in one statement
+        collected_at = datetime.now()
+        rows = {}
+        for rec in records:
+            rows[(rec.location_id, rec.source, rec.observation_date)] = (
+                rec.location_id, rec.source, Json(rec.raw_data), rec.observation_date,
+                collected_at, batch_id
+            )
+
+        try:
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO bronze.weather_raw (
+                    location_id, source, raw_response, observation_date,
+                    collected_at, batch_id, is_processed
+                ) VALUES %s
+                ON CONFLICT (location_id, source, observation_date)
+                DO UPDATE SET
+                    raw_response = EXCLUDED.raw_response,
+                    collected_at = EXCLUDED.collected_at,
+                    batch_id = EXCLUDED.batch_id,
+                    is_processed = FALSE
+            """, list(rows.values()), template="(%s, %s, %s, %s, %s, %s, FALSE)", page_size=1000)
+
+            conn.commit()
+            cursor.close()
+            conn.close()
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Error saving batch to bronze: {e}")
+            if conn:
+                conn.rollback()
+                conn.close()
+            return 0
+
+    def save_alerts_batch_to_bronze(self, records: List[WeatherRecord], batch_id: str) -> int:
+        """
+        Bulk-save the alerts carried by a batch of One Call records.
+
+        Returns:
+            Number of alerts saved
+        """
+        collected_at = datetime.now()
+        rows = {}
+        for rec in records:
+            for alert in rec.alerts:
+                alert_id = f"{alert.get('event', 'unknown')}_{alert.get('start', 0)}"
+                rows[(rec.location_id, alert_id)] = (
+                    rec.location_id,
+                    alert_id,
+                    alert.get('sender_name'),
+                    alert.get('event', 'Unknown'),
+                    datetime.fromtimestamp(alert['start']) if alert.get('start') else None,
+                    datetime.fromtimestamp(alert['end']) if alert.get('end') else None,
+                    alert.get('description'),
+                    alert.get('tags', []),
+                    Json(alert),
+                    collected_at,
+                    batch_id
+                )
+        if not rows:
+            return 0
+
+        conn = self._get_db_connection()
+        if not conn:
+            return 0
+
+        try:
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO bronze.weather_alerts_raw (
+                    location_id, alert_id, sender_name, event,
+                    start_time, end_time, description, tags,
+                    raw_data, collected_at, batch_id
+                ) VALUES %s
+                ON CONFLICT (location_id, alert_id)
+                DO UPDATE SET
+                    description = EXCLUDED.description,
+                    end_time = EXCLUDED.end_time,
+                    raw_data = EXCLUDED.raw_data,
+                    collected_at = EXCLUDED.collected_at
+            """, list(rows.values()), page_size=1000)
+
+            conn.commit()
+            cursor.close()
+            conn.close()
+            logger.info(f"Saved {len(rows)} weather alerts")
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Error saving alerts: {e}")
+            if conn:
+                conn.rollback()
+                conn.close()
+            return 0
+
     def save_alerts_to_bronze(
         self,
         location_id: str,
@@ -533,6 +657,16 @@ class WeatherCollectorAgent:
                 conn.close()
             return 0
 
+    def _fetch_engine(self) -> WeatherFetchEngine:
+        """Async fetch engine pointed at this collector's endpoints."""
+        return WeatherFetchEngine(
+            openweather_api_key=self.openweather_api_key,
+            openweather_base=self.OPENWEATHER_BASE,
+            onecall_url=self.OPENWEATHER_ONECALL,
+            open_meteo_base=self.OPEN_METEO_BASE,
+            open_meteo_archive=self.OPEN_METEO_ARCHIVE,
+        )
+
     def collect_current_weather(self, locations: List[WeatherLocation] = None) -> CollectorResult:
         """
         Collect current weather for all (or specified) locations.
@@ -557,51 +691,21 @@ class WeatherCollectorAgent:
             batch_id=batch_id
         )
 
-        total_alerts = 0
+        # One Call 3.0 (includes alerts) -> OpenWeather current -> Open-Meteo,
+        # fetched concurrently across locations
+        try:
+            fetched, failed = asyncio.run(self._fetch_engine().fetch_current(locations, today))
+        except Exception as e:
+            logger.error(f"Error fetching weather: {e}")
+            result.errors.append(f"Error fetching weather: {str(e)}")
+            fetched, failed = {}, []
 
-        for loc in locations:
-            try:
-                weather_data = None
-                source = None
-                alerts = []
-
-                # Try One Call API 3.0 first (includes alerts)
-                if self.openweather_api_key:
-                    onecall_data = self.fetch_openweather_onecall(loc.lat, loc.lon)
-                    if onecall_data:
-                        weather_data = onecall_data
-                        source = 'openweather_onecall'
-                        alerts = onecall_data.get('alerts', [])
-
-                        # Save alerts if any
-                        if alerts:
-                            alerts_saved = self.save_alerts_to_bronze(loc.id, alerts, batch_id)
-                            total_alerts += alerts_saved
-
-                # Fall back to basic OpenWeather API
-                if not weather_data and self.openweather_api_key:
-                    weather_data = self.fetch_openweather_current(loc.lat, loc.lon)
-                    if weather_data:
-                        source = 'openweather'
-
-                # Fall back to Open-Meteo if OpenWeather failed or not configured
-                if not weather_data:
-                    weather_data = self.fetch_open_meteo_current(loc.lat, loc.lon)
-                    if weather_data:
-                        source = 'open_meteo'
-
-                if weather_data:
-                    saved = self.save_to_bronze(loc.id, source, weather_data, today, batch_id)
-                    if saved:
-                        result.records_collected += 1
-                    result.locations_processed += 1
-                    logger.debug(f"Collected weather for {loc.display_name} (alerts: {len(alerts)})")
-                else:
-                    result.errors.append(f"Failed to fetch weather for {loc.id}")
+        result.errors.extend(f"Failed to fetch weather for {loc_id}" for loc_id in failed)
+        result.locations_processed = len(fetched)
 
-            except Exception as e:
-                result.errors.append(f"Error collecting {loc.id}: {str(e)}")
-                logger.error(f"Error collecting weather for {loc.id}: {e}")
+        records = list(fetched.values())
+        result.records_collected = self.save_batch_to_bronze(records, batch_id)
+        total_alerts = self.save_alerts_batch_to_bronze(records, batch_id)
 
         # Transform to silver
         if result.records_collected > 0:
@@ -656,42 +760,24 @@ class WeatherCollectorAgent:
             batch_id=batch_id
         )
 
-        for loc in locations:
-            try:
-                # Open-Meteo for historical (free)
-                weather_data = self.fetch_open_meteo_historical(
-                    loc.lat, loc.lon, start_date, end_date
-                )
+        # Open-Meteo archive (free), many locations per request, one record per day
+        try:
+            fetched, failed = asyncio.run(
+                self._fetch_engine().fetch_historical(locations, start_date, end_date)
+            )
+        except Exception as e:
+            logger.error(f"Error fetching historical weather: {e}")
+            result.errors.append(f"Error fetching historical weather: {str(e)}")
+            fetched, failed = {}, []
 
-                if weather_data and 'daily' in weather_data:
-                    # Save each day separately
-                    daily = weather_data['daily']
-                    dates = daily.get('time', [])
-
-                    for i, date_str in enumerate(dates):
-                        day_data = {
-                            'daily': {
-                                key: [val[i]] if isinstance(val, list) and i < len(val) else val
-                                for key, val in daily.items()
-                            },
-                            'latitude': weather_data.get('latitude'),
-                            'longitude': weather_data.get('longitude'),
-                            'timezone': weather_data.get('timezone')
-                        }
-
-                        obs_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        saved = self.save_to_bronze(loc.id, 'open_meteo', day_data, obs_date, batch_id)
-                        if saved:
-                            result.records_collected += 1
-
-                    result.locations_processed += 1
-                    logger.info(f"Collected {len(dates)} days for {loc.display_name}")
-                else:
-                    result.errors.append(f"No historical data for {loc.id}")
+        result.errors.extend(f"No historical data for {loc_id}" for loc_id in failed)
+        result.locations_processed = len(fetched)
+        for loc_id, days in fetched.items():
+            logger.info(f"Collected {len(days)} days for {loc_id}")
 
-            except Exception as e:
-                result.errors.append(f"Error collecting historical {loc.id}: {str(e)}")
-                logger.error(f"Error collecting historical for {loc.id}: {e}")
+        result.records_collected = self.save_batch_to_bronze(
+            [rec for days in fetched.values() for rec in days], batch_id
+        )
 
         # Transform to silver
         if result.records_collected > 0:
@@ -0,0 +1,261 @@
+"""
+Weather Fetch Engine
+Async, batched weather fetching for many locations at once.
+
+- OpenWeather (One Call 3.0, falling back to current weather) is requested per
+  location, fanned out over one keep-alive aiohttp session with bounded
+  concurrency.
+- Open-Meteo forecast and archive requests carry many locations each using the
+  API's comma-separated multi-coordinate form.
+- Each provider draws from a shared token bucket (src.utils.rate_limit), so
+  concurrent runs in one process respect the same per-provider budget.
+
+The engine only fetches; WeatherCollectorAgent bulk-writes the returned
+records to bronze and runs the silver transform once per batch.
+
+Round Lakes Commodities
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.rate_limit import install_shared_limiter
+
+logger = logging.getLogger('WeatherCollector')
+
+WEATHER_CONCURRENCY = int(os.getenv('RLC_WEATHER_CONCURRENCY', 16))
+OPEN_METEO_BATCH = int(os.getenv('RLC_OPEN_METEO_BATCH', 50))      # locations per request
+OPENWEATHER_RATE_PER_MIN = float(os.getenv('RLC_OPENWEATHER_RATE_PER_MIN', 60))
+OPENWEATHER_BURST = float(os.getenv('RLC_OPENWEATHER_BURST', 10))
+# Open-Meteo counts each location in a multi-coordinate request as a call
+OPEN_METEO_RATE_PER_MIN = float(os.getenv('RLC_OPEN_METEO_RATE_PER_MIN', 600))
+OPEN_METEO_BURST = float(os.getenv('RLC_OPEN_METEO_BURST', 100))
+
+OPEN_METEO_CURRENT_DAILY = ('temperature_2m_max,temperature_2m_min,temperature_2m_mean,'
+                            'precipitation_sum,wind_speed_10m_max,weather_code')
+OPEN_METEO_ARCHIVE_DAILY = ('temperature_2m_max,temperature_2m_min,temperature_2m_mean,'
+                            'precipitation_sum,precipitation_hours,wind_speed_10m_max,'
+                            'weather_code,et0_fao_evapotranspiration')
+
+
+@dataclass
+class WeatherRecord:
+    """One bronze.weather_raw row, plus any alerts that came with it."""
+    location_id: str
+    source: str
+    raw_data: Dict
+    observation_date: date
+    alerts: List[Dict] = field(default_factory=list)
+
+
+def split_daily(weather_data: Dict) -> List[Tuple[date, Dict]]:
+    """Split an Open-Meteo daily response into one (date, payload) per day."""
+    daily = weather_data['daily']
+    days = []
+    for i, date_str in enumerate(daily.get('time', [])):
+        day_data = {
+            'daily': {
+                key: [val[i]] if isinstance(val, list) and i < len(val) else val
+                for key, val in daily.items()
+            },
+            'latitude': weather_data.get('latitude'),
+            'longitude': weather_data.get('longitude'),
+            'timezone': weather_data.get('timezone')
+        }
+        days.append((datetime.strptime(date_str, '%Y-%m-%d').date(), day_data))
+    return days
+
+
+class WeatherFetchEngine:
+    """
+    Fetches current or historical weather for a list of WeatherLocations.
+
+    Args:
+        openweather_api_key: OpenWeather key; Open-Meteo only if None
+        openweather_base / onecall_url / open_meteo_base / open_meteo_archive:
+            Endpoint roots (the collector's class attributes)
+        concurrency: Maximum requests in flight across all providers
+            (default RLC_WEATHER_CONCURRENCY)
+        batch_size: Locations per Open-Meteo request (default RLC_OPEN_METEO_BATCH)
+    """
+
+    def __init__(
+        self,
+        openweather_api_key: Optional[str],
+        openweather_base: str,
+        onecall_url: str,
+        open_meteo_base: str,
+        open_meteo_archive: str,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        user_agent: str = 'RLC-WeatherCollector/1.0',
+    ):
+        self.openweather_api_key = openweather_api_key
+        self.openweather_base = openweather_base
+        self.onecall_url = onecall_url
+        self.open_meteo_base = open_meteo_base
+        self.open_meteo_archive = open_meteo_archive
+        self.concurrency = max(1, concurrency or WEATHER_CONCURRENCY)
+        self.batch_size = max(1, batch_size or OPEN_METEO_BATCH)
+        self.user_agent = user_agent
+        self.openweather_limiter = install_shared_limiter(
+            'weather:openweather', OPENWEATHER_RATE_PER_MIN, OPENWEATHER_BURST)
+        self.open_meteo_limiter = install_shared_limiter(
+            'weather:open_meteo', OPEN_METEO_RATE_PER_MIN, OPEN_METEO_BURST)
+        self.onecall_enabled = True
+        self.requests = 0
+
+    # ── HTTP ─────────────────────────────────────────────────
+
+    async def _get_json(self, session, semaphore, limiter, url: str, params: Dict,
+                        timeout: float, tokens: float = 1.0):
+        async with semaphore:
+            wait = limiter.reserve(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.requests += 1
+            async with session.get(url, params=params,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    def _session(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        return aiohttp.ClientSession(connector=connector,
+                                     headers={'User-Agent': self.user_agent})
+
+    # ── Providers ────────────────────────────────────────────
+
+    async def _onecall(self, session, semaphore, loc) -> Optional[Dict]:
+        if not self.onecall_enabled:
+            return None
+        params = {'lat': loc.lat, 'lon': loc.lon, 'appid': self.openweather_api_key, 'units': 'metric'}
+        try:
+            return await self._get_json(session, semaphore, self.openweather_limiter,
+                                        self.onecall_url, params, timeout=20)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
+                if self.onecall_enabled:
+                    logger.error("One Call API 3.0 requires subscription - falling back to basic API")
+                self.onecall_enabled = False
+            else:
+                logger.error(f"OpenWeather One Call API error for {loc.id}: {e}")
+        except Exception as e:
+            logger.error(f"OpenWeather One Call API error for {loc.id}: {e!r}")
+        return None
+
+    async def _openweather_current(self, session, semaphore, loc) -> Optional[Dict]:
+        params = {'lat': loc.lat, 'lon': loc.lon, 'appid': self.openweather_api_key, 'units': 'metric'}
+        try:
+            return await self._get_json(session, semaphore, self.openweather_limiter,
+                                        f"{self.openweather_base}/weather", params, timeout=15)
+        except Exception as e:
+            logger.error(f"OpenWeather API error for {loc.id}: {e!r}")
+            return None
+
+    async def _open_meteo(self, session, semaphore, url: str, locations: list,
+                          params: Dict, timeout: float) -> List[Optional[Dict]]:
+        """One multi-coordinate request; one response (or None) per location."""
+        params = dict(params,
+                      latitude=','.join(str(loc.lat) for loc in locations),
+                      longitude=','.join(str(loc.lon) for loc in locations))
+        try:
+            data = await self._get_json(session, semaphore, self.open_meteo_limiter, url, params,
+                                        timeout=timeout, tokens=len(locations))
+        except Exception as e:
+            logger.error(f"Open-Meteo API error for {len(locations)} locations: {e!r}")
+            return [None] * len(locations)
+        # A single coordinate comes back as an object, several as a list
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, list) or len(data) != len(locations):
+            logger.error(f"Open-Meteo returned {len(data) if isinstance(data, list) else 'no'} "
+                         f"results for {len(locations)} locations")
+            return [None] * len(locations)
+        return data
+
+    async def _open_meteo_batched(self, session, semaphore, url: str, locations: list,
+                                  params: Dict, timeout: float) -> List[Optional[Dict]]:
+        chunks = [locations[i:i + self.batch_size]
+                  for i in range(0, len(locations), self.batch_size)]
+        responses = await asyncio.gather(*(
+            self._open_meteo(session, semaphore, url, chunk, params, timeout) for chunk in chunks))
+        return [data for chunk in responses for data in chunk]
+
+    # ── Collection modes ─────────────────────────────────────
+
+    async def fetch_current(self, locations: list, observation_date: date
+                            ) -> Tuple[Dict[str, WeatherRecord], List[str]]:
+        """
+        Current weather per location: One Call 3.0, then OpenWeather current,
+        then Open-Meteo (batched) for whatever is still missing.
+
+        Returns:
+            ({location_id: WeatherRecord}, [location_id without data])
+        """
+        records: Dict[str, WeatherRecord] = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._session() as session:
+            pending = list(locations)
+            if self.openweather_api_key:
+                for source, fetch in (('openweather_onecall', self._onecall),
+                                      ('openweather', self._openweather_current)):
+                    if not pending:
+                        break
+                    responses = await asyncio.gather(*(fetch(session, semaphore, loc) for loc in pending))
+                    missing = []
+                    for loc, data in zip(pending, responses):
+                        if data:
+                            alerts = data.get('alerts', []) if source == 'openweather_onecall' else []
+                            records[loc.id] = WeatherRecord(loc.id, source, data, observation_date, alerts)
+                        else:
+                            missing.append(loc)
+                    pending = missing
+
+            if pending:
+                params = {'current_weather': 'true', 'daily': OPEN_METEO_CURRENT_DAILY,
+                          'timezone': 'auto', 'forecast_days': 1}
+                responses = await self._open_meteo_batched(
+                    session, semaphore, f"{self.open_meteo_base}/forecast", pending, params, timeout=30)
+                for loc, data in zip(pending, responses):
+                    if data:
+                        records[loc.id] = WeatherRecord(loc.id, 'open_meteo', data, observation_date)
+
+        failed = [loc.id for loc in locations if loc.id not in records]
+        return records, failed
+
+    async def fetch_historical(self, locations: list, start_date: date, end_date: date
+                               ) -> Tuple[Dict[str, List[WeatherRecord]], List[str]]:
+        """
+        Daily history per location from the Open-Meteo archive, one record per day.
+
+        Returns:
+            ({location_id: [WeatherRecord, ...]}, [location_id without data])
+        """
+        params = {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat(),
+                  'daily': OPEN_METEO_ARCHIVE_DAILY, 'timezone': 'auto'}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._session() as session:
+            responses = await self._open_meteo_batched(
+                session, semaphore, self.open_meteo_archive, list(locations), params, timeout=120)
+
+        records: Dict[str, List[WeatherRecord]] = {}
+        failed = []
+        for loc, data in zip(locations, responses):
+            if data and 'daily' in data:
+                records[loc.id] = [WeatherRecord(loc.id, 'open_meteo', day_data, obs_date)
+                                   for obs_date, day_data in split_daily(data)]
+            else:
+                failed.append(loc.id)
+        return records, failed
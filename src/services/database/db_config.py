@@ -14,10 +14,15 @@ Usage:
     # For pandas/SQLAlchemy
     engine = get_engine()
     df = pd.read_sql("SELECT * FROM commodity_balance_sheets", engine)
+
+PostgreSQL connections are drawn from a process-wide pool (see pool.py) and
+the SQLAlchemy engine is built once per process, so calling get_connection()
+in a hot loop is cheap. Pool metrics: get_pool_stats().
 """
 
 import os
 import sys
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 
@@ -50,6 +55,12 @@ PG_PORT = os.environ.get("RLC_PG_PORT", "5432")
 PG_DATABASE = os.environ.get("RLC_PG_DATABASE", "rlc_commodities")
 PG_USER = os.environ.get("RLC_PG_USER", "postgres")
 PG_PASSWORD = os.environ.get("RLC_PG_PASSWORD")
+PG_SSLMODE = os.environ.get("RLC_PG_SSLMODE")  # e.g. "require" for RDS
+
+# Connection pool sizing (PostgreSQL only)
+PG_POOL_MIN = int(os.environ.get("RLC_PG_POOL_MIN", "1"))
+PG_POOL_MAX = int(os.environ.get("RLC_PG_POOL_MAX", "10"))
+PG_POOL_TIMEOUT = float(os.environ.get("RLC_PG_POOL_TIMEOUT", "30"))
 
 # SQLite settings (backup/development)
 RLC_ROOT = Path("C:/RLC") if sys.platform == "win32" else Path("/home/user/RLC-Agent")
@@ -66,44 +77,156 @@ def get_connection_string():
         return f"sqlite:///{SQLITE_PATH}"
 
 
+_pools = {}  # effective sslmode -> ConnectionPool
+_engine = None
+_init_lock = threading.Lock()
+
+# libpq sslmodes that never fall back to an unencrypted connection, weakest first
+_SSL_ENFORCING = ("require", "verify-ca", "verify-full")
+
+
+def _effective_sslmode(minimum=None):
+    """RLC_PG_SSLMODE, raised to `minimum` if it is weaker (or unset)."""
+    if minimum is None:
+        return PG_SSLMODE
+    if PG_SSLMODE in _SSL_ENFORCING and (
+            _SSL_ENFORCING.index(PG_SSLMODE) >= _SSL_ENFORCING.index(minimum)):
+        return PG_SSLMODE
+    return minimum
+
+
+def _connect_postgres(sslmode=None):
+    """Open a raw psycopg2 connection (used by the pool)."""
+    import psycopg2
+    kwargs = dict(
+        host=PG_HOST,
+        port=PG_PORT,
+        database=PG_DATABASE,
+        user=PG_USER,
+        password=PG_PASSWORD,
+    )
+    if sslmode:
+        kwargs["sslmode"] = sslmode
+    return psycopg2.connect(**kwargs)
+
+
+def get_pool(min_sslmode=None):
+    """
+    Get the process-wide PostgreSQL connection pool (created on first use).
+
+    Args:
+        min_sslmode: Callers that must never connect unencrypted pass
+            "require" (or stricter). They get a pool whose connections use at
+            least that mode; it is the same pool as everyone else's when
+            RLC_PG_SSLMODE already satisfies it.
+    """
+    sslmode = _effective_sslmode(min_sslmode)
+    pool = _pools.get(sslmode)
+    if pool is None:
+        with _init_lock:
+            pool = _pools.get(sslmode)
+            if pool is None:
+                from src.services.database.pool import ConnectionPool
+                pool = _pools[sslmode] = ConnectionPool(
+                    connect=lambda: _connect_postgres(sslmode),
+                    minconn=PG_POOL_MIN,
+                    maxconn=PG_POOL_MAX,
+                    checkout_timeout=PG_POOL_TIMEOUT,
+                )
+    return pool
+
+
+def get_pool_stats():
+    """Pool metrics (checkout latency, saturation), or None if no pool yet."""
+    stats = {}
+    default_pool = _pools.get(PG_SSLMODE)
+    if default_pool is not None:
+        stats["connections"] = default_pool.stats()
+    for sslmode, pool in _pools.items():
+        if sslmode != PG_SSLMODE:
+            stats[f"connections_sslmode_{sslmode}"] = pool.stats()
+    if _engine is not None and DB_TYPE == "postgresql":
+        stats["engine"] = _engine.pool.status()
+    return stats or None
+
+
+def close_pool():
+    """Close pooled connections and dispose the engine (for shutdown)."""
+    global _engine
+    with _init_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
 def get_engine():
     """
     Get SQLAlchemy engine for the configured database.
     Use for pandas operations and bulk inserts.
+
+    The engine (and its own connection pool) is created once per process.
     """
-    from sqlalchemy import create_engine
-    return create_engine(get_connection_string())
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                from sqlalchemy import create_engine
+                if DB_TYPE == "postgresql":
+                    connect_args = {"sslmode": PG_SSLMODE} if PG_SSLMODE else {}
+                    _engine = create_engine(
+                        get_connection_string(),
+                        pool_size=PG_POOL_MAX,
+                        max_overflow=0,
+                        pool_timeout=PG_POOL_TIMEOUT,
+                        pool_pre_ping=True,
+                        connect_args=connect_args,
+                    )
+                else:
+                    _engine = create_engine(get_connection_string())
+    return _engine
 
 
 @contextmanager
-def get_connection():
+def get_connection(statement_timeout_ms=None, dict_rows=True):
     """
     Get a database connection (context manager).
     Works with both PostgreSQL and SQLite.
 
+    PostgreSQL connections come from the shared pool and are returned to it
+    on exit; the block is committed on success and rolled back on error.
+
+    Args:
+        statement_timeout_ms: PostgreSQL statement_timeout for this checkout
+        dict_rows: Use RealDictCursor (default) -- pass False for tuple rows
+
     Usage:
         with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT 1")
     """
+    if DB_TYPE == "postgresql":
+        import psycopg2.extras
+        with get_pool().connection(statement_timeout_ms=statement_timeout_ms) as conn:
+            # Use RealDictCursor for dict-like row access
+            conn.cursor_factory = psycopg2.extras.RealDictCursor if dict_rows else None
+            try:
+                yield conn
+                if not conn.closed:
+                    conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+        return
+
     conn = None
     try:
-        if DB_TYPE == "postgresql":
-            import psycopg2
-            import psycopg2.extras
-            conn = psycopg2.connect(
-                host=PG_HOST,
-                port=PG_PORT,
-                database=PG_DATABASE,
-                user=PG_USER,
-                password=PG_PASSWORD
-            )
-            # Use RealDictCursor for dict-like row access
-            conn.cursor_factory = psycopg2.extras.RealDictCursor
-        else:
-            import sqlite3
-            conn = sqlite3.connect(str(SQLITE_PATH))
-            conn.row_factory = sqlite3.Row
+        import sqlite3
+        conn = sqlite3.connect(str(SQLITE_PATH))
+        conn.row_factory = sqlite3.Row
 
         yield conn
         conn.commit()
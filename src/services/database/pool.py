@@ -0,0 +1,352 @@
+"""
+Process-wide PostgreSQL connection pool for RLC Agent.
+
+Backs db_config.get_connection() so the dispatcher, CollectorRunner,
+KGManager, CallLogger and the kg/ helpers all reuse a small set of warm
+connections instead of paying a TCP + TLS + auth handshake per call.
+
+Features:
+    - Thread-safe, blocking checkout with min/max size (callers wait up to
+      `checkout_timeout` seconds when the pool is saturated instead of
+      failing immediately like psycopg2.pool.ThreadedConnectionPool)
+    - Health checks: closed connections are discarded, and connections that
+      have been idle longer than `health_check_interval` are pinged with
+      SELECT 1 before being handed out
+    - Per-checkout statement timeouts (SET / RESET statement_timeout)
+    - Fork safety: a child process never reuses its parent's sockets
+    - Metrics (checkout latency, saturation, peak usage) via stats()
+
+Usage:
+    pool = ConnectionPool(connect=lambda: psycopg2.connect(...), maxconn=10)
+    with pool.connection(statement_timeout_ms=5000) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+    print(pool.stats())
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within checkout_timeout."""
+    pass
+
+
+class ConnectionPool:
+    """
+    Blocking, thread-safe pool of DB-API connections.
+
+    The pool never commits on behalf of the caller; it only rolls back
+    whatever the caller left open when a connection is returned, so a
+    returned connection is always idle and outside a transaction.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        minconn: int = 1,
+        maxconn: int = 10,
+        checkout_timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        max_idle_seconds: float = 300.0,
+    ):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool bounds: minconn={minconn}, maxconn={maxconn}")
+
+        self._connect = connect
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_seconds = max_idle_seconds
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()          # (conn, last_used_monotonic)
+        self._in_use = set()          # id(conn)
+        self._size = 0                # idle + in use + being created
+        self._pid = os.getpid()
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0               # checkouts that found the pool saturated
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._health_check_failures = 0
+        self._peak_in_use = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._recent_waits_ms = deque(maxlen=1000)
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Check a connection out of the pool, opening a new one if the pool is
+        below maxconn. Blocks up to `timeout` (default checkout_timeout)
+        seconds when saturated; raises PoolTimeout after that.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            conn = None
+            create = False
+            with self._cond:
+                self._check_pid()
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                while not self._idle and self._size >= self.maxconn:
+                    waited = True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(pool max={self.maxconn}, in use={len(self._in_use)})"
+                        )
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()   # LIFO keeps hot conns hot
+                    self._in_use.add(id(conn))
+                else:
+                    last_used = None
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created += 1
+                    self._in_use.add(id(conn))
+            elif not self._is_healthy(conn, last_used):
+                self._discard(conn)
+                continue
+
+            self._record_checkout(start, waited)
+            return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool (or close it if discard=True / broken)."""
+        with self._cond:
+            if os.getpid() != self._pid or id(conn) not in self._in_use:
+                # Inherited from a parent process or not ours: never reuse.
+                return
+
+        if not discard and not self._is_closed(conn):
+            try:
+                conn.rollback()
+                if getattr(conn, 'autocommit', False):
+                    conn.autocommit = False
+            except Exception:
+                discard = True
+        else:
+            discard = True
+
+        if discard:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._in_use.discard(id(conn))
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._trim_idle_locked()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, statement_timeout_ms: Optional[int] = None,
+                   timeout: Optional[float] = None):
+        """
+        Context manager around getconn/putconn.
+
+        Args:
+            statement_timeout_ms: If set, applied as the session
+                statement_timeout for this checkout only (reset on return)
+            timeout: Checkout wait override in seconds
+        """
+        conn = self.getconn(timeout=timeout)
+        discard = False
+        try:
+            if statement_timeout_ms:
+                self._set_statement_timeout(conn, int(statement_timeout_ms))
+            yield conn
+        except BaseException:
+            discard = self._is_closed(conn)
+            raise
+        finally:
+            if statement_timeout_ms and not discard and not self._is_closed(conn):
+                try:
+                    conn.rollback()
+                    self._set_statement_timeout(conn, None)
+                except Exception:
+                    discard = True
+            self.putconn(conn, discard=discard)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def fill(self):
+        """Open connections up to minconn (optional warm-up)."""
+        while True:
+            with self._cond:
+                if self._size >= self.minconn:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._created += 1
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def closeall(self):
+        """Close idle connections; in-use connections are closed on return."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool state and checkout metrics (JSON-serializable)."""
+        with self._cond:
+            recent = sorted(self._recent_waits_ms)
+            p95 = recent[int(0.95 * (len(recent) - 1))] if recent else 0.0
+            in_use = len(self._in_use)
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'min': self.minconn,
+                'max': self.maxconn,
+                'utilization': round(in_use / self.maxconn, 3),
+                'peak_in_use': self._peak_in_use,
+                'checkouts': self._checkouts,
+                'saturated_checkouts': self._waits,
+                'checkout_timeouts': self._timeouts,
+                'connections_created': self._created,
+                'connections_discarded': self._discarded,
+                'health_check_failures': self._health_check_failures,
+                'checkout_wait_avg_ms': round(
+                    self._wait_total_ms / self._checkouts, 3) if self._checkouts else 0.0,
+                'checkout_wait_p95_ms': round(p95, 3),
+                'checkout_wait_max_ms': round(self._wait_max_ms, 3),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _record_checkout(self, start: float, waited: bool):
+        wait_ms = (time.monotonic() - start) * 1000
+        with self._cond:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+            self._recent_waits_ms.append(wait_ms)
+            self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+
+    def _check_pid(self):
+        """Called with the lock held. Drop (don't close) a parent's connections."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
+
+    def _is_healthy(self, conn, last_used: Optional[float]) -> bool:
+        if self._is_closed(conn):
+            return False
+        if last_used is None or time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.debug(f"Pooled connection failed health check: {e}")
+            with self._cond:
+                self._health_check_failures += 1
+            return False
+
+    def _discard(self, conn):
+        with self._cond:
+            if id(conn) in self._in_use:
+                self._in_use.discard(id(conn))
+                self._size -= 1
+                self._discarded += 1
+            self._cond.notify()
+        self._close_quietly(conn)
+
+    def _trim_idle_locked(self):
+        """Close connections idle past max_idle_seconds, keeping minconn."""
+        now = time.monotonic()
+        while (self._idle and self._size > self.minconn
+               and now - self._idle[0][1] > self.max_idle_seconds):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _set_statement_timeout(conn, ms: Optional[int]):
+        cursor = conn.cursor()
+        if ms is None:
+            cursor.execute("RESET statement_timeout")
+        else:
+            cursor.execute("SET statement_timeout = %s", (ms,))
+        cursor.close()
+        conn.commit()
+
+    @staticmethod
+    def _is_closed(conn) -> bool:
+        return bool(getattr(conn, 'closed', False))
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
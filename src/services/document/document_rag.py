@@ -14,6 +14,14 @@ Usage:
 
     # Rebuild index
     python document_rag.py --rebuild
+
+    # Convert a legacy data/document_index.json into the vector index
+    python document_rag.py --migrate
+
+Indexing is a streaming pipeline: files are parsed and chunked in a process
+pool, chunks flow through a bounded queue to the embedder, which keeps up
+to EMBED_IN_FLIGHT batch requests open, and each file is committed to the
+index as soon as its embeddings arrive.
 """
 
 import os
@@ -22,12 +30,18 @@ import json
 import hashlib
 import argparse
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import re
 
+try:
+    from src.services.document.vector_index import VectorIndex, migrate_json_index
+except ImportError:
+    from vector_index import VectorIndex, migrate_json_index
+
 # Try to import optional dependencies
 try:
     import pandas as pd
@@ -59,6 +73,12 @@ CHUNK_SIZE = 500  # characters per chunk
 CHUNK_OVERLAP = 50  # overlap between chunks
 TOP_K_RESULTS = 5  # number of results to return
 
+# Ingestion pipeline
+PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # parser processes
+EMBED_BATCH_SIZE = 32  # texts per embedding request
+EMBED_IN_FLIGHT = 4  # concurrent embedding requests
+PIPELINE_QUEUE_SIZE = 8  # parsed files buffered ahead of the embedder
+
 
 @dataclass
 class DocumentChunk:
@@ -100,10 +120,17 @@ class SearchResult:
 class OllamaEmbedder:
     """Generate embeddings using Ollama's nomic-embed-text model."""
 
-    def __init__(self, base_url: str = DEFAULT_OLLAMA_URL, model: str = EMBED_MODEL):
+    def __init__(
+        self,
+        base_url: str = DEFAULT_OLLAMA_URL,
+        model: str = EMBED_MODEL,
+        max_in_flight: int = EMBED_IN_FLIGHT
+    ):
         self.base_url = base_url
         self.model = model
         self._session = None
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._batch_api = True  # cleared if the server lacks /api/embed
 
     async def _ensure_session(self):
         if self._session is None:
@@ -154,18 +181,38 @@ class OllamaEmbedder:
             print(f"Embedding failed: {e}")
             raise
 
-    async def embed_batch(self, texts: List[str], batch_size: int = 10) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
-        embeddings = []
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = await asyncio.gather(
-                *[self.embed(text) for text in batch]
-            )
-            embeddings.extend(batch_embeddings)
-            if i + batch_size < len(texts):
-                print(f"  Embedded {i + batch_size}/{len(texts)} chunks...")
-        return embeddings
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts in one request (Ollama /api/embed).
+
+        Waits for a slot in the in-flight window. Falls back to one
+        /api/embeddings request per text on servers without /api/embed.
+        """
+        async with self._in_flight:
+            if self._batch_api:
+                session = await self._ensure_session()
+                payload = {"model": self.model, "input": texts}
+                async with session.post(
+                    f"{self.base_url}/api/embed",
+                    json=payload,
+                    timeout=120
+                ) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        return data["embeddings"]
+                    if resp.status != 404:
+                        error = await resp.text()
+                        raise Exception(f"Embedding error: {error}")
+                print("Server has no /api/embed; falling back to single-text requests")
+                self._batch_api = False
+
+            return list(await asyncio.gather(*[self.embed(text) for text in texts]))
+
+    async def embed_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
+        """Generate embeddings for multiple texts (batches run concurrently)."""
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*[self.embed_many(b) for b in batches])
+        return [e for batch in results for e in batch]
 
 
 class DocumentProcessor:
@@ -317,8 +364,50 @@ class DocumentProcessor:
             return f"[PDF file: {file_path.name} - Error: {e}]", {"error": str(e)}
 
 
+def chunk_document(file_path: str) -> Tuple[str, List[dict]]:
+    """
+    Parse and chunk one document (runs in the parser process pool).
+
+    Returns (file_path, chunk dicts without embeddings). Module-level so it
+    pickles for ProcessPoolExecutor.
+    """
+    path = Path(file_path)
+    file_type = path.suffix.lower()
+
+    # Process based on file type
+    if file_type == '.md':
+        content, metadata = DocumentProcessor.process_markdown(path)
+    elif file_type == '.xlsx':
+        content, metadata = DocumentProcessor.process_excel(path)
+    elif file_type == '.pdf':
+        content, metadata = DocumentProcessor.process_pdf(path)
+    else:
+        return file_path, []
+
+    if not content:
+        return file_path, []
+
+    chunks = []
+    for i, text in enumerate(DocumentProcessor.chunk_text(content)):
+        chunks.append(DocumentChunk(
+            doc_id=hashlib.md5(f"{path}:{i}".encode()).hexdigest(),
+            file_path=str(path),
+            file_name=path.name,
+            file_type=file_type,
+            chunk_index=i,
+            content=text,
+            metadata=metadata
+        ).to_dict())
+    return file_path, chunks
+
+
 class VectorStore:
-    """Simple JSON-based vector store for document embeddings."""
+    """
+    Legacy JSON-based vector store (data/document_index.json).
+
+    Superseded by vector_index.VectorIndex; kept so old indexes can still be
+    read. Convert with `python document_rag.py --migrate`.
+    """
 
     def __init__(self, store_path: Path):
         self.store_path = store_path
@@ -420,14 +509,25 @@ class DocumentRAG:
     def __init__(
         self,
         project_root: Path,
-        ollama_url: str = DEFAULT_OLLAMA_URL
+        ollama_url: str = DEFAULT_OLLAMA_URL,
+        parse_workers: int = PARSE_WORKERS,
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_in_flight: int = EMBED_IN_FLIGHT
     ):
         self.project_root = project_root
         self.data_dir = project_root / "data"
-        self.index_path = self.data_dir / "document_index.json"
-
-        self.embedder = OllamaEmbedder(ollama_url)
-        self.store = VectorStore(self.index_path)
+        self.index_path = self.data_dir / "document_index"
+        self.legacy_index_path = self.data_dir / "document_index.json"
+
+        if not self.index_path.exists() and self.legacy_index_path.exists():
+            print(f"Migrating {self.legacy_index_path.name} to vector index...")
+            migrate_json_index(self.legacy_index_path, self.index_path)
+
+        self.parse_workers = parse_workers
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.embedder = OllamaEmbedder(ollama_url, max_in_flight=max_in_flight)
+        self.store = VectorIndex(self.index_path)
         self.processor = DocumentProcessor()
 
         # Directories to index
@@ -463,38 +563,8 @@ class DocumentRAG:
 
     async def index_file(self, file_path: Path) -> List[DocumentChunk]:
         """Index a single file and return its chunks."""
-        file_type = file_path.suffix.lower()
-
-        # Process based on file type
-        if file_type == '.md':
-            content, metadata = self.processor.process_markdown(file_path)
-        elif file_type == '.xlsx':
-            content, metadata = self.processor.process_excel(file_path)
-        elif file_type == '.pdf':
-            content, metadata = self.processor.process_pdf(file_path)
-        else:
-            return []
-
-        if not content:
-            return []
-
-        # Create chunks
-        text_chunks = self.processor.chunk_text(content)
-
-        chunks = []
-        for i, text in enumerate(text_chunks):
-            chunk = DocumentChunk(
-                doc_id=hashlib.md5(f"{file_path}:{i}".encode()).hexdigest(),
-                file_path=str(file_path),
-                file_name=file_path.name,
-                file_type=file_type,
-                chunk_index=i,
-                content=text,
-                metadata=metadata
-            )
-            chunks.append(chunk)
-
-        return chunks
+        _, chunks = chunk_document(str(file_path))
+        return [DocumentChunk.from_dict(c) for c in chunks]
 
     async def build_index(self, force_rebuild: bool = False):
         """Build or update the document index."""
@@ -512,58 +582,132 @@ class DocumentRAG:
 
         # Find documents
         documents = self.find_documents()
-        print(f"Found {len(documents)} documents to process")
+        print(f"Found {len(documents)} documents")
 
-        # Process each document
-        new_chunks = []
-        updated_files = 0
+        if force_rebuild:
+            # Forget every hash up front: an interrupted rebuild then resumes
+            # with --index, skipping files already re-embedded.
+            self.store.clear_file_hashes()
+            self.store.save()
 
+        # Only files new or changed since their last commit
+        pending = {}
         for doc_path in documents:
             file_hash = self.get_file_hash(doc_path)
-            str_path = str(doc_path)
-
-            # Check if file needs updating
-            if not force_rebuild and not self.store.file_needs_update(str_path, file_hash):
-                continue
-
-            print(f"\nIndexing: {doc_path.name}")
-
-            # Remove old chunks for this file
-            self.store.remove_file(str_path)
-
-            # Process file
-            chunks = await self.index_file(doc_path)
-
-            if chunks:
-                # Generate embeddings
-                print(f"  Creating {len(chunks)} embeddings...")
-                texts = [c.content for c in chunks]
-                embeddings = await self.embedder.embed_batch(texts)
-
-                for chunk, embedding in zip(chunks, embeddings):
-                    chunk.embedding = embedding
+            if self.store.file_needs_update(str(doc_path), file_hash):
+                pending[str(doc_path)] = file_hash
+        print(f"{len(pending)} new or changed documents to process")
 
-                new_chunks.extend(chunks)
-                self.store.set_file_hash(str_path, file_hash)
-                updated_files += 1
-
-        # Add new chunks to store
-        if new_chunks:
-            self.store.add_chunks(new_chunks)
-            self.store.save()
+        start = datetime.now()
+        totals = await self._run_pipeline(pending)
+        self.store.save()
+        elapsed = (datetime.now() - start).total_seconds()
 
         print(f"\n{'=' * 60}")
         print(f"Indexing Complete!")
-        print(f"  Updated files: {updated_files}")
-        print(f"  New chunks: {len(new_chunks)}")
-        print(f"  Total chunks: {len(self.store.chunks)}")
+        print(f"  Updated files: {totals['files']}")
+        print(f"  New chunks: {totals['chunks']}")
+        print(f"  Failed files: {totals['failed']}")
+        print(f"  Total chunks: {len(self.store)}")
+        print(f"  Elapsed: {elapsed:.1f}s"
+              f" ({totals['chunks'] / elapsed if elapsed else 0:.1f} chunks/s)")
         print(f"{'=' * 60}\n")
 
         return True
 
+    async def _run_pipeline(self, pending: Dict[str, str]) -> Dict[str, int]:
+        """
+        Parse -> embed -> commit pipeline over {file_path: file_hash}.
+
+        Parsing runs in a process pool (at most 2x parse_workers files at a
+        time), parsed files wait in a bounded queue, and up to max_in_flight
+        files are embedded concurrently. Each file is committed to the index
+        as soon as its embeddings arrive, so a crash loses at most the files
+        still in flight.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        totals = {"files": 0, "chunks": 0, "failed": 0}
+        done_count = 0
+
+        async def produce(pool):
+            paths = iter(pending)
+            parsing = {}
+            while True:
+                while len(parsing) < self.parse_workers * 2:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    parsing[loop.run_in_executor(pool, chunk_document, path)] = path
+                if not parsing:
+                    break
+                finished, _ = await asyncio.wait(parsing, return_when=asyncio.FIRST_COMPLETED)
+                for fut in finished:
+                    path = parsing.pop(fut)
+                    try:
+                        await queue.put(fut.result())
+                    except Exception as e:
+                        print(f"  Parse failed for {Path(path).name}: {e}")
+                        totals["failed"] += 1
+            await queue.put(None)
+
+        async def embed_and_commit(path: str, chunk_dicts: List[dict]):
+            nonlocal done_count
+            chunks = [DocumentChunk.from_dict(c) for c in chunk_dicts]
+            try:
+                embeddings = await self.embedder.embed_batch(
+                    [c.content for c in chunks], self.batch_size
+                )
+            except Exception as e:
+                print(f"  Embedding failed for {Path(path).name}: {e}")
+                totals["failed"] += 1
+                return
+            for chunk, embedding in zip(chunks, embeddings):
+                chunk.embedding = embedding
+
+            # Checkpoint: old rows tombstoned, new rows + hash committed together
+            self.store.remove_file(path)
+            self.store.add_chunks(chunks)
+            self.store.set_file_hash(path, pending[path])
+            self.store.save()
+            totals["files"] += 1
+            totals["chunks"] += len(chunks)
+            done_count += 1
+            print(f"  [{done_count}/{len(pending)}] {Path(path).name}: {len(chunks)} chunks")
+
+        async def consume():
+            embedding = set()
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                path, chunk_dicts = item
+                if not chunk_dicts:
+                    self.store.remove_file(path)
+                    continue
+                embedding.add(asyncio.create_task(embed_and_commit(path, chunk_dicts)))
+                if len(embedding) >= self.max_in_flight:
+                    finished, embedding = await asyncio.wait(
+                        embedding, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in finished:
+                        task.result()  # surface index write errors
+            if embedding:
+                finished, _ = await asyncio.wait(embedding)
+                for task in finished:
+                    task.result()
+
+        if not pending:
+            return totals
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            await asyncio.gather(produce(pool), consume())
+
+        return totals
+
     async def search(self, query: str, top_k: int = TOP_K_RESULTS) -> List[SearchResult]:
         """Search for documents matching the query."""
-        if not self.store.chunks:
+        if not len(self.store):
             print("Index is empty. Run with --index first.")
             return []
 
@@ -571,13 +715,14 @@ class DocumentRAG:
         query_embedding = await self.embedder.embed(query)
 
         # Search
-        results = self.store.search(query_embedding, top_k)
+        hits = self.store.search(query_embedding, top_k)
 
-        return results
+        return [SearchResult(chunk=DocumentChunk.from_dict(c), score=s) for c, s in hits]
 
     async def close(self):
         """Clean up resources."""
         await self.embedder.close()
+        self.store.close()
 
 
 # Tool interface for agent_tools.py
@@ -591,7 +736,7 @@ def search_documents_sync(query: str, top_k: int = 5) -> Dict[str, Any]:
         rag = DocumentRAG(project_root)
 
         try:
-            if not rag.store.chunks:
+            if not len(rag.store):
                 return {
                     "success": False,
                     "error": "Document index is empty. Run: python document_rag.py --index"
@@ -614,7 +759,7 @@ def search_documents_sync(query: str, top_k: int = 5) -> Dict[str, Any]:
 def get_index_stats() -> Dict[str, Any]:
     """Get statistics about the document index."""
     project_root = Path(__file__).parent.parent
-    index_path = project_root / "data" / "document_index.json"
+    index_path = project_root / "data" / "document_index"
 
     if not index_path.exists():
         return {
@@ -622,8 +767,11 @@ def get_index_stats() -> Dict[str, Any]:
             "message": "No index found. Run: python document_rag.py --index"
         }
 
-    store = VectorStore(index_path)
-    stats = store.get_stats()
+    store = VectorIndex(index_path)
+    try:
+        stats = store.get_stats()
+    finally:
+        store.close()
     stats["indexed"] = True
     stats["index_path"] = str(index_path)
 
@@ -637,12 +785,36 @@ async def main():
     parser.add_argument("--rebuild", action="store_true", help="Force rebuild entire index")
     parser.add_argument("--search", type=str, help="Search query")
     parser.add_argument("--stats", action="store_true", help="Show index statistics")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Convert data/document_index.json into the vector index")
     parser.add_argument("--ollama-url", default=DEFAULT_OLLAMA_URL, help="Ollama API URL")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS,
+                        help=f"Parser processes (default {PARSE_WORKERS})")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE,
+                        help=f"Texts per embedding request (default {EMBED_BATCH_SIZE})")
+    parser.add_argument("--in-flight", type=int, default=EMBED_IN_FLIGHT,
+                        help=f"Concurrent embedding requests (default {EMBED_IN_FLIGHT})")
 
     args = parser.parse_args()
 
     project_root = Path(__file__).parent.parent
-    rag = DocumentRAG(project_root, args.ollama_url)
+
+    if args.migrate:
+        legacy = project_root / "data" / "document_index.json"
+        if not legacy.exists():
+            print(f"No legacy index at {legacy}")
+            return
+        stats = migrate_json_index(legacy, project_root / "data" / "document_index")
+        print(f"Migrated {stats['total_chunks']} chunks from {stats['total_files']} files")
+        print(f"You can now delete {legacy}")
+        return
+
+    rag = DocumentRAG(
+        project_root, args.ollama_url,
+        parse_workers=args.workers,
+        batch_size=args.batch_size,
+        max_in_flight=args.in_flight
+    )
 
     try:
         if args.stats:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Stub Ollama embedding server for benchmarking and tests.
+
+Speaks the three endpoints DocumentRAG uses (/api/tags, /api/embed,
+/api/embeddings) and returns deterministic pseudo-embeddings derived from
+the text, after a configurable delay that models per-request overhead plus
+per-text compute.
+
+Usage:
+    python stub_embedding_server.py --port 11435 --request-ms 20 --text-ms 2
+    python document_rag.py --index --ollama-url http://localhost:11435
+
+    # In-process
+    server = StubEmbeddingServer(request_ms=5).start()
+    ...  server.url, server.requests, server.texts
+    server.stop()
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import numpy as np
+
+DEFAULT_DIM = 768
+STUB_MODEL = "nomic-embed-text:latest"
+
+
+def fake_embedding(text: str, dim: int = DEFAULT_DIM) -> List[float]:
+    """Deterministic unit vector for a text."""
+    seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "little")
+    vec = np.random.default_rng(seed).standard_normal(dim)
+    return (vec / np.linalg.norm(vec)).round(6).tolist()
+
+
+class StubEmbeddingServer:
+    """Threaded HTTP server imitating Ollama's embedding API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        dim: int = DEFAULT_DIM,
+        request_ms: float = 0.0,
+        text_ms: float = 0.0,
+        batch_api: bool = True
+    ):
+        self.dim = dim
+        self.request_ms = request_ms
+        self.text_ms = text_ms
+        self.batch_api = batch_api
+        self.requests = 0
+        self.texts = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubEmbeddingServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.requests += 1
+            self.texts += len(texts)
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            time.sleep((self.request_ms + self.text_ms * len(texts)) / 1000)
+            return [fake_embedding(t, self.dim) for t in texts]
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send(200, {"models": [{"name": STUB_MODEL}]})
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/embed" and server.batch_api:
+                    texts = payload.get("input", [])
+                    if isinstance(texts, str):
+                        texts = [texts]
+                    self._send(200, {"model": STUB_MODEL, "embeddings": server._embed(texts)})
+                elif self.path == "/api/embeddings":
+                    self._send(200, {"embedding": server._embed([payload.get("prompt", "")])[0]})
+                else:
+                    self._send(404, {"error": "not found"})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Ollama embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    parser.add_argument("--request-ms", type=float, default=20.0, help="Fixed delay per request")
+    parser.add_argument("--text-ms", type=float, default=2.0, help="Extra delay per text")
+    parser.add_argument("--no-batch", action="store_true", help="Disable /api/embed (old Ollama)")
+    args = parser.parse_args()
+
+    server = StubEmbeddingServer(args.host, args.port, args.dim, args.request_ms,
+                                 args.text_ms, batch_api=not args.no_batch)
+    print(f"Stub embedding server on {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Served {server.requests} requests, {server.texts} texts")
+
+
+if __name__ == "__main__":
+    main()
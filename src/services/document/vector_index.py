@@ -0,0 +1,374 @@
+"""
+Vector index backend for Document RAG.
+
+Replaces the single pretty-printed JSON index (document_index.json) with:
+
+    <index_dir>/embeddings.f32   float32 matrix, one L2-normalized row per chunk,
+                                 memory-mapped for search (no JSON parse at startup)
+    <index_dir>/meta.sqlite      chunk metadata, file hashes and index info
+
+Search is a single matrix-vector product over the memory-mapped rows plus
+np.argpartition for top-k. Adding a file appends rows to the matrix and
+inserts its metadata in one SQLite transaction; removing a file tombstones
+its rows (compact() reclaims the space). Nothing is ever fully rewritten on
+save, so an interrupted build keeps every file committed before the crash.
+compact() commits its row_id remap together with a pending marker before
+swapping the rewritten matrix in, so a crash between the two is finished
+on the next open instead of pairing new row_ids with the old matrix.
+
+Usage:
+    index = VectorIndex(Path("data/document_index"))
+    index.add_chunks(chunks)              # DocumentChunk list with .embedding set
+    index.set_file_hash(path, file_hash)
+    index.save()
+    hits = index.search(query_embedding, top_k=5)   # [(chunk_dict, score), ...]
+
+    # One-off migration from the legacy JSON index
+    migrate_json_index(Path("data/document_index.json"), Path("data/document_index"))
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.f32"
+META_FILE = "meta.sqlite"
+
+# compact() automatically once this fraction of rows are tombstones
+COMPACT_THRESHOLD = 0.25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    row_id      INTEGER PRIMARY KEY,    -- row in embeddings.f32
+    doc_id      TEXT NOT NULL,
+    file_path   TEXT NOT NULL,
+    file_name   TEXT NOT NULL,
+    file_type   TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    content     TEXT NOT NULL,
+    metadata    TEXT NOT NULL,          -- JSON
+    deleted     INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_chunks_file ON chunks (file_path);
+CREATE TABLE IF NOT EXISTS files (
+    file_path TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS info (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero, so they score 0 like before)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class VectorIndex:
+    """Memory-mapped float32 embedding matrix with a SQLite metadata sidecar."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.emb_path = self.index_dir / EMBEDDINGS_FILE
+        self.db = sqlite3.connect(str(self.index_dir / META_FILE))
+        self.db.executescript(_SCHEMA)
+
+        self.dim: Optional[int] = self._get_info("dim", int)
+        self.n_rows: int = self._get_info("n_rows", int) or 0
+        self._matrix: Optional[np.memmap] = None
+        self._deleted: Optional[np.ndarray] = None
+        self._recover()
+
+    # ------------------------------------------------------------------
+    # Info helpers
+    # ------------------------------------------------------------------
+
+    def _get_info(self, key: str, cast=str):
+        row = self.db.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return cast(row[0]) if row and row[0] is not None else None
+
+    def _set_info(self, key: str, value):
+        self.db.execute(
+            "INSERT INTO info (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, None if value is None else str(value)),
+        )
+
+    def _recover(self):
+        """
+        Repair the matrix after a crash.
+
+        Finishes a compaction whose metadata committed but whose matrix swap
+        did not (or discards the rewritten matrix if the metadata never
+        committed), then drops matrix rows written after the last metadata
+        commit (crash mid-append) -- all of them if the first append never
+        committed and dim is still unset.
+        """
+        tmp = self._compact_tmp_path()
+        if self._get_info("compact_pending"):
+            if tmp.exists():
+                os.replace(tmp, self.emb_path)
+            with self.db:
+                self._set_info("compact_pending", None)
+        elif tmp.exists():
+            tmp.unlink()
+
+        if self.emb_path.exists():
+            expected = self.n_rows * (self.dim or 0) * 4
+            if self.emb_path.stat().st_size > expected:
+                with open(self.emb_path, "r+b") as f:
+                    f.truncate(expected)
+
+    # ------------------------------------------------------------------
+    # VectorStore-compatible API
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        row = self.db.execute("SELECT COUNT(*) FROM chunks WHERE deleted = 0").fetchone()
+        return row[0]
+
+    @property
+    def file_hashes(self) -> Dict[str, str]:
+        return dict(self.db.execute("SELECT file_path, file_hash FROM files"))
+
+    def file_needs_update(self, file_path: str, current_hash: str) -> bool:
+        row = self.db.execute(
+            "SELECT file_hash FROM files WHERE file_path = ?", (file_path,)
+        ).fetchone()
+        return row is None or row[0] != current_hash
+
+    def set_file_hash(self, file_path: str, file_hash: str):
+        self.db.execute(
+            "INSERT INTO files (file_path, file_hash) VALUES (?, ?) "
+            "ON CONFLICT(file_path) DO UPDATE SET file_hash = excluded.file_hash",
+            (file_path, file_hash),
+        )
+
+    def clear_file_hashes(self):
+        """Mark every file as needing re-indexing (chunks stay until replaced)."""
+        self.db.execute("DELETE FROM files")
+
+    def add_chunks(self, chunks: List[Any]):
+        """
+        Append chunks (DocumentChunk-like, with .embedding) to the index.
+
+        Rows are appended to embeddings.f32 first, then metadata and the new
+        row count are committed together; _recover() discards any rows whose
+        metadata never committed.
+        """
+        chunks = [c for c in chunks if c.embedding]
+        if not chunks:
+            return
+
+        vectors = _normalize(np.asarray([c.embedding for c in chunks], dtype=np.float32))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._set_info("dim", self.dim)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}"
+            )
+
+        with open(self.emb_path, "ab") as f:
+            f.write(vectors.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        start = self.n_rows
+        self.db.executemany(
+            "INSERT INTO chunks (row_id, doc_id, file_path, file_name, file_type, "
+            "chunk_index, content, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (start + i, c.doc_id, c.file_path, c.file_name, c.file_type,
+                 c.chunk_index, c.content, json.dumps(c.metadata, default=str))
+                for i, c in enumerate(chunks)
+            ],
+        )
+        self.n_rows = start + len(chunks)
+        self._set_info("n_rows", self.n_rows)
+        self.db.commit()
+        self._matrix = None
+        self._deleted = None
+
+    def remove_file(self, file_path: str):
+        """Tombstone all rows for a file and forget its hash."""
+        self.db.execute("UPDATE chunks SET deleted = 1 WHERE file_path = ? AND deleted = 0",
+                        (file_path,))
+        self.db.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+        self._deleted = None
+
+    def save(self):
+        """Commit pending metadata; compact if tombstones pile up."""
+        self._set_info("updated_at", datetime.now().isoformat())
+        self.db.commit()
+        if self.n_rows and (self.n_rows - len(self)) / self.n_rows > COMPACT_THRESHOLD:
+            self.compact()
+
+    def close(self):
+        self._matrix = None
+        self.db.close()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _load_matrix(self) -> Optional[np.ndarray]:
+        if self._matrix is None and self.n_rows and self.dim:
+            self._matrix = np.memmap(self.emb_path, dtype=np.float32, mode="r",
+                                     shape=(self.n_rows, self.dim))
+        if self._deleted is None and self.n_rows:
+            self._deleted = np.zeros(self.n_rows, dtype=bool)
+            rows = [r[0] for r in self.db.execute("SELECT row_id FROM chunks WHERE deleted = 1")]
+            self._deleted[rows] = True
+        return self._matrix
+
+    def search_rows(self, query_embedding: List[float], top_k: int) -> List[tuple]:
+        """Top-k (row_id, score) pairs by cosine similarity, best first."""
+        matrix = self._load_matrix()
+        if matrix is None:
+            return []
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return []
+        scores = matrix @ (q / norm)
+        scores[self._deleted] = -np.inf
+
+        live = int((~self._deleted).sum())
+        k = min(top_k, live)
+        if k <= 0:
+            return []
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the most similar chunks.
+
+        Returns (chunk_dict, score) pairs, best first. chunk_dict has the
+        DocumentChunk fields minus the embedding.
+        """
+        hits = self.search_rows(query_embedding, top_k)
+        if not hits:
+            return []
+        placeholders = ",".join("?" * len(hits))
+        rows = {
+            r[0]: r for r in self.db.execute(
+                f"SELECT row_id, doc_id, file_path, file_name, file_type, chunk_index, "
+                f"content, metadata FROM chunks WHERE row_id IN ({placeholders})",
+                [row_id for row_id, _ in hits],
+            )
+        }
+        results = []
+        for row_id, score in hits:
+            r = rows[row_id]
+            chunk = {
+                "doc_id": r[1], "file_path": r[2], "file_name": r[3], "file_type": r[4],
+                "chunk_index": r[5], "content": r[6], "metadata": json.loads(r[7]),
+            }
+            results.append((chunk, score))
+        return results
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _compact_tmp_path(self) -> Path:
+        return self.emb_path.with_suffix(".f32.tmp")
+
+    def compact(self):
+        """
+        Rewrite the matrix without tombstoned rows and renumber row_ids.
+
+        The remap and the compact_pending marker commit in one transaction;
+        from then on the rewritten matrix is authoritative and _recover()
+        completes the swap if we crash before os.replace().
+        """
+        matrix = self._load_matrix()
+        if matrix is None:
+            return
+        keep = np.flatnonzero(~self._deleted)
+        tmp = self._compact_tmp_path()
+        with open(tmp, "wb") as f:
+            for start in range(0, len(keep), 65536):
+                f.write(np.ascontiguousarray(matrix[keep[start:start + 65536]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._matrix = None
+        del matrix
+
+        with self.db:
+            self.db.execute("DELETE FROM chunks WHERE deleted = 1")
+            self.db.execute("CREATE TEMP TABLE remap (old INTEGER PRIMARY KEY, new INTEGER)")
+            self.db.executemany("INSERT INTO remap VALUES (?, ?)",
+                                [(int(old), new) for new, old in enumerate(keep)])
+            # Shift out of the way first so the renumbering never collides
+            self.db.execute("UPDATE chunks SET row_id = -1 - row_id")
+            self.db.execute(
+                "UPDATE chunks SET row_id = (SELECT new FROM remap WHERE old = -1 - chunks.row_id)"
+            )
+            self.db.execute("DROP TABLE remap")
+            self.n_rows = len(keep)
+            self._set_info("n_rows", self.n_rows)
+            self._set_info("compact_pending", 1)
+        os.replace(tmp, self.emb_path)
+        with self.db:
+            self._set_info("compact_pending", None)
+        self._deleted = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the index."""
+        by_type = dict(self.db.execute(
+            "SELECT file_type, COUNT(*) FROM chunks WHERE deleted = 0 GROUP BY file_type"
+        ))
+        n_files = self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return {
+            "total_chunks": len(self),
+            "total_files": n_files,
+            "chunks_by_type": by_type,
+            "dimension": self.dim,
+            "tombstoned_rows": self.n_rows - len(self),
+            "matrix_bytes": self.emb_path.stat().st_size if self.emb_path.exists() else 0,
+        }
+
+
+def migrate_json_index(json_path: Path, index_dir: Path) -> Dict[str, Any]:
+    """
+    Convert a legacy document_index.json into a VectorIndex directory.
+
+    Chunks and file hashes carry over unchanged (embeddings are normalized on
+    the way in, which does not change cosine rankings). The JSON file is left
+    in place; delete it once the new index checks out.
+    """
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    chunks = [SimpleNamespace(**c) for c in data.get("chunks", [])]
+    index = VectorIndex(index_dir)
+    try:
+        if len(index):
+            raise ValueError(f"{index_dir} already contains an index; refusing to migrate into it")
+        batch = 5000
+        for start in range(0, len(chunks), batch):
+            index.add_chunks(chunks[start:start + batch])
+        for file_path, file_hash in data.get("file_hashes", {}).items():
+            index.set_file_hash(file_path, file_hash)
+        index.save()
+        return index.get_stats()
+    finally:
+        index.close()
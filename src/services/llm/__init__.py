@@ -1,7 +1,10 @@
 """LLM services: model routing, API client, and call logging."""
 
 from src.services.llm.model_router import ModelRouter, ModelConfig
-from src.services.llm.llm_client import call_llm, LLMResponse
+from src.services.llm.llm_client import (
+    call_llm, stream_llm, LLMResponse, LLMStream, LLMResponseCache,
+)
 from src.services.llm.call_logger import CallLogger
 
-__all__ = ['ModelRouter', 'ModelConfig', 'call_llm', 'LLMResponse', 'CallLogger']
+__all__ = ['ModelRouter', 'ModelConfig', 'call_llm', 'stream_llm', 'LLMResponse',
+           'LLMStream', 'LLMResponseCache', 'CallLogger']
@@ -8,6 +8,10 @@ row's chain_hash, making silent deletion/modification detectable.
 Sensitivity-aware: sensitivity <= 1 stores full prompt/response in details
 JSONB; sensitivity >= 2 stores metadata only (hashes, tokens, context keys).
 
+Streamed calls also record time-to-first-token (ttft_ms, from
+LLMResponse.ttft_ms); responses served from the LLM response cache are
+logged with zero cost and details['cache_hit'] = True.
+
 Usage:
     from src.services.llm.call_logger import CallLogger
 
@@ -29,6 +33,7 @@ Usage:
 import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
 from contextlib import contextmanager
@@ -38,21 +43,28 @@ from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Audit inserts must never hang an LLM pipeline on a locked chain row.
+LOG_STATEMENT_TIMEOUT_MS = 10000
+
 
 class CallLogger:
     """
     Writes LLM call records to core.llm_call_log with hash chaining.
 
-    Each call opens its own DB connection (following KGManager pattern).
+    Each call checks out a pooled DB connection (following KGManager pattern).
     Uses get_connection() directly -- not execute_query() which blocks INSERT.
+    Reading the prior chain hash and inserting are serialized per process, so
+    concurrent pipelines cannot fork the chain.
     """
 
+    _chain_lock = threading.Lock()
+
     def __init__(self, pipeline_run_id: Optional[uuid.UUID] = None):
         self.pipeline_run_id = pipeline_run_id
 
     def _get_connection(self):
         from src.services.database.db_config import get_connection
-        return get_connection()
+        return get_connection(statement_timeout_ms=LOG_STATEMENT_TIMEOUT_MS)
 
     # ------------------------------------------------------------------
     # log_call
@@ -72,10 +84,13 @@ class CallLogger:
         details: Optional[dict] = None,
         context_keys: Optional[List[str]] = None,
         pipeline_run_id: Optional[uuid.UUID] = None,
+        ttft_ms: Optional[int] = None,
     ) -> uuid.UUID:
         """
         Insert a successful LLM call record with hash chaining.
 
+        ttft_ms is the time to first token for streamed calls (None otherwise).
+
         Returns the call's UUID.
         """
         call_id = uuid.uuid4()
@@ -88,10 +103,6 @@ class CallLogger:
             tokens_in, tokens_out, called_at,
         )
 
-        # Get prior chain hash for chaining
-        prior_chain = self._get_last_chain_hash()
-        chain_hash = self._compute_chain_hash(record_hash, prior_chain)
-
         # Sensitivity-aware details
         safe_details = self._sanitize_details(details, sensitivity)
 
@@ -99,13 +110,13 @@ class CallLogger:
             INSERT INTO core.llm_call_log (
                 id, pipeline_run_id, task_type, model_id, provider,
                 sensitivity, prompt_hash, output_hash,
-                tokens_in, tokens_out, cost_usd, latency_ms,
+                tokens_in, tokens_out, cost_usd, latency_ms, ttft_ms,
                 status, details, context_keys,
                 record_hash, chain_hash, called_at
             ) VALUES (
                 %s, %s, %s, %s, %s,
                 %s, %s, %s,
-                %s, %s, %s, %s,
+                %s, %s, %s, %s, %s,
                 'success', %s, %s,
                 %s, %s, %s
             )
@@ -114,16 +125,12 @@ class CallLogger:
             str(call_id), str(run_id) if run_id else None,
             task_type, model_id, provider,
             sensitivity, prompt_hash, output_hash,
-            tokens_in, tokens_out, cost_usd, latency_ms,
+            tokens_in, tokens_out, cost_usd, latency_ms, ttft_ms,
             json.dumps(safe_details) if safe_details else None,
             context_keys,
-            record_hash, chain_hash, called_at,
+            record_hash,
         )
-
-        with self._get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, params)
-            conn.commit()
+        self._insert_chained(sql, params, record_hash, called_at)
 
         logger.debug("Logged LLM call %s (%s, %s)", call_id, task_type, model_id)
         return call_id
@@ -153,9 +160,6 @@ class CallLogger:
         record_hash = self._compute_record_hash(
             call_id, model_id, prompt_hash, None, tokens_in, 0, called_at,
         )
-        prior_chain = self._get_last_chain_hash()
-        chain_hash = self._compute_chain_hash(record_hash, prior_chain)
-
         safe_details = self._sanitize_details(details, sensitivity)
 
         sql = """
@@ -181,13 +185,9 @@ class CallLogger:
             error_message,
             json.dumps(safe_details) if safe_details else None,
             context_keys,
-            record_hash, chain_hash, called_at,
+            record_hash,
         )
-
-        with self._get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, params)
-            conn.commit()
+        self._insert_chained(sql, params, record_hash, called_at)
 
         logger.warning("Logged LLM error %s (%s, %s): %s",
                         call_id, task_type, model_id, error_message[:100])
@@ -238,7 +238,8 @@ class CallLogger:
                 COALESCE(SUM(tokens_in), 0) AS total_tokens_in,
                 COALESCE(SUM(tokens_out), 0) AS total_tokens_out,
                 COALESCE(SUM(cost_usd), 0) AS total_cost_usd,
-                COALESCE(AVG(latency_ms), 0) AS avg_latency_ms
+                COALESCE(AVG(latency_ms), 0) AS avg_latency_ms,
+                AVG(ttft_ms) AS avg_ttft_ms
             FROM core.llm_call_log
             WHERE pipeline_run_id = %s
         """
@@ -291,6 +292,16 @@ class CallLogger:
             return self.compute_hash(record_hash + prior_chain_hash)
         return record_hash
 
+    def _insert_chained(self, sql: str, params: tuple, record_hash: str, called_at):
+        """Append chain_hash and called_at to params and insert, under the chain lock."""
+        with self._chain_lock:
+            prior_chain = self._get_last_chain_hash()
+            chain_hash = self._compute_chain_hash(record_hash, prior_chain)
+            with self._get_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(sql, params + (chain_hash, called_at))
+                conn.commit()
+
     def _get_last_chain_hash(self) -> Optional[str]:
         """Fetch the most recent chain_hash from the log."""
         sql = """
@@ -318,7 +329,7 @@ class CallLogger:
         safe = {}
         for key in ('context_keys', 'template_id', 'template_version',
                      'task_type', 'prompt_hash', 'output_hash',
-                     'tokens_in', 'tokens_out'):
+                     'tokens_in', 'tokens_out', 'cache_hit'):
             if key in details:
                 safe[key] = details[key]
         safe['_redacted'] = True
@@ -364,6 +375,8 @@ class _CallTracker:
                 'system_prompt': self._prompt_text[:500],
                 'response_preview': self._response.text[:500],
             }
+        if getattr(self._response, 'cached', False):
+            details = dict(details or {}, cache_hit=True)
 
         self._logger.log_call(
             task_type=self._task_type,
@@ -378,6 +391,7 @@ class _CallTracker:
             latency_ms=latency,
             details=details,
             context_keys=self._context_keys,
+            ttft_ms=getattr(self._response, 'ttft_ms', None),
         )
 
     def _finish_error(self, error_message: str):
@@ -403,6 +417,8 @@ class _CallTracker:
         """Estimate USD cost from token counts and model config."""
         if self._response is None or self._model is None:
             return 0.0
+        if getattr(self._response, 'cached', False):
+            return 0.0
         cost_in = (self._response.tokens_in / 1000) * self._model.cost_per_1k_in
         cost_out = (self._response.tokens_out / 1000) * self._model.cost_per_1k_out
         return round(cost_in + cost_out, 6)
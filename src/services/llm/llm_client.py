@@ -5,25 +5,53 @@ Thin wrapper that dispatches LLM calls to Anthropic or Ollama based on
 the ModelConfig's provider. Consolidates three existing call patterns
 into one function.
 
+Clients are created once per process and reused, so repeated calls share
+HTTP keep-alive connections: one anthropic.Anthropic per API key, one
+pooled requests.Session for Ollama.
+
+Responses can be streamed (stream_llm, or call_llm with on_token) to get
+text as it is generated and a time-to-first-token measurement. Completed
+responses can optionally be cached on disk, keyed on (model_id,
+prompt_hash, temperature, max_tokens), so re-running a pipeline on
+unchanged inputs makes no API calls. Responses cut off at max_tokens are
+never cached. The cache is off unless a LLMResponseCache is passed or
+RLC_LLM_CACHE_DIR is set.
+
 Usage:
     from src.services.llm.model_router import ModelRouter
-    from src.services.llm.llm_client import call_llm
+    from src.services.llm.llm_client import call_llm, stream_llm
 
     router = ModelRouter()
     model = router.route('summary', sensitivity=0)
     response = call_llm(model, 'You are a commodity analyst.', 'Summarize corn S&D.')
     print(response.text)
+
+    stream = stream_llm(model, 'You are a commodity analyst.', 'Summarize corn S&D.')
+    for chunk in stream:
+        print(chunk, end='', flush=True)
+    print(stream.response.ttft_ms)
 """
 
+import hashlib
+import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Union
 
 from src.services.llm.model_router import ModelConfig
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held per host by the shared Ollama session
+LLM_HTTP_POOL_SIZE = int(os.getenv('RLC_LLM_HTTP_POOL', 8))
+# (connect, read) seconds; with streaming the read timeout applies between chunks
+OLLAMA_TIMEOUT = (float(os.getenv('RLC_OLLAMA_CONNECT_TIMEOUT', 10)),
+                  float(os.getenv('RLC_OLLAMA_READ_TIMEOUT', 300)))
+
 
 @dataclass
 class LLMResponse:
@@ -34,14 +62,185 @@ class LLMResponse:
     latency_ms: int
     model_id: str
     provider: str
+    ttft_ms: Optional[int] = None   # Time to first token (streamed calls only)
+    cached: bool = False            # Served from LLMResponseCache, no API call made
+    truncated: bool = False         # Stopped at max_tokens (never cached)
+
+
+# ---------------------------------------------------------------------------
+# Persistent clients
+# ---------------------------------------------------------------------------
+
+_client_lock = threading.Lock()
+_anthropic_clients: Dict[str, object] = {}
+_ollama_session = None
+
+
+def get_anthropic_client():
+    """Shared anthropic.Anthropic client for the current ANTHROPIC_API_KEY."""
+    import anthropic
+
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise RuntimeError("ANTHROPIC_API_KEY not set in environment")
+
+    with _client_lock:
+        client = _anthropic_clients.get(api_key)
+        if client is None:
+            client = anthropic.Anthropic(api_key=api_key)
+            _anthropic_clients[api_key] = client
+    return client
+
+
+def get_ollama_session():
+    """Shared requests.Session with a keep-alive connection pool for Ollama."""
+    global _ollama_session
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _client_lock:
+        if _ollama_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=LLM_HTTP_POOL_SIZE,
+                                  pool_maxsize=LLM_HTTP_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _ollama_session = session
+    return _ollama_session
+
+
+def close_clients():
+    """Close and forget the shared clients (they are recreated on next use)."""
+    global _ollama_session
+    with _client_lock:
+        clients = list(_anthropic_clients.values())
+        _anthropic_clients.clear()
+        session, _ollama_session = _ollama_session, None
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing Anthropic client: {e}")
+    if session is not None:
+        session.close()
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+def hash_prompt(system_prompt: str, user_prompt: str) -> str:
+    """SHA-256 of a prompt pair, matching RenderedPrompt.prompt_hash."""
+    combined = f"{system_prompt}\n---\n{user_prompt}"
+    return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Content-addressed on-disk cache of completed LLM responses.
+
+    One JSON file per (model_id, prompt_hash, temperature, max_tokens). The
+    prompt hash covers the full rendered prompt, so any change to the inputs
+    is a miss. Truncated responses are not stored. Entries never expire
+    unless ttl_hours is given.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], ttl_hours: Optional[float] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_hours = ttl_hours
+
+    @staticmethod
+    def key(model_id: str, prompt_hash: str, temperature: float, max_tokens: int) -> str:
+        return hashlib.sha256(
+            f"{model_id}|{prompt_hash}|{float(temperature)!r}|{int(max_tokens)}".encode('utf-8')
+        ).hexdigest()
+
+    def _path(self, model_id: str, prompt_hash: str, temperature: float, max_tokens: int) -> Path:
+        return self.cache_dir / f"{self.key(model_id, prompt_hash, temperature, max_tokens)}.json"
+
+    def get(self, model_id: str, prompt_hash: str, temperature: float,
+            max_tokens: int) -> Optional[LLMResponse]:
+        """Cached response, or None on a miss"""
+        path = self._path(model_id, prompt_hash, temperature, max_tokens)
+        if not path.exists():
+            return None
+        if self.ttl_hours is not None:
+            age_hours = (time.time() - path.stat().st_mtime) / 3600
+            if age_hours >= self.ttl_hours:
+                return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"Error reading LLM cache {path.name}: {e}")
+            return None
+        return LLMResponse(
+            text=entry['text'],
+            tokens_in=entry['tokens_in'],
+            tokens_out=entry['tokens_out'],
+            latency_ms=0,
+            model_id=entry['model_id'],
+            provider=entry['provider'],
+            cached=True,
+        )
+
+    def put(self, prompt_hash: str, temperature: float, max_tokens: int, response: LLMResponse):
+        """Store a response (written atomically; safe across threads); truncated ones are skipped"""
+        if response.truncated:
+            logger.debug("Not caching %s response cut off at max_tokens=%s",
+                         response.model_id, max_tokens)
+            return
+        path = self._path(response.model_id, prompt_hash, temperature, max_tokens)
+        tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        entry = {
+            'model_id': response.model_id,
+            'provider': response.provider,
+            'prompt_hash': prompt_hash,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'text': response.text,
+            'tokens_in': response.tokens_in,
+            'tokens_out': response.tokens_out,
+            'latency_ms': response.latency_ms,
+        }
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Error writing LLM cache {path.name}: {e}")
 
 
+_default_caches: Dict[str, LLMResponseCache] = {}
+
+
+def default_response_cache() -> Optional[LLMResponseCache]:
+    """The cache under RLC_LLM_CACHE_DIR, or None when caching is not enabled."""
+    cache_dir = os.environ.get("RLC_LLM_CACHE_DIR")
+    if not cache_dir:
+        return None
+    with _client_lock:
+        cache = _default_caches.get(cache_dir)
+        if cache is None:
+            cache = LLMResponseCache(cache_dir)
+            _default_caches[cache_dir] = cache
+    return cache
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
 def call_llm(
     model: ModelConfig,
     system_prompt: str,
     user_prompt: str,
     max_tokens: int = None,
     temperature: float = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    cache: Union[LLMResponseCache, bool, None] = None,
+    prompt_hash: Optional[str] = None,
 ) -> LLMResponse:
     """
     Call an LLM and return a standardized response.
@@ -55,6 +254,12 @@ def call_llm(
         user_prompt: User message / prompt body
         max_tokens: Override model default (optional)
         temperature: Override model default (optional)
+        on_token: Stream the response, calling this with each text chunk;
+            the returned LLMResponse then carries ttft_ms (optional)
+        cache: LLMResponseCache to read and fill; False disables caching;
+            None uses default_response_cache() (RLC_LLM_CACHE_DIR)
+        prompt_hash: Cache key for the prompt, e.g. RenderedPrompt.prompt_hash
+            (computed from the prompts if omitted)
 
     Returns:
         LLMResponse with text, token counts, and latency
@@ -65,14 +270,111 @@ def call_llm(
     effective_max_tokens = max_tokens or model.max_tokens
     effective_temperature = temperature if temperature is not None else model.temperature
 
+    if cache is None:
+        cache = default_response_cache()
+    if cache:
+        prompt_hash = prompt_hash or hash_prompt(system_prompt, user_prompt)
+        cached = cache.get(model.model_id, prompt_hash, effective_temperature,
+                           effective_max_tokens)
+        if cached is not None:
+            logger.debug("LLM cache hit for %s (%s)", model.model_id, prompt_hash[:12])
+            if on_token:
+                on_token(cached.text)
+            return cached
+
+    if on_token:
+        stream = stream_llm(model, system_prompt, user_prompt,
+                            effective_max_tokens, effective_temperature)
+        for chunk in stream:
+            on_token(chunk)
+        response = stream.response
+    elif model.provider == 'anthropic':
+        response = _call_anthropic(model, system_prompt, user_prompt,
+                                   effective_max_tokens, effective_temperature)
+    elif model.provider == 'ollama':
+        response = _call_ollama(model, system_prompt, user_prompt,
+                                effective_max_tokens, effective_temperature)
+    else:
+        raise ValueError(f"Unknown provider: {model.provider}")
+
+    if cache:
+        cache.put(prompt_hash, effective_temperature, effective_max_tokens, response)
+    return response
+
+
+class LLMStream:
+    """
+    Iterator over the text chunks of a streamed LLM call.
+
+    Once iteration finishes, .response holds the full LLMResponse, with
+    ttft_ms measured from the start of iteration to the first chunk.
+    """
+
+    def __init__(self, model: ModelConfig, chunks: Iterator[str]):
+        self.model = model
+        self._chunks = chunks
+        self.ttft_ms: Optional[int] = None
+        self.response: Optional[LLMResponse] = None
+
+    def __iter__(self) -> Iterator[str]:
+        start = time.perf_counter()
+        parts = []
+        while True:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration as done:
+                tokens_in, tokens_out, truncated = done.value or (0, 0, False)
+                break
+            if not chunk:
+                continue
+            if self.ttft_ms is None:
+                self.ttft_ms = int((time.perf_counter() - start) * 1000)
+            parts.append(chunk)
+            yield chunk
+
+        self.response = LLMResponse(
+            text=''.join(parts),
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            model_id=self.model.model_id,
+            provider=self.model.provider,
+            ttft_ms=self.ttft_ms,
+            truncated=truncated,
+        )
+
+    def collect(self) -> LLMResponse:
+        """Consume the stream and return the full response."""
+        for _ in self:
+            pass
+        return self.response
+
+
+def stream_llm(
+    model: ModelConfig,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = None,
+    temperature: float = None,
+) -> LLMStream:
+    """
+    Start a streamed LLM call. Nothing is sent until the stream is iterated.
+
+    Args are as for call_llm. Responses are not cached on this path; use
+    call_llm(on_token=...) for a streamed call that reads and fills the cache.
+    """
+    effective_max_tokens = max_tokens or model.max_tokens
+    effective_temperature = temperature if temperature is not None else model.temperature
+
     if model.provider == 'anthropic':
-        return _call_anthropic(model, system_prompt, user_prompt,
-                               effective_max_tokens, effective_temperature)
+        chunks = _stream_anthropic(model, system_prompt, user_prompt,
+                                   effective_max_tokens, effective_temperature)
     elif model.provider == 'ollama':
-        return _call_ollama(model, system_prompt, user_prompt,
-                            effective_max_tokens, effective_temperature)
+        chunks = _stream_ollama(model, system_prompt, user_prompt,
+                                effective_max_tokens, effective_temperature)
     else:
         raise ValueError(f"Unknown provider: {model.provider}")
+    return LLMStream(model, chunks)
 
 
 def _call_anthropic(
@@ -83,13 +385,7 @@ def _call_anthropic(
     temperature: float,
 ) -> LLMResponse:
     """Call Anthropic Claude API."""
-    import anthropic
-
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY not set in environment")
-
-    client = anthropic.Anthropic(api_key=api_key)
+    client = get_anthropic_client()
 
     start = time.perf_counter()
     message = client.messages.create(
@@ -108,41 +404,69 @@ def _call_anthropic(
         model_id=model.model_id,
         provider='anthropic',
         latency_ms=latency_ms,
+        truncated=getattr(message, 'stop_reason', None) == 'max_tokens',
     )
 
 
-def _call_ollama(
+def _stream_anthropic(
     model: ModelConfig,
     system_prompt: str,
     user_prompt: str,
     max_tokens: int,
     temperature: float,
-) -> LLMResponse:
-    """Call Ollama local LLM via REST API."""
-    import requests
+) -> Iterator[str]:
+    """Stream Anthropic text deltas; returns (tokens_in, tokens_out, truncated)."""
+    client = get_anthropic_client()
 
-    base_url = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+    with client.messages.stream(
+        model=model.model_id,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system=system_prompt,
+        messages=[{"role": "user", "content": user_prompt}],
+    ) as stream:
+        for text in stream.text_stream:
+            yield text
+        message = stream.get_final_message()
+    return (message.usage.input_tokens, message.usage.output_tokens,
+            getattr(message, 'stop_reason', None) == 'max_tokens')
 
-    start = time.perf_counter()
-    response = requests.post(
+
+def _ollama_request(model, system_prompt, user_prompt, max_tokens, temperature, stream):
+    base_url = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+    response = get_ollama_session().post(
         f"{base_url}/api/generate",
         json={
             "model": model.model_id,
             "prompt": f"{system_prompt}\n\n{user_prompt}",
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
             },
         },
-        timeout=300,
+        timeout=OLLAMA_TIMEOUT,
+        stream=stream,
     )
-    latency_ms = int((time.perf_counter() - start) * 1000)
-
     if response.status_code != 200:
-        raise RuntimeError(
-            f"Ollama returned {response.status_code}: {response.text[:200]}"
-        )
+        text = response.text[:200]
+        response.close()
+        raise RuntimeError(f"Ollama returned {response.status_code}: {text}")
+    return response
+
+
+def _call_ollama(
+    model: ModelConfig,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float,
+) -> LLMResponse:
+    """Call Ollama local LLM via REST API."""
+    start = time.perf_counter()
+    response = _ollama_request(model, system_prompt, user_prompt,
+                               max_tokens, temperature, stream=False)
+    latency_ms = int((time.perf_counter() - start) * 1000)
 
     data = response.json()
     text = data.get("response", "")
@@ -158,4 +482,33 @@ def _call_ollama(
         model_id=model.model_id,
         provider='ollama',
         latency_ms=latency_ms,
+        truncated=data.get("done_reason") == "length",
     )
+
+
+def _stream_ollama(
+    model: ModelConfig,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float,
+) -> Iterator[str]:
+    """Stream Ollama NDJSON chunks; returns (tokens_in, tokens_out, truncated)."""
+    response = _ollama_request(model, system_prompt, user_prompt,
+                               max_tokens, temperature, stream=True)
+    usage = (0, 0, False)
+    with response:
+        # Read to the end of the body (past the 'done' line) so the
+        # connection goes back to the pool
+        for line in response.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get("error"):
+                raise RuntimeError(f"Ollama error: {data['error']}")
+            if data.get("response"):
+                yield data["response"]
+            if data.get("done"):
+                usage = (data.get("prompt_eval_count", 0), data.get("eval_count", 0),
+                         data.get("done_reason") == "length")
+    return usage
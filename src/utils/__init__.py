@@ -13,6 +13,12 @@ from .config import (
     get_settings,
     reload_settings,
 )
+from .rate_limit import (
+    TokenBucket,
+    install_shared_limiter,
+    get_shared_limiter,
+    remove_shared_limiter,
+)
 
 __all__ = [
     "Settings",
@@ -22,4 +28,8 @@ __all__ = [
     "AgentConfig",
     "get_settings",
     "reload_settings",
+    "TokenBucket",
+    "install_shared_limiter",
+    "get_shared_limiter",
+    "remove_shared_limiter",
 ]
@@ -0,0 +1,118 @@
+"""
+Shared rate limiting for collectors.
+
+A TokenBucket enforces an aggregate request rate across threads. Buckets can
+be registered per source (keyed by CollectorConfig.source_name) so that every
+collector instance for that source -- e.g. several annual backfill chunks
+running in parallel -- draws from the same budget instead of each enforcing
+rate_limit_per_minute on its own.
+
+Usage:
+    from src.utils.rate_limit import install_shared_limiter, get_shared_limiter
+
+    install_shared_limiter('USDA AMS', rate_per_minute=30)
+    get_shared_limiter('USDA AMS').acquire()   # blocks until a token is free
+
+    # asyncio callers reserve and sleep on the event loop instead
+    await asyncio.sleep(get_shared_limiter('USDA AMS').reserve())
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Args:
+        rate_per_minute: Sustained rate (tokens added per minute)
+        capacity: Maximum burst size. Defaults to 1, i.e. requests are evenly
+            spaced at 60/rate_per_minute seconds -- the same spacing
+            BaseCollector._respect_rate_limit() applies per instance.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = 1.0):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be positive, got {rate_per_minute}")
+        self.rate_per_minute = rate_per_minute
+        self.capacity = max(1.0, float(capacity))
+        self._rate = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now; never blocks."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.acquired += 1
+                return True
+            return False
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens` now and return how long the caller must wait before
+        using them; never blocks.
+
+        Tokens are reserved under the lock (the balance may go negative), so
+        concurrent callers queue up in arrival order without busy-waiting.
+
+        Returns:
+            Seconds the caller must wait (0 if the tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.waited_seconds += wait
+        return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available, then take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_shared: Dict[str, TokenBucket] = {}
+_shared_lock = threading.Lock()
+
+
+def install_shared_limiter(key: str, rate_per_minute: float,
+                           capacity: float = 1.0) -> TokenBucket:
+    """Register (or return the existing) shared bucket for a source key."""
+    with _shared_lock:
+        bucket = _shared.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate_per_minute, capacity)
+            _shared[key] = bucket
+        return bucket
+
+
+def get_shared_limiter(key: str) -> Optional[TokenBucket]:
+    """Shared bucket for a source key, or None if none is installed."""
+    return _shared.get(key)
+
+
+def remove_shared_limiter(key: str):
+    """Unregister a shared bucket (collectors fall back to per-instance spacing)."""
+    with _shared_lock:
+        _shared.pop(key, None)
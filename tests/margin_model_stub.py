@@ -0,0 +1,151 @@
+"""
+Stand-in for src.engines.feedstock_allocation.margin_model, which is not
+present in every checkout. The allocator tests swap it into sys.modules for
+the duration of their module when the real one cannot be imported, so the
+allocation cores, batch mode and bulk save are exercised either way.
+
+The margin is deliberately not linear in the feedstock price and carries a
+small facility-specific term, so an allocation core that shares or
+interpolates margins across facilities or prices disagrees with the
+per-pair reference.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+CONVERSION_RATES = {
+    'transesterification': {'SBO': 7.55, 'CO': 7.55, 'DCO': 7.60, 'UCO': 7.70,
+                            'EBFT': 7.80, 'IBFT': 7.85, 'YG': 7.75},
+    'hefa': {'SBO': 8.40, 'CO': 8.40, 'DCO': 8.50, 'UCO': 8.60,
+             'EBFT': 8.70, 'IBFT': 8.75, 'YG': 8.65},
+    'coprocessing': {'SBO': 8.90, 'DCO': 9.00, 'UCO': 9.10},
+}
+
+RIN_EQUIVALENCE = {'biodiesel': 1.5, 'renewable_diesel': 1.7, 'saf': 1.6, 'coprocessing': 1.7}
+
+PROCESSING_COST = {'transesterification': 0.45, 'hefa': 0.80, 'coprocessing': 0.35}
+CARBON_INTENSITY_DISCOUNT = {'UCO': 0.04, 'EBFT': 0.02, 'IBFT': 0.03, 'DCO': 0.02}
+
+
+@dataclass
+class FeedstockCost:
+    feedstock_code: str
+    price_per_lb: float
+    freight_per_lb: float = 0.0
+
+
+@dataclass
+class CreditStack:
+    rin_per_gal: float
+    lcfs_per_gal: float
+    btc_45z_per_gal: float
+    state_credit_per_gal: float
+
+    @property
+    def total_per_gal(self) -> float:
+        return self.rin_per_gal + self.lcfs_per_gal + self.btc_45z_per_gal + self.state_credit_per_gal
+
+
+@dataclass
+class MarginResult:
+    facility_id: int
+    feedstock_code: str
+    feedstock_cost_per_lb: float
+    revenue_per_gal: float
+    margin_per_gal: float
+
+
+class CreditResolver:
+
+    def build_credit_stack(self, calc_date: date, fuel_type: str, rin_price_cents: float,
+                           lcfs_credit_per_gal: float = 0.0,
+                           destination_state: Optional[str] = None) -> CreditStack:
+        state_credit = {'IL': 0.02, 'IA': 0.03}.get(destination_state, 0.0)
+        return CreditStack(
+            rin_per_gal=rin_price_cents / 100.0 * RIN_EQUIVALENCE.get(fuel_type, 1.5),
+            lcfs_per_gal=lcfs_credit_per_gal,
+            btc_45z_per_gal=0.20 if calc_date.year >= 2025 else 1.00,
+            state_credit_per_gal=state_credit,
+        )
+
+
+class MarginCalculator:
+
+    def get_conversion_rate(self, technology: str, feedstock_code: str) -> float:
+        return CONVERSION_RATES.get(technology, {}).get(feedstock_code, 8.0)
+
+    def calculate(self, facility_id: int, fuel_type: str, technology: str,
+                  feedstock: FeedstockCost, fuel_price: float, credits: CreditStack,
+                  period: date) -> MarginResult:
+        # Delivered cost with a volume-weighted basis: quadratic in price
+        price = feedstock.price_per_lb
+        cost_per_lb = price + feedstock.freight_per_lb + 0.1 * price * price
+        lbs_per_gal = self.get_conversion_rate(technology, feedstock.feedstock_code)
+        revenue = fuel_price + credits.total_per_gal
+        site_cost = PROCESSING_COST.get(technology, 0.5) + 0.001 * (facility_id % 7)
+        margin = (revenue - cost_per_lb * lbs_per_gal - site_cost
+                  + CARBON_INTENSITY_DISCOUNT.get(feedstock.feedstock_code, 0.0))
+        return MarginResult(
+            facility_id=facility_id,
+            feedstock_code=feedstock.feedstock_code,
+            feedstock_cost_per_lb=cost_per_lb,
+            revenue_per_gal=revenue,
+            margin_per_gal=margin,
+        )
+
+
+@dataclass
+class ImpliedValue:
+    grade_code: str
+    pathway: str
+    fuel_type: str
+    fuel_price_per_gal: float
+    rin_value_per_gal: float
+    lcfs_value_per_gal: float
+    btc_45z_per_gal: float
+    state_credit_per_gal: float
+    total_revenue_per_gal: float
+    processing_cost_per_gal: float
+    lbs_per_gal: float
+    implied_value_per_lb: float
+    ci_score_used: float
+
+
+class TallowSplitCalculator:
+
+    MARKET_PRICE = {'ebft': 0.52, 'ibft': 0.47}
+
+    def allocate_tallow(self, eia_total_mil_lbs: float, period: date, fuel_price: float,
+                        rin_price_cents: float, lcfs_credit_per_gal: float = 0.0,
+                        pathway: str = 'hefa', fuel_type: str = 'renewable_diesel') -> dict:
+        rin = rin_price_cents / 100.0 * RIN_EQUIVALENCE.get(fuel_type, 1.7)
+        result = {'eia_total_mil_lbs': eia_total_mil_lbs}
+        spreads = {}
+        for grade, ci in (('ebft', 40.0), ('ibft', 30.0)):
+            lbs_per_gal = CONVERSION_RATES['hefa'][grade.upper()]
+            revenue = fuel_price + rin + lcfs_credit_per_gal
+            implied = (revenue - PROCESSING_COST['hefa']) / lbs_per_gal
+            spreads[grade] = implied - self.MARKET_PRICE[grade]
+            result[f'{grade}_iv'] = ImpliedValue(
+                grade_code=grade.upper(), pathway=pathway, fuel_type=fuel_type,
+                fuel_price_per_gal=fuel_price, rin_value_per_gal=rin,
+                lcfs_value_per_gal=lcfs_credit_per_gal, btc_45z_per_gal=0.0,
+                state_credit_per_gal=0.0, total_revenue_per_gal=revenue,
+                processing_cost_per_gal=PROCESSING_COST['hefa'], lbs_per_gal=lbs_per_gal,
+                implied_value_per_lb=implied, ci_score_used=ci,
+            )
+        ebft_share = 0.55 if spreads['ebft'] >= spreads['ibft'] else 0.45
+        for grade, share in (('ebft', ebft_share), ('ibft', 1.0 - ebft_share)):
+            result[grade] = {
+                'allocated_mil_lbs': eia_total_mil_lbs * share,
+                'allocated_pct': share * 100.0,
+                'best_pathway': pathway,
+                'implied_value_per_lb': result[f'{grade}_iv'].implied_value_per_lb,
+                'market_price_per_lb': self.MARKET_PRICE[grade],
+                'margin_spread_per_lb': spreads[grade],
+                'pull_flag': spreads[grade] > 0,
+                'allocation_method': 'economic_pull',
+                'constraint_notes': None,
+            }
+        return result
@@ -0,0 +1,242 @@
+"""
+Tests for the buffered transformation audit sink (src/agents/core/audit_sink.py)
+and TransformationLogger's use of it. Fake DB-API connections; no database.
+"""
+
+import json
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.agents.core.audit_sink import AuditSink
+from src.agents.core.transformation_logger import TransformationLogger
+
+
+class FakeIntegrityError(Exception):
+    """Stands in for psycopg2.IntegrityError: a data error, not a connection one."""
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def _check(self, params):
+        if list(params) and list(params)[3] in self.db.bad_steps:
+            raise FakeIntegrityError(f"duplicate key for {params[3]}")
+
+    def mogrify(self, sql, params):
+        # psycopg2.extras.execute_batch mogrifies each statement, then sends
+        # the joined page in one execute() call
+        self._check(params)
+        self.db.statements.append((sql, list(params)))
+        return b'stmt'
+
+    def execute(self, sql, params=None):
+        self.db.round_trips += 1
+        if isinstance(sql, bytes):
+            return
+        self._check(params)
+        self.db.statements.append((sql, list(params)))
+
+    def fetchone(self):
+        return {'id': len(self.db.statements)}
+
+
+class FakeDB:
+    def __init__(self):
+        self.statements = []
+        self.round_trips = 0
+        self.commits = 0
+        self.down = False
+        self.bad_steps = set()
+
+    @contextmanager
+    def connection(self):
+        if self.down:
+            raise ConnectionError("could not connect to server")
+        committed = len(self.statements)
+        try:
+            yield self
+        except Exception:
+            del self.statements[committed:]   # rollback
+            raise
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def kinds(self):
+        return [sql.split('audit.')[1].split('(')[0] for sql, _ in self.statements]
+
+
+class TestAuditSink(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spill = Path(self.tmp.name) / 'spill.jsonl'
+        self.sink = AuditSink(self.db.connection, spill_path=self.spill,
+                              flush_interval=60, batch_size=1000)
+        self.addCleanup(self.sink.close)
+
+    def _op(self, session, n):
+        return (session, 'TRANSFORM', ['bronze.t'], f'step {n}', 'silver.t',
+                n, n, 'SQL', None, None, None, None, 1)
+
+    def test_flush_is_one_transaction_in_order(self):
+        for n in range(50):
+            self.sink.submit('operation', self._op('s1', n))
+        self.sink.submit('lineage', ('TABLE', 'bronze', 't', 'TABLE', 'silver', 't',
+                                     'TRANSFORMS', 's1', None, None, None))
+        self.sink.submit('operation', self._op('s1', 50))
+        self.assertEqual(self.db.statements, [])
+
+        self.assertTrue(self.sink.flush())
+        self.assertEqual(self.db.commits, 1)
+        self.assertLess(self.db.round_trips, 51)
+        steps = [p[3] for sql, p in self.db.statements if 'log_transformation_operation' in sql]
+        self.assertEqual(steps, [f'step {n}' for n in range(51)])
+        self.assertEqual(self.db.kinds()[50], 'add_lineage_edge')
+        self.assertEqual(self.sink.stats()['written'], 52)
+
+    def test_batch_size_triggers_background_flush(self):
+        sink = AuditSink(self.db.connection, spill_path=self.spill,
+                         flush_interval=60, batch_size=5)
+        self.addCleanup(sink.close)
+        for n in range(5):
+            sink.submit('operation', self._op('s1', n))
+        deadline = time.monotonic() + 2
+        while len(self.db.statements) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.db.statements), 5)
+
+    def test_spill_and_replay_preserve_order(self):
+        self.db.down = True
+        self.sink.submit('operation', self._op('s1', 0))
+        self.assertFalse(self.sink.flush())
+        self.sink.submit('operation', self._op('s1', 1))
+        self.assertFalse(self.sink.flush())
+        lines = self.spill.read_text().splitlines()
+        self.assertEqual([json.loads(l)['params'][3] for l in lines], ['step 0', 'step 1'])
+
+        self.db.down = False
+        self.sink.submit('operation', self._op('s1', 2))
+        self.assertTrue(self.sink.flush())
+        self.assertEqual([p[3] for _, p in self.db.statements], ['step 0', 'step 1', 'step 2'])
+        self.assertFalse(self.spill.exists())
+        stats = self.sink.stats()
+        self.assertEqual((stats['spilled'], stats['replayed']), (2, 2))
+
+    def test_bad_record_is_quarantined_not_spilled(self):
+        self.db.bad_steps = {'step 1'}
+        for n in range(4):
+            self.sink.submit('operation', self._op('s1', n))
+        self.assertTrue(self.sink.flush())
+        self.assertEqual([p[3] for _, p in self.db.statements], ['step 0', 'step 2', 'step 3'])
+        self.assertFalse(self.spill.exists())
+        rejected = [json.loads(l) for l in self.sink.quarantine_path.read_text().splitlines()]
+        self.assertEqual([r['params'][3] for r in rejected], ['step 1'])
+        self.assertIn('duplicate key', rejected[0]['error'])
+        stats = self.sink.stats()
+        self.assertEqual((stats['written'], stats['quarantined'], stats['spilled']), (3, 1, 0))
+
+        # Later flushes are not blocked by it
+        self.sink.submit('operation', self._op('s1', 4))
+        self.assertTrue(self.sink.flush())
+        self.assertEqual(self.db.statements[-1][1][3], 'step 4')
+
+    def test_bad_record_in_spill_backlog_does_not_block_replay(self):
+        self.db.down = True
+        for n in range(4):
+            self.sink.submit('operation', self._op('s1', n))
+        self.assertFalse(self.sink.flush())
+
+        self.db.down = False
+        self.db.bad_steps = {'step 0'}
+        self.sink.submit('operation', self._op('s1', 4))
+        self.assertTrue(self.sink.flush())
+        self.assertEqual([p[3] for _, p in self.db.statements],
+                         ['step 1', 'step 2', 'step 3', 'step 4'])
+        self.assertFalse(self.spill.exists())
+        self.assertEqual(self.sink.stats()['quarantined'], 1)
+
+    def test_torn_spill_line_is_skipped(self):
+        self.spill.write_text(
+            json.dumps({'kind': 'complete', 'params': ['s1', 'COMPLETED', None, None]})
+            + '\n{"kind": "oper'
+        )
+        self.assertTrue(self.sink.flush())
+        self.assertEqual(self.db.kinds(), ['complete_transformation_session'])
+
+    def test_overhead_is_measured(self):
+        for n in range(200):
+            self.sink.submit('operation', self._op('s1', n))
+        stats = self.sink.stats()
+        self.assertGreater(stats['overhead_avg_us'], 0)
+        self.assertLess(stats['overhead_avg_us'], 1000)
+        self.assertEqual(stats['pending'], 200)
+
+
+class TestLoggerBuffering(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sink = AuditSink(self.db.connection, spill_path=Path(self.tmp.name) / 's.jsonl',
+                              flush_interval=60)
+        self.addCleanup(self.sink.close)
+
+    def test_checkin_flushes_session(self):
+        log = TransformationLogger('test_agent', source_tables=['bronze.t'], sink=self.sink)
+        log.session_id = uuid4()
+        log._is_active = True
+        for n in range(3):
+            result = log.log_operation('TRANSFORM', input_tables=['bronze.t'],
+                                       parameters={'n': n})
+            self.assertIsNone(result.operation_id)
+            self.assertEqual(result.operation_order, n + 1)
+        log.add_lineage('bronze', 't', 'silver', 't', 'TRANSFORMS')
+        log.register_output('TABLE', 'silver.t', data_as_of=None)
+        self.assertEqual(self.db.statements, [])
+
+        log.checkin()
+        self.assertEqual(self.db.kinds(), [
+            'log_transformation_operation', 'log_transformation_operation',
+            'log_transformation_operation', 'add_lineage_edge',
+            'register_output_artifact', 'complete_transformation_session',
+        ])
+        self.assertEqual(self.db.statements[0][1][0], str(log.session_id))
+        self.assertEqual(self.db.statements[0][1][8], json.dumps({'n': 0}))
+        self.assertEqual(self.db.commits, 1)
+
+    def test_checkin_spills_instead_of_raising(self):
+        log = TransformationLogger('test_agent', sink=self.sink)
+        log.session_id = uuid4()
+        log._is_active = True
+        log.log_operation('TRANSFORM')
+        self.db.down = True
+        log.checkin()
+        self.assertFalse(log._is_active)
+        self.assertEqual(self.sink.stats()['spilled'], 2)
+
+    def test_unbuffered_returns_ids(self):
+        log = TransformationLogger('test_agent', sink=self.sink, buffered=False)
+        log.session_id = uuid4()
+        log._is_active = True
+        self.assertEqual(log.log_operation('TRANSFORM').operation_id, 1)
+        self.assertEqual(self.db.commits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
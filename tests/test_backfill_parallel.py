@@ -0,0 +1,144 @@
+"""
+Tests for the shared token bucket and the parallel backfill mode.
+
+No network or database: CollectorRunner is replaced with a stub.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.rate_limit import (
+    TokenBucket,
+    get_shared_limiter,
+    install_shared_limiter,
+    remove_shared_limiter,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_first_acquire_is_free(self):
+        bucket = TokenBucket(rate_per_minute=60)
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_requests_are_spaced(self):
+        bucket = TokenBucket(rate_per_minute=1200)   # 20/s -> 50ms spacing
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_concurrent_callers_share_budget(self):
+        bucket = TokenBucket(rate_per_minute=1200)
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)
+        self.assertEqual(bucket.acquired, 6)
+
+    def test_try_acquire(self):
+        bucket = TokenBucket(rate_per_minute=1)
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_shared_registry(self):
+        a = install_shared_limiter('test_source', 30)
+        b = install_shared_limiter('test_source', 999)
+        self.assertIs(a, b)
+        self.assertIs(get_shared_limiter('test_source'), a)
+        remove_shared_limiter('test_source')
+        self.assertIsNone(get_shared_limiter('test_source'))
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate_per_minute=0)
+
+
+class _StubResult:
+    def __init__(self, success=True, rows=10):
+        self.success = success
+        self.rows_collected = rows
+        self.error_message = None if success else 'boom'
+        self.started_at = datetime.now()
+        self.finished_at = datetime.now()
+
+
+class _StubRunner:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+
+    def run_collector(self, name, triggered_by='manual', **kwargs):
+        time.sleep(0.01)
+        with self.lock:
+            self.calls.append((name, kwargs.get('start_date')))
+        return _StubResult(success=name not in self.fail)
+
+
+class TestParallelBackfill(unittest.TestCase):
+
+    def setUp(self):
+        from src.dispatcher.backfill import BackfillRunner, ProgressTracker
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runner = BackfillRunner(delay_override=0)
+        self.runner.progress = ProgressTracker(Path(self.tmp.name) / 'progress.json')
+        self.runner.runner = _StubRunner(fail={'epa_rfs'})
+        self.addCleanup(self.runner.cleanup)
+        self.addCleanup(self.tmp.cleanup)
+
+    def _tasks(self):
+        return self.runner.get_tasks(collectors=['drought_monitor', 'cftc_cot', 'epa_rfs'])
+
+    def test_parallel_matches_serial_coverage(self):
+        tasks = self._tasks()
+        results = {"success": 0, "failed": 0, "skipped": 0, "total_rows": 0}
+        with patch.object(self.runner, '_shared_rate_limit', return_value=('Drought', 6000)), \
+                patch('builtins.print'):
+            self.runner._run_parallel(tasks, resume=False, workers=4, results=results)
+
+        self.assertEqual(len(self.runner.runner.calls), len(tasks))
+        self.assertEqual(results['failed'], 1)
+        self.assertEqual(results['success'], len(tasks) - 1)
+        self.assertTrue(self.runner.progress.is_done('cftc_cot'))
+        self.assertFalse(self.runner.progress.is_done('epa_rfs'))
+        # Shared limiter is removed once the run finishes
+        self.assertIsNone(get_shared_limiter('Drought'))
+
+    def test_resume_skips_completed(self):
+        tasks = self._tasks()
+        self.runner.progress.mark_done('cftc_cot', 5)
+        results = {"success": 0, "failed": 0, "skipped": 0, "total_rows": 0}
+        with patch.object(self.runner, '_shared_rate_limit', return_value=None), \
+                patch('builtins.print'):
+            self.runner._run_parallel(tasks, resume=True, workers=3, results=results)
+        self.assertEqual(results['skipped'], 1)
+        self.assertNotIn('cftc_cot', [c for c, _ in self.runner.runner.calls])
+
+    def test_lanes(self):
+        tasks = self._tasks()
+        with patch.object(self.runner, '_shared_rate_limit', return_value=('Drought', 60)):
+            lanes, keys = self.runner._build_lanes(tasks)
+        remove_shared_limiter('Drought')
+        drought = [l for l in lanes if l['collector'] == 'drought_monitor']
+        from src.dispatcher.backfill import MAX_LANES_PER_SOURCE
+        self.assertEqual(len(drought), MAX_LANES_PER_SOURCE)
+        self.assertFalse(any(l['paced'] for l in drought))
+        self.assertEqual(sum(len(l['tasks']) for l in lanes), len(tasks))
+        self.assertEqual(keys, ['Drought'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for CensusFetchPlanner in scripts/pull_census_trade.py: HS-code probing,
+concurrent grid execution, record order, and the on-disk response cache.
+HTTP goes to a fake session; nothing touches the Census API.
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.rate_limit import install_shared_limiter, remove_shared_limiter
+
+_sleep = time.sleep
+
+_spec = importlib.util.spec_from_file_location(
+    'pull_census_trade', PROJECT_ROOT / 'scripts' / 'pull_census_trade.py')
+pct = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pct)
+
+EXPORT_HEADER = ['ALL_VAL_MO', 'QTY_1_MO', 'QTY_2_MO', 'UNIT_QY1', 'UNIT_QY2',
+                 'VES_WGT_MO', 'AIR_WGT_MO', 'CTY_CODE', 'CTY_NAME', 'E_COMMODITY', 'time', 'COMM_LVL']
+IMPORT_HEADER = ['GEN_VAL_MO', 'GEN_QY1_MO', 'CON_QY1_MO', 'UNIT_QY1', 'UNIT_QY2',
+                 'CTY_CODE', 'CTY_NAME', 'I_COMMODITY', 'time', 'COMM_LVL']
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = '' if data is None else repr(data)
+
+    def json(self):
+        return self._data
+
+
+class FakeCensus:
+    """
+    Serves synthetic rows per (flow, hs_code, month). `empty` holds keys that
+    return 204; `broken` holds keys that return 500 every time.
+    """
+
+    def __init__(self, empty=(), broken=()):
+        self.empty = set(empty)
+        self.broken = set(broken)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        flow = url.rstrip('/').split('/')[-2]
+        hs_code = params.get('E_COMMODITY') or params.get('I_COMMODITY')
+        key = (flow, hs_code, params['time'])
+        with self._lock:
+            self.calls.append(key)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            if key in self.broken:
+                return FakeResponse(500)
+            if key in self.empty or (flow, hs_code, '*') in self.empty:
+                return FakeResponse(204)
+            month = int(params['time'][-2:])
+            if flow == 'exports':
+                rows = [[str(1000 * month), '0', '0', '-', '-', str(50000 + int(hs_code[-2:])), '0',
+                         code, name, hs_code, params['time'], 'HS6']
+                        for code, name in (('5700', 'CHINA'), ('2010', 'MEXICO'))]
+                return FakeResponse(200, [EXPORT_HEADER] + rows)
+            rows = [[str(10 * month), '100', '0', 'KG', '-', '1220', 'CANADA', hs_code, params['time'], 'HS6']]
+            return FakeResponse(200, [IMPORT_HEADER] + rows)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestCensusFetchPlanner(unittest.TestCase):
+
+    def setUp(self):
+        remove_shared_limiter('Census API')
+        install_shared_limiter('Census API', rate_per_minute=60000, capacity=100)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(remove_shared_limiter, 'Census API')
+        # Skip retry backoff; keep the fake server's short latency
+        sleep = mock.patch('time.sleep', side_effect=lambda s: None if s >= 1 else _sleep(s))
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def _run(self, census, workers=4, start=date(2024, 1, 1), end=date(2024, 6, 30), refresh=False):
+        cache = pct.CensusResponseCache(Path(self.tmp.name), today=date(2026, 1, 15))
+        planner = pct.CensusFetchPlanner('SOYBEANS', start, end, workers=workers,
+                                         cache=cache, refresh=refresh)
+        planner.session = census
+        with redirect_stdout(io.StringIO()):
+            records = planner.run()
+        return planner, records
+
+    def test_probe_then_concurrent_grid(self):
+        # Imports: 120110 has no trade, so only 120190 is used after the probe month
+        census = FakeCensus(empty={('imports', '120110', '*')})
+        planner, records = self._run(census)
+
+        self.assertEqual(planner.working_codes, {'exports': ['120110', '120190'], 'imports': ['120190']})
+        self.assertEqual(len(census.calls), 6 * 2 + (2 + 5))
+        self.assertEqual(len(set(census.calls)), len(census.calls))
+        self.assertGreater(census.max_in_flight, 1)
+        self.assertLessEqual(census.max_in_flight, 4)
+        self.assertEqual(planner.stats, {'cached': 0, 'fetched': 19, 'failed': 0})
+
+        # Same order as the serial month -> flow -> code loop
+        order = [(r['month'], r['flow'], r['hs_code'], r['country_name']) for r in records]
+        expected = [(m, f, code, name)
+                    for m in range(1, 7)
+                    for f, codes, names in (('exports', ['120110', '120190'], ['CHINA', 'MEXICO']),
+                                            ('imports', ['120190'], ['CANADA']))
+                    for code in codes for name in names]
+        self.assertEqual(order, expected)
+        self.assertTrue(all(r['commodity'] == 'SOYBEANS' for r in records))
+        self.assertEqual(records[0]['marketing_year'], '2023/24')
+
+    def test_four_digit_fallback_when_no_six_digit_code_works(self):
+        census = FakeCensus(empty={('exports', '120110', '*'), ('exports', '120190', '*'),
+                                   ('imports', '120110', '2024-01'), ('imports', '120190', '2024-01'),
+                                   ('imports', '1201', '2024-01')})
+        planner, records = self._run(census, end=date(2024, 3, 31))
+        self.assertEqual(planner.working_codes['exports'], ['1201'])
+        # Imports found nothing in January, so February is probed again
+        self.assertEqual(planner.working_codes['imports'], ['120110', '120190'])
+        self.assertEqual(sum(1 for c in census.calls if c[0] == 'imports' and c[2] == '2024-01'), 3)
+        self.assertFalse([r for r in records if r['flow'] == 'imports' and r['month'] == 1])
+
+    def test_rerun_reads_cache_and_refetches_only_failures(self):
+        broken = {('exports', '120190', '2024-03'), ('imports', '120110', '2024-05')}
+        census = FakeCensus(broken=broken)
+        first, first_records = self._run(census)
+        self.assertEqual(first.stats['failed'], 2)
+        self.assertEqual({(r.flow, r.hs_code, f"{r.year}-{r.month:02d}") for r in first.failed}, broken)
+
+        healthy = FakeCensus()
+        second, second_records = self._run(healthy)
+        self.assertEqual(sorted(healthy.calls), sorted(broken))
+        self.assertEqual(second.stats, {'cached': 22, 'fetched': 2, 'failed': 0})
+        self.assertEqual(len(second_records), len(first_records) + 2 + 1)
+
+        third_census = FakeCensus()
+        third, third_records = self._run(third_census)
+        self.assertEqual(third_census.calls, [])
+        self.assertEqual(third_records, second_records)
+
+        refreshed = FakeCensus()
+        self._run(refreshed, refresh=True)
+        self.assertEqual(len(refreshed.calls), 24)
+
+    def test_recent_months_expire(self):
+        cache = pct.CensusResponseCache(Path(self.tmp.name), ttl_hours=24, recent_months=3,
+                                        today=date(2024, 6, 15))
+        params = {'time': '2024-01', 'key': 'secret'}
+        cache.put('url', params, [['h'], ['row']])
+        cache.put('url', dict(params, time='2024-05'), [['h'], ['row']])
+        # API key is not part of the cache key
+        self.assertEqual(cache.get('url', {'time': '2024-01', 'key': 'other'}, date(2024, 1, 1)),
+                         [['h'], ['row']])
+        self.assertIsNotNone(cache.get('url', dict(params, time='2024-05'), date(2024, 5, 1)))
+
+        old = time.time() - 2 * 86400
+        for path in Path(self.tmp.name).glob('*.json'):
+            self.assertNotIn('secret', path.read_text())
+            os.utime(path, (old, old))
+        self.assertIsNotNone(cache.get('url', params, date(2024, 1, 1)))
+        self.assertIsNone(cache.get('url', dict(params, time='2024-05'), date(2024, 5, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for the COPY + merge load path in scripts/pull_census_trade.py, using a
+fake psycopg2 connection that records the statements and the COPY payload.
+"""
+
+import csv
+import importlib.util
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+_spec = importlib.util.spec_from_file_location(
+    'pull_census_trade', PROJECT_ROOT / 'scripts' / 'pull_census_trade.py')
+pct = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pct)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.conn.log.append(('execute', ' '.join(sql.split()), params))
+
+    def copy_expert(self, sql, file):
+        self.conn.log.append(('copy', sql, file.read()))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append(('commit', None, None))
+
+    def close(self):
+        pass
+
+
+def _record(month, flow, hs_code, country, value, quantity=1000.0, commodity='SOYBEANS'):
+    d = date(2024, month, 1)
+    return {
+        'year': 2024, 'month': month, 'date': d, 'flow': flow, 'hs_code': hs_code,
+        'country_code': '5700', 'country_name': country, 'value_usd': value,
+        'quantity': quantity, 'unit': 'KG', 'commodity': commodity,
+        'marketing_year': pct.get_marketing_year(commodity, d),
+    }
+
+
+class TestCensusBulkLoad(unittest.TestCase):
+
+    def _write(self, records, bulk=True):
+        conn = FakeConnection()
+        with redirect_stdout(io.StringIO()):
+            written = pct._write_postgresql(conn, records, bulk=bulk)
+        return written, conn.log
+
+    def test_statements_per_batch_do_not_grow_with_records(self):
+        records = [_record(m, flow, hs, country, 10.0 * m)
+                   for m in (9, 10, 11)
+                   for flow in ('exports', 'imports')
+                   for hs in pct.HS_CODES['SOYBEANS']
+                   for country in ('CHINA', 'MEXICO', 'JAPAN')]
+        written, log = self._write(records)
+        self.assertEqual(written, len(records))
+
+        ddl_commit = [kind for kind, *_ in log].index('commit')
+        after_ddl = [(kind, sql) for kind, sql, _ in log[ddl_commit + 1:]]
+        kinds = [kind for kind, _ in after_ddl]
+        self.assertEqual(kinds, ['execute', 'copy', 'execute', 'execute', 'execute', 'commit'])
+        self.assertIn('CREATE TEMP TABLE census_trade_stage', after_ddl[0][1])
+        self.assertIn('ON COMMIT DROP', after_ddl[0][1])
+        merge, monthly, yearly = (sql for kind, sql in after_ddl[2:5])
+        self.assertIn('INSERT INTO census_trade_records', merge)
+        self.assertIn('seq DESC', merge)
+        self.assertIn('INSERT INTO census_trade_monthly_summary', monthly)
+        self.assertIn('FROM census_trade_stage', monthly)
+        self.assertIn('INSERT INTO census_trade_yearly_summary', yearly)
+        self.assertIn('FROM census_trade_monthly_summary', yearly)
+
+        # The row-wise path issues a statement per record
+        _, rowwise = self._write(records, bulk=False)
+        self.assertGreater(sum(1 for kind, *_ in rowwise if kind == 'execute'), len(records))
+
+    def test_copy_payload(self):
+        records = [
+            _record(9, 'exports', '120110', 'CHINA', 1500.25),
+            _record(9, 'exports', '120190', 'CHINA', 99.5, quantity=None),
+            _record(8, 'imports', '120190', 'CANADA', None, quantity=42.0),
+        ]
+        records[2]['unit'] = ''
+        _, log = self._write(records)
+        copy_sql, payload = next((sql, data) for kind, sql, data in log if kind == 'copy')
+        self.assertIn("NULL '\\N'", copy_sql)
+        self.assertIn('FORMAT csv', copy_sql)
+
+        rows = list(csv.reader(io.StringIO(payload)))
+        self.assertEqual(len(rows), 3)
+        header = pct.STAGE_COLUMNS
+        first, second, third = (dict(zip(header, row)) for row in rows)
+        self.assertEqual([r['seq'] for r in (first, second, third)], ['0', '1', '2'])
+        self.assertEqual(first['trade_date'], '2024-09-01')
+        self.assertEqual(first['value_usd'], '1500.25')
+        self.assertEqual(first['destination_region'], pct.get_destination_region('CHINA'))
+        self.assertEqual(first['marketing_year'], '2024/25')
+        self.assertEqual(second['quantity'], '\\N')
+        self.assertEqual(third['value_usd'], '\\N')
+        self.assertEqual(third['unit'], '')
+        self.assertEqual(third['marketing_year'], '2023/24')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ proven live against a deliberately broken term (see handoff 2026-08-03); these t
 deterministic assembly logic the trigger cannot see: contract-code parsing and stack arithmetic.
 """
 
-from src.curves.engine import contract_tenor_to_window
+from datetime import date
+
+from src.curves.engine import assemble_stacks, contract_tenor_to_window, stack_rows
 from src.curves.specs import BRSBO_FOB_PARITY
 
 
@@ -44,3 +46,32 @@ class TestBrsboSpec:
         # drifts from this convention silently loses enforcement.
         assert BRSBO_FOB_PARITY.curve_key == "BRSBO_FOB_PARITY"
         assert BRSBO_FOB_PARITY.quality_rank.startswith("DERIVED_")
+
+
+class TestBatchedAssembly:
+    MARKS = [
+        ("ZL_U26", 67.47, "yfinance", "DELAYED", 1200),
+        ("ZL_Z26", 66.10, "yfinance", "DELAYED", 0),      # thin — refused
+        ("ZL_FRONT", 67.00, "yfinance", "DELAYED", 5000),  # not dated — refused
+        ("ZL_F27", 65.90, "yfinance", "DELAYED", None),    # no volume — refused
+        ("ZL_H27", 65.20, "yfinance", "DELAYED", 80),
+    ]
+
+    def test_guards_applied(self):
+        stacks = assemble_stacks(BRSBO_FOB_PARITY, date(2026, 7, 31), self.MARKS)
+        assert [w for w, _ in stacks] == ["2026-09", "2027-03"]
+        assert len(stacks[0][1]) == 1 + len(BRSBO_FOB_PARITY.fixed_terms)
+
+    def test_bulk_rows_tie_out(self):
+        obs = date(2026, 7, 31)
+        stacks = assemble_stacks(BRSBO_FOB_PARITY, obs, self.MARKS)
+        terms, headlines = stack_rows(BRSBO_FOB_PARITY, obs, stacks)
+        assert len(terms) == sum(len(t) for _, t in stacks)
+        assert len(headlines) == len(stacks)
+        # Every headline is the (rounded) sum of its window's terms — what the deferred
+        # curve_term_tieout trigger checks at COMMIT.
+        for h in headlines:
+            window, headline = h[3], h[4]
+            total = sum(t[4] for t in terms if t[2] == window)
+            assert abs(headline - total) <= max(0.01, abs(total) * 1e-4)
+            assert h[0] == BRSBO_FOB_PARITY.curve_key and h[2] == "WINDOW"
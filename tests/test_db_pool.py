@@ -0,0 +1,189 @@
+"""
+Tests for the shared PostgreSQL connection pool (src/services/database/pool.py).
+
+Uses fake DB-API connections so no database is required.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.database import db_config
+from src.services.database.pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            self.conn.closed = 2
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.statements.append((sql, params))
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.autocommit = False
+        self.cursor_factory = None
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.opened = []
+
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+
+        self.pool = ConnectionPool(connect=connect, minconn=1, maxconn=2,
+                                   checkout_timeout=0.2)
+
+    def test_connection_is_reused(self):
+        with self.pool.connection() as c1:
+            pass
+        with self.pool.connection() as c2:
+            pass
+        self.assertIs(c1, c2)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.pool.stats()['checkouts'], 2)
+
+    def test_saturated_pool_times_out(self):
+        a = self.pool.getconn()
+        b = self.pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            self.pool.getconn()
+        stats = self.pool.stats()
+        self.assertEqual(stats['checkout_timeouts'], 1)
+        self.assertEqual(stats['in_use'], 2)
+        self.assertEqual(stats['utilization'], 1.0)
+        self.pool.putconn(a)
+        self.pool.putconn(b)
+
+    def test_waiter_gets_returned_connection(self):
+        a = self.pool.getconn()
+        b = self.pool.getconn()
+        got = []
+
+        def waiter():
+            got.append(self.pool.getconn(timeout=2))
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.05)
+        self.pool.putconn(a)
+        t.join()
+        self.assertIs(got[0], a)
+        self.assertEqual(self.pool.stats()['saturated_checkouts'], 1)
+        self.pool.putconn(b)
+        self.pool.putconn(got[0])
+
+    def test_closed_connection_is_discarded(self):
+        with self.pool.connection() as c1:
+            c1.closed = 2
+        with self.pool.connection() as c2:
+            pass
+        self.assertIsNot(c1, c2)
+        self.assertEqual(self.pool.stats()['connections_discarded'], 1)
+        self.assertEqual(self.pool.stats()['size'], 1)
+
+    def test_stale_connection_fails_health_check(self):
+        self.pool.health_check_interval = 0
+        with self.pool.connection() as c1:
+            pass
+        c1.broken = True
+        with self.pool.connection() as c2:
+            pass
+        self.assertIsNot(c1, c2)
+        self.assertEqual(self.pool.stats()['health_check_failures'], 1)
+
+    def test_statement_timeout_set_and_reset(self):
+        with self.pool.connection(statement_timeout_ms=5000) as conn:
+            pass
+        sqls = [s for s, _ in conn.statements]
+        self.assertEqual(sqls[0], "SET statement_timeout = %s")
+        self.assertEqual(conn.statements[0][1], (5000,))
+        self.assertEqual(sqls[-1], "RESET statement_timeout")
+
+    def test_returned_connection_is_rolled_back(self):
+        conn = self.pool.getconn()
+        conn.autocommit = True
+        self.pool.putconn(conn)
+        self.assertGreaterEqual(conn.rollbacks, 1)
+        self.assertFalse(conn.autocommit)
+
+    def test_closeall(self):
+        with self.pool.connection():
+            pass
+        self.pool.closeall()
+        self.assertTrue(all(c.closed for c in self.opened))
+        with self.assertRaises(RuntimeError):
+            self.pool.getconn()
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(connect=FakeConnection, minconn=3, maxconn=2)
+
+
+class TestPoolSslMode(unittest.TestCase):
+    """get_pool(min_sslmode=...) must never hand out a weaker sslmode."""
+
+    def setUp(self):
+        self.addCleanup(setattr, db_config, 'PG_SSLMODE', db_config.PG_SSLMODE)
+        self.addCleanup(db_config._pools.clear)
+        db_config._pools.clear()
+
+    def test_require_enforced_when_env_unset(self):
+        db_config.PG_SSLMODE = None
+        self.assertIsNone(db_config._effective_sslmode())
+        self.assertEqual(db_config._effective_sslmode('require'), 'require')
+
+    def test_weaker_env_mode_is_raised(self):
+        db_config.PG_SSLMODE = 'prefer'
+        self.assertEqual(db_config._effective_sslmode('require'), 'require')
+
+    def test_stricter_env_mode_wins(self):
+        db_config.PG_SSLMODE = 'verify-full'
+        self.assertEqual(db_config._effective_sslmode('require'), 'verify-full')
+
+    def test_separate_pool_only_when_modes_differ(self):
+        db_config.PG_SSLMODE = None
+        self.assertIsNot(db_config.get_pool(), db_config.get_pool(min_sslmode='require'))
+        db_config._pools.clear()
+        db_config.PG_SSLMODE = 'require'
+        self.assertIs(db_config.get_pool(), db_config.get_pool(min_sslmode='require'))
+
+
+if __name__ == '__main__':
+    unittest.main()
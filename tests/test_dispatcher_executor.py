@@ -0,0 +1,198 @@
+"""
+Tests for the dispatcher's CollectorExecutor (priority lanes, per-host caps,
+de-duplication and metrics). Collector runs are stubbed — no DB or network.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.dispatcher import collector_registry
+from src.dispatcher.collector_registry import CollectorRegistry
+from src.dispatcher.collector_runner import CollectorRunner
+from src.dispatcher.executor import (
+    CollectorExecutor,
+    ExecutorConfig,
+    LANE_DEFAULT,
+    LANE_PRICE,
+)
+
+
+class _StubRegistry:
+    HOSTS = {
+        'ams_grain_settlement': 'https://www.ams.usda.gov/mnreports',
+        'usda_ams_cash_prices': 'https://marsapi.ams.usda.gov',
+        'nass_a': 'https://quickstats.nass.usda.gov/api',
+        'nass_b': 'https://quickstats.nass.usda.gov/api',
+        'nass_c': 'https://quickstats.nass.usda.gov/api',
+    }
+
+    def get_source_url(self, name):
+        return self.HOSTS.get(name)
+
+    def get_collector(self, name):
+        raise AssertionError("executor must not instantiate collectors to find their host")
+
+
+class _StubRunner:
+    def __init__(self, duration=0.05, gate=None):
+        self.registry = _StubRegistry()
+        self.duration = duration
+        self.gate = gate
+        self.order = []
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run_with_retry(self, collector_name, **kwargs):
+        if self.gate is not None:
+            self.gate.wait()
+        host = self.registry.HOSTS.get(collector_name, collector_name)
+        with self.lock:
+            self.order.append(collector_name)
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(self.duration)
+        with self.lock:
+            self.active[host] -= 1
+        return SimpleNamespace(success=True, collector_name=collector_name)
+
+
+class TestCollectorExecutor(unittest.TestCase):
+
+    def test_lane_assignment(self):
+        self.assertEqual(CollectorExecutor.lane_for('ams_grain_settlement'), LANE_PRICE)
+        self.assertEqual(CollectorExecutor.lane_for('futures_price_mark_bridge'), LANE_PRICE)
+        self.assertEqual(CollectorExecutor.lane_for('nass_grain_crush_pdf'), LANE_DEFAULT)
+
+    def test_price_lane_runs_first(self):
+        gate = threading.Event()
+        runner = _StubRunner(duration=0.01, gate=gate)
+        executor = CollectorExecutor(runner, ExecutorConfig(max_workers=1, price_workers=0))
+        try:
+            # Occupy the only worker, then queue slow loads ahead of a price feed
+            blocker = executor.submit('blocker')
+            time.sleep(0.05)
+            futures = [executor.submit(n, priority=1) for n in ('monthly_a', 'monthly_b')]
+            futures.append(executor.submit('ams_grain_settlement', priority=3))
+            gate.set()
+            for f in futures + [blocker]:
+                f.result(timeout=5)
+            self.assertEqual(runner.order[1], 'ams_grain_settlement')
+        finally:
+            executor.shutdown()
+
+    def test_host_limit(self):
+        runner = _StubRunner(duration=0.1)
+        executor = CollectorExecutor(runner, ExecutorConfig(max_workers=4, price_workers=0,
+                                                            host_limit=1))
+        try:
+            futures = [executor.submit(n) for n in ('nass_a', 'nass_b', 'nass_c')]
+            for f in futures:
+                f.result(timeout=5)
+            self.assertEqual(runner.peak[_StubRegistry.HOSTS['nass_a']], 1)
+        finally:
+            executor.shutdown()
+
+    def test_duplicate_submit_returns_same_future(self):
+        gate = threading.Event()
+        runner = _StubRunner(duration=0.01, gate=gate)
+        executor = CollectorExecutor(runner, ExecutorConfig(max_workers=2, price_workers=0))
+        try:
+            f1 = executor.submit('cftc_cot')
+            f2 = executor.submit('cftc_cot')
+            self.assertIs(f1, f2)
+            gate.set()
+            f1.result(timeout=5)
+            self.assertEqual(executor.stats()['deduplicated'], 1)
+            self.assertEqual(runner.order.count('cftc_cot'), 1)
+        finally:
+            executor.shutdown()
+
+    def test_stats(self):
+        runner = _StubRunner(duration=0.01)
+        executor = CollectorExecutor(runner, ExecutorConfig(max_workers=3, price_workers=1))
+        try:
+            futures = [executor.submit(n) for n in ('nass_a', 'usda_ams_cash_prices')]
+            for f in futures:
+                f.result(timeout=5)
+            time.sleep(0.05)
+            stats = executor.stats()
+            self.assertEqual(stats['completed'], 2)
+            self.assertEqual(stats['running'], 0)
+            self.assertEqual(stats['queue_depth'], {LANE_PRICE: 0, LANE_DEFAULT: 0})
+            self.assertIn('p95_s', stats['queue_wait'][LANE_PRICE])
+        finally:
+            executor.shutdown()
+
+    def test_cancel_pending_skips_queued_runs_and_retry_backoff(self):
+        runner = CollectorRunner(_StubRegistry())
+        attempts = []
+
+        def failing_attempt(collector_name, **kwargs):
+            attempts.append(collector_name)
+            return SimpleNamespace(success=False, collector_name=collector_name)
+
+        runner.run_collector = failing_attempt
+        executor = CollectorExecutor(runner, ExecutorConfig(max_workers=1, price_workers=0))
+        running = executor.submit('nass_a', retry_delay_minutes=15)
+        queued = executor.submit('nass_b')
+        deadline = time.monotonic() + 2
+        while not attempts and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        start = time.monotonic()
+        executor.shutdown(wait=True, cancel_pending=True)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertTrue(queued.cancelled())
+        self.assertFalse(running.result(timeout=1).success)
+        self.assertEqual(attempts, ['nass_a'])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ExecutorConfig(mode='fibers')
+
+
+@dataclass
+class _ExampleConfig:
+    source_name: str = 'Example'
+    source_url: str = 'https://api.example.gov/v1'
+
+
+class _AnnotatedCollector:
+    instances = 0
+
+    def __init__(self, config: Optional[_ExampleConfig] = None):
+        _AnnotatedCollector.instances += 1
+        self.config = config or _ExampleConfig()
+
+
+class TestRegistrySourceUrl(unittest.TestCase):
+
+    def test_source_url_read_from_config_class(self):
+        registry = CollectorRegistry()
+        entries = {'example': {'module': __name__, 'class': '_AnnotatedCollector'},
+                   'pinned': {'module': __name__, 'class': '_AnnotatedCollector',
+                              'source_url': 'https://pinned.example.gov'}}
+        with mock.patch.dict(collector_registry.COLLECTOR_MAP, entries):
+            self.assertEqual(registry.get_source_url('example'), 'https://api.example.gov/v1')
+            self.assertEqual(registry.get_source_url('pinned'), 'https://pinned.example.gov')
+            self.assertIsNone(registry.get_source_url('not_registered'))
+        self.assertEqual(_AnnotatedCollector.instances, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for the Document RAG ingestion pipeline against the stub embedding server.
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.document.document_rag import DocumentRAG, chunk_document
+from src.services.document.stub_embedding_server import StubEmbeddingServer
+
+
+def _write_docs(docs_dir: Path, count: int):
+    docs_dir.mkdir(parents=True)
+    for i in range(count):
+        body = ' '.join(f"Soybean crush margin note {i} sentence {j}." for j in range(60))
+        (docs_dir / f"note_{i}.md").write_text(f"# Note {i}\n\n{body}\n")
+
+
+class TestIngestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        _write_docs(self.root / 'docs', 6)
+        self.server = StubEmbeddingServer(dim=32, request_ms=5).start()
+        self.addCleanup(self.server.stop)
+
+    def _rag(self, **kwargs):
+        rag = DocumentRAG(self.root, self.server.url, parse_workers=2, **kwargs)
+        rag.index_dirs = [self.root / 'docs']
+        return rag
+
+    def _build(self, rag, force_rebuild=False):
+        async def run():
+            try:
+                return await rag.build_index(force_rebuild=force_rebuild)
+            finally:
+                await rag.close()
+        with patch('builtins.print'):
+            return asyncio.run(run())
+
+    def test_builds_index_with_batched_requests(self):
+        expected = sum(len(chunk_document(str(p))[1]) for p in (self.root / 'docs').glob('*.md'))
+        self.assertTrue(self._build(self._rag(batch_size=8, max_in_flight=3)))
+
+        rag = self._rag()
+        self.assertEqual(len(rag.store), expected)
+        self.assertEqual(rag.store.get_stats()['total_files'], 6)
+        self.assertEqual(self.server.texts, expected)
+        self.assertLess(self.server.requests, expected)
+        self.assertLessEqual(self.server.max_concurrent, 3)
+        rag.store.close()
+
+    def test_rerun_skips_unchanged_files(self):
+        self._build(self._rag())
+        texts = self.server.texts
+        self._build(self._rag())
+        self.assertEqual(self.server.texts, texts)
+
+    def test_interrupted_rebuild_resumes(self):
+        self._build(self._rag())
+        total = self.server.texts
+
+        # Rebuild where embedding fails for one file: the others are checkpointed
+        rag = self._rag()
+        original = rag.embedder.embed_batch
+
+        async def flaky(texts, batch_size):
+            if 'note 3 ' in texts[0]:
+                raise ConnectionError("server went away")
+            return await original(texts, batch_size)
+
+        rag.embedder.embed_batch = flaky
+        self._build(rag, force_rebuild=True)
+
+        rag = self._rag()
+        self.assertTrue(rag.store.file_needs_update(str(self.root / 'docs' / 'note_3.md'), 'x'))
+        self.assertEqual(rag.store.get_stats()['total_files'], 5)
+        rag.store.close()
+
+        before = self.server.texts
+        self._build(self._rag())
+        self.assertLess(self.server.texts - before, total)  # only note_3 re-embedded
+        rag = self._rag()
+        self.assertEqual(rag.store.get_stats()['total_files'], 6)
+        self.assertEqual(len(rag.store), total)
+        rag.store.close()
+
+    def test_falls_back_without_batch_endpoint(self):
+        self.server.batch_api = False
+        self._build(self._rag(batch_size=8))
+        self.assertEqual(self.server.requests, self.server.texts)
+
+    def test_search_finds_exact_chunk(self):
+        self._build(self._rag())
+        _, chunks = chunk_document(str(self.root / 'docs' / 'note_2.md'))
+
+        async def run(rag):
+            try:
+                return await rag.search(chunks[1]['content'], top_k=3)
+            finally:
+                await rag.close()
+        results = asyncio.run(run(self._rag()))
+        self.assertEqual(results[0].chunk.file_name, 'note_2.md')
+        self.assertEqual(results[0].chunk.chunk_index, 1)
+        self.assertAlmostEqual(results[0].score, 1.0, places=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Tests for the memory-mapped Document RAG vector index and the JSON migration.
+"""
+
+import json
+import math
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.document.vector_index import VectorIndex, migrate_json_index
+
+
+def _chunk(file_path, i, embedding, file_type='markdown'):
+    return SimpleNamespace(
+        doc_id=f"{file_path}:{i}", file_path=file_path, file_name=Path(file_path).name,
+        file_type=file_type, chunk_index=i, content=f"chunk {i} of {file_path}",
+        metadata={'i': i}, embedding=embedding,
+    )
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+class TestVectorIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name) / 'index'
+        rng = np.random.default_rng(7)
+        self.vectors = {
+            f: rng.normal(size=(4, 16)).tolist() for f in ('a.md', 'b.md', 'c.md')
+        }
+
+    def _build(self):
+        index = VectorIndex(self.dir)
+        for f, vecs in self.vectors.items():
+            index.add_chunks([_chunk(f, i, v) for i, v in enumerate(vecs)])
+            index.set_file_hash(f, f"hash-{f}")
+        index.save()
+        return index
+
+    def test_search_matches_brute_force(self):
+        index = self._build()
+        query = self.vectors['b.md'][2]
+        hits = index.search(query, top_k=5)
+
+        expected = sorted(
+            ((f, i, _cosine(query, v)) for f, vecs in self.vectors.items()
+             for i, v in enumerate(vecs)),
+            key=lambda t: t[2], reverse=True)[:5]
+        self.assertEqual([(c['file_path'], c['chunk_index']) for c, _ in hits],
+                         [(f, i) for f, i, _ in expected])
+        for (_, score), (_, _, want) in zip(hits, expected):
+            self.assertAlmostEqual(score, want, places=5)
+        self.assertEqual(hits[0][0]['metadata'], {'i': 2})
+        index.close()
+
+    def test_persists_and_tracks_hashes(self):
+        self._build().close()
+        index = VectorIndex(self.dir)
+        self.assertEqual(len(index), 12)
+        self.assertFalse(index.file_needs_update('a.md', 'hash-a.md'))
+        self.assertTrue(index.file_needs_update('a.md', 'changed'))
+        self.assertTrue(index.file_needs_update('new.md', 'x'))
+        index.close()
+
+    def test_remove_file_and_compact(self):
+        index = self._build()
+        index.remove_file('a.md')
+        hits = index.search(self.vectors['a.md'][0], top_k=12)
+        self.assertEqual(len(hits), 8)
+        self.assertNotIn('a.md', {c['file_path'] for c, _ in hits})
+
+        index.compact()
+        self.assertEqual(index.n_rows, 8)
+        self.assertEqual(index.emb_path.stat().st_size, 8 * 16 * 4)
+        top = index.search(self.vectors['c.md'][3], top_k=1)[0][0]
+        self.assertEqual((top['file_path'], top['chunk_index']), ('c.md', 3))
+        index.close()
+
+    def test_save_compacts_past_threshold(self):
+        index = self._build()
+        index.remove_file('a.md')
+        index.remove_file('b.md')
+        index.save()
+        self.assertEqual(index.get_stats()['tombstoned_rows'], 0)
+        self.assertEqual(index.n_rows, 4)
+        index.close()
+
+    def test_recovers_from_partial_append(self):
+        self._build().close()
+        with open(self.dir / 'embeddings.f32', 'ab') as f:
+            f.write(np.ones(16, dtype=np.float32).tobytes())
+        index = VectorIndex(self.dir)
+        self.assertEqual(index.emb_path.stat().st_size, 12 * 16 * 4)
+        self.assertEqual(len(index.search(self.vectors['a.md'][0], top_k=50)), 12)
+        index.close()
+
+    def test_recovers_from_crash_before_first_commit(self):
+        index = VectorIndex(self.dir)
+        db = index.db
+        index.db = mock.Mock(wraps=db)
+        index.db.commit.side_effect = sqlite3.OperationalError('simulated crash')
+        with self.assertRaises(sqlite3.OperationalError):
+            index.add_chunks([_chunk('a.md', i, v) for i, v in enumerate(self.vectors['a.md'])])
+        db.close()
+
+        index = VectorIndex(self.dir)
+        self.assertIsNone(index.dim)
+        self.assertEqual(index.emb_path.stat().st_size, 0)
+        for f in ('b.md', 'c.md'):
+            index.add_chunks([_chunk(f, i, v) for i, v in enumerate(self.vectors[f])])
+        for file_path in ('b.md', 'c.md'):
+            for i, vec in enumerate(self.vectors[file_path]):
+                top, score = index.search(vec, top_k=1)[0]
+                self.assertEqual((top['file_path'], top['chunk_index']), (file_path, i))
+                self.assertAlmostEqual(score, 1.0, places=5)
+        index.close()
+
+    def test_recovers_from_crash_between_remap_and_swap(self):
+        index = self._build()
+        index.remove_file('a.md')
+        with mock.patch('src.services.document.vector_index.os.replace',
+                        side_effect=OSError('simulated crash')):
+            with self.assertRaises(OSError):
+                index.compact()
+        index.db.close()
+
+        index = VectorIndex(self.dir)
+        self.assertEqual(index.n_rows, 8)
+        self.assertEqual(index.emb_path.stat().st_size, 8 * 16 * 4)
+        self.assertFalse(index._compact_tmp_path().exists())
+        for file_path in ('b.md', 'c.md'):
+            for i, vec in enumerate(self.vectors[file_path]):
+                top = index.search(vec, top_k=1)[0][0]
+                self.assertEqual((top['file_path'], top['chunk_index']), (file_path, i))
+        index.close()
+
+    def test_discards_compaction_that_never_committed(self):
+        index = self._build()
+        index.remove_file('a.md')
+        index.db.commit()
+        index._compact_tmp_path().write_bytes(b'partial')
+        index.close()
+
+        index = VectorIndex(self.dir)
+        self.assertFalse(index._compact_tmp_path().exists())
+        self.assertEqual(index.n_rows, 12)
+        top = index.search(self.vectors['c.md'][3], top_k=1)[0][0]
+        self.assertEqual((top['file_path'], top['chunk_index']), ('c.md', 3))
+        index.close()
+
+    def test_dimension_mismatch(self):
+        index = self._build()
+        with self.assertRaises(ValueError):
+            index.add_chunks([_chunk('d.md', 0, [1.0, 2.0])])
+        index.close()
+
+    def test_empty_index(self):
+        index = VectorIndex(self.dir)
+        self.assertEqual(index.search([1.0, 0.0], top_k=3), [])
+        self.assertEqual(index.get_stats()['total_chunks'], 0)
+        index.close()
+
+
+class TestMigration(unittest.TestCase):
+
+    def test_migrate_json_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = Path(tmp) / 'document_index.json'
+            chunks = [vars(_chunk('x.xlsx', i, [float(i), 1.0, 0.0], 'excel')) for i in range(3)]
+            legacy.write_text(json.dumps({
+                'chunks': chunks,
+                'file_hashes': {'x.xlsx': 'abc'},
+                'updated_at': '2025-01-01T00:00:00',
+            }))
+            stats = migrate_json_index(legacy, Path(tmp) / 'index')
+            self.assertEqual(stats['total_chunks'], 3)
+            self.assertEqual(stats['total_files'], 1)
+            self.assertEqual(stats['chunks_by_type'], {'excel': 3})
+
+            index = VectorIndex(Path(tmp) / 'index')
+            self.assertFalse(index.file_needs_update('x.xlsx', 'abc'))
+            self.assertEqual(index.search([2.0, 1.0, 0.0], top_k=1)[0][0]['chunk_index'], 2)
+            index.close()
+
+            with self.assertRaises(ValueError):
+                migrate_json_index(legacy, Path(tmp) / 'index')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+"""
+Tests for FeedstockAllocator batch mode (src/engines/feedstock_allocation/allocator.py):
+range panels must reproduce the month-by-month loads, and batch allocations
+must match allocate_month. The database is a fake cursor answering both the
+per-month and the panel queries from the same in-memory tables.
+"""
+
+import importlib
+import sys
+import unittest
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import margin_model_stub
+
+MARGIN_MODEL = 'src.engines.feedstock_allocation.margin_model'
+alloc_mod = None
+
+
+def setUpModule():
+    # margin_model is not present in every checkout: stand in for it while this
+    # module runs; patch.dict drops the stub and the allocator bound to it after
+    global alloc_mod
+    modules = {}
+    try:
+        importlib.import_module(MARGIN_MODEL)
+    except ImportError:
+        modules[MARGIN_MODEL] = margin_model_stub
+    patcher = mock.patch.dict(sys.modules, modules)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+    alloc_mod = importlib.import_module('src.engines.feedstock_allocation.allocator')
+
+PERIODS = [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+
+FACILITIES = [
+    dict(facility_id=1, company='A', facility_name='A RD', state='TX', padd='PADD3',
+         fuel_type='renewable_diesel', technology='hefa', year_online=2019,
+         eligible_feedstocks=['SBO', 'DCO', 'BFT'], primary_feedstock='SBO', feedstock_mix=None),
+    dict(facility_id=2, company='B', facility_name='B BD', state='IA', padd='PADD2',
+         fuel_type='biodiesel', technology=None, year_online=2008,
+         eligible_feedstocks=None, primary_feedstock='SBO', feedstock_mix=None),
+    dict(facility_id=3, company='C', facility_name='C RD', state='CA', padd='PADD5',
+         fuel_type='renewable_diesel', technology='hefa', year_online=2024,
+         eligible_feedstocks=['UCO', 'SBO', 'CO'], primary_feedstock='UCO', feedstock_mix=None),
+    dict(facility_id=4, company='D', facility_name='D SAF', state='IL', padd='PADD2',
+         fuel_type='saf', technology='hefa', year_online=2020,
+         eligible_feedstocks=['SBO'], primary_feedstock='SBO', feedstock_mix=None),
+]
+HISTORY = [  # facility_id, effective_date, nameplate_mmgy, status
+    (1, date(2020, 1, 1), 300.0, 'operating'),
+    (2, date(2019, 1, 1), 60.0, 'operating'),
+    (2, date(2024, 2, 1), 60.0, 'idle'),
+    (3, date(2024, 3, 1), 120.0, 'under_construction'),
+    (4, date(2018, 1, 1), 0.0, 'operating'),
+]
+SUPPLY = [  # period, code, region, available, price
+    (PERIODS[0], 'SBO', 'PADD2', 500.0, 0.45), (PERIODS[0], 'SBO', 'PADD3', 150.0, 0.46),
+    (PERIODS[0], 'DCO', 'PADD3', 60.0, 0.38), (PERIODS[0], 'BFT', 'PADD3', 80.0, 0.40),
+    (PERIODS[0], 'UCO', 'PADD5', 90.0, 0.41), (PERIODS[0], 'DCO', 'PADD2', 200.0, 0.37),
+    (PERIODS[1], 'SBO', 'PADD2', 450.0, 0.47), (PERIODS[1], 'SBO', 'PADD3', 100.0, 0.48),
+    (PERIODS[1], 'DCO', 'PADD3', 70.0, 0.36), (PERIODS[1], 'UCO', 'PADD5', 80.0, 0.42),
+]
+FEEDSTOCK_PRICES = [  # code, region, date, price_per_lb
+    ('SBO', 'central_il', date(2023, 12, 15), 45.0),
+    ('SBO', 'central_il', date(2024, 2, 20), 0.47),
+    ('SBO', 'central_il', date(2024, 2, 27), 0.0),
+    ('UCO', 'il_wi', date(2024, 1, 10), 0.41),
+    ('CO', 'central_us', date(2024, 3, 5), 0.55),
+    ('BFT', 'chicago', date(2023, 11, 1), 0.43),
+]
+CREDIT_PRICES = [  # frequency, date, d4_rin, lcfs_ca
+    ('weekly', date(2023, 12, 29), 110.0, None),
+    ('weekly', date(2024, 2, 16), None, 0.60),
+    ('monthly', date(2024, 1, 1), 120.0, 0.55),
+]
+FUEL_PRICES = [  # date, b100_upper_midwest, rd_california
+    (date(2023, 12, 20), 4.2, 3.9),
+    (date(2024, 2, 28), None, 4.0),
+]
+TALLOW_BALANCE = {PERIODS[0]: 700e6}
+EIA_TALLOW = [  # year, month, sheet, quantity
+    (2024, 2, 'table_2b', 300.0), (2024, 2, 'table_2c', 250.0), (2024, 2, 'old_table3', 999.0),
+    (2024, 3, 'old_table3', 400.0),
+]
+FORECASTS = {PERIODS[1]: {'renewable_diesel': 25.0}}
+
+
+def _lookback(rows, last, first):
+    """Rows dated <= last and >= the latest date at/before first (emulates the COALESCE bound)."""
+    before = [r[0] for r in rows if r[0] <= first]
+    lower = max(before) if before else first
+    return [r for r in rows if lower <= r[0] <= last]
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.connection = db
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, args):
+        self.db.inserted.append(tuple(args))
+        return b'(row)'
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if isinstance(sql, bytes):
+            self.db.bulk.append(sql)
+            return
+        if 'reference.biofuel_facilities' in sql:
+            (period,) = params
+            rows = []
+            for fac in FACILITIES:
+                hist = sorted(h for h in HISTORY if h[0] == fac['facility_id'] and h[1] <= period)
+                for h in hist[-1:] if 'JOIN LATERAL' in sql else hist:
+                    rows.append(dict(fac, effective_date=h[1], nameplate_mmgy=h[2], status=h[3]))
+            if 'JOIN LATERAL' in sql:
+                rows = [r for r in rows if r['status'] in ('operating', 'under_construction')
+                        and r['nameplate_mmgy'] > 0]
+                rows.sort(key=lambda r: -r['nameplate_mmgy'])
+            self._rows = rows
+        elif 'silver.feedstock_supply' in sql:
+            periods = params[0] if 'ANY' in sql else [params[0]]
+            self._rows = [dict(period=p, feedstock_code=c, region=r, net_available_biofuel=a,
+                               avg_price_per_lb=px)
+                          for p, c, r, a, px in SUPPLY if p in periods]
+        elif 'bronze.feedstock_prices' in sql:
+            if 'unnest' in sql:
+                codes, regions, last, first, _ = params
+                rows = []
+                for pair in zip(codes, regions):
+                    series = [(d, px) for c, r, d, px in FEEDSTOCK_PRICES if (c, r) == pair and px > 0]
+                    rows += [dict(feedstock_code=pair[0], region=pair[1], price_date=d, price_per_lb=px)
+                             for d, px in _lookback(series, last, first)]
+            else:
+                code, region, period = params
+                series = sorted((d, px) for c, r, d, px in FEEDSTOCK_PRICES
+                                if (c, r) == (code, region) and d <= period and px > 0)
+                rows = [dict(price_per_lb=px) for d, px in series[::-1]]
+            self._rows = rows
+        elif 'bronze.credit_prices' in sql:
+            if 'COALESCE' in sql:
+                last, first, _ = params
+                rows = []
+                for freq in ('monthly', 'weekly'):
+                    series = [(d, rin, lcfs) for f, d, rin, lcfs in CREDIT_PRICES if f == freq]
+                    rows += [dict(frequency=freq, price_date=d, d4_rin=rin, lcfs_ca=lcfs)
+                             for d, rin, lcfs in _lookback(series, last, first)]
+            else:
+                period, freq = params
+                series = sorted((d, rin, lcfs) for f, d, rin, lcfs in CREDIT_PRICES
+                                if f == freq and d <= period)
+                rows = [dict(d4_rin=rin, lcfs_ca=lcfs) for d, rin, lcfs in series[::-1]]
+            self._rows = rows
+        elif 'bronze.fuel_prices' in sql:
+            if 'COALESCE' in sql:
+                last, first, _ = params
+                series = _lookback(FUEL_PRICES, last, first)
+            else:
+                series = [r for r in FUEL_PRICES if r[0] <= params[0]][::-1]
+            self._rows = [dict(price_date=d, b100_upper_midwest=b, rd_california=rd)
+                          for d, b, rd in series]
+        elif 'silver.tallow_balance' in sql:
+            periods = params[0] if 'ANY' in sql else [params[0]]
+            self._rows = [dict(period=p, value_lbs=v) for p, v in TALLOW_BALANCE.items() if p in periods]
+        elif 'bronze.eia_feedstock_monthly' in sql:
+            if 'unnest' in sql:
+                years, months, sheets = params
+                months = set(zip(years, months))
+            else:
+                year, month, *sheets = params
+                months = {(year, month)}
+            self._rows = [dict(year=y, month=m, source_sheet=s, quantity_mil_lbs=q)
+                          for y, m, s, q in EIA_TALLOW if (y, m) in months and s in sheets]
+        elif 'silver.fuel_production_forecast' in sql:
+            periods = params[0] if 'ANY' in sql else [params[0]]
+            self._rows = [dict(period=p, fuel_type=ft, production_mmgal=v)
+                          for p, fc in FORECASTS.items() if p in periods for ft, v in fc.items()]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeDB:
+    encoding = 'UTF8'
+
+    def __init__(self):
+        self.statements = []
+        self.bulk = []
+        self.inserted = []
+        self.commits = 0
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class TestAllocatorBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        patcher = mock.patch('src.services.database.db_config.get_connection', self.db.connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.allocator = alloc_mod.FeedstockAllocator()
+
+    def test_panels_match_monthly_loads(self):
+        panel = self.allocator.load_range_inputs(PERIODS[0], PERIODS[-1], self.db.connection)
+        self.assertEqual(len(self.db.statements), 8)
+        self.assertEqual(list(panel), PERIODS)
+        for period in PERIODS:
+            self.assertEqual(panel[period], self.allocator.load_month_inputs(period), period)
+
+        jan, feb, mar = (panel[p] for p in PERIODS)
+        self.assertEqual([f.facility_id for f in jan.facilities], [1, 2])
+        self.assertEqual([f.facility_id for f in mar.facilities], [1, 3])
+        self.assertEqual((jan.prices['rin_d4_cents'], mar.prices['lcfs_per_gal']), (110.0, 0.60))
+        self.assertEqual((jan.tallow_guardrail, feb.tallow_guardrail, mar.tallow_guardrail),
+                         (700.0, 550.0, 400.0))
+        self.assertEqual(mar.supply[('SBO', 'PADD2')].price_per_lb, 0.47)   # estimated month
+        self.assertEqual(feb.forecasts, {'renewable_diesel': 25.0})
+
+    def test_production_forecasts_read_by_column(self):
+        # get_connection yields RealDictCursor rows, so positional access would
+        # fail and be swallowed as "no forecasts"
+        self.assertEqual(self.allocator.load_production_forecasts(PERIODS[1]),
+                         {'renewable_diesel': 25.0})
+        self.assertEqual(self.allocator.load_production_forecasts(PERIODS[0]), {})
+
+        inputs = self.allocator.load_month_inputs(PERIODS[1])
+        self.allocator.distribute_production_forecasts(inputs.facilities, inputs.forecasts, PERIODS[1])
+        rd = [f for f in inputs.facilities if f.fuel_type == 'renewable_diesel']
+        self.assertAlmostEqual(sum(f._implied_monthly_gal for f in rd), 25.0)
+
+    def test_batch_matches_allocate_month(self):
+        batch = self.allocator.run_batch(PERIODS[0], PERIODS[-1], ['base'], save=False,
+                                         workers=1, connection_fn=self.db.connection)
+        for period in PERIODS:
+            expected = self.allocator.allocate_month(period)
+            self.assertTrue(expected)
+            self.assertEqual(batch[(period, 'base')], expected, period)
+
+    def test_process_pool_scenarios_match_serial(self):
+        scenarios = {'base': {}, 'high_sbo': {'feedstock_price_mult': {'SBO': 1.5}},
+                     'low_rin': {'prices': {'rin_d4_cents': 40}}}
+        serial = self.allocator.run_batch(PERIODS[0], PERIODS[-1], scenarios, save=False,
+                                          workers=1, connection_fn=self.db.connection)
+        parallel = self.allocator.run_batch(PERIODS[0], PERIODS[-1], scenarios, save=False,
+                                            workers=3, connection_fn=self.db.connection)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(parallel), len(PERIODS) * len(scenarios))
+
+        def sbo_lbs(scenario):
+            return sum(r.allocated_mil_lbs for (_, name), results in parallel.items()
+                       if name == scenario for r in results if r.feedstock_code == 'SBO')
+        self.assertLess(sbo_lbs('high_sbo'), sbo_lbs('base'))
+        self.assertEqual(self.allocator.allocate_month(PERIODS[1], 'low_rin', scenarios['low_rin']),
+                         parallel[(PERIODS[1], 'low_rin')])
+
+    def test_save_batch_is_one_bulk_transaction(self):
+        with mock.patch.object(alloc_mod.FeedstockAllocator, '_write_to_eia_data') as sync:
+            results = self.allocator.run_batch(PERIODS[0], PERIODS[-1], ['base', 'alt'], save=True,
+                                               workers=1, connection_fn=self.db.connection)
+        sync.assert_called_once()
+        self.assertEqual(self.db.commits, 1)
+
+        n_results = sum(len(r) for r in results.values())
+        alloc_rows = [row for row in self.db.inserted if len(row) == len(alloc_mod.ALLOCATION_COLUMNS)]
+        self.assertEqual(len(alloc_rows), n_results)
+        self.assertEqual(len({(row[0], row[2], row[1]) for row in alloc_rows}), len(PERIODS) * 2)
+        # Every month has a tallow guardrail: 2 implied-value + 2 detail rows per run
+        self.assertEqual(len(self.db.inserted) - n_results, len(PERIODS) * 2 * 4)
+        self.assertEqual(len(self.db.bulk), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the indexed allocation core in src/engines/feedstock_allocation/allocator.py:
+it must reproduce the per-pair core on a synthetic month while calling the
+credit resolver and margin calculator once per distinct key instead of per pair.
+"""
+
+import copy
+import importlib
+import random
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import margin_model_stub
+
+MARGIN_MODEL = 'src.engines.feedstock_allocation.margin_model'
+alloc_mod = None
+
+
+def setUpModule():
+    # margin_model is not present in every checkout: stand in for it while this
+    # module runs; patch.dict drops the stub and the allocator bound to it after
+    global alloc_mod
+    modules = {}
+    try:
+        importlib.import_module(MARGIN_MODEL)
+    except ImportError:
+        modules[MARGIN_MODEL] = margin_model_stub
+    patcher = mock.patch.dict(sys.modules, modules)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+    alloc_mod = importlib.import_module('src.engines.feedstock_allocation.allocator')
+
+PADDS = {'PADD2': ['IA', 'IL', ''], 'PADD3': ['TX', 'LA'], 'PADD5': ['CA', 'WA']}
+CODES = ['SBO', 'DCO', 'UCO', 'EBFT', 'IBFT', 'CO']
+FUEL_TECH = [('biodiesel', 'transesterification'), ('renewable_diesel', 'hefa'),
+             ('saf', 'hefa'), ('coprocessing', 'coprocessing')]
+
+
+def _month(n=150, seed=11):
+    rng = random.Random(seed)
+    facilities = []
+    for i in range(n):
+        fuel_type, technology = rng.choice(FUEL_TECH)
+        padd = rng.choice(list(PADDS))
+        r = rng.random()
+        if r < 0.15:
+            eligible = []                                   # falls back to every tech feedstock
+        elif r < 0.25:
+            eligible = ['OTHER', 'SBO', 'SBO']              # ignored code, duplicate pair
+        else:
+            eligible = rng.sample(CODES, rng.randint(1, 4))
+        facilities.append(alloc_mod.Facility(
+            facility_id=i + 1 if i != 40 else 7,            # one facility_id shared by two rows
+            company='Co', facility_name=f'Plant {i}', state=rng.choice(PADDS[padd]),
+            padd=padd, fuel_type=fuel_type, technology=technology,
+            nameplate_mmgy=float(rng.choice([30, 60, 60, 120, 250])),   # ties in need and margin
+            status='operating', year_online=rng.choice([2010, 2024, 2025]),
+            eligible_feedstocks=eligible,
+        ))
+    supply = {}
+    for code in CODES:
+        for padd in PADDS:
+            supply[(code, padd)] = alloc_mod.RegionalSupply(
+                feedstock_code=code, region=padd,
+                available_mil_lbs=0.0 if (code, padd) == ('CO', 'PADD3') else rng.uniform(20, 400),
+                price_per_lb=rng.choice([0.38, 0.41, 0.45, 0.52]),
+            )
+    prices = {'rin_d4_cents': 105.0, 'lcfs_per_gal': 0.62, 'ulsd': 2.45, 'b100': 4.35}
+    return alloc_mod.MonthInputs(period=date(2025, 1, 1), facilities=facilities,
+                                 supply=supply, prices=prices)
+
+
+class TestIndexedCore(unittest.TestCase):
+
+    def _run(self, indexed, inputs):
+        inputs = copy.deepcopy(inputs)
+        allocator = alloc_mod.FeedstockAllocator(indexed=indexed)
+        return allocator, allocator.allocate_inputs(inputs), inputs.supply
+
+    def assertSameAllocation(self, expected, got):
+        self.assertEqual(len(got), len(expected))
+        for x, y in zip(expected, got):
+            self.assertEqual((y.facility_id, y.feedstock_code, y.constraint_binding, y.margin_rank),
+                             (x.facility_id, x.feedstock_code, x.constraint_binding, x.margin_rank))
+            for attr in ('allocated_mil_lbs', 'allocated_mil_gal', 'pct_of_facility',
+                         'feedstock_cost_lb', 'margin_per_gal'):
+                self.assertAlmostEqual(getattr(y, attr), getattr(x, attr), places=9, msg=attr)
+
+    def test_matches_per_pair_core(self):
+        for seed in (11, 12, 13):
+            inputs = _month(seed=seed)
+            _, expected, expected_supply = self._run(False, inputs)
+            _, got, got_supply = self._run(True, inputs)
+            self.assertTrue(expected)
+            self.assertSameAllocation(expected, got)
+            self.assertIn('supply', {r.constraint_binding for r in got})
+            for key, regional in expected_supply.items():
+                self.assertAlmostEqual(got_supply[key].consumed_mil_lbs,
+                                       regional.consumed_mil_lbs, places=9)
+
+    def test_per_pair_core_is_the_default(self):
+        # The indexed core is opt-in until it is faster than the per-pair core
+        with mock.patch.object(alloc_mod.FeedstockAllocator, '_allocate_indexed') as indexed:
+            self.assertTrue(alloc_mod.FeedstockAllocator().allocate_inputs(_month(n=20)))
+        indexed.assert_not_called()
+
+    def test_diversification_cap_matches(self):
+        config = alloc_mod.AllocationConfig(max_single_feedstock_pct=0.5)
+        inputs = _month(n=40, seed=5)
+        runs = []
+        for indexed in (False, True):
+            allocator = alloc_mod.FeedstockAllocator(config, indexed=indexed)
+            runs.append(allocator.allocate_inputs(copy.deepcopy(inputs)))
+        self.assertSameAllocation(*runs)
+        self.assertTrue(all(r.pct_of_facility <= 0.5 + 1e-9 for r in runs[1]))
+
+    def test_facility_specific_margin_terms(self):
+        inputs = _month(n=60, seed=3)
+        runs = []
+        for indexed in (False, True):
+            allocator = alloc_mod.FeedstockAllocator(indexed=indexed)
+            calculate = allocator.margin_calc.calculate
+
+            def site_adjusted(**kwargs):
+                margin = calculate(**kwargs)
+                margin.margin_per_gal += 0.05 * (kwargs['facility_id'] % 5)
+                return margin
+
+            with mock.patch.object(allocator.margin_calc, 'calculate', side_effect=site_adjusted):
+                runs.append(allocator.allocate_inputs(copy.deepcopy(inputs)))
+        self.assertSameAllocation(*runs)
+
+    def test_credit_stacks_and_margins_memoized(self):
+        inputs = _month()
+        allocator = alloc_mod.FeedstockAllocator(indexed=True)
+        credit_keys = {(f.fuel_type, f.padd == 'PADD5', f.state or None) for f in inputs.facilities}
+        with mock.patch.object(allocator.credit_resolver, 'build_credit_stack',
+                               wraps=allocator.credit_resolver.build_credit_stack) as credits, \
+                mock.patch.object(allocator.margin_calc, 'calculate',
+                                  wraps=allocator.margin_calc.calculate) as calculate:
+            allocator.allocate_inputs(copy.deepcopy(inputs))
+        self.assertLessEqual(credits.call_count, len(credit_keys))
+        self.assertLess(credits.call_count, len(inputs.facilities) / 3)
+
+        pairs = []
+        for f in inputs.facilities:
+            eligible = f.eligible_feedstocks or list(alloc_mod.CONVERSION_RATES.get(f.technology, {}))
+            pairs.extend((f.facility_id, f.fuel_type, f.technology, f.padd, f.state or None, code)
+                         for code in eligible
+                         if code != 'OTHER' and inputs.supply.get((code, f.padd))
+                         and inputs.supply[(code, f.padd)].available_mil_lbs > 0)
+        # One calculate() per distinct set of arguments; only duplicate pairs share one
+        self.assertEqual(calculate.call_count, len(set(pairs)))
+        self.assertLess(calculate.call_count, len(pairs))
+
+
+if __name__ == '__main__':
+    unittest.main()
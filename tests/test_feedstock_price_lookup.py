@@ -0,0 +1,150 @@
+"""
+Tests for the as-of price lookup (src/reports/feedstock_report/price_lookup.py)
+and the price dashboard built on it. Fake DB-API connection; no database.
+"""
+
+import sys
+import unittest
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.reports.feedstock_report import data_pack
+from src.reports.feedstock_report.price_lookup import PriceLookup, PriceSeries, series_key
+
+WEEK = date(2026, 5, 22)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.statements.append((sql, params))
+        if 'feedstock_prices_consolidated' in sql:
+            codes, fs, regions, start, end = params
+            wanted = set(zip(fs, regions))
+            self._rows = [r for r in self.db.feedstock
+                          if r['feedstock_code'] in codes
+                          and (r['feedstock_code'], r['region']) in wanted
+                          and start <= r['price_date'] <= end]
+            self._rows.sort(key=lambda r: (r['feedstock_code'], r['region'], r['price_date']))
+        else:
+            table = 'fuel' if 'fuel_prices' in sql else 'credit'
+            start, end = params
+            self._rows = [r for r in self.db.wide[table] if start <= r['price_date'] <= end]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeDB:
+    def __init__(self):
+        self.statements = []
+        self.feedstock = []
+        self.wide = {'fuel': [], 'credit': []}
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def _weekly(n, start=WEEK, step=1.0, base=100.0):
+    """n weekly (date, value) pairs ending at start, oldest first."""
+    return [(start - timedelta(weeks=n - 1 - i), base + step * i) for i in range(n)]
+
+
+class TestPriceSeries(unittest.TestCase):
+
+    def test_as_of_and_range(self):
+        s = PriceSeries()
+        for d, v in [(date(2026, 1, 2), 1.0), (date(2026, 1, 9), 3.0), (date(2026, 1, 16), 2.0)]:
+            s.append(d, v, 'ams')
+        self.assertIsNone(s.as_of(date(2026, 1, 1)))
+        self.assertEqual(s.as_of(date(2026, 1, 9)).value, 3.0)
+        self.assertEqual(s.as_of(date(2026, 1, 12)).date, date(2026, 1, 9))
+        self.assertEqual(s.range(date(2026, 1, 3), date(2026, 1, 16)), (2.0, 3.0))
+        self.assertIsNone(s.range(date(2026, 1, 10), date(2026, 1, 15)))
+
+    def test_duplicate_date_keeps_last(self):
+        s = PriceSeries()
+        s.append(date(2026, 1, 2), 1.0, 'fastmarkets')
+        s.append(date(2026, 1, 2), 1.5, 'ams')
+        self.assertEqual((s.as_of(date(2026, 1, 2)).value, s.as_of(date(2026, 1, 2)).source),
+                         (1.5, 'ams'))
+
+
+class TestPriceLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        for d, v in _weekly(60):
+            self.db.feedstock.append({'feedstock_code': 'SBO', 'region': 'iowa',
+                                      'price_date': d, 'price_per_lb': v, 'source': 'ams'})
+            # Same code, region not requested: must not leak in
+            self.db.feedstock.append({'feedstock_code': 'SBO', 'region': 'brazil',
+                                      'price_date': d, 'price_per_lb': 1.0, 'source': 'x'})
+        for d, v in _weekly(60, step=0.01, base=1.0):
+            self.db.wide['credit'].append({'price_date': d, 'source': 'emts',
+                                           'd4_rin': v, 'd6_rin': None})
+
+    def test_one_query_per_table(self):
+        keys = [('feedstock', 'SBO', 'iowa'), ('credit', 'd4_rin'), ('credit', 'd6_rin')]
+        lookup = PriceLookup.load(keys, end_date=WEEK, connection_fn=self.db.connection)
+        self.assertEqual(lookup.queries, 2)
+        self.assertIn('ANY(%s)', self.db.statements[0][0])
+        self.assertEqual(len(lookup.get(('feedstock', 'SBO', 'iowa')).dates), 54)
+        self.assertEqual(lookup.get(('credit', 'd6_rin')).dates, [])
+        self.assertEqual(lookup.as_of(('feedstock', 'SBO', 'iowa'), WEEK).value, 159.0)
+        self.assertEqual(lookup.pct_change(('feedstock', 'SBO', 'iowa'), WEEK, 1),
+                         round(1 / 158 * 100, 2))
+        self.assertEqual(lookup.range(('feedstock', 'SBO', 'iowa'), WEEK, 52), (107.0, 159.0))
+
+    def test_rejects_bad_column(self):
+        with self.assertRaises(ValueError):
+            PriceLookup.load([('fuel', 'ulsd_gulf; DROP TABLE x')], end_date=WEEK,
+                             connection_fn=self.db.connection)
+
+    def test_dashboard_matches_per_entry_semantics(self):
+        original = data_pack.PRICE_DASHBOARD
+        data_pack.PRICE_DASHBOARD = [
+            {'group': 'g', 'product': 'Soybean Oil', 'location': 'Iowa',
+             'source_table': 'feedstock', 'fs': 'SBO', 'region': 'iowa'},
+            {'group': 'g', 'product': 'Soybean Oil', 'location': 'Brazil',
+             'source_table': 'feedstock', 'fs': 'SBO', 'region': 'brazil', 'is_placeholder': True},
+            {'group': 'g', 'product': 'D4 RIN', 'location': 'EMTS', 'source_table': 'credit', 'col': 'd4_rin'},
+            {'group': 'g', 'product': 'D6 RIN', 'location': 'EMTS', 'source_table': 'credit', 'col': 'd6_rin'},
+        ]
+        self.addCleanup(setattr, data_pack, 'PRICE_DASHBOARD', original)
+
+        live = [e for e in data_pack.PRICE_DASHBOARD if not e.get('is_placeholder')]
+        lookup = PriceLookup.load([series_key(e) for e in live], end_date=WEEK,
+                                  connection_fn=self.db.connection)
+        rows = data_pack.build_price_dashboard(WEEK, lookup=lookup)
+
+        sbo, placeholder, d4, d6 = rows
+        self.assertEqual((sbo.weekly_avg, sbo.unit, sbo.source), (159.0, '$/lb', 'ams'))
+        self.assertEqual(sbo.mom_change_pct, round((159 - 155) / 155 * 100, 2))
+        self.assertEqual(sbo.yoy_change_pct, round((159 - 107) / 107 * 100, 2))
+        self.assertEqual((sbo.range_52w_low, sbo.range_52w_high), (107.0, 159.0))
+        self.assertEqual(placeholder.source, 'placeholder')
+        self.assertEqual(d4.unit, '$/credit')
+        self.assertAlmostEqual(d4.weekly_avg, 1.59)
+        self.assertEqual(d6.source, 'no_data')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+"""
+Tests for gridded forecast aggregation (src/agents/collectors/global/forecast_grid.py)
+and the GFS/GEFS collectors built on it. Grids are small synthetic arrays;
+the NetCDF round trip runs only where xarray and a NetCDF backend exist.
+"""
+
+import importlib
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 'global' is a Python keyword, so load the package modules by string.
+forecast_grid = importlib.import_module("src.agents.collectors.global.forecast_grid")
+gefs = importlib.import_module("src.agents.collectors.global.gefs_ensemble_collector")
+gfs = importlib.import_module("src.agents.collectors.global.gfs_forecast_collector")
+
+RUN = date(2026, 6, 1)
+LATS = np.arange(60.0, 29.0, -2.0)            # north to south, like GRIB
+LONS = np.arange(0.0, 360.0, 2.0)             # 0..358 east, like GFS/GEFS
+BOUNDS = {
+    'US_CORN_BELT': (38, 48, -98, -82),
+    'EU_FRANCE': (44, 50, -2, 8),              # straddles the prime meridian
+    'AU_EASTERN': (-36, -26, 144, 152),        # not on this grid
+}
+
+
+def _member_grid(seed, days=8):
+    """6-hourly steps from run+6h through run+days+1 with smooth random fields."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64(datetime.combine(RUN, datetime.min.time()), 's')
+    times = start + np.arange(6, 24 * (days + 1) + 1, 6) * np.timedelta64(1, 'h')
+    n = len(times)
+    shape = (n, LATS.size, LONS.size)
+    base = 15 + 10 * np.cos(np.deg2rad(LATS))[None, :, None] + rng.normal(0, 3, shape)
+    return forecast_grid.GridFields(
+        lats=LATS, lons=((LONS + 180) % 360) - 180, valid_times=times,
+        fields={
+            'tmax': base + 8, 'tmin': base - 8,
+            'precip': np.clip(rng.gamma(0.4, 4.0, shape) - 1, 0, None),
+        },
+    )
+
+
+def _brute_region_mean(field2d, bounds):
+    lons = ((LONS + 180) % 360) - 180
+    num = den = 0.0
+    for i, lat in enumerate(LATS):
+        for j, lon in enumerate(lons):
+            if bounds[0] <= lat <= bounds[1] and bounds[2] <= lon <= bounds[3]:
+                if not np.isnan(field2d[i, j]):
+                    w = np.cos(np.deg2rad(lat))
+                    num += w * field2d[i, j]
+                    den += w
+    return num / den if den else np.nan
+
+
+class TestGridReductions(unittest.TestCase):
+
+    def test_region_means_match_cell_loop(self):
+        rng = np.random.default_rng(0)
+        field = rng.normal(0, 1, (3, LATS.size, LONS.size))
+        field[1, 5, :] = np.nan
+        regions = forecast_grid.RegionGrid(LATS, ((LONS + 180) % 360) - 180, BOUNDS)
+        means, coverage = regions.reduce(field)
+        self.assertEqual(means.shape, (3, 3))
+        for t in range(3):
+            for r, code in enumerate(BOUNDS):
+                expected = _brute_region_mean(field[t], BOUNDS[code])
+                if np.isnan(expected):
+                    self.assertTrue(np.isnan(means[t, r]))
+                else:
+                    self.assertAlmostEqual(means[t, r], expected, places=10)
+        self.assertEqual(coverage[0, 0], 100.0)
+        self.assertLess(coverage[1, 1], 100.0)       # row 5 (lat 50) is NaN in EU_FRANCE
+        self.assertEqual(coverage[0, 2], 0.0)
+
+    def test_daily_folding_is_period_ending(self):
+        grid = _member_grid(1, days=3)
+        daily = forecast_grid.daily_fields(grid, RUN, 4)
+        # Day 1 = June 2: steps valid 06Z, 12Z, 18Z on June 2 and 00Z on June 3
+        start = np.datetime64('2026-06-02T00:00:00')
+        in_day = (grid.valid_times > start) & (grid.valid_times <= start + np.timedelta64(1, 'D'))
+        self.assertEqual(int(in_day.sum()), 4)
+        np.testing.assert_allclose(daily['tmax'][0], grid.fields['tmax'][in_day].max(axis=0))
+        np.testing.assert_allclose(daily['precip'][0], grid.fields['precip'][in_day].sum(axis=0))
+        self.assertTrue(np.isnan(daily['tmin'][3]).all())     # beyond the last step
+
+        # Folding file by file gives the same result as one decode
+        acc = forecast_grid.DailyGrids(RUN, 4)
+        for i in range(len(grid.valid_times)):
+            acc.add(forecast_grid.GridFields(grid.lats, grid.lons, grid.valid_times[i:i + 1],
+                                             {k: v[i:i + 1] for k, v in grid.fields.items()}))
+        np.testing.assert_allclose(acc.result().fields['precip'], daily['precip'])
+
+    def test_run_helpers(self):
+        precip = np.array([[0.0, 5.0], [0.5, 0.0], [0.2, 0.0], [3.0, 0.1]])
+        np.testing.assert_array_equal(forecast_grid.dry_run_lengths(precip), [[1, 0], [2, 1], [3, 2], [0, 3]])
+        weekly = forecast_grid.trailing_sum(np.arange(9.0).reshape(1, 9), 7, axis=1)
+        self.assertTrue(np.isnan(weekly[0, :6]).all())
+        np.testing.assert_array_equal(weekly[0, 6:], [21, 28, 35])
+
+
+class TestEnsembleCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = gefs.GEFSCollector()
+        self.members = {f'gep{i:02d}': [_member_grid(i)] for i in range(1, 8)}
+
+    def test_tables_match_per_member_loops(self):
+        forecasts = self.collector.collect_ensemble_forecast(
+            run_date=RUN, regions=list(BOUNDS), max_lead_days=8, member_files=self.members)
+        self.assertEqual(len(forecasts), 8 * 2)             # AU_EASTERN has no cells
+        f = next(x for x in forecasts if x.region_code == 'EU_FRANCE' and x.valid_date == RUN + timedelta(days=7))
+        self.assertEqual(f.ensemble_members, 7)
+
+        # Reference: region-mean daily values per member, then the original list-based stats
+        member_data = {}
+        for m, (grid,) in self.members.items():
+            daily = forecast_grid.daily_fields(grid, RUN, 8)
+            member_data[m] = {k: [_brute_region_mean(daily[k][d], BOUNDS['EU_FRANCE']) for d in range(8)]
+                              for k in ('tmax', 'tmin', 'precip')}
+        tmax = [v['tmax'][6] for v in member_data.values()]
+        tmin = [v['tmin'][6] for v in member_data.values()]
+        precip = [v['precip'][6] for v in member_data.values()]
+        week = [sum(v['precip'][:7]) for v in member_data.values()]
+        gdd = [max(0, (lo + min(hi, 30)) / 2 - 10) for lo, hi in zip(tmin, tmax)]
+
+        self.assertAlmostEqual(f.precip_p10, np.percentile(precip, 10), places=9)
+        self.assertAlmostEqual(f.precip_std, np.std(precip), places=9)
+        self.assertAlmostEqual(f.tmax_p90, np.percentile(tmax, 90), places=9)
+        self.assertAlmostEqual(f.gdd_p50, np.percentile(gdd, 50), places=9)
+        self.assertEqual(f.prob_heat_stress, round(sum(t > 30 for t in tmax) / 7 * 100, 1))
+        self.assertEqual(f.prob_frost, round(sum(t < 0 for t in tmin) / 7 * 100, 1))
+        self.assertEqual(f.prob_dry_week, round(sum(w < 5 for w in week) / 7 * 100, 1))
+        first = next(x for x in forecasts if x.valid_date == RUN + timedelta(days=1))
+        self.assertEqual(first.prob_dry_week, 0.0)            # no full week yet
+
+    def test_member_dict_aggregation(self):
+        data = {'a': {'precip': 1.0, 'tmax': 31.0, 'tmin': -1.0},
+                'b': {'precip': 4.0, 'tmax': 29.0, 'tmin': 2.0},
+                'c': {'precip': 9.0, 'tmax': 36.0}}
+        f = self.collector.aggregate_ensemble_to_region(data, 'US_CORN_BELT', RUN, RUN)
+        self.assertEqual(f.precip_p50, 4.0)
+        self.assertEqual(f.prob_extreme_heat, 33.3)
+        self.assertEqual(f.prob_frost, 50.0)                  # 'c' has no tmin
+        self.assertEqual(f.gdd_p50, 0.0)                      # no gdd values supplied
+        self.assertEqual(self.collector.calculate_probability([1, 2, 3], 1.5), 66.7)
+
+    def test_bulk_insert_single_statement(self):
+        forecasts = self.collector.collect_ensemble_forecast(
+            run_date=RUN, regions=['US_CORN_BELT'], max_lead_days=3, member_files=self.members)
+        conn = _FakeConn()
+        self.assertEqual(self.collector.save_ensemble_to_database(forecasts, conn=conn), 3)
+        self.assertEqual(len(conn.statements), 1)
+        self.assertEqual(len(conn.rows), 3)
+        self.assertEqual(conn.commits, 1)
+
+    def test_forecast_key_selection(self):
+        keys = [f'gefs.20260601/00/atmos/pgrb2ap5/gep01.t00z.pgrb2a.0p50.f{h:03d}{ext}'
+                for h in (0, 3, 6, 12, 384) for ext in ('', '.idx')]
+        selected = self.collector.select_forecast_keys(keys, max_lead_days=1)
+        self.assertEqual([k[-4:] for k in selected], ['f006', 'f012'])
+
+
+class TestDeterministicCollector(unittest.TestCase):
+
+    def test_gfs_forecast_from_local_grid(self):
+        collector = gfs.GFSCollector()
+        grid = _member_grid(42, days=5)
+        forecasts = collector.collect_forecast(run_date=RUN, regions=['US_CORN_BELT', 'AU_EASTERN'],
+                                               max_lead_days=5, files=[grid])
+        self.assertEqual([f.valid_date for f in forecasts], [RUN + timedelta(days=d) for d in range(1, 6)])
+        daily = forecast_grid.daily_fields(grid, RUN, 5)
+        tmax = [_brute_region_mean(daily['tmax'][d], BOUNDS['US_CORN_BELT']) for d in range(5)]
+        self.assertAlmostEqual(forecasts[2].tmax_c, tmax[2], places=9)
+        self.assertEqual(forecasts[0].coverage_pct, 100.0)
+        self.assertEqual(forecasts[0].gdd_corn,
+                         collector.calculate_gdd(forecasts[0].tmin_c, forecasts[0].tmax_c, 10, 30))
+
+
+def _netcdf_backend():
+    try:
+        import xarray  # noqa: F401
+    except ImportError:
+        return False
+    for module in ('netCDF4', 'scipy'):
+        try:
+            importlib.import_module(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+@unittest.skipUnless(_netcdf_backend(), "xarray with a NetCDF backend not installed")
+class TestNetCDFFixture(unittest.TestCase):
+
+    def test_decode_units_and_longitudes(self):
+        import xarray as xr
+
+        grid = _member_grid(5, days=2)
+        times = grid.valid_times.astype('datetime64[ns]')
+        ds = xr.Dataset(
+            {
+                'tmax': (('valid_time', 'latitude', 'longitude'), grid.fields['tmax'] + 273.15, {'units': 'K'}),
+                'tmin': (('valid_time', 'latitude', 'longitude'), grid.fields['tmin'] + 273.15, {'units': 'K'}),
+                'tp': (('valid_time', 'latitude', 'longitude'), grid.fields['precip'], {'units': 'kg m**-2'}),
+            },
+            coords={'valid_time': times, 'latitude': LATS, 'longitude': LONS},
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'gep01.nc'
+            ds.to_netcdf(path)
+            decoded = forecast_grid.read_forecast_file(path)
+            forecasts = gefs.GEFSCollector().collect_ensemble_forecast(
+                run_date=RUN, regions=['EU_FRANCE'], max_lead_days=2, member_files={'gep01': [path]})
+
+        np.testing.assert_allclose(decoded.fields['tmax'], grid.fields['tmax'], atol=1e-9)
+        np.testing.assert_array_equal(decoded.lons, grid.lons)
+        daily = forecast_grid.daily_fields(grid, RUN, 2)
+        self.assertAlmostEqual(forecasts[1].precip_p50,
+                               _brute_region_mean(daily['precip'][1], BOUNDS['EU_FRANCE']), places=9)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+
+    def mogrify(self, template, args):
+        self.conn.rows.append(args)
+        return b'(row)'
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+
+
+class _FakeConn:
+    encoding = 'UTF8'
+
+    def __init__(self):
+        self.statements = []
+        self.rows = []
+        self.commits = 0
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for the catalog-based DatabaseChecker in src/agents/log_review_agent.py
+and CollectorRunner's table watermark update. Fake DB-API objects; no database.
+"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.agents.log_review_agent import DatabaseChecker, LogReviewConfig
+from src.dispatcher.collector_runner import CollectorRunner
+
+
+class UndefinedTable(Exception):
+    pgcode = '42P01'
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if 'COUNT(*)' in sql:
+            raise AssertionError("freshness check must not COUNT(*)")
+        if 'FROM monitored' in sql:
+            if 'core.table_watermark' in sql and not self.db.has_watermark_table:
+                raise UndefinedTable('relation "core.table_watermark" does not exist')
+            with_watermarks = 'core.table_watermark' in sql
+            self._rows = []
+            for schema, table, exists, rows, indexed, watermark, runner in self.db.catalog:
+                if not with_watermarks:
+                    watermark, runner = None, False
+                self._rows.append((schema, table, exists, rows, indexed, watermark, runner))
+        elif 'UNION ALL' in sql or sql.startswith('(SELECT'):
+            self._rows = []
+            for part in sql.split(' UNION ALL '):
+                idx = int(part.split('SELECT ')[1].split(' AS idx')[0])
+                table = part.rsplit('.', 1)[1].strip('")')
+                self._rows.append((idx, self.db.max_ts.get(table)))
+        elif 'UPDATE core.table_watermark' in sql:
+            self.db.watermark_updates.append(params)
+            self.rowcount = 2
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self):
+        self.statements = []
+        self.has_watermark_table = True
+        self.catalog = []
+        self.max_ts = {}
+        self.watermark_updates = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestDatabaseChecker(unittest.TestCase):
+
+    TABLES = [
+        ('bronze', 'cftc_cot', 'collected_at'),
+        ('bronze', 'weather_raw', 'collected_at'),
+        ('bronze', 'census_trade', 'collected_at'),
+        ('bronze', 'nass_production', 'collected_at'),
+        ('bronze', 'conab_production', 'created_at'),
+        ('bronze', 'weather_alerts_raw', 'collected_at'),
+    ]
+
+    def setUp(self):
+        now = datetime.now()
+        self.db = FakeConn()
+        self.db.catalog = [
+            # schema, table, exists, row_estimate, ts_indexed, watermark, runner_maintained
+            ('bronze', 'cftc_cot', True, 50000, True, now - timedelta(hours=2), True),
+            ('bronze', 'weather_raw', True, 9000000, True, None, False),
+            ('bronze', 'census_trade', True, 3000000, False, now - timedelta(days=100), False),
+            ('bronze', 'nass_production', False, 0, False, None, False),
+            ('bronze', 'conab_production', True, 0, False, None, False),
+            ('bronze', 'weather_alerts_raw', True, 0, True, None, False),
+        ]
+        self.db.max_ts = {'weather_raw': now - timedelta(hours=1), 'weather_alerts_raw': None}
+        self.checker = DatabaseChecker(LogReviewConfig())
+        self.checker.TABLES_TO_MONITOR = self.TABLES
+        self.checker.conn = self.db
+
+    def _by_table(self, results):
+        return {r.table: r for r in results}
+
+    def test_two_round_trips_no_scans(self):
+        results = self._by_table(self.checker.check_all_tables())
+        self.assertEqual(self.checker.last_round_trips, 2)
+        self.assertEqual(len(self.db.statements), 2)
+        self.assertIsNotNone(self.checker.last_check_ms)
+        # Only the indexed, non-watermarked tables get a MAX()
+        self.assertIn('"weather_raw"', self.db.statements[1])
+        self.assertNotIn('"cftc_cot"', self.db.statements[1])
+        self.assertNotIn('"conab_production"', self.db.statements[1])
+
+        self.assertEqual((results['cftc_cot'].status, results['cftc_cot'].source), ('FRESH', 'watermark'))
+        self.assertEqual(results['cftc_cot'].row_count, 50000)
+        self.assertEqual((results['weather_raw'].status, results['weather_raw'].source), ('FRESH', 'index'))
+        self.assertEqual(results['census_trade'].status, 'VERY_STALE')     # seeded watermark
+        self.assertEqual(results['nass_production'].status, 'MISSING')
+        self.assertEqual(results['conab_production'].status, 'UNKNOWN')
+        self.assertEqual(results['weather_alerts_raw'].status, 'EMPTY')
+
+    def test_allow_scan_covers_unindexed_tables(self):
+        self.checker.config.freshness_allow_scan = True
+        self.db.max_ts['conab_production'] = datetime.now() - timedelta(hours=5)
+        results = self._by_table(self.checker.check_all_tables())
+        self.assertEqual((results['conab_production'].status, results['conab_production'].source),
+                         ('FRESH', 'scan'))
+
+    def test_missing_watermark_table_falls_back_to_indexes(self):
+        self.db.has_watermark_table = False
+        results = self._by_table(self.checker.check_all_tables())
+        self.assertEqual(self.db.rollbacks, 1)
+        self.assertFalse(self.checker.use_watermarks)
+        self.assertEqual(results['cftc_cot'].source, 'index')
+        # Next run skips the failing probe entirely
+        self.db.statements.clear()
+        self.checker.check_all_tables()
+        self.assertEqual(len(self.db.statements), 2)
+
+
+class TestRunnerWatermark(unittest.TestCase):
+
+    def test_advance_watermarks(self):
+        db = FakeConn()
+        runner = CollectorRunner(registry=object())
+        self.assertEqual(runner._advance_watermarks(db, 'cftc_cot', 1200), 2)
+        self.assertEqual(db.watermark_updates, [(1200, 'cftc_cot')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the set-based KG paths: bulk_upsert_contexts, get_enriched_contexts,
+the node-id cache, and KGEnricher's single-round-trip lookup.
+
+The database is faked at KGManager._get_connection.
+"""
+
+import json
+import sys
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.knowledge_graph import kg_manager
+from src.knowledge_graph.kg_enricher import KGEnricher
+from src.knowledge_graph.kg_manager import KGManager, clear_node_id_cache
+
+NODES = {'corn': 1, 'soybeans': 2, 'cftc.cot': 3}
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.db.statements.append((sql, params))
+        if 'FROM core.kg_node WHERE node_key = ANY' in sql:
+            self._rows = [{'node_key': k, 'id': NODES[k]} for k in params[0] if k in NODES]
+        elif 'INSERT INTO core.kg_context' in sql:
+            node_ids = params[1]
+            live = set(self.db.live_ids)
+            self._rows = [{'node_id': nid, 'was_inserted': i % 2 == 0}
+                          for i, nid in enumerate(node_ids) if nid in live]
+        elif 'jsonb_agg' in sql:
+            self._rows = [{
+                'id': NODES[k], 'node_type': 'commodity', 'node_key': k, 'label': k.title(),
+                'properties': {},
+                'contexts': [{'context_type': 'expert_rule', 'context_key': f'{k}_rule',
+                              'context_value': {'rule': f'{k} rule'}}],
+                'edges': [{'edge_type': 'CAUSES', 'direction': 'outgoing',
+                           'source_key': k, 'source_label': k.title(),
+                           'target_key': 'x', 'target_label': 'X', 'properties': {}}],
+            } for k in params[0] if k in NODES]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeDB:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.live_ids = set(NODES.values())
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TestKGBulk(unittest.TestCase):
+
+    def setUp(self):
+        clear_node_id_cache()
+        self.db = FakeDB()
+        patcher = patch.object(KGManager, '_get_connection', lambda _self: self.db.connection())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.kg = KGManager()
+
+    def _contexts(self):
+        return [
+            {'node_key': 'corn', 'context_type': 'seasonal_norm', 'context_key': 'a',
+             'context_value': {'v': 1}},
+            {'node_key': 'soybeans', 'context_type': 'seasonal_norm', 'context_key': 'a',
+             'context_value': {'v': 2}},
+            {'node_key': 'corn', 'context_type': 'seasonal_norm', 'context_key': 'b',
+             'context_value': {'v': 3}},
+            {'node_key': 'corn', 'context_type': 'seasonal_norm', 'context_key': 'a',
+             'context_value': {'v': 4}},   # duplicate key: last wins
+            {'node_key': 'wheat_missing', 'context_type': 'seasonal_norm', 'context_key': 'a',
+             'context_value': {}},
+        ]
+
+    def test_bulk_upsert_is_set_based(self):
+        result = self.kg.bulk_upsert_contexts(self._contexts())
+
+        inserts = [p for s, p in self.db.statements if 'INSERT INTO core.kg_context' in s]
+        self.assertEqual(len(inserts), 1)
+        source, node_ids, types, keys, values, whens = inserts[0]
+        self.assertEqual(source, 'computed')
+        self.assertEqual(sorted(zip(node_ids, keys)), [(1, 'a'), (1, 'b'), (2, 'a')])
+        self.assertIn(json.dumps({'v': 4}), values)
+        self.assertNotIn(json.dumps({'v': 1}), values)
+
+        self.assertEqual(result['total'], 5)
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(result['inserted'] + result['updated'] + result['failed'], 5)
+        self.assertIn('Node not found: wheat_missing', result['errors'])
+        self.assertEqual(self.db.commits, 1)
+
+    def test_bulk_upsert_chunks(self):
+        with patch.object(kg_manager, 'BULK_UPSERT_CHUNK', 2):
+            self.kg.bulk_upsert_contexts(self._contexts())
+        inserts = [s for s, _ in self.db.statements if 'INSERT INTO core.kg_context' in s]
+        self.assertEqual(len(inserts), 2)
+
+    def test_node_ids_cached_between_calls(self):
+        self.kg.bulk_upsert_contexts(self._contexts())
+        self.kg.bulk_upsert_contexts(self._contexts()[:3])
+        resolves = [p for s, p in self.db.statements if 'WHERE node_key = ANY' in s
+                    and 'jsonb_agg' not in s]
+        self.assertEqual(len(resolves), 1)
+
+    def test_stale_cached_id_is_evicted(self):
+        self.kg.resolve_node_ids(['corn', 'soybeans'])
+        self.db.live_ids.discard(2)          # soybeans deleted after caching
+        result = self.kg.bulk_upsert_contexts(self._contexts()[:3])
+        self.assertEqual(result['failed'], 1)
+        self.assertNotIn('soybeans', kg_manager._node_ids)
+        self.assertIn('corn', kg_manager._node_ids)
+
+    def test_enriched_contexts_one_round_trip(self):
+        result = self.kg.get_enriched_contexts(['corn', 'soybeans', 'nope'])
+        self.assertEqual(len(self.db.statements), 1)
+        self.assertEqual(set(result), {'corn', 'soybeans'})
+        corn = result['corn']
+        self.assertEqual(corn['node']['node_key'], 'corn')
+        self.assertNotIn('contexts', corn['node'])
+        self.assertEqual(corn['summary']['context_types'], ['expert_rule'])
+        self.assertEqual(corn['summary']['edge_count'], 1)
+        # Enrichment query also warms the id cache
+        self.kg.resolve_node_ids(['corn'])
+        self.assertEqual(len(self.db.statements), 1)
+
+    def test_get_enriched_context_single(self):
+        self.assertIsNone(self.kg.get_enriched_context('nope'))
+        self.assertEqual(self.kg.get_enriched_context('corn')['node']['id'], 1)
+
+    def test_enricher_uses_one_query(self):
+        enricher = KGEnricher()
+        result = enricher.enrich_collection_event('cftc_cot', rows_collected=10)
+        self.assertEqual(len(self.db.statements), 1)
+        self.assertEqual([n['node_key'] for n in result['related_nodes']],
+                         ['cftc.cot', 'corn', 'soybeans'])
+        self.assertEqual(len(result['key_contexts']), 3)
+        self.assertIn('Links: CAUSES', result['enriched_summary'])
+
+
+if __name__ == '__main__':
+    unittest.main()
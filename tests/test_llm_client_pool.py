@@ -0,0 +1,294 @@
+"""
+Tests for the persistent client layer in src/services/llm/llm_client.py:
+keep-alive client reuse, streaming with time-to-first-token, the on-disk
+response cache, and TTFT / cache-hit logging in CallLogger.
+
+Ollama is a local stub HTTP server; Anthropic is a fake SDK module.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.llm import llm_client
+from src.services.llm.call_logger import CallLogger
+from src.services.llm.llm_client import LLMResponse, LLMResponseCache, call_llm, stream_llm
+from src.services.llm.model_router import ModelConfig
+
+CHUNKS = ['Corn ', 'stocks ', 'tightened.']
+
+OLLAMA = ModelConfig(model_id='llama3.1:70b', provider='ollama', tier='local',
+                     cost_per_1k_in=0.0, cost_per_1k_out=0.0)
+CLAUDE = ModelConfig(model_id='claude-sonnet-4-20250514', provider='anthropic', tier='cloud',
+                     cost_per_1k_in=0.003, cost_per_1k_out=0.015)
+
+
+class StubOllama:
+    """/api/generate over HTTP/1.1 keep-alive; streamed replies are chunked NDJSON."""
+
+    def __init__(self, first_token_delay=0.05, chunk_delay=0.05):
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stub.requests.append(body)
+                stub.connections.add(self.client_address)
+                chunks = CHUNKS[:body['options']['num_predict']]
+                done = {'done': True, 'prompt_eval_count': 42, 'eval_count': len(chunks),
+                        'done_reason': 'length' if len(chunks) < len(CHUNKS) else 'stop'}
+                if not body['stream']:
+                    payload = json.dumps(dict(done, response=''.join(chunks))).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                time.sleep(stub.first_token_delay)
+                lines = [{'response': c, 'done': False} for c in chunks] + [dict(done, response='')]
+                for i, line in enumerate(lines):
+                    if i:
+                        time.sleep(stub.chunk_delay)
+                    data = json.dumps(line).encode() + b'\n'
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                    self.wfile.flush()
+                self.wfile.write(b'0\r\n\r\n')
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fake_anthropic_module():
+    """A stand-in for the anthropic SDK that counts client construction."""
+    module = types.ModuleType('anthropic')
+    module.clients = []
+
+    class Stream:
+        def __enter__(self):
+            time.sleep(0.03)
+            self.text_stream = iter(CHUNKS)
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def get_final_message(self):
+            return types.SimpleNamespace(usage=types.SimpleNamespace(input_tokens=42, output_tokens=3))
+
+    class Messages:
+        def create(self, **kwargs):
+            chunks = CHUNKS[:kwargs['max_tokens']]
+            return types.SimpleNamespace(
+                content=[types.SimpleNamespace(text=''.join(chunks))],
+                usage=types.SimpleNamespace(input_tokens=42, output_tokens=len(chunks)),
+                stop_reason='max_tokens' if len(chunks) < len(CHUNKS) else 'end_turn')
+
+        def stream(self, **kwargs):
+            return Stream()
+
+    class Anthropic:
+        def __init__(self, api_key):
+            self.api_key = api_key
+            self.messages = Messages()
+            module.clients.append(self)
+
+        def close(self):
+            pass
+
+    module.Anthropic = Anthropic
+    return module
+
+
+class TestLLMClientPool(unittest.TestCase):
+
+    def setUp(self):
+        llm_client.close_clients()
+        self.addCleanup(llm_client.close_clients)
+        env = mock.patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'key-a'})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop('RLC_LLM_CACHE_DIR', None)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_ollama_calls_share_one_connection(self):
+        with StubOllama() as server, mock.patch.dict(os.environ, {'OLLAMA_URL': server.url}):
+            responses = [call_llm(OLLAMA, 'sys', f'prompt {i}') for i in range(3)]
+        self.assertEqual([r.text for r in responses], [''.join(CHUNKS)] * 3)
+        self.assertEqual(responses[0].tokens_in, 42)
+        self.assertIsNone(responses[0].ttft_ms)
+        self.assertEqual(len(server.requests), 3)
+        self.assertFalse(any(r['stream'] for r in server.requests))
+        self.assertEqual(len(server.connections), 1)
+
+    def test_ollama_stream_records_ttft(self):
+        with StubOllama() as server, mock.patch.dict(os.environ, {'OLLAMA_URL': server.url}):
+            stream = stream_llm(OLLAMA, 'sys', 'user')
+            self.assertEqual(server.requests, [])         # nothing sent until iterated
+            chunks = list(stream)
+            tokens = []
+            response = call_llm(OLLAMA, 'sys', 'user', on_token=tokens.append)
+
+        self.assertEqual(chunks, CHUNKS)
+        self.assertEqual(tokens, CHUNKS)
+        for result in (stream.response, response):
+            self.assertEqual(result.text, ''.join(CHUNKS))
+            self.assertEqual((result.tokens_in, result.tokens_out), (42, 3))
+            self.assertGreaterEqual(result.ttft_ms, 40)
+            self.assertGreaterEqual(result.latency_ms - result.ttft_ms, 100)
+        self.assertTrue(all(r['stream'] for r in server.requests))
+        self.assertEqual(len(server.connections), 1)
+
+    def test_anthropic_client_reused_per_key(self):
+        fake = fake_anthropic_module()
+        with mock.patch.dict(sys.modules, {'anthropic': fake}):
+            call_llm(CLAUDE, 'sys', 'one')
+            call_llm(CLAUDE, 'sys', 'two')
+            stream = stream_llm(CLAUDE, 'sys', 'three')
+            self.assertEqual(list(stream), CHUNKS)
+            self.assertEqual(len(fake.clients), 1)
+
+            with mock.patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'key-b'}):
+                call_llm(CLAUDE, 'sys', 'four')
+            self.assertEqual([c.api_key for c in fake.clients], ['key-a', 'key-b'])
+
+        self.assertGreaterEqual(stream.response.ttft_ms, 25)
+        self.assertEqual(stream.response.tokens_out, 3)
+
+    def test_cache_hit_makes_no_request(self):
+        cache = LLMResponseCache(self.tmp.name)
+        with StubOllama() as server, mock.patch.dict(os.environ, {'OLLAMA_URL': server.url}):
+            first = call_llm(OLLAMA, 'sys', 'user', cache=cache)
+            second = call_llm(OLLAMA, 'sys', 'user', cache=cache)
+            self.assertEqual(len(server.requests), 1)
+            self.assertFalse(first.cached)
+            self.assertTrue(second.cached)
+            self.assertEqual(second.text, first.text)
+            self.assertEqual((second.tokens_in, second.tokens_out), (42, 3))
+
+            # Key is (model_id, prompt_hash, temperature, max_tokens)
+            call_llm(OLLAMA, 'sys', 'user', temperature=0.9, cache=cache)
+            call_llm(OLLAMA, 'sys', 'changed', cache=cache)
+            call_llm(OLLAMA, 'sys', 'user', max_tokens=1024, cache=cache)
+            call_llm(OLLAMA, 'sys', 'user', cache=False)
+            self.assertEqual(len(server.requests), 5)
+
+            # Streamed calls are served from the cache as one chunk
+            tokens = []
+            hit = call_llm(OLLAMA, 'sys', 'user', cache=cache, on_token=tokens.append)
+            self.assertTrue(hit.cached)
+            self.assertEqual(tokens, [''.join(CHUNKS)])
+
+            # RLC_LLM_CACHE_DIR turns on the default cache; prompt_hash is the key
+            with mock.patch.dict(os.environ, {'RLC_LLM_CACHE_DIR': self.tmp.name}):
+                self.assertTrue(call_llm(OLLAMA, 'other', 'prompt',
+                                         prompt_hash=llm_client.hash_prompt('sys', 'user')).cached)
+            self.assertEqual(len(server.requests), 5)
+
+    def test_truncated_response_is_not_cached(self):
+        cache = LLMResponseCache(self.tmp.name)
+        with StubOllama(0, 0) as server, mock.patch.dict(os.environ, {'OLLAMA_URL': server.url}):
+            for on_token in (None, [].append):
+                cut = call_llm(OLLAMA, 'sys', 'user', max_tokens=2, cache=cache, on_token=on_token)
+                self.assertTrue(cut.truncated)
+                self.assertEqual(cut.text, ''.join(CHUNKS[:2]))
+            full = call_llm(OLLAMA, 'sys', 'user', cache=cache)
+            self.assertFalse(full.truncated)
+            self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(list(Path(self.tmp.name).glob('*.json'))), 1)
+
+        with mock.patch.dict(sys.modules, {'anthropic': fake_anthropic_module()}):
+            cut = call_llm(CLAUDE, 'sys', 'user', max_tokens=1, cache=cache)
+            self.assertTrue(cut.truncated)
+            self.assertFalse(call_llm(CLAUDE, 'sys', 'user', max_tokens=1, cache=cache).cached)
+            self.assertEqual(call_llm(CLAUDE, 'sys', 'user', cache=cache).text, ''.join(CHUNKS))
+            self.assertTrue(call_llm(CLAUDE, 'sys', 'user', cache=cache).cached)
+
+    def test_prompt_hash_matches_rendered_prompt(self):
+        from src.prompts.base_template import BasePromptTemplate
+        self.assertEqual(llm_client.hash_prompt('sys', 'user'),
+                         BasePromptTemplate._hash_prompt('sys', 'user'))
+
+
+class TestCallLoggerTTFT(unittest.TestCase):
+
+    def _logger(self, mock_get_conn):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        ctx = MagicMock()
+        ctx.__enter__ = MagicMock(return_value=conn)
+        ctx.__exit__ = MagicMock(return_value=False)
+        mock_get_conn.return_value = ctx
+        return CallLogger(), cursor
+
+    def _insert(self, cursor):
+        sql, params = next(call.args for call in cursor.execute.call_args_list
+                           if 'INSERT INTO core.llm_call_log' in call.args[0])
+        columns = sql.split('(', 1)[1].split(')', 1)[0]
+        columns = [c.strip() for c in columns.split(',')]
+        columns.remove('status')                            # literal 'success'
+        return dict(zip(columns, params))
+
+    @patch('src.services.llm.call_logger.CallLogger._get_connection')
+    def test_track_logs_ttft(self, mock_get_conn):
+        call_logger, cursor = self._logger(mock_get_conn)
+        response = LLMResponse(text='ok', tokens_in=1000, tokens_out=1000, latency_ms=900,
+                               model_id=CLAUDE.model_id, provider='anthropic', ttft_ms=120)
+        with call_logger.track('analysis', CLAUDE) as tracker:
+            tracker.set_response(response)
+        row = self._insert(cursor)
+        self.assertEqual(row['ttft_ms'], 120)
+        self.assertEqual(row['cost_usd'], 0.018)
+
+    @patch('src.services.llm.call_logger.CallLogger._get_connection')
+    def test_cache_hit_is_free_and_flagged(self, mock_get_conn):
+        call_logger, cursor = self._logger(mock_get_conn)
+        response = LLMResponse(text='ok', tokens_in=1000, tokens_out=1000, latency_ms=0,
+                               model_id=CLAUDE.model_id, provider='anthropic', cached=True)
+        with call_logger.track('analysis', CLAUDE, sensitivity=2) as tracker:
+            tracker.set_response(response)
+        row = self._insert(cursor)
+        self.assertEqual(row['cost_usd'], 0.0)
+        self.assertIsNone(row['ttft_ms'])
+        self.assertTrue(json.loads(row['details'])['cache_hit'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the incremental log scanner and rolling summary index in
+src/agents/log_review_agent.py. Uses temporary log files only.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.agents.log_review_agent import LogParser, LogScanner, LogSummaryIndex
+
+
+def _line(when: datetime, level: str, message: str) -> str:
+    return f"{when:%Y-%m-%d %H:%M:%S},123 - OvernightRunner - {level} - {message}\n"
+
+
+class TestLogScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.log = self.dir / 'overnight_runner_1.log'
+        self.now = datetime.now().replace(microsecond=0)
+        self.since = self.now - timedelta(hours=24)
+
+    def _scanner(self):
+        index = LogSummaryIndex(self.dir / 'index.json')
+        return LogScanner(self.dir / 'state.json', index=index, workers=2)
+
+    def _append(self, *lines):
+        with open(self.log, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+
+    def _summary(self, scanner):
+        states = scanner.scan([self.log])
+        return LogScanner.summarize(self.log, states[str(self.log)], self.since)
+
+    def test_only_new_bytes_are_read(self):
+        self._append(_line(self.now, 'ERROR', 'download failed'),
+                     _line(self.now, 'INFO', 'Saved 10 rows'))
+        first = self._summary(self._scanner())
+        size = self.log.stat().st_size
+
+        self._append(_line(self.now, 'WARNING', 'slow response'))
+        scanner = self._scanner()          # fresh process: state comes from disk
+        second = self._summary(scanner)
+
+        self.assertEqual(len(first.errors), 1)
+        self.assertEqual(scanner.last_scan_bytes, self.log.stat().st_size - size)
+        self.assertEqual(second.total_lines, 3)
+        self.assertEqual(len(second.errors), 1)      # remembered from the first run
+        self.assertEqual(len(second.warnings), 1)
+        self.assertEqual(second.success_indicators[0][:10], f"{self.now:%Y-%m-%d}")
+
+    def test_matches_full_parse(self):
+        old = self.now - timedelta(hours=30)
+        self._append(_line(old, 'ERROR', 'old failure'),
+                     _line(self.now, 'INFO', 'Error: bad row'),
+                     "[%s] warning: retrying\n" % f"{self.now:%Y-%m-%d %H:%M:%S}",
+                     "not a log line\n",
+                     _line(self.now, 'INFO', 'Report Generated'))
+        incremental = self._summary(self._scanner())
+        full = LogParser.parse_file(self.log, self.since)
+        self.assertEqual(incremental.total_lines, full.total_lines)
+        self.assertEqual([e.message for e in incremental.errors], [e.message for e in full.errors])
+        self.assertEqual([e.message for e in incremental.warnings], [e.message for e in full.warnings])
+        self.assertEqual(incremental.success_indicators, full.success_indicators)
+
+    def test_partial_line_waits_for_newline(self):
+        self._append(_line(self.now, 'ERROR', 'first'))
+        with open(self.log, 'a', encoding='utf-8') as f:
+            f.write(_line(self.now, 'ERROR', 'second').rstrip('\n'))
+        self.assertEqual(len(self._summary(self._scanner()).errors), 1)
+        self._append('\n')
+        self.assertEqual(len(self._summary(self._scanner()).errors), 2)
+
+    def test_truncation_rescans_from_start(self):
+        self._append(*[_line(self.now, 'INFO', f'step {i}') for i in range(5)])
+        self._summary(self._scanner())
+        with open(self.log, 'w', encoding='utf-8') as f:
+            f.write(_line(self.now, 'ERROR', 'after rotate'))
+        summary = self._summary(self._scanner())
+        self.assertEqual(summary.total_lines, 1)
+        self.assertEqual([e.message for e in summary.errors], ['after rotate'])
+
+    def test_rewritten_head_detected(self):
+        self._append(_line(self.now, 'INFO', 'aaaa'))
+        self._summary(self._scanner())
+        # Same-size-or-larger rewrite with different content (copytruncate + regrow)
+        with open(self.log, 'w', encoding='utf-8') as f:
+            f.write(_line(self.now, 'ERROR', 'bbbb'))
+            f.write(_line(self.now, 'INFO', 'cccc'))
+        summary = self._summary(self._scanner())
+        self.assertEqual(summary.total_lines, 2)
+        self.assertEqual(len(summary.errors), 1)
+
+    def test_entries_pruned_after_retention(self):
+        old = self.now - timedelta(days=10)
+        self._append(_line(old, 'ERROR', 'ancient'), _line(self.now, 'ERROR', 'recent'))
+        scanner = self._scanner()
+        scanner.scan([self.log])
+        state = json.loads((self.dir / 'state.json').read_text())
+        messages = [e[4] for e in state['files'][str(self.log)]['entries']]
+        self.assertEqual(messages, ['recent'])
+
+    def test_summary_index_accumulates_and_trends(self):
+        yesterday = self.now - timedelta(days=1)
+        self._append(_line(yesterday, 'ERROR', 'x'), _line(self.now, 'WARNING', 'y'))
+        self._summary(self._scanner())
+        self._append(_line(self.now, 'ERROR', 'z'))
+        self._summary(self._scanner())
+
+        trend = LogSummaryIndex(self.dir / 'index.json').trend(2)
+        self.assertEqual([r['date'] for r in trend],
+                         [yesterday.date().isoformat(), self.now.date().isoformat()])
+        self.assertEqual((trend[0]['errors'], trend[0]['lines']), (1, 1))
+        self.assertEqual((trend[1]['errors'], trend[1]['warnings'], trend[1]['lines']), (1, 1, 2))
+
+    def test_full_rescan_does_not_double_count(self):
+        self._append(_line(self.now, 'ERROR', 'x'))
+        self._summary(self._scanner())
+        scanner = self._scanner()
+        scanner.force_rescan = True
+        self._summary(scanner)
+        self.assertEqual(LogSummaryIndex(self.dir / 'index.json').trend(1)[0]['errors'], 1)
+
+    def test_truncate_then_rescan_replaces_index_counts(self):
+        self._append(_line(self.now, 'ERROR', 'x'),
+                     *[_line(self.now, 'INFO', f'step {i}') for i in range(3)])
+        self._summary(self._scanner())
+        with open(self.log, 'w', encoding='utf-8') as f:
+            f.write(_line(self.now, 'ERROR', 'x'))
+            f.write(_line(self.now, 'INFO', 'step 0'))
+        summary = self._summary(self._scanner())
+
+        today = LogSummaryIndex(self.dir / 'index.json').trend(1)[0]
+        self.assertEqual((today['lines'], today['errors']), (2, 1))
+        self.assertEqual([e.message for e in summary.errors], ['x'])
+
+        self._append(_line(self.now, 'WARNING', 'y'))
+        self._summary(self._scanner())
+        today = LogSummaryIndex(self.dir / 'index.json').trend(1)[0]
+        self.assertEqual((today['lines'], today['errors'], today['warnings']), (3, 1, 1))
+
+    def test_parallel_scan_of_many_files(self):
+        logs = []
+        for i in range(6):
+            path = self.dir / f'scheduler_{i}.log'
+            path.write_text(_line(self.now, 'ERROR', f'file {i}'))
+            logs.append(path)
+        states = self._scanner().scan(logs)
+        for i, path in enumerate(logs):
+            summary = LogScanner.summarize(path, states[str(path)], self.since)
+            self.assertEqual([e.message for e in summary.errors], [f'file {i}'])
+
+    def test_deleted_files_dropped_from_state(self):
+        self._append(_line(self.now, 'INFO', 'a'))
+        scanner = self._scanner()
+        scanner.scan([self.log])
+        os.remove(self.log)
+        scanner.scan([])
+        self.assertEqual(scanner.state['files'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
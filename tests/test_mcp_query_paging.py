@@ -0,0 +1,162 @@
+"""
+Tests for server-side-cursor paging in the MCP server (src/mcp/query_pager.py
+and query_database's paging mode). Fake DB-API connections, no database.
+"""
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mcp import commodities_db_server as mcp_server
+from src.mcp.query_pager import QueryPager
+from src.services.database.pool import ConnectionPool
+
+ROWS = [(i, f"row{i}") for i in range(7)]
+
+
+class FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.description = None
+        self.itersize = 2000
+        self._pos = 0
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        if self.name is not None:
+            self.description = [('id',), ('label',)]
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        rows = ROWS[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.statements = []
+        self.fetch_sizes = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        return FakeCursor(self, name)
+
+    def cancel(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class TestQueryPager(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ConnectionPool(FakeConnection, minconn=0, maxconn=4)
+        self.pager = QueryPager(lambda: self.pool, max_open=2)
+
+    def test_walks_all_pages(self):
+        page = self.pager.open("SELECT * FROM t", None, page_size=3)
+        seen = [r['id'] for r in page['rows']]
+        self.assertEqual(page['columns'], ['id', 'label'])
+        while page['next_cursor']:
+            page = self.pager.next(page['next_cursor'])
+            seen.extend(r['id'] for r in page['rows'])
+        self.assertEqual(seen, list(range(7)))
+        self.assertEqual(page['page'], 3)
+        self.assertEqual(page['rows_so_far'], 7)
+        # Exhausted cursor released its connection
+        self.assertEqual(self.pool.stats()['in_use'], 0)
+        self.assertEqual(self.pager.stats()['open_cursors'], 0)
+
+    def test_exact_multiple_has_no_empty_last_page(self):
+        page = self.pager.open("SELECT * FROM t", None, page_size=7)
+        self.assertEqual(page['row_count'], 7)
+        self.assertIsNone(page['next_cursor'])
+
+    def test_read_only_transaction_and_timeout(self):
+        self.pager.open("SELECT * FROM t", None, page_size=3, statement_timeout_ms=1234)
+        session = next(iter(self.pager._sessions.values()))
+        self.assertEqual(session.conn.statements[:2],
+                         ["SET TRANSACTION READ ONLY", "SET LOCAL statement_timeout = %s"])
+        self.assertEqual(session.cursor.itersize, 3)
+
+    def test_columnar_encoding(self):
+        page = self.pager.open("SELECT * FROM t", None, page_size=3, encoding='columnar')
+        self.assertEqual(page['data'], {'id': [0, 1, 2], 'label': ['row0', 'row1', 'row2']})
+
+    def test_close_and_unknown_token(self):
+        page = self.pager.open("SELECT * FROM t", None, page_size=2)
+        self.assertTrue(self.pager.close(page['next_cursor']))
+        self.assertEqual(self.pool.stats()['in_use'], 0)
+        self.assertIn('error', self.pager.next(page['next_cursor']))
+
+    def test_evicts_oldest_cursor(self):
+        tokens = [self.pager.open("SELECT * FROM t", None, page_size=2)['next_cursor']
+                  for _ in range(3)]
+        self.assertIn('error', self.pager.next(tokens[0]))
+        self.assertEqual(self.pager.next(tokens[2])['rows'][0]['id'], 2)
+        self.assertEqual(self.pager.stats()['evicted'], 1)
+        self.assertLessEqual(self.pool.stats()['in_use'], 2)
+
+    def test_idle_cursors_expire(self):
+        pager = QueryPager(lambda: self.pool, idle_timeout=0.05)
+        token = pager.open("SELECT * FROM t", None, page_size=2)['next_cursor']
+        time.sleep(0.1)
+        pager.reap()
+        self.assertEqual(pager.stats()['expired'], 1)
+        self.assertEqual(self.pool.stats()['in_use'], 0)
+        self.assertIn('error', pager.next(token))
+
+
+class TestQueryDatabasePaging(unittest.TestCase):
+
+    def setUp(self):
+        mcp_server.shutdown()
+        mcp_server._pool = ConnectionPool(FakeConnection, minconn=0, maxconn=4)
+        self.addCleanup(mcp_server.shutdown)
+
+    def test_paged_tool_calls(self):
+        page = json.loads(mcp_server.dispatch_tool(
+            'query_database', {'sql': 'SELECT * FROM bronze.census_trade;', 'page_size': 4}))
+        self.assertEqual(page['row_count'], 4)
+        page = json.loads(mcp_server.dispatch_tool(
+            'query_database', {'cursor': page['next_cursor'], 'encoding': 'columnar'}))
+        self.assertEqual(page['data']['id'], [4, 5, 6])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_paging_rejects_writes(self):
+        result = json.loads(mcp_server.query_database('DELETE FROM bronze.fas_psd', page_size=10))
+        self.assertIn('error', result)
+
+    def test_columnar_one_shot(self):
+        fake = {"columns": ["a", "b"], "rows": [{"a": 1, "b": 2}, {"a": 3, "b": 4}], "row_count": 2}
+        with patch.object(mcp_server, 'execute_query', return_value=fake):
+            result = json.loads(mcp_server.query_database('SELECT 1', encoding='columnar'))
+        self.assertEqual(result['data'], {"a": [1, 3], "b": [2, 4]})
+
+    def test_bad_encoding(self):
+        result = json.loads(mcp_server.query_database('SELECT 1', encoding='xml'))
+        self.assertIn('error', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for the MCP tool result cache (src/mcp/result_cache.py) and its
+wiring into commodities_db_server.dispatch_tool. No database required.
+"""
+
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mcp.result_cache import ToolResultCache
+
+
+class _Versions:
+    def __init__(self):
+        self.version = 1
+        self.calls = 0
+
+    def __call__(self, sources):
+        self.calls += 1
+        return (self.version,)
+
+
+class TestToolResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.versions = _Versions()
+        self.cache = ToolResultCache(self.versions, max_entries=2, poll_interval=0)
+        self.computed = 0
+
+    def _compute(self, payload=None):
+        def run():
+            self.computed += 1
+            return json.dumps(payload or {"rows": [self.computed]})
+        return run
+
+    def test_hit_after_miss(self):
+        first = self.cache.get_or_compute('t', {'a': 1}, ['src'], self._compute())
+        second = self.cache.get_or_compute('t', {'a': 1}, ['src'], self._compute())
+        self.assertEqual(first, second)
+        self.assertEqual(self.computed, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['by_tool']['t'], {'hits': 1, 'misses': 1})
+
+    def test_arguments_are_part_of_key(self):
+        self.cache.get_or_compute('t', {'a': 1, 'b': 2}, ['src'], self._compute())
+        self.cache.get_or_compute('t', {'b': 2, 'a': 1}, ['src'], self._compute())
+        self.cache.get_or_compute('t', {'a': 2}, ['src'], self._compute())
+        self.assertEqual(self.computed, 2)
+
+    def test_new_collector_run_invalidates(self):
+        self.cache.get_or_compute('t', {}, ['src'], self._compute())
+        self.versions.version = 2
+        result = self.cache.get_or_compute('t', {}, ['src'], self._compute())
+        self.assertEqual(json.loads(result), {"rows": [2]})
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_version_polled_at_most_once_per_interval(self):
+        cache = ToolResultCache(self.versions, poll_interval=60)
+        for _ in range(5):
+            cache.get_or_compute('t', {}, ['src'], self._compute())
+        self.assertEqual(self.versions.calls, 1)
+        self.assertEqual(cache.stats()['version_queries'], 1)
+
+    def test_errors_not_cached(self):
+        self.cache.get_or_compute('t', {}, ['src'], self._compute({"error": "timeout"}))
+        self.cache.get_or_compute('t', {}, ['src'], self._compute({"error": "timeout"}))
+        self.assertEqual(self.computed, 2)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_lru_eviction(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.get_or_compute('t', {'k': key}, ['src'], self._compute())
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_version_failure_bypasses_cache(self):
+        def broken(sources):
+            raise RuntimeError("db down")
+        cache = ToolResultCache(broken)
+        cache.get_or_compute('t', {}, ['src'], self._compute())
+        cache.get_or_compute('t', {}, ['src'], self._compute())
+        self.assertEqual(self.computed, 2)
+        self.assertEqual(cache.stats()['bypassed'], 2)
+
+
+class TestServerCacheWiring(unittest.TestCase):
+
+    def setUp(self):
+        from src.mcp import commodities_db_server as mcp_server
+        self.mcp = mcp_server
+        self.versions = _Versions()
+        self.cache = ToolResultCache(self.versions, poll_interval=0)
+        patcher = patch.object(mcp_server, '_result_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cached_tool_hits(self):
+        calls = []
+
+        def fake_execute(sql, params=None, limit=500):
+            calls.append(params)
+            time.sleep(0.01)
+            return {"columns": ["marketing_year"], "rows": [{"marketing_year": 2025}], "row_count": 1}
+
+        with patch.object(self.mcp, 'execute_query', side_effect=fake_execute):
+            args = {'commodity': 'corn', 'country': 'US'}
+            first = self.mcp.dispatch_tool('get_balance_sheet', args)
+            second = self.mcp.dispatch_tool('get_balance_sheet', args)
+            self.versions.version = 2
+            self.mcp.dispatch_tool('get_balance_sheet', args)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 2)
+        stats = json.loads(self.mcp.dispatch_tool('get_cache_stats', {}))
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['invalidations'], 1)
+        self.assertGreater(stats['saved_seconds'], 0)
+        self.assertIn('get_balance_sheet', stats['cached_tools'])
+
+    def test_uncached_tool_skips_cache(self):
+        with patch.object(self.mcp, 'execute_query', return_value={"rows": []}) as eq:
+            self.mcp.dispatch_tool('list_tables', {})
+            self.mcp.dispatch_tool('list_tables', {})
+        self.assertEqual(eq.call_count, 2)
+        self.assertEqual(self.versions.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
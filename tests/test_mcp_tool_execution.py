@@ -0,0 +1,128 @@
+"""
+Tests for the commodities MCP server's tool execution: thread-pool offload,
+per-tool timeouts with query cancellation, and the shared connection pool.
+
+Fake DB-API connections; the mcp package itself is not required.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mcp import commodities_db_server as mcp_server
+from src.services.database.pool import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        if sql.startswith('SELECT pg_sleep'):
+            # Block until cancelled, like a long-running query
+            if not self.conn.cancelled.wait(timeout=5):
+                raise AssertionError("query was never cancelled")
+            raise RuntimeError("canceling statement due to user request")
+        if sql.startswith('SELECT'):
+            self.description = [('value',)]
+
+    def fetchall(self):
+        return [{'value': 1}]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.statements = []
+        self.cancelled = threading.Event()
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class TestMcpToolExecution(unittest.TestCase):
+
+    def setUp(self):
+        self.opened = []
+
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+
+        mcp_server.shutdown()
+        mcp_server._pool = ConnectionPool(connect, minconn=0, maxconn=4)
+        self.addCleanup(mcp_server.shutdown)
+
+    def test_tool_calls_run_concurrently(self):
+        def slow_tool(name, arguments):
+            time.sleep(0.3)
+            return name
+
+        async def run_all():
+            return await asyncio.gather(*[
+                mcp_server.run_tool(f"tool_{i}", {}) for i in range(4)
+            ])
+
+        with patch.object(mcp_server, 'dispatch_tool', side_effect=slow_tool):
+            start = time.monotonic()
+            results = asyncio.run(run_all())
+        self.assertLess(time.monotonic() - start, 0.9)
+        self.assertEqual(results, [f"tool_{i}" for i in range(4)])
+
+    def test_queries_share_pooled_connection(self):
+        for _ in range(3):
+            result = mcp_server.execute_query("SELECT 1 AS value")
+            self.assertEqual(result['row_count'], 1)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_timeout_cancels_running_query(self):
+        with patch.dict(mcp_server.TOOL_TIMEOUTS, {'query_database': 0.2}):
+            start = time.monotonic()
+            result = asyncio.run(mcp_server.run_tool(
+                'query_database', {'sql': 'SELECT pg_sleep(60)'}))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertIn('timed out', result)
+        conn = self.opened[0]
+        self.assertTrue(conn.cancelled.wait(timeout=2))
+        # Checkout carried the tool's statement_timeout
+        self.assertIn('SET statement_timeout = %s', conn.statements)
+
+    def test_errors_are_returned_as_json(self):
+        with patch.object(mcp_server, 'dispatch_tool', side_effect=KeyError('sql')):
+            result = asyncio.run(mcp_server.run_tool('query_database', {}))
+        self.assertIn('error', result)
+
+    def test_unknown_tool(self):
+        result = asyncio.run(mcp_server.run_tool('no_such_tool', {}))
+        self.assertIn('Unknown tool', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Tests for ReportBatchRunner (src/pipeline/batch_runner.py): concurrent prompt
+context builds, the shared KG fetch, per-provider LLM limits, ModelRouter
+fallbacks and per-stage timings. Templates and the LLM are fakes; no DB.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analysis.templates.base_template import BaseAnalysisTemplate
+from src.pipeline.batch_runner import ReportBatchRunner
+from src.pipeline.report_pipeline import ReportPipeline
+from src.services.llm.llm_client import LLMResponse
+from src.services.llm.model_router import ModelRouter
+
+NARRATIVE = " ".join(["Corn ending stocks fell on stronger exports this month."] * 8)
+
+
+class FakeTemplate(BaseAnalysisTemplate):
+    report_type = 'wasde'
+
+    def __init__(self, template_id, kg_node_keys, delay=0.2):
+        self.template_id = template_id
+        self.kg_node_keys = kg_node_keys
+        self.delay = delay
+
+    def check_data_ready(self):
+        return True
+
+    def gather_data(self):
+        time.sleep(self.delay)
+        return {}
+
+    def compute_analysis(self, data):
+        return {
+            'report_date': '2026-10-09', 'marketing_year': self.template_id,
+            'balance_sheet_table': '', 'delta_summary': '', 'global_context': '',
+            'is_august_wasde': False,
+        }
+
+
+class FakeLLM:
+    """Stands in for call_llm; tracks in-flight calls per provider."""
+
+    def __init__(self, failing=(), delay=0.1):
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = defaultdict(int)
+        self.max_in_flight = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __call__(self, model, system_prompt, user_prompt, **kwargs):
+        with self._lock:
+            self.calls.append(model.model_id)
+            self.in_flight[model.provider] += 1
+            self.max_in_flight[model.provider] = max(self.max_in_flight[model.provider],
+                                                     self.in_flight[model.provider])
+        try:
+            time.sleep(self.delay)
+            if model.model_id in self.failing:
+                raise RuntimeError(f"{model.model_id} unavailable")
+            return LLMResponse(text=NARRATIVE, tokens_in=1000, tokens_out=300, latency_ms=100,
+                               model_id=model.model_id, provider=model.provider)
+        finally:
+            with self._lock:
+                self.in_flight[model.provider] -= 1
+
+
+def _event_log_connection():
+    conn = MagicMock()
+    conn.__enter__ = MagicMock(return_value=conn)
+    conn.__exit__ = MagicMock(return_value=False)
+    return conn
+
+
+class TestReportBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        stages = patch.multiple(ReportPipeline, _stage_charts=MagicMock(return_value=[]),
+                                _stage_publish=MagicMock(), _get_connection=_event_log_connection)
+        stages.start()
+        self.addCleanup(stages.stop)
+        self.kg = MagicMock()
+        self.kg.get_enriched_contexts.side_effect = lambda keys: {
+            k: {'node': {'label': k}} for k in keys if k != 'missing'}
+        self.call_logger = MagicMock()
+        self.templates = [
+            FakeTemplate('corn', ['corn', 'usda.wasde.revision_pattern']),
+            FakeTemplate('soybeans', ['soybeans', 'usda.wasde.revision_pattern', 'missing']),
+            FakeTemplate('wheat', ['wheat']),
+        ]
+
+    def _run(self, llm, **kwargs):
+        runner = ReportBatchRunner(self.templates, router=ModelRouter(),
+                                   call_logger=self.call_logger, **kwargs)
+        runner._kg_manager = self.kg
+        with patch('src.services.llm.llm_client.call_llm', llm):
+            return runner.run(triggered_by='usda_wasde')
+
+    def test_templates_run_concurrently(self):
+        llm = FakeLLM()
+        t0 = time.perf_counter()
+        batch = self._run(llm, provider_concurrency={'anthropic': 2})
+        elapsed = time.perf_counter() - t0
+
+        self.assertTrue(batch.success, [r.error_message for r in batch.results])
+        self.assertEqual([r.template_id for r in batch.results], ['corn', 'soybeans', 'wheat'])
+        # Serially this is 3 x (0.2s context + 0.1s LLM)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(llm.max_in_flight['anthropic'], 2)
+
+        # One KG round trip for the union of keys; each template sees only its own
+        self.kg.get_enriched_contexts.assert_called_once_with(
+            ['corn', 'usda.wasde.revision_pattern', 'soybeans', 'missing', 'wheat'])
+        self.assertEqual(set(batch.results[1].prompt_context['kg_context']),
+                         {'soybeans', 'usda.wasde.revision_pattern'})
+
+        for result in batch.results:
+            self.assertEqual(set(result.stage_timings) - {'llm_queue'},
+                             {'prompt_context', 'llm', 'charts', 'publish', 'validation', 'event_log'})
+            self.assertGreaterEqual(result.stage_timings['prompt_context'], 200)
+            self.assertGreaterEqual(result.stage_timings['llm'], 100)
+            self.assertEqual(result.llm_model_id, 'claude-opus-4-20250514')
+        self.assertIn('kg_prefetch', batch.stage_timings)
+        self.assertLessEqual(max(r.stage_timings['prompt_context'] for r in batch.results),
+                             batch.stage_timings['total'])
+
+    def test_context_workers_bound_prompt_builds(self):
+        batch = self._run(FakeLLM(delay=0), context_workers=1)
+        self.assertTrue(batch.success)
+        # One at a time: the last template waits for the other two
+        self.assertGreaterEqual(max(r.stage_timings['prompt_context'] for r in batch.results), 550)
+
+    def test_fallback_to_local_model_under_ollama_limit(self):
+        claude = ['claude-opus-4-20250514', 'claude-sonnet-4-20250514', 'claude-haiku-4-5-20251001']
+        llm = FakeLLM(failing=claude)
+        batch = self._run(llm)
+
+        self.assertTrue(batch.success, [r.error_message for r in batch.results])
+        self.assertEqual({r.llm_model_id for r in batch.results}, {'llama3.1:70b'})
+        self.assertEqual(llm.max_in_flight['ollama'], 1)
+        self.assertGreater(max(r.stage_timings.get('llm_queue', 0) for r in batch.results), 0)
+
+        errors = [c.kwargs['model_id'] for c in self.call_logger.log_error.call_args_list]
+        self.assertEqual(sorted(errors), sorted(claude * 3))
+        logged = {c.kwargs['model_id'] for c in self.call_logger.log_call.call_args_list}
+        self.assertEqual(logged, {'llama3.1:70b'})
+
+    def test_failures_are_kept_per_template(self):
+        llm = FakeLLM(failing=ModelRouter._FALLBACK_CHAIN.keys(), delay=0)
+        self.templates = self.templates[:1] + [FakeTemplate('wheat', ['wheat'], delay=0)]
+        with patch.object(FakeTemplate, 'check_data_ready',
+                          lambda self: self.template_id != 'corn'):
+            batch = self._run(llm)
+        corn, wheat = batch.results
+        self.assertIn('Data not ready', corn.error_message)
+        self.assertFalse(wheat.success)
+        self.assertIn('llama3.1:8b unavailable', wheat.error_message)
+        self.assertEqual(batch.failed, [corn, wheat])
+
+    def test_failed_kg_prefetch_falls_back_per_template(self):
+        self.kg.get_enriched_contexts.side_effect = RuntimeError('kg down')
+        own_kg = MagicMock()
+        own_kg.get_enriched_context.side_effect = lambda key: {'node': {'label': key}}
+        with patch.object(BaseAnalysisTemplate, '_get_kg_manager', return_value=own_kg):
+            batch = self._run(FakeLLM(delay=0))
+        self.assertTrue(batch.success)
+        self.assertEqual(set(batch.results[2].prompt_context['kg_context']), {'wheat'})
+        self.assertEqual(own_kg.get_enriched_context.call_count, 6)
+
+
+class TestCallLoggerChainLock(unittest.TestCase):
+
+    def test_concurrent_calls_extend_one_chain(self):
+        from src.services.llm.call_logger import CallLogger
+
+        chain, rows = [], []        # rows: (record_hash, chain_hash) in insert order
+
+        def last_chain_hash():
+            prior = chain[-1] if chain else None
+            time.sleep(0.005)                   # widen the read -> insert window
+            return prior
+
+        def connection():
+            conn = _event_log_connection()
+            conn.cursor.return_value.execute.side_effect = \
+                lambda sql, params: rows.append(params[-3:-1]) or chain.append(params[-2])
+            return conn
+
+        call_logger = CallLogger()
+        with patch.object(call_logger, '_get_last_chain_hash', last_chain_hash), \
+                patch.object(call_logger, '_get_connection', connection):
+            threads = [threading.Thread(target=call_logger.log_call,
+                                        kwargs={'task_type': 'analysis', 'model_id': f'm{i}'})
+                       for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[0][1], rows[0][0])
+        for (_, prior), (record_hash, chain_hash) in zip(rows, rows[1:]):
+            self.assertEqual(chain_hash, CallLogger.compute_hash(record_hash + prior))
+
+
+if __name__ == '__main__':
+    unittest.main()
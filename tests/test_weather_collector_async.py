@@ -0,0 +1,283 @@
+"""
+Tests for the async, batched collection path in
+src/scheduler/agents/weather_collector_agent.py, run against a local stub of the
+OpenWeather and Open-Meteo endpoints.
+"""
+
+import json
+import sys
+import threading
+import time
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.scheduler.agents import weather_collector_agent as wca
+from src.scheduler.agents import weather_fetch
+from src.services.location_service import WeatherLocation
+from src.utils.rate_limit import remove_shared_limiter
+
+
+class StubWeatherServer:
+    """Serves canned OpenWeather / Open-Meteo responses and records every request."""
+
+    def __init__(self, onecall_status=200, failing_current=(), delay=0.02):
+        self.onecall_status = onecall_status
+        self.failing_current = set(failing_current)     # lat values that 500 on /weather
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests.append((url.path, query))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    status, body = stub.respond(url.path, query)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def paths(self, path):
+        return [q for p, q in self.requests if p == path]
+
+    def respond(self, path, query):
+        if path == '/data/3.0/onecall':
+            if self.onecall_status != 200:
+                return self.onecall_status, {'cod': self.onecall_status}
+            lat = float(query['lat'])
+            alerts = [{'event': 'Heat', 'start': 1760000000, 'end': 1760086400,
+                       'sender_name': 'NWS', 'description': 'Hot', 'tags': ['Extreme temperature value']}]
+            return 200, {'lat': lat, 'current': {'temp': 21.0}, 'alerts': alerts if lat < 1 else []}
+        if path == '/data/2.5/weather':
+            lat = float(query['lat'])
+            if lat in self.failing_current:
+                return 500, {'cod': 500}
+            return 200, {'coord': {'lat': lat}, 'main': {'temp': 20.0}}
+        if path in ('/v1/forecast', '/v1/archive'):
+            lats = [float(x) for x in query['latitude'].split(',')]
+            lons = [float(x) for x in query['longitude'].split(',')]
+            if path == '/v1/forecast':
+                days = [query.get('start_date', '2025-06-01')]
+            else:
+                start = date.fromisoformat(query['start_date'])
+                end = date.fromisoformat(query['end_date'])
+                days = [date.fromordinal(d).isoformat()
+                        for d in range(start.toordinal(), end.toordinal() + 1)]
+            results = [{
+                'latitude': lat, 'longitude': lon, 'timezone': 'UTC',
+                'current_weather': {'temperature': 19.0},
+                'daily': {'time': days,
+                          'temperature_2m_max': [lat + i for i in range(len(days))],
+                          'precipitation_sum': [0.5] * len(days)},
+            } for lat, lon in zip(lats, lons)]
+            return 200, results[0] if len(results) == 1 else results
+        return 404, {}
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.connection = mock.Mock(encoding='UTF8')
+        self.rowcount = 0
+
+    def mogrify(self, template, args):
+        return repr(tuple(str(a) for a in args)).encode()
+
+    def execute(self, sql, params=None):
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        self.log.append((sql, params))
+
+    def fetchone(self):
+        return (0,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _locations(n):
+    # lat doubles as a stable per-location key in the stub
+    return [WeatherLocation(id=f'loc_{i}', name=f'loc_{i}', display_name=f'Loc {i}',
+                            region='US', country='US', lat=float(i), lon=-90.0 - i)
+            for i in range(n)]
+
+
+class TestAsyncWeatherCollection(unittest.TestCase):
+
+    def setUp(self):
+        for name in ('weather:openweather', 'weather:open_meteo'):
+            remove_shared_limiter(name)
+        # Production budgets would make these tests wait; the rate test sets its own
+        rates = mock.patch.multiple(weather_fetch, OPENWEATHER_RATE_PER_MIN=60000.0,
+                                    OPENWEATHER_BURST=1000.0, OPEN_METEO_RATE_PER_MIN=60000.0,
+                                    OPEN_METEO_BURST=1000.0)
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.sql_log = []
+        self.collector = wca.WeatherCollectorAgent.__new__(wca.WeatherCollectorAgent)
+        self.collector.openweather_api_key = None
+        self.collector._get_db_connection = lambda: FakeConnection(self.sql_log)
+
+    def tearDown(self):
+        for name in ('weather:openweather', 'weather:open_meteo'):
+            remove_shared_limiter(name)
+
+    def _point_at(self, server):
+        self.collector.OPENWEATHER_BASE = f"{server.base}/data/2.5"
+        self.collector.OPENWEATHER_ONECALL = f"{server.base}/data/3.0/onecall"
+        self.collector.OPEN_METEO_BASE = f"{server.base}/v1"
+        self.collector.OPEN_METEO_ARCHIVE = f"{server.base}/v1/archive"
+
+    def _statements(self, table):
+        return [sql for sql, _ in self.sql_log if f'INSERT INTO {table}' in sql]
+
+    def test_open_meteo_batches_locations(self):
+        locations = _locations(120)
+        with StubWeatherServer() as server:
+            self._point_at(server)
+            with mock.patch.object(weather_fetch, 'OPEN_METEO_BATCH', 50):
+                result = self.collector.collect_current_weather(locations)
+
+        forecast = server.paths('/v1/forecast')
+        self.assertEqual(len(forecast), 3)                  # 50 + 50 + 20 coordinates
+        self.assertEqual(sorted(len(q['latitude'].split(',')) for q in forecast), [20, 50, 50])
+        self.assertEqual(result.records_collected, 120)
+        self.assertEqual(result.locations_processed, 120)
+        self.assertEqual(result.errors, [])
+
+        # One bulk insert, then one silver transform for the whole batch
+        self.assertEqual(len(self._statements('bronze.weather_raw')), 1)
+        transforms = [p for sql, p in self.sql_log if 'process_weather_to_silver' in sql]
+        self.assertEqual(transforms, [(result.batch_id,)])
+
+    def test_openweather_fallback_chain_and_alerts(self):
+        locations = _locations(12)
+        self.collector.openweather_api_key = 'test-key'
+        with StubWeatherServer(onecall_status=401, failing_current={3.0, 7.0}) as server:
+            self._point_at(server)
+            result = self.collector.collect_current_weather(locations)
+
+        # OneCall disabled after the 401s; current weather for all; Open-Meteo for the two failures
+        self.assertLessEqual(len(server.paths('/data/3.0/onecall')), len(locations))
+        self.assertEqual(len(server.paths('/data/2.5/weather')), 12)
+        forecast = server.paths('/v1/forecast')
+        self.assertEqual(len(forecast), 1)
+        self.assertEqual(sorted(forecast[0]['latitude'].split(',')), ['3.0', '7.0'])
+        self.assertEqual(result.records_collected, 12)
+        self.assertFalse(self._statements('bronze.weather_alerts_raw'))
+
+        with StubWeatherServer() as server:
+            self._point_at(server)
+            self.sql_log.clear()
+            result = self.collector.collect_current_weather(locations)
+        self.assertFalse(server.paths('/data/2.5/weather'))
+        self.assertEqual(len(self._statements('bronze.weather_alerts_raw')), 1)
+        self.assertIn('loc_0', self._statements('bronze.weather_alerts_raw')[0])
+        self.assertTrue(any('silver.weather_alert' in sql for sql, _ in self.sql_log))
+
+    def test_concurrency_is_bounded(self):
+        locations = _locations(40)
+        self.collector.openweather_api_key = 'test-key'
+        with StubWeatherServer(delay=0.05) as server:
+            self._point_at(server)
+            with mock.patch.object(weather_fetch, 'WEATHER_CONCURRENCY', 6):
+                result = self.collector.collect_current_weather(locations)
+        self.assertEqual(result.records_collected, 40)
+        self.assertGreater(server.max_in_flight, 1)
+        self.assertLessEqual(server.max_in_flight, 6)
+
+    def test_open_meteo_budget_charged_per_location(self):
+        # 30 locations in batches of 10 against a 10-token bucket refilling at 100/s:
+        # the second and third requests wait for 20 tokens between them (~0.2s)
+        locations = _locations(30)
+        with StubWeatherServer(delay=0) as server, \
+                mock.patch.multiple(weather_fetch, OPEN_METEO_BATCH=10,
+                                    OPEN_METEO_RATE_PER_MIN=6000.0, OPEN_METEO_BURST=10.0):
+            self._point_at(server)
+            t0 = time.perf_counter()
+            result = self.collector.collect_current_weather(locations)
+            elapsed = time.perf_counter() - t0
+        self.assertEqual(len(server.paths('/v1/forecast')), 3)
+        self.assertEqual(result.records_collected, 30)
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_historical_splits_days_in_one_insert(self):
+        locations = _locations(7)
+        with StubWeatherServer() as server:
+            self._point_at(server)
+            result = self.collector.collect_historical(date(2025, 6, 1), date(2025, 6, 5), locations)
+
+        self.assertEqual(len(server.paths('/v1/archive')), 1)
+        self.assertEqual(result.records_collected, 7 * 5)
+        self.assertEqual(result.locations_processed, 7)
+        inserts = self._statements('bronze.weather_raw')
+        self.assertEqual(len(inserts), 1)
+        self.assertIn('2025-06-05', inserts[0])
+        self.assertEqual(sum('process_weather_to_silver' in sql for sql, _ in self.sql_log), 1)
+
+    def test_failed_batch_reports_each_location(self):
+        locations = _locations(3)
+        with StubWeatherServer() as server:
+            self._point_at(server)
+            self.collector.OPEN_METEO_ARCHIVE = f"{server.base}/v1/missing"
+            result = self.collector.collect_historical(date(2025, 6, 1), date(2025, 6, 2), locations)
+        self.assertFalse(result.success)
+        self.assertEqual(result.errors, [f"No historical data for loc_{i}" for i in range(3)])
+        self.assertFalse(any('process_weather_to_silver' in sql for sql, _ in self.sql_log))
+
+
+if __name__ == '__main__':
+    unittest.main()
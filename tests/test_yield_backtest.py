@@ -0,0 +1,196 @@
+"""
+Tests for the yield backtest engine (src/models/yield_backtest.py) and
+YieldModelValidator.run_backtest on top of it. A stand-in fit function
+replaces the sklearn sub-models; the database is a fake cursor.
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.yield_backtest import PANEL_VERSION, BacktestEngine, Panel, load_panel
+from src.models.yield_model_validator import YieldModelValidator
+from src.models.yield_prediction_model import ALL_NUMERIC_FEATURES
+
+STATES = {'IA': 'Iowa', 'IL': 'Illinois', 'NE': 'Nebraska'}
+YEARS = range(2005, 2021)
+WEEKS = (26, 30)
+N_FEATURES = len(ALL_NUMERIC_FEATURES)
+
+FIT_CALLS = []
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+class IdentityScaler:
+    def transform(self, X):
+        return X
+
+
+def mean_deviation_fit(states, years, X, y, trend_yields):
+    """Every sub-model predicts the mean training deviation from trend."""
+    FIT_CALLS.append(sorted(set(np.asarray(years).tolist())))
+    dev = float(np.mean(y - trend_yields))
+    return {'model_a': ConstantModel(dev), 'model_b': ConstantModel(dev),
+            'scaler': IdentityScaler(), 'analog_data': None}
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if 'COALESCE(MAX(updated_at)' in sql:
+            self._rows = [(f"{len(self.db.rows)}|v{self.db.version}", '48|x', '3|y')]
+        elif 'silver.yield_features f' in sql:
+            self._rows = sorted(self.db.rows, key=lambda r: (r[2], r[1], r[0]))
+        elif 'silver.yield_trend' in sql:
+            self._rows = [(name, *coef) for name, coef in self.db.trends.items()]
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self):
+        rng = np.random.default_rng(3)
+        self.statements = []
+        self.version = 1
+        self.rows = []
+        self.trends = {name: (2.0, -3850.0) for name in STATES.values()}
+        for year in YEARS:
+            for week in WEEKS:
+                for st in STATES:
+                    actual = 2.0 * year - 3850.0 + rng.normal(0, 5)
+                    if year == 2020 and st == 'NE':
+                        actual = None          # no final yield yet
+                    self.rows.append((st, year, week, 'reproductive',
+                                      *rng.normal(0, 1, N_FEATURES), actual))
+
+    def connect(self):
+        return self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+class TestBacktestEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = Path(self.tmp.name)
+        FIT_CALLS.clear()
+
+    def _engine(self, **kwargs):
+        kwargs.setdefault('workers', 1)
+        return BacktestEngine(cache_dir=self.cache, fit_fn=mean_deviation_fit,
+                              connection_fn=self.db.connect, **kwargs)
+
+    def test_leave_one_year_out_folds(self):
+        folds = self._engine().run(['corn'], [2018, 2020, 2030], WEEKS)['corn']
+        self.assertEqual([(f['test_year'], f['week']) for f in folds],
+                         [(2018, 26), (2018, 30), (2020, 26), (2020, 30)])
+        for f, years in zip(folds, FIT_CALLS):
+            self.assertNotIn(f['test_year'], years)
+        self.assertEqual(FIT_CALLS[0], [y for y in YEARS if y != 2018])
+        self.assertEqual(folds[2]['states'], ['IA', 'IL'])   # NE 2020 has no actual
+        self.assertEqual(folds[0]['n_train'], 3 * 15 - 1)
+
+    def test_walk_forward_trains_on_earlier_years(self):
+        self._engine().run(['corn'], [2018], [26], walk_forward=True)
+        self.assertEqual(FIT_CALLS, [list(range(2005, 2018))])
+
+    def test_unchanged_folds_are_skipped(self):
+        first = self._engine().run(['corn'], [2017, 2018], WEEKS)
+        FIT_CALLS.clear()
+        engine = self._engine()
+        self.assertEqual(engine.run(['corn'], [2017, 2018], WEEKS), first)
+        self.assertEqual((engine.stats['cached'], engine.stats['computed']), (4, 0))
+        self.assertEqual(FIT_CALLS, [])
+
+        # Changing a week-26 row invalidates only the week-26 folds
+        i = next(i for i, r in enumerate(self.db.rows) if r[1] == 2010 and r[2] == 26)
+        self.db.rows[i] = self.db.rows[i][:4] + (9.0,) + self.db.rows[i][5:]
+        self.db.version += 1
+        engine = self._engine()
+        engine.run(['corn'], [2017, 2018], WEEKS)
+        self.assertEqual((engine.stats['cached'], engine.stats['computed']), (2, 2))
+
+    def test_process_pool_matches_serial(self):
+        serial = self._engine(use_cache=False).run(['corn', 'soybeans'], [2016, 2018], WEEKS)
+        parallel = self._engine(use_cache=False, workers=3).run(['corn', 'soybeans'], [2016, 2018], WEEKS)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(parallel['soybeans']), 4)
+
+    def test_panel_snapshot_reused_until_source_changes(self):
+        load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+        self.db.statements.clear()
+        panel = load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+        self.assertEqual(len(self.db.statements), 1)                 # fingerprint only
+        self.assertIsInstance(panel, Panel)
+        self.assertEqual(panel.features.shape, (len(self.db.rows), N_FEATURES))
+        self.assertEqual(int(np.isnan(panel.actuals).sum()), 2)
+
+        self.db.version += 1
+        self.db.statements.clear()
+        load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+        self.assertEqual(len(self.db.statements), 3)
+
+    def test_panel_snapshot_reloaded_when_layout_changes(self):
+        for name, value in (('PANEL_VERSION', PANEL_VERSION + 1),
+                            ('ALL_NUMERIC_FEATURES', ALL_NUMERIC_FEATURES[::-1])):
+            load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+            self.db.statements.clear()
+            with mock.patch(f'src.models.yield_backtest.{name}', value):
+                load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+            self.assertEqual(len(self.db.statements), 3, name)
+
+    def test_null_trend_coefficients_are_skipped(self):
+        # A NULL coefficient means no trend, as in YieldPredictionModel._trend_coefficients
+        self.db.trends['Nebraska'] = (None, -3850.0)
+        panel = load_panel('corn', cache_dir=self.cache, connection_fn=self.db.connect)
+        no_trend = np.isnan(panel.trend_yields)
+        self.assertTrue(no_trend.any())
+        self.assertEqual(set(panel.states[no_trend].tolist()), {'NE'})
+
+        folds = self._engine(use_cache=False).run(['corn'], [2018], [26])['corn']
+        self.assertEqual(folds[0]['states'], ['IA', 'IL'])
+
+    def test_validator_metrics(self):
+        validator = YieldModelValidator(engine=self._engine())
+        results = validator.run_backtest('corn', [2017, 2018, 2019], forecast_weeks=[26, 30, 34])
+        self.assertEqual(results['week_34'], {'n': 0})
+        m = results['week_26']
+        self.assertEqual(m['n'], 9)
+        self.assertEqual(m['raw']['years'], [2017] * 3 + [2018] * 3 + [2019] * 3)
+        self.assertLess(m['rmse'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
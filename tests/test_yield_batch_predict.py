@@ -0,0 +1,169 @@
+"""
+Tests for batch inference in src/models/yield_prediction_model.py.
+Sub-models are small picklable stand-ins; the database is a fake cursor.
+"""
+
+import json
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models import yield_prediction_model as ypm
+from src.models.yield_prediction_model import (
+    ALL_NUMERIC_FEATURES, ANALOG_FEATURES, YieldPredictionModel,
+)
+
+STATES = ['IA', 'IL', 'IN', 'NE', 'OH', 'MN']
+N_FEATURES = len(ALL_NUMERIC_FEATURES)
+
+
+class LinearStub:
+    """predict(X) = X @ coef; counts calls so tests can see batching."""
+    def __init__(self, coef):
+        self.coef = np.asarray(coef, dtype=float)
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(X, dtype=float) @ self.coef
+
+
+class ScalerStub:
+    def transform(self, X):
+        return np.asarray(X, dtype=float) / 10.0
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if 'silver.yield_features' in sql:
+            crop, weeks, year = params[:3]
+            states = params[3] if len(params) > 3 else STATES
+            self._rows = [r for r in self.db.features if r[1] in weeks and r[0] in states]
+            self._rows.sort(key=lambda r: (r[1], r[0]))
+        elif 'silver.yield_trend' in sql:
+            self._rows = [('Iowa', 2.0, -3900.0), ('Illinois', 2.1, -4050.0),
+                          ('Indiana', 1.9, -3680.0), ('Nebraska', 1.8, -3450.0),
+                          ('Ohio', 1.7, -3260.0)]   # no Minnesota: MN is skipped
+        elif 'bronze.nass_state_yields' in sql:
+            self._rows = [('IA', 200.0), ('IL', None)]
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self, features):
+        self.features = features
+        self.statements = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+def _reference_analog(features, analog_data, trend_yield, year):
+    """The original per-state analog computation, kept as an oracle."""
+    a_idx = [analog_data['feature_names'].index(f) for f in ANALOG_FEATURES]
+    stored = np.array(analog_data['features'])[:, a_idx]
+    years = np.array(analog_data['years'])
+    mean, std = stored.mean(axis=0), stored.std(axis=0)
+    std[std == 0] = 1
+    d = np.sqrt((((stored - mean) / std - (features[a_idx] - mean) / std) ** 2).sum(axis=1))
+    mask = years != year
+    d, ys = d[mask], years[mask]
+    dev = (np.array(analog_data['yields']) - np.array(analog_data['trend_yields']))[mask]
+    top = np.argsort(d)[:5]
+    w = 1.0 / (d[top] + 0.01)
+    w /= w.sum()
+    return trend_yield + np.sum(w * dev[top]), "Similar to " + ", ".join(str(int(y)) for y in ys[top[:3]])
+
+
+class TestBatchPredict(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        model_dir = Path(self.tmp.name)
+
+        self.analog = {
+            'states': ['IA'] * 20, 'years': list(range(2004, 2024)),
+            'yields': list(rng.normal(180, 10, 20)), 'trend_yields': [180.0] * 20,
+            'features': rng.normal(0, 1, (20, N_FEATURES)).tolist(),
+            'feature_names': ALL_NUMERIC_FEATURES,
+        }
+        for name, obj in [('model_a', LinearStub(rng.normal(0, 0.1, 6))),
+                          ('model_b', LinearStub(rng.normal(0, 0.1, N_FEATURES))),
+                          ('scaler', ScalerStub()), ('analog_data', self.analog)]:
+            with open(model_dir / f'corn_{name}.pkl', 'wb') as f:
+                pickle.dump(obj, f)
+        (model_dir / 'corn_metadata.json').write_text(json.dumps({'rmse_cv': 8.0}))
+
+        features = []
+        for week in (26, 30):
+            for st in STATES:
+                values = list(rng.normal(0, 1, N_FEATURES))
+                values[0] = None        # NULL feature column -> 0
+                features.append((st, week, 'reproductive' if week == 30 else None, *values))
+        self.conn = FakeConn(features)
+        patcher = mock.patch.object(ypm, 'get_db_connection', lambda: self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = YieldPredictionModel(model_dir=model_dir)
+
+    def test_batch_matches_single_week(self):
+        batch = self.model.predict_batch('corn', 2026, [26, 30])
+        self.assertEqual(len(batch), 10)               # MN has no trend row
+        single = self.model.predict('corn', 2026, 26) + self.model.predict('corn', 2026, 30)
+        self.assertEqual(batch, single)
+
+        ia = batch[0]
+        self.assertEqual((ia.state, ia.forecast_week, ia.commodity), ('IA', 26, 'CORN'))
+        self.assertEqual(ia.trend_yield, round(2.0 * 2026 - 3900.0, 1))
+        self.assertEqual(ia.last_year_yield, 200.0)
+        self.assertIsNone(batch[1].last_year_yield)    # NULL last-year yield
+        self.assertLess(batch[0].confidence, batch[5].confidence)
+
+    def test_one_query_per_table_and_one_model_call(self):
+        self.model.predict_batch('corn', 2026, [26, 30])
+        self.assertEqual(len(self.conn.statements), 3)
+        models = self.model._load_models('corn')
+        self.assertEqual((models['model_a'].calls, models['model_b'].calls), (1, 1))
+
+        # Trend coefficients and loaded models are reused across calls
+        self.model.predict_batch('corn', 2026, [26])
+        self.assertEqual(sum('yield_trend' in s for s in self.conn.statements), 1)
+        self.assertIs(self.model._load_models('corn'), models)
+
+    def test_vectorized_analogs_match_per_row(self):
+        rows = np.array([r[3:] for r in self.conn.features], dtype=float)
+        rows = np.nan_to_num(rows, nan=0.0)
+        trends = np.linspace(170, 190, len(rows))
+        yields, labels = self.model._analog_predict_batch(rows, self.analog, trends, 2010)
+        for i in range(len(rows)):
+            ref_yield, ref_label = _reference_analog(rows[i], self.analog, trends[i], 2010)
+            self.assertAlmostEqual(yields[i], ref_yield, places=9)
+            self.assertEqual(labels[i], ref_label)
+            self.assertNotIn('2010', labels[i])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Tests for the set-based season builder in src/models/yield_feature_engine.py.
+The database is a fake cursor that answers each source query from in-memory
+rows and captures the bulk upsert.
+"""
+
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models.yield_feature_engine import (
+    FEATURE_COLUMNS, YieldFeatureEngine, nass_week_to_date,
+)
+
+YEAR = 2024
+WEEKS = (3, 4, 5)
+PLANTING = date(YEAR, 4, 15)            # corn planting start in crop_thresholds
+
+
+def _daily_obs():
+    """Two IA stations with varied temps/precip from Apr 1 through mid-May."""
+    obs = []
+    d = date(YEAR, 4, 1)
+    i = 0
+    while d <= date(YEAR, 5, 15):
+        high = 60 + (i * 7) % 40          # 60..99 F: some days above 95 F (35 C)
+        low = 28 + (i * 5) % 30           # 28..57 F: some frost days
+        precip = [0.0, 0.2, 12.0, 0.0, 0.0, 0.5, 30.0][i % 7]
+        obs.append(('des_moines_ia', d, (high + low) / 2, high, low, precip))
+        obs.append(('ames_ia', d, (high + low) / 2 + 2, high + 4, low, None if i % 3 else precip))
+        if i % 5 == 0:                    # a day with no temperature readings at one station
+            obs.append(('mason_city_ia', d, None, None, None, 3.0))
+        d += timedelta(days=1)
+        i += 1
+    return obs
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.connection = db
+        self._rows = []
+
+    def mogrify(self, template, args):
+        self.db.upserted.append(tuple(args))
+        return b'(row)'
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if isinstance(sql, bytes):
+            return
+        if 'silver.weather_observation' in sql:
+            patterns, start, end = params
+            suffixes = [p[-2:] for p in patterns]
+            groups = {}
+            for loc, d, avg, high, low, precip in self.db.obs:
+                if loc[-2:] in suffixes and start <= d <= end:
+                    groups.setdefault((loc[-2:], d), []).append((avg, high, low, precip))
+            self._rows = []
+            for (st, d), vals in sorted(groups.items()):
+                row = [st, d]
+                for k in range(3):
+                    present = [v[k] for v in vals if v[k] is not None]
+                    row += [sum(present) if present else None, len(present)]
+                row.append(sum(v[3] or 0 for v in vals))
+                self._rows.append(tuple(row))
+        elif 'reference.weather_climatology' in sql:
+            self._rows = [('US_SOY_BELT', 4, 100.0, 50.0),
+                          ('US_CORN_BELT', 4, 120.0, 60.0),
+                          ('US_CORN_BELT', 5, None, 40.0)]
+        elif 'gold.cpc_condition_weekly' in sql:
+            self._rows = [(3, 70.0), (3, 10.0), (4, None)]
+        elif 'gold.cpc_condition_yoy' in sql:
+            self._rows = [(4, -2.5)]
+        elif 'gold.cpc_progress_weekly' in sql:
+            self._rows = [(YEAR, 4, 0.6), (YEAR - 1, 4, 0.4), (YEAR - 2, 4, 0.5),
+                          (YEAR - 3, 4, None), (YEAR - 1, 5, 0.9)]
+        elif 'bronze.nass_crop_condition' in sql:
+            wk4 = nass_week_to_date(YEAR, 4)
+            self._rows = [(wk4, 'GOOD', 55.0), (wk4, 'EXCELLENT', None),
+                          (wk4 - timedelta(days=2), 'EXCELLENT', 12.0)]
+        elif 'bronze.nass_crop_progress' in sql:
+            self._rows = [(nass_week_to_date(YEAR, 5), 41.0), (nass_week_to_date(YEAR, 5) - timedelta(days=3), 30.0)]
+        elif 'bronze.ndvi_observation' in sql:
+            if self.db.ndvi_error:
+                raise RuntimeError('relation "bronze.ndvi_observation" does not exist')
+            wk5 = nass_week_to_date(YEAR, 5)
+            self._rows = [('IA', wk5 - timedelta(days=21), 0.30, None),
+                          ('IA', wk5 - timedelta(days=14), None, None),
+                          ('IA', wk5 - timedelta(days=7), 0.40, 0.02),
+                          ('IA', wk5, 0.45, 0.05)]
+        elif 'bronze.weather_email_extract' in sql:
+            self._rows = [(5, 'Drought stress building; net drying'), (5, None),
+                          (5, 'Favorable rains, adequate moisture')]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConn:
+    encoding = 'UTF8'
+
+    def __init__(self, ndvi_error=False):
+        self.obs = _daily_obs()
+        self.ndvi_error = ndvi_error
+        self.statements = []
+        self.upserted = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _reference_weather(obs, week_date):
+    """The original day-by-day loop from planting, kept as an oracle."""
+    days = {}
+    for loc, d, avg, high, low, precip in obs:
+        if PLANTING <= d <= week_date:
+            days.setdefault(d, []).append((high, low, precip))
+    gdd_cum = precip_cum = 0.0
+    heat = frost = excess = dry = max_dry = 0
+    for d in sorted(days):
+        highs = [v[0] for v in days[d] if v[0] is not None]
+        lows = [v[1] for v in days[d] if v[1] is not None]
+        max_f = sum(highs) / len(highs) if highs else None
+        min_f = sum(lows) / len(lows) if lows else None
+        max_c = (max_f - 32) * 5 / 9 if max_f else 0
+        min_c = (min_f - 32) * 5 / 9 if min_f else 0
+        gdd_cum += max(0, (min_c + min(max_c, 30)) / 2 - 10)
+        p = sum(v[2] or 0 for v in days[d])
+        precip_cum += p
+        heat += max_c > 35
+        frost += min_c < 0
+        excess += p > 75 / 7
+        dry = dry + 1 if p < 1.0 else 0
+        max_dry = max(max_dry, dry)
+    week = [o for o in obs if week_date - timedelta(days=6) <= o[1] <= week_date]
+    tavg = [o[2] for o in week if o[2] is not None]
+    tmax = [o[3] for o in week if o[3] is not None]
+    return {
+        'gdd_cum': round(gdd_cum, 1), 'precip_cum_mm': round(precip_cum, 1),
+        'stress_days_heat': heat, 'frost_events': frost,
+        'excess_moisture_days': excess, 'stress_days_drought': max_dry,
+        'tavg_weekly': round((sum(tavg) / len(tavg) - 32) * 5 / 9, 1),
+        'tmax_weekly_avg': round((sum(tmax) / len(tmax) - 32) * 5 / 9, 1),
+    }
+
+
+class TestBuildSeason(unittest.TestCase):
+
+    def _build(self, conn, states=('IA', 'IL'), **kwargs):
+        engine = YieldFeatureEngine(conn=conn)
+        count = engine.build_season('corn', YEAR, list(states), WEEKS[0], WEEKS[-1], **kwargs)
+        rows = {(r[0], r[3]): dict(zip(FEATURE_COLUMNS, r[5:5 + len(FEATURE_COLUMNS)]))
+                for r in conn.upserted}
+        return count, rows
+
+    def test_weather_matches_daily_reference(self):
+        conn = FakeConn()
+        count, rows = self._build(conn)
+        self.assertEqual(count, 6)
+        for week in WEEKS:
+            expected = _reference_weather(conn.obs, nass_week_to_date(YEAR, week))
+            got = rows[('IA', week)]
+            for key, value in expected.items():
+                self.assertAlmostEqual(got[key], value, places=6, msg=f"week {week} {key}")
+            self.assertIsInstance(got['stress_days_heat'], int)
+
+        # Season-to-date normals come from the first preferred region (April only)
+        wk3 = rows[('IA', 3)]
+        self.assertAlmostEqual(wk3['gdd_vs_normal_pct'], (wk3['gdd_cum'] - 120) / 120 * 100, delta=0.1)
+
+        # No weather stations: cumulative NULL, counters 0
+        il = rows[('IL', 4)]
+        self.assertIsNone(il['gdd_cum'])
+        self.assertEqual(il['stress_days_heat'], 0)
+
+    def test_one_query_per_source_and_one_upsert(self):
+        conn = FakeConn()
+        _, rows = self._build(conn)
+        self.assertEqual(len(conn.statements), 10)
+        self.assertEqual(sum(isinstance(s, bytes) for s in conn.statements), 1)
+        self.assertEqual(conn.commits, 1)
+
+        wk4, wk5 = rows[('IA', 4)], rows[('IL', 5)]
+        self.assertEqual(rows[('IA', 3)]['condition_index'], 70.0)
+        self.assertEqual(wk4['condition_vs_5yr'], -2.5)
+        self.assertEqual(wk4['progress_vs_normal'], round(0.6 - 0.45, 3))
+        self.assertEqual(wk4['good_excellent_pct'], 67.0)
+        self.assertIsNone(rows[('IA', 5)]['good_excellent_pct'])
+        self.assertEqual(wk5['pct_planted'], 41.0)
+        self.assertEqual((wk5['ww_risk_score'], wk5['ww_outlook_sentiment']), (3.0, 0.33))
+        self.assertIsNone(wk4['ww_risk_score'])
+
+        ia5 = rows[('IA', 5)]
+        self.assertEqual((ia5['ndvi_mean'], ia5['ndvi_anomaly']), (0.45, 0.05))
+        self.assertAlmostEqual(ia5['ndvi_trend_4wk'], 0.075)
+        self.assertIsNone(wk5['ndvi_mean'])
+
+    def test_incremental_builds_newest_week_only(self):
+        conn = FakeConn()
+        count, rows = self._build(conn, incremental=True)
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(rows), [('IA', 5), ('IL', 5)])
+        full = self._build(FakeConn())[1]
+        self.assertEqual(rows[('IA', 5)], full[('IA', 5)])
+
+    def test_full_state_names_are_normalized(self):
+        # yield_orchestrator passes --state through as typed
+        count, rows = self._build(FakeConn(), states=['Iowa', 'ILLINOIS', 'IA'])
+        expected = self._build(FakeConn())[1]
+        self.assertEqual(count, 6)
+        self.assertEqual(rows, expected)
+
+    def test_missing_ndvi_table_rolls_back_and_continues(self):
+        conn = FakeConn(ndvi_error=True)
+        count, rows = self._build(conn)
+        self.assertEqual((count, conn.rollbacks), (6, 1))
+        self.assertIsNone(rows[('IA', 5)]['ndvi_mean'])
+        self.assertIsNotNone(rows[('IA', 5)]['gdd_cum'])
+
+
+if __name__ == '__main__':
+    unittest.main()